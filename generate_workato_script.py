@@ -61,16 +61,27 @@ def fast_count_lines(file_path, chunk_size=1024 * 1024):
 
 def load_mandatory_dependencies() -> str:
     import_lines = """from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime, timedelta, timezone
 import csv
 import io
-import pandas as pd
-from dataclasses import dataclass, field
-from typing import TypeVar, Dict, Optional, List, Union, Tuple, Callable, Type, Any
+import os
+from dataclasses import dataclass, field, asdict
+from typing import TypeVar, Dict, Optional, List, Union, Tuple, Callable, Type, Any, Iterable, Iterator, Hashable, Awaitable, Sequence
 import xml.etree.ElementTree as ET
-from functools import wraps
+from functools import wraps, partial
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, Future, FIRST_COMPLETED, wait
+from collections import OrderedDict
+from collections.abc import Mapping
+import threading
+import queue
+import pickle
+import sqlite3
+import hashlib
+import contextlib
 
 import requests
+from requests.adapters import HTTPAdapter
 
 import time
 
@@ -82,7 +93,7 @@ T = TypeVar('T')
     content_models_py = copy_lines_from_file(models_py_path, 7)
 
     utils_py_path = "workday/utils.py"
-    content_utils_py = copy_lines_from_file(utils_py_path, 11)
+    content_utils_py = copy_lines_from_file(utils_py_path, 14)
 
     csv_helpers_py_path = "workday/csv_helpers.py"
     content_csv_helpers_py = copy_lines_from_file(csv_helpers_py_path, 8)
@@ -90,16 +101,37 @@ T = TypeVar('T')
     xml_helpers_py_path = "workday/xml_helper.py"
     content_xml_helpers_py = copy_lines_from_file(xml_helpers_py_path, 6)
 
+    transport_py_path = "workday/transport.py"
+    content_transport_py = copy_lines_from_file(transport_py_path, 7)
+
+    token_provider_py_path = "workday/token_provider.py"
+    content_token_provider_py = copy_lines_from_file(token_provider_py_path, 6)
+
+    entity_cache_py_path = "workday/entity_cache.py"
+    content_entity_cache_py = copy_lines_from_file(entity_cache_py_path, 8)
+
+    snapshot_store_py_path = "workday/snapshot_store.py"
+    content_snapshot_store_py = copy_lines_from_file(snapshot_store_py_path, 7)
+
     api_generator_py_path = "workday/workday_api_generator_call.py"
-    content_main_macro_py = copy_lines_from_file(api_generator_py_path, 21, 45)
-    content_main_wd_classes_py = copy_lines_from_file(api_generator_py_path, 46)
+    content_main_macro_py = copy_lines_from_file(api_generator_py_path, 28, 60)
+    content_main_wd_classes_py = copy_lines_from_file(api_generator_py_path, 61)
+
+    master_data_py_path = "workday/master_data.py"
+    content_master_data_py = copy_lines_from_file(master_data_py_path, 10)
 
     api_workday_impl_py_path = "workday/workday_implement_api.py"
-    content_api_workday_py = copy_lines_from_file(api_workday_impl_py_path, 7)
+    content_api_workday_py = copy_lines_from_file(api_workday_impl_py_path, 8)
 
     api_raas_impl_py_path = "workday/workday_raas_implementation_api.py"
     content_api_raas_py = copy_lines_from_file(api_raas_impl_py_path, 8)
 
+    scope_scheduler_py_path = "workday/scope_scheduler.py"
+    content_scope_scheduler_py = copy_lines_from_file(scope_scheduler_py_path, 6)
+
+    journal_backfill_py_path = "workday/journal_backfill.py"
+    content_journal_backfill_py = copy_lines_from_file(journal_backfill_py_path, 17)
+
     # api_wd_data_table_py_path = "workday/workato_api_client.py"
     # content_wd_data_client_py = copy_lines_from_file(api_wd_data_table_py_path, 11, 83)
 
@@ -114,12 +146,26 @@ T = TypeVar('T')
     {DOUBLE_RETURN_LINES}
     {content_xml_helpers_py}
     {DOUBLE_RETURN_LINES}
+    {content_transport_py}
+    {DOUBLE_RETURN_LINES}
+    {content_token_provider_py}
+    {DOUBLE_RETURN_LINES}
+    {content_entity_cache_py}
+    {DOUBLE_RETURN_LINES}
+    {content_snapshot_store_py}
+    {DOUBLE_RETURN_LINES}
     {content_main_wd_classes_py}
     {DOUBLE_RETURN_LINES}
+    {content_master_data_py}
+    {DOUBLE_RETURN_LINES}
     {content_api_workday_py}
     {DOUBLE_RETURN_LINES}
     {content_api_raas_py}
     {DOUBLE_RETURN_LINES}
+    {content_journal_backfill_py}
+    {DOUBLE_RETURN_LINES}
+    {content_scope_scheduler_py}
+    {DOUBLE_RETURN_LINES}
     """
 
 
@@ -128,19 +174,19 @@ def generate_file():
 
     # Generate AJ script
     journ_gen_py_path = "workday_accounting_journal_generator.py"
-    content_journal_gen = copy_lines_from_file(journ_gen_py_path, 8)
+    content_journal_gen = copy_lines_from_file(journ_gen_py_path, 12)
 
     content = f"{mandatory_dep}\n{content_journal_gen}"
     write_content_to_file(content, "workato_journal_script.py")
 
     # Generate AJ heavy workload script
     journ_gen_one_page_py_path = "workday_journal_one_page_generator.py"
-    content_journal_one_page = copy_lines_from_file(journ_gen_one_page_py_path, 11)
+    content_journal_one_page = copy_lines_from_file(journ_gen_one_page_py_path, 15)
     content = f"{mandatory_dep}\n{content_journal_one_page}"
     write_content_to_file(content, "workato_journal_one_page_script.py")
 
     raas_gen_py_path = "workday_all_report_generator.py"
-    content_raas_gen = copy_lines_from_file(raas_gen_py_path, 5)
+    content_raas_gen = copy_lines_from_file(raas_gen_py_path, 10)
     # Generate WD services script
     content = f"{mandatory_dep}\n{content_raas_gen}"
     write_content_to_file(content, "workato_raas_script.py")
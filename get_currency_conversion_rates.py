@@ -1,8 +1,11 @@
+import contextlib
 import requests
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, asdict
-from typing import List, Union, Dict, Any, Optional
+from typing import List, Union, Dict, Any, Optional, Callable, Iterable, Iterator, Tuple
 import time
+import queue
+import threading
 from functools import wraps
 from datetime import datetime
 
@@ -12,6 +15,7 @@ FROM_CURRENCY_CODE = "USD"
 WD_EFFECTIVE_TIMESTAMP_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
 KYRIBA_CURRENCY_RATE_TYPE_ID = 'Current'
 PIGMENT_CURRENCY_RATE_TYPE_ID = 'Monthly_Average'
+DEFAULT_TOKEN_REFRESH_MARGIN = 120  # number of seconds before its expiry the access token is refreshed
 
 
 # DATACLASS OBJECTS
@@ -80,6 +84,168 @@ def retry_on_500(retries=3, delay=2):
     return decorator
 
 
+def prefetch_pages(
+        fetch_page: Callable[[int], bytes],
+        pages: Iterable[int],
+        depth: int = 1,
+) -> Iterator[Tuple[int, Optional[bytes], Optional[Exception]]]:
+    """
+    Fetch the pages in order on a background thread which stays up to `depth` pages ahead of the consumer.
+    At most `depth` fetched pages are buffered, plus the one being fetched.
+    :param fetch_page: Function returning the payload of a page number, called on the background thread
+    :param pages: Page numbers to fetch, in the order they are yielded
+    :param depth: Maximum number of fetched pages waiting to be consumed
+    :return: Iterator of (page, payload, None), or (page, None, error) when the page could not be fetched
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, depth))
+    stopped = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        # do not block forever on a full queue once the consumer is gone
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch_all():
+        try:
+            for page in pages:
+                if stopped.is_set():
+                    return
+                try:
+                    item = (page, fetch_page(page), None)
+                except Exception as error:
+                    item = (page, None, error)
+                if not put(item):
+                    return
+        finally:
+            put(done)
+
+    fetcher = threading.Thread(target=fetch_all, name='page-prefetch', daemon=True)
+    fetcher.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            yield item
+    finally:
+        stopped.set()
+        fetcher.join()
+
+
+class TokenProvider:
+    """
+    Hands out the access token: it is asked for the token before each request.
+    It tracks the token expiry (`expires_in` of the OAuth answer) and refreshes the token shortly before, or after
+    a 401 answer. One refresh runs at a time: Workday rotates the refresh token on each refresh.
+    Same as `workday/token_provider.py`, without the coroutine helpers
+    """
+
+    def __init__(
+            self,
+            fetch_tokens: Optional[Callable[[], Dict[str, Any]]] = None,
+            access_token: Optional[str] = None,
+            refresh_margin: float = DEFAULT_TOKEN_REFRESH_MARGIN,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param fetch_tokens: Requests a new token and returns the OAuth answer (`access_token`, `expires_in`).
+            None for a fixed token which is never refreshed
+        :param access_token: Token to start with, fetched on the first `get_token` when not provided
+        :param refresh_margin: Number of seconds before the expiry the token is refreshed
+        :param clock: Time source, in seconds
+        """
+        self._fetch_tokens = fetch_tokens
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        # (access token, expiry time or None when unknown), replaced as a whole so it is never read half updated
+        self._state: Tuple[Optional[str], Optional[float]] = (access_token, None)
+        self._lock = threading.Lock()
+        self.refresh_count = 0
+
+    @classmethod
+    def of(cls, token: Union[str, 'TokenProvider', None]) -> 'TokenProvider':
+        """ The provider itself, or a fixed token provider for a plain token """
+        return token if isinstance(token, TokenProvider) else cls(access_token=token)
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """ Current token, without any refresh """
+        return self._state[0]
+
+    @property
+    def can_refresh(self) -> bool:
+        return self._fetch_tokens is not None
+
+    def _is_fresh(self, state: Tuple[Optional[str], Optional[float]]) -> bool:
+        access_token, expires_at = state
+        if access_token is None:
+            return False
+        return expires_at is None or self._clock() < expires_at - self.refresh_margin
+
+    def get_token(self) -> Optional[str]:
+        """
+        :return: A valid token, refreshed first when it is about to expire
+        """
+        if not self.can_refresh or self._is_fresh(self._state):
+            return self._state[0]
+
+        with self._lock:
+            # refreshed by another caller while this one was waiting
+            if not self._is_fresh(self._state):
+                self._refresh()
+            return self._state[0]
+
+    def refresh(self) -> Optional[str]:
+        """ Refresh the token now, e.g: on start """
+        with self._lock:
+            self._refresh()
+            return self._state[0]
+
+    def refresh_after_unauthorized(self, rejected_token: Optional[str]) -> bool:
+        """
+        To call after a 401 answer: refresh the token, unless another caller has already replaced the rejected one
+        :param rejected_token: Token sent with the request
+        :return: True when the request can be sent again with `get_token()`
+        """
+        if not self.can_refresh:
+            return False
+
+        with self._lock:
+            if self._state[0] == rejected_token:
+                self._refresh()
+        return True
+
+    def call_with_token(self, send: Callable[[Optional[str]], Any]) -> Any:
+        """
+        Send a request with the current token, and once again with a new token after a 401 answer
+        :param send: Sends the request with the given token and returns the response
+        :return: Response
+        """
+        access_token = self.get_token()
+        response = send(access_token)
+        if response.status_code == 401 and self.refresh_after_unauthorized(access_token):
+            response = send(self.get_token())
+        return response
+
+    def _refresh(self):
+        # called with the lock held
+        tokens = self._fetch_tokens() or {}
+        access_token = tokens.get('access_token')
+        if not access_token:
+            raise ValueError('The token answer has no access_token')
+
+        expires_in = tokens.get('expires_in')
+        expires_at = self._clock() + float(expires_in) if expires_in else None
+        self._state = (access_token, expires_at)
+        self.refresh_count += 1
+
+
 class WorkdayConnector:
     def __init__(self, workday, tenant, client_id, client_secret, refresh_token, version='v42.1', xml_version='1.0'):
         self.workday = workday
@@ -89,11 +255,24 @@ class WorkdayConnector:
         self.refresh_token = refresh_token
         self.version = version
         self.xml_version = xml_version
-        self.access_token = None
         self.base_uri = f'https://{self.workday}'
+        # Shared access token, pass it as the `token` of the services so they get it refreshed
+        self.token_provider = TokenProvider(self._request_tokens)
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """ Last acquired access token, None before `acquire_token` """
+        return self.token_provider.access_token
 
-    @retry_on_500(retries=3, delay=2)
     def acquire_token(self):
+        self.token_provider.refresh()
+
+    @retry_on_500(retries=3, delay=2)
+    def _request_tokens(self) -> Dict[str, Any]:
+        """
+        Request a new access token with the refresh token
+        :return: OAuth answer: access_token, refresh_token, expires_in, ...
+        """
         refresh_url = f'{self.base_uri}/ccx/oauth2/{self.tenant}/token'
         print(refresh_url)
         payload = {
@@ -110,8 +289,9 @@ class WorkdayConnector:
 
         if response.status_code == 200:
             tokens = response.json()
-            self.access_token = tokens.get('access_token')
-            self.refresh_token = tokens.get('refresh_token')
+            # the refresh token may be rotated, the next refresh has to send the new one
+            self.refresh_token = tokens.get('refresh_token') or self.refresh_token
+            return tokens
         else:
             response.raise_for_status()
 
@@ -168,7 +348,8 @@ class GetAllFXRates:
             kyriba_currency_rate_type_id=KYRIBA_CURRENCY_RATE_TYPE_ID
     ):
         self.base_url = base_url
-        self.token = token
+        # a plain token is never refreshed, pass `connector.token_provider` to get it refreshed
+        self.token_provider = TokenProvider.of(token)
         self.api_version = version
         self.url = f'{base_url}/ccx/service/{service_path}/Financial_Management/{version}'
 
@@ -189,6 +370,10 @@ class GetAllFXRates:
 
         self.all_fx_rates: List[CurrencyConversionRate] = []
 
+    @property
+    def token(self) -> Optional[str]:
+        return self.token_provider.get_token()
+
     def parse_currency_conversion_rates(self, xml_input: Union[str, bytes]) -> List[CurrencyConversionRate]:
         """
         Parse the XML response and extract FX rates
@@ -295,26 +480,36 @@ class GetAllFXRates:
         :param next_page: Next page number
         :return: response SOAP payload in bytes
         """
-        headers = {
-            'Content-Type': 'application/xml',
-            'Authorization': f'Bearer {self.token}'
-        }
-
         # If paginating, include the next page token in the request
         if next_page:
             payload = f'''<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Currency_Conversion_Rates_Request\r\n            xmlns:wd=\"urn:com.workday/bsvc\"\r\n            wd:version=\"{self.api_version}\">\r\n            <wd:Request_Criteria>\r\n                \r\n\t\t\t\t<wd:Effective_Timestamp>{effective_timestamp}</wd:Effective_Timestamp>\r\n\r\n                <wd:Currency_Rate_Type_Reference> \r\n                    <wd:ID wd:type=\"Currency_Rate_Type_ID\">{rates_type}</wd:ID>\r\n                </wd:Currency_Rate_Type_Reference>\r\n            </wd:Request_Criteria>\r\n\r\n            <wd:Response_Filter>\r\n                <wd:Page>{next_page}</wd:Page>\r\n                <wd:Count>999</wd:Count>\r\n            </wd:Response_Filter>\r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n            </wd:Response_Group>\r\n        </wd:Get_Currency_Conversion_Rates_Request>\r\n    </env:Body>\r\n</env:Envelope>'''
         else:
             payload = f'''<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Currency_Conversion_Rates_Request\r\n            xmlns:wd=\"urn:com.workday/bsvc\"\r\n            wd:version=\"{self.api_version}\">\r\n            <wd:Request_Criteria>\r\n                \r\n\t\t\t\t<wd:Effective_Timestamp>{effective_timestamp}</wd:Effective_Timestamp>\r\n\r\n                <wd:Currency_Rate_Type_Reference> \r\n                    <wd:ID wd:type=\"Currency_Rate_Type_ID\">{rates_type}</wd:ID>\r\n                </wd:Currency_Rate_Type_Reference>\r\n            </wd:Request_Criteria>\r\n\r\n            <wd:Response_Filter>\r\n                <wd:Page>1</wd:Page>\r\n                <wd:Count>999</wd:Count>\r\n            </wd:Response_Filter>\r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n            </wd:Response_Group>\r\n        </wd:Get_Currency_Conversion_Rates_Request>\r\n    </env:Body>\r\n</env:Envelope>'''
 
-        response = requests.post(self.url, headers=headers, data=payload)
+        def send(token: Optional[str]) -> requests.Response:
+            headers = {
+                'Content-Type': 'application/xml',
+                'Authorization': f'Bearer {token}'
+            }
+            return requests.post(self.url, headers=headers, data=payload)
+
+        # sent again with a new token after a 401
+        response = self.token_provider.call_with_token(send)
         response.raise_for_status()  # Raise an error for bad status codes
         return response.content
 
-    def fetch_currency_conversion_rates(self, effective_timestamp: str, rates_type: str) -> List[CurrencyConversionRate]:
+    def fetch_currency_conversion_rates(
+            self,
+            effective_timestamp: str,
+            rates_type: str,
+            prefetch_depth: int = 0
+    ) -> List[CurrencyConversionRate]:
         """
         Parse the FX rates response payload
         :param effective_timestamp:
         :param rates_type: Type : Current / Average_month / Average_YTD / End_of_ Month / Singapore / Israel / Egypte
+        :param prefetch_depth: Opt-in, fetch the next pages on a background thread staying up to `prefetch_depth`
+            pages ahead of the parsing (0 = fetch then parse each page)
         :return: List of extracted FX Rates
         """
         # Fetch all FX rates using pagination
@@ -335,7 +530,20 @@ class GetAllFXRates:
             print(f'Found: {len(fx_rates)} rates')
             all_fx_rates.extend(fx_rates)
 
-            if next_page_data.page >= 1:
+            if next_page_data.page >= 1 and prefetch_depth > 0:
+                # closing: the fetcher thread is stopped as soon as a page fails, before the error goes up
+                with contextlib.closing(prefetch_pages(
+                    lambda page: self.fetch_fx_rates(effective_timestamp, rates_type, page),
+                    range(2, self.total_page + 1),
+                    prefetch_depth
+                )) as fetched_pages:
+                    for page, response_content, error in fetched_pages:
+                        self.next_page = page
+                        if error is not None:
+                            raise error
+                        fx_rates = self.parse_currency_conversion_rates(response_content)
+                        all_fx_rates.extend(fx_rates)
+            elif next_page_data.page >= 1:
                 for page in range(2, self.total_page + 1):
                     # call next page
                     self.next_page = page
@@ -420,6 +628,8 @@ def main(input):
     effective_timestamp = input['effective_timestamp']  # Supposed to be the last day of the previous month
     pigment_currency_rate_type_id = input['pigment_currency_rate_type_id']
     kyriba_currency_rate_type_id = input['kyriba_currency_rate_type_id']
+    # Optional, number of pages fetched ahead while the current one is parsed (0 = disabled)
+    prefetch_depth = int(input.get('prefetch_depth') or 0)
 
     connector = WorkdayConnector(workday, tenant, client_id, client_secret, refresh_token)
     connector.acquire_token()
@@ -427,15 +637,19 @@ def main(input):
     fx_rates = GetAllFXRates(
         base_url=connector.base_uri,
         service_path=connector.tenant,
-        token=connector.access_token,
+        token=connector.token_provider,
         version=connector.version,
         pigment_currency_rate_type_id=pigment_currency_rate_type_id,
         kyriba_currency_rate_type_id=kyriba_currency_rate_type_id
     )
 
-    kyr_all_fx_rates = fx_rates.fetch_currency_conversion_rates(effective_timestamp, kyriba_currency_rate_type_id)
+    kyr_all_fx_rates = fx_rates.fetch_currency_conversion_rates(
+        effective_timestamp, kyriba_currency_rate_type_id, prefetch_depth=prefetch_depth
+    )
     # effective date Should be the last day of the month for average
-    pgm_all_fx_rates = fx_rates.fetch_currency_conversion_rates(effective_timestamp, pigment_currency_rate_type_id)
+    pgm_all_fx_rates = fx_rates.fetch_currency_conversion_rates(
+        effective_timestamp, pigment_currency_rate_type_id, prefetch_depth=prefetch_depth
+    )
     last_day_date = effective_timestamp[:10]  # take only the start of the US date e.g: 2024-07-26
     print(last_day_date)
     try:
@@ -0,0 +1,459 @@
+"""
+Synthetic benchmarks of the parsing hot paths, no Workday tenant needed:
+
+    python test/benchmarks.py
+"""
+import contextlib
+import io
+import os
+import tempfile
+import re
+import time
+import timeit
+import tracemalloc
+import xml.etree.ElementTree as ET
+from typing import Optional, Tuple, List
+
+from workday.workday_api_generator_call import *
+from workday.workday_implement_api import GetRAASSuppliers, GetAllJournals
+from workday.xml_helper import WORKTAG_ID_FIELDS
+from workday.csv_helpers import CSVJournalHelper
+from workday.columnar_helpers import ColumnarJournalHelper
+from workday.utils import merge_csv_files
+
+WD_NS = 'urn:com.workday/bsvc'
+JOURNAL_ENTRY_DATA_PATH = './/wd:Journal_Entry_Data'
+
+
+def build_journal_line(journal: int, line: int) -> str:
+    return (
+        '<wd:Journal_Entry_Line_Data>'
+        f'<wd:Line_Company_Reference><wd:ID wd:type="Company_Reference_ID">C{journal % 7}</wd:ID></wd:Line_Company_Reference>'
+        f'<wd:Ledger_Account_Reference><wd:ID wd:type="Ledger_Account_ID">{6000 + line}</wd:ID></wd:Ledger_Account_Reference>'
+        f'<wd:Debit_Amount>{journal}.{line}</wd:Debit_Amount><wd:Credit_Amount>0</wd:Credit_Amount>'
+        f'<wd:Currency_Rate>1</wd:Currency_Rate><wd:Memo>Journal {journal} line {line}</wd:Memo>'
+        f'<wd:Worktags_Reference><wd:ID wd:type="Spend_Category_ID">SC{line}</wd:ID></wd:Worktags_Reference>'
+        f'<wd:Worktags_Reference><wd:ID wd:type="Supplier_ID">SUP-{journal % 200}</wd:ID></wd:Worktags_Reference>'
+        f'<wd:Worktags_Reference><wd:ID wd:type="Cost_Center_Reference_ID">CC{journal % 5}</wd:ID></wd:Worktags_Reference>'
+        '</wd:Journal_Entry_Line_Data>'
+    )
+
+
+def build_journal_page(journals: int = 999, lines: int = 4, outdated_every: int = 0) -> bytes:
+    """
+    Build a `Get_Journals` answer page
+    :param journals: Number of journals in the page
+    :param lines: Number of lines by journal
+    :param outdated_every: One journal out of `outdated_every` is created the day before, 0 for none
+    :return: Bytes representation of response payload
+    """
+    entries = ''.join(
+        '<wd:Journal_Entry><wd:Journal_Entry_Data>'
+        f'<wd:Journal_Entry_Reference><wd:ID wd:type="Accounting_Journal_ID">AJ-{journal}</wd:ID></wd:Journal_Entry_Reference>'
+        f'<wd:Journal_Number>JN{journal}</wd:Journal_Number>'
+        f'<wd:Creation_Date>2025-01-{19 if outdated_every and journal % outdated_every == 0 else 20}T05:00:00.000-08:00</wd:Creation_Date>'
+        '<wd:Accounting_Date>2025-01-20</wd:Accounting_Date>'
+        + ''.join(build_journal_line(journal, line) for line in range(lines)) +
+        '</wd:Journal_Entry_Data></wd:Journal_Entry>'
+        for journal in range(journals)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"><env:Body>'
+        f'<wd:Get_Journals_Response xmlns:wd="{WD_NS}">'
+        f'<wd:Response_Results><wd:Total_Results>{journals}</wd:Total_Results><wd:Total_Pages>1</wd:Total_Pages>'
+        f'<wd:Page_Results>{journals}</wd:Page_Results><wd:Page>1</wd:Page></wd:Response_Results>'
+        f'<wd:Response_Data>{entries}</wd:Response_Data>'
+        '</wd:Get_Journals_Response></env:Body></env:Envelope>'
+    ).encode('utf-8')
+
+
+class BenchmarkJournalService(WorkdayService):
+    """ Journal service keeping only the journal ID, so the benchmarks measure the XML handling """
+
+    def __init__(self, **kwargs):
+        super().__init__('https://localhost', 'tenant', 'token', {'wd': WD_NS}, **kwargs)
+
+    def _parse_entity_element(self, entry: ET.Element) -> Optional[str]:
+        return self._get_entity_id(entry)
+
+    def _update_cache(self, element: str):
+        self.cache.update({element: element})
+
+    def _generate_payload(self, entity_id: str, **kwargs) -> str:
+        return ''
+
+    def _generate_payload_pagination(self, next_page: int, **kwargs) -> str:
+        return ''
+
+    def _get_entity_id(self, entry: ET.Element) -> Optional[str]:
+        return self.xml_helper.get_single_tag_line_value(entry, 'wd:Journal_Entry_Reference/wd:ID', str)
+
+
+def benchmark_parse_once(journals: int = 999, repeat: int = 5):
+    """
+    Parsing the page twice (one pass for `Response_Results`, one for the entities, each on a decoded UTF-8 copy)
+    against the single `_parse_response` pass
+    """
+    page = build_journal_page(journals)
+    service = BenchmarkJournalService()
+    ns = service.namespace
+
+    def parse_twice():
+        root = ET.fromstring(service.xml_helper.bytes_to_utf8_string(page))
+        service._read_response_results(root.find('.//wd:Response_Results', ns))
+        root = ET.fromstring(service.xml_helper.bytes_to_utf8_string(page))
+        return root.findall(JOURNAL_ENTRY_DATA_PATH, ns)
+
+    def parse_once():
+        return service._parse_response(page, JOURNAL_ENTRY_DATA_PATH)
+
+    twice = min(timeit.repeat(parse_twice, number=1, repeat=repeat))
+    once = min(timeit.repeat(parse_once, number=1, repeat=repeat))
+    print(f'{journals} journals page ({len(page) / 1e6:.1f} MB)')
+    print(f'  parse twice: {twice * 1000:.1f} ms')
+    print(f'  parse once:  {once * 1000:.1f} ms ({(1 - once / twice) * 100:.0f}% saved)')
+
+
+def benchmark_reference_ids(journals: int = 999, repeat: int = 5):
+    """
+    Reading the references of every journal line with one `wd:ID[@wd:type="..."]` lookup by ID type
+    against one `get_id_map` scan by reference
+    """
+    service = BenchmarkJournalService()
+    xml_helper = service.xml_helper
+    ns = service.namespace
+    _, journal_entries = service._parse_response(build_journal_page(journals), JOURNAL_ENTRY_DATA_PATH)
+    lines = [line for journal in journal_entries for line in journal.findall('.//wd:Journal_Entry_Line_Data', ns)]
+    worktag_types = [id_type for id_type, _ in WORKTAG_ID_FIELDS]
+
+    def predicate_lookups():
+        for line in lines:
+            line_company_ref = line.find('wd:Line_Company_Reference', ns)
+            for id_type in ('WID', 'Organization_Reference_ID', 'Company_Reference_ID'):
+                xml_helper.safe_get_text(line_company_ref, f'wd:ID[@wd:type="{id_type}"]')
+            ledger_acc_ref = line.find('wd:Ledger_Account_Reference', ns)
+            for id_type in ('WID', 'Ledger_Account_ID'):
+                xml_helper.safe_get_text(ledger_acc_ref, f'wd:ID[@wd:type="{id_type}"]')
+            for worktag in line.findall('.//wd:Worktags_Reference', ns):
+                for id_type in worktag_types:
+                    xml_helper.safe_get_text(worktag, f'wd:ID[@wd:type="{id_type}"]')
+
+    def id_map_scans():
+        for line in lines:
+            xml_helper.get_id_map(line.find('wd:Line_Company_Reference', ns))
+            xml_helper.get_id_map(line.find('wd:Ledger_Account_Reference', ns))
+            for worktag in line.findall('.//wd:Worktags_Reference', ns):
+                xml_helper.create_worktags_object(worktag, WorktagsReference())
+
+    predicate = min(timeit.repeat(predicate_lookups, number=1, repeat=repeat))
+    id_map = min(timeit.repeat(id_map_scans, number=1, repeat=repeat))
+    print(f'{len(lines)} journal lines references')
+    print(f'  predicate lookups: {predicate / len(lines) * 1e6:.1f} us / line')
+    print(f'  ID map scans:      {id_map / len(lines) * 1e6:.1f} us / line ({(1 - id_map / predicate) * 100:.0f}% saved)')
+
+
+def build_supplier_data(supplier: int) -> ET.Element:
+    return ET.fromstring(
+        f'<wd:Supplier_Data xmlns:wd="{WD_NS}">'
+        f'<wd:Supplier_ID>SUP-{supplier}</wd:Supplier_ID><wd:Supplier_Reference_ID>S{supplier}</wd:Supplier_Reference_ID>'
+        f'<wd:Supplier_Name>Supplier {supplier}</wd:Supplier_Name>'
+        '<wd:Worktag_Only>0</wd:Worktag_Only><wd:Submit>1</wd:Submit><wd:FATCA>0</wd:FATCA>'
+        '<wd:Disable_Change_Order>0</wd:Disable_Change_Order><wd:Acknowledgement_Expected>1</wd:Acknowledgement_Expected>'
+        '<wd:Approval_Status_Reference><wd:ID wd:type="WID">a1</wd:ID>'
+        '<wd:ID wd:type="Document_Status_ID">APPROVED</wd:ID></wd:Approval_Status_Reference>'
+        '<wd:Supplier_Category_Reference><wd:ID wd:type="WID">b2</wd:ID>'
+        f'<wd:ID wd:type="Supplier_Category_ID">SC-{supplier % 9}</wd:ID></wd:Supplier_Category_Reference>'
+        '<wd:Payment_Terms_Reference><wd:ID wd:type="Payment_Terms_ID">NET_30</wd:ID></wd:Payment_Terms_Reference>'
+        '<wd:Default_Payment_Type_Reference><wd:ID wd:type="Payment_Type_ID">ACH</wd:ID></wd:Default_Payment_Type_Reference>'
+        '<wd:Invoice_Any_Supplier>0</wd:Invoice_Any_Supplier><wd:Edit_Portal_Taxes>1</wd:Edit_Portal_Taxes>'
+        '<wd:IRS_1099_Supplier>0</wd:IRS_1099_Supplier><wd:Enable_ASN>0</wd:Enable_ASN>'
+        '<wd:Supplier_Address_Data><wd:Municipality>Paris</wd:Municipality></wd:Supplier_Address_Data>'
+        '</wd:Supplier_Data>'
+    )
+
+
+def benchmark_field_extractor(suppliers: int = 5000, repeat: int = 5):
+    """
+    Reading the `GetRAASSuppliers` fields with one `find` lookup by field
+    against one `FieldExtractor` walk by entry
+    """
+    service = GetRAASSuppliers('https://localhost', 'tenant', 'token')
+    xml_helper = service.xml_helper
+    entries = [build_supplier_data(supplier) for supplier in range(suppliers)]
+
+    def field_lookups():
+        for entry in entries:
+            for spec in service.FIELD_SPECS:
+                if spec.id_type is None:
+                    xml_helper.get_single_tag_line_value(entry, spec.path, spec.converter)
+                else:
+                    xml_helper.get_reference_id(entry, spec.path, spec.id_type, spec.converter)
+
+    def field_extractor():
+        for entry in entries:
+            service.field_extractor.extract(entry)
+
+    lookups = min(timeit.repeat(field_lookups, number=1, repeat=repeat))
+    extractor = min(timeit.repeat(field_extractor, number=1, repeat=repeat))
+    print(f'{suppliers} suppliers, {len(service.FIELD_SPECS)} fields')
+    print(f'  field lookups:   {lookups / suppliers * 1e6:.1f} us / supplier')
+    print(f'  field extractor: {extractor / suppliers * 1e6:.1f} us / supplier ({(1 - extractor / lookups) * 100:.0f}% saved)')
+
+
+def benchmark_creation_date_prescan(journals: int = 999, repeat: int = 5):
+    """
+    Parsing a page where half of the journals are not created on the filtered date, then rejecting them
+    in `_parse_journals`, against dropping them with the creation date pre-scan first
+    """
+    page = build_journal_page(journals, outdated_every=2)
+    service = GetAllJournals(
+        'https://localhost', 'tenant', 'token', creation_date='2025-01-20', filter_by_creation_date=True,
+        ledger_accounts={}, cost_centers={}, subsidiaries={}, book_codes={}, gtm_org={},
+        raas_suppliers=None, resource_category_service=None, customer_contract_service=None,
+    )
+
+    def parse_then_reject():
+        _, journal_entries = service._parse_response(page, JOURNAL_ENTRY_DATA_PATH)
+        return [service._parse_journals(journal) for journal in journal_entries]
+
+    def prescan_then_parse():
+        kept_page, _, _ = service._prescan_creation_dates(page, JOURNAL_ENTRY_DATA_PATH)
+        _, journal_entries = service._parse_response(kept_page, JOURNAL_ENTRY_DATA_PATH)
+        return [service._parse_journals(journal) for journal in journal_entries]
+
+    _, discarded, bytes_discarded = service._prescan_creation_dates(page, JOURNAL_ENTRY_DATA_PATH)
+    rejected = min(timeit.repeat(parse_then_reject, number=1, repeat=repeat))
+    prescan = min(timeit.repeat(prescan_then_parse, number=1, repeat=repeat))
+    print(f'{journals} journals page, {discarded} out of the creation date ({bytes_discarded / len(page) * 100:.0f}% of the bytes)')
+    print(f'  parse then reject:   {rejected * 1000:.1f} ms')
+    print(f'  pre-scan then parse: {prescan * 1000:.1f} ms ({(1 - prescan / rejected) * 100:.0f}% saved)')
+
+
+def benchmark_parse_processes(journals: int = 999, pages: int = 4, workers: Tuple[int, ...] = (1, 2, 4, 8)):
+    """
+    Journals parsed by second in this process against `parse_processes` workers (the mapping is left out)
+    """
+    page = build_journal_page(journals)
+
+    def build_service(parse_processes: Optional[int]) -> GetAllJournals:
+        service = GetAllJournals(
+            'https://localhost', 'tenant', 'token', creation_date='2025-01-20', filter_by_creation_date=False,
+            ledger_accounts={}, cost_centers={}, subsidiaries={}, book_codes={}, gtm_org={},
+            raas_suppliers=None, resource_category_service=None, customer_contract_service=None,
+            two_phase=True, parse_processes=parse_processes,
+        )
+        # parsed journals only
+        service._is_collecting_all_pages = True
+        return service
+
+    def parse_pages(service: GetAllJournals):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(pages):
+                service._parse_page(page, JOURNAL_ENTRY_DATA_PATH)
+
+    print(f'{pages} pages of {journals} journals ({os.cpu_count()} CPUs)')
+    in_process = min(timeit.repeat(lambda: parse_pages(build_service(None)), number=1, repeat=3))
+    print(f'  in process:  {journals * pages / in_process:,.0f} journals / s')
+    for parse_processes in workers:
+        service = build_service(parse_processes)
+        try:
+            # start the workers before timing
+            parse_pages(service)
+            elapsed = min(timeit.repeat(lambda: parse_pages(service), number=1, repeat=3))
+        finally:
+            service.shutdown_parse_pool()
+        print(f'  {parse_processes} processes: {journals * pages / elapsed:,.0f} journals / s '
+              f'(x{in_process / elapsed:.2f})')
+
+
+def build_supplier_page(suppliers: int, page: int, total_pages: int) -> bytes:
+    """
+    Build a `Get_Suppliers` answer page
+    """
+    entries = ''.join(
+        '<wd:Supplier>' + ET.tostring(build_supplier_data(supplier), encoding='unicode') + '</wd:Supplier>'
+        for supplier in range(suppliers)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"><env:Body>'
+        f'<wd:Get_Suppliers_Response xmlns:wd="{WD_NS}">'
+        f'<wd:Response_Results><wd:Total_Results>{suppliers * total_pages}</wd:Total_Results>'
+        f'<wd:Total_Pages>{total_pages}</wd:Total_Pages>'
+        f'<wd:Page_Results>{suppliers}</wd:Page_Results><wd:Page>{page}</wd:Page></wd:Response_Results>'
+        f'<wd:Response_Data>{entries}</wd:Response_Data>'
+        '</wd:Get_Suppliers_Response></env:Body></env:Envelope>'
+    ).encode()
+
+
+class LatencyTransport:
+    """
+    Answer the pagination requests with prebuilt pages after a fixed latency, in place of `WorkdayTransport`
+    """
+
+    class Response:
+        def __init__(self, content: bytes):
+            self.content = content
+
+        def raise_for_status(self):
+            pass
+
+    def __init__(self, pages: List[bytes], latency: float):
+        self.pages = pages
+        self.latency = latency
+
+    def request(self, method: str, url: str, headers=None, data=None, **kwargs):
+        time.sleep(self.latency)
+        page = int(re.search(r'<wd:Page>(\d+)</wd:Page>', data).group(1))
+        return LatencyTransport.Response(self.pages[page - 1])
+
+
+def benchmark_prefetch(suppliers: int = 999, pages: int = 8, latency: float = 0.05, depths: Tuple[int, ...] = (1, 2)):
+    """
+    Paginated `get_all_entities` alternating fetch and parse, against the pages prefetched by a background thread
+    """
+    page_contents = [build_supplier_page(suppliers, page, pages) for page in range(1, pages + 1)]
+
+    def get_all_suppliers(prefetch_depth: int) -> float:
+        service = GetRAASSuppliers(
+            'https://localhost', 'tenant', 'token', transport=LatencyTransport(page_contents, latency)
+        )
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            service.get_all_entities('.//wd:Supplier_Data', prefetch_depth=prefetch_depth)
+        return time.perf_counter() - start
+
+    print(f'{pages} pages of {suppliers} suppliers, {latency * 1000:.0f} ms latency by request')
+    sequential = min(get_all_suppliers(0) for _ in range(3))
+    print(f'  fetch then parse: {sequential * 1000:.0f} ms')
+    for depth in depths:
+        prefetched = min(get_all_suppliers(depth) for _ in range(3))
+        print(f'  prefetch depth {depth}: {prefetched * 1000:.0f} ms ({(1 - prefetched / sequential) * 100:.0f}% saved)')
+
+
+def field_lambda(field_: tuple):
+    """
+    Per-field lambda of a path field, shaped like the hand written ones: `o.a.b if o.a else None`
+    """
+    getter = field_[1]
+    if callable(getter):
+        return getter
+    parent = 'o.' + getter.rpartition('.')[0] if '.' in getter else 'o'
+    value = f'o.{getter} if {parent} else None'
+    if len(field_) > 2:
+        return lambda o, get=eval(f'lambda o: {value}'), transform=field_[2]: transform(get(o)) if get(o) else None
+    return eval(f'lambda o: {value}')
+
+
+def build_mapped_journals(journals: int, lines: int) -> List[MappedJournal]:
+    deals = [DealInfo(f'CON-{deal}', f'Deal {deal}', f'PO{deal}', False, 'Subscription') for deal in range(50)]
+    vendors = [VendorInfo(vendor_code=f'SUP-{vendor}', company_name=f'Supplier {vendor}') for vendor in range(200)]
+    return [
+        MappedJournal(
+            account_info=AccountInfo(code='LEDGER-1'),
+            document_info=DocumentInfo(document_number=f'JN{journal}', description=f'Journal\n{journal}'),
+            book_code_info=BookCodeInfo('BC1', 'Book code'),
+            mapped_entries=[
+                MappedEntryJournal(
+                    subsidiary_info=SubsidiaryInfo('C1', 'Company'),
+                    amount_info=AmountInfo(debit=journal + line / 10, credit=0, ledger_debit=journal, ledger_credit=0),
+                    cost_center_info=CostCenterInfo(code=f'CC{journal % 5}', name='Cost center'),
+                    revenue_info=RevenueInfo(deal=deals[journal % 50] if line % 2 else None, revenue_name='Revenue'),
+                    vendor_info=vendors[journal % 200],
+                    expense_type=SpendCategory(f'SC{line}', 'Spend category'),
+                    memo=f'Journal {journal} line {line}',
+                )
+                for line in range(lines)
+            ],
+            journal_id=f'AJ-{journal}', journal_workday_id=f'wid{journal}', creation_Date='2025-01-20',
+            journal_status='Posted', ledger_currency='USD',
+        )
+        for journal in range(journals)
+    ]
+
+
+def benchmark_row_projector(lines: int = 500_000, lines_by_journal: int = 4):
+    """
+    Journal CSV export with one lambda by field against the compiled row projector
+    """
+    mapped_journals = build_mapped_journals(lines // lines_by_journal, lines_by_journal)
+    compiled = CSVJournalHelper()
+    per_field = CSVJournalHelper()
+    journal_getters = [field_lambda(field_) for field_ in per_field.fields]
+    entry_line_getters = [field_lambda(field_) for field_ in per_field.entry_line_fields[1:]]
+    per_field._journal_projector = lambda journal: [getter(journal) for getter in journal_getters]
+    per_field._entry_line_projector = lambda entry: [getter(entry) for getter in entry_line_getters]
+
+    lambdas = min(timeit.repeat(lambda: per_field.mapped_journals_to_csv(mapped_journals), number=1, repeat=2))
+    projector = min(timeit.repeat(lambda: compiled.mapped_journals_to_csv(mapped_journals), number=1, repeat=2))
+    assert per_field.mapped_journals_to_csv(mapped_journals) == compiled.mapped_journals_to_csv(mapped_journals)
+    print(f'{lines} lines CSV export')
+    print(f'  field lambdas:  {lines / lambdas:,.0f} rows / s')
+    print(f'  row projector:  {lines / projector:,.0f} rows / s (x{lambdas / projector:.2f})')
+
+
+def benchmark_columnar_export(lines: int = 200_000, lines_by_journal: int = 4):
+    """
+    Journal export as CSV against the typed columnar exports: write time and file size
+    """
+    mapped_journals = build_mapped_journals(lines // lines_by_journal, lines_by_journal)
+    csv_helper = CSVJournalHelper()
+    columnar_helper = ColumnarJournalHelper(csv_helper)
+
+    def write_csv(path: str):
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write(csv_helper.mapped_journals_to_csv(mapped_journals))
+
+    exports = [
+        ('csv', write_csv),
+        ('parquet', lambda path: columnar_helper.export_to_parquet(mapped_journals, path)),
+        ('feather', lambda path: columnar_helper.export_to_feather(mapped_journals, path)),
+    ]
+    print(f'{lines} lines journal export')
+    dataframe = min(timeit.repeat(lambda: columnar_helper.to_dataframe(mapped_journals), number=1, repeat=2))
+    print(f'  dataframe: {dataframe * 1000:8.0f} ms')
+    with tempfile.TemporaryDirectory() as directory:
+        for name, export in exports:
+            path = os.path.join(directory, f'journals.{name}')
+            try:
+                duration = min(timeit.repeat(lambda: export(path), number=1, repeat=2))
+            except ImportError:
+                print(f'  {name:9}: skipped (pyarrow not installed)')
+                continue
+            print(f'  {name:9}: {duration * 1000:8.0f} ms {os.path.getsize(path):>12,} bytes')
+
+
+def benchmark_merge_csv_files(days: int = 14, lines_by_day: int = 20_000):
+    """
+    Merge of the per day journal CSV files of a backfill: time and peak Python memory
+    """
+    csv_content = CSVJournalHelper().mapped_journals_to_csv(build_mapped_journals(lines_by_day // 4, 4))
+    with tempfile.TemporaryDirectory() as directory:
+        csv_paths = []
+        for day in range(days):
+            csv_paths.append(os.path.join(directory, f'day_{day}.csv'))
+            with open(csv_paths[-1], 'w', newline='') as file:
+                file.write(csv_content)
+        output_path = os.path.join(directory, 'merged.csv')
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        merge_csv_files(csv_paths, output_path)
+        duration = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'{days} files of {lines_by_day} lines merged into {os.path.getsize(output_path):,} bytes')
+        print(f'  {duration * 1000:.0f} ms, peak memory {peak / 1024 / 1024:.1f} MiB')
+
+
+if __name__ == '__main__':
+    benchmark_parse_once()
+    benchmark_reference_ids()
+    benchmark_field_extractor()
+    benchmark_creation_date_prescan()
+    benchmark_parse_processes()
+    benchmark_prefetch()
+    benchmark_row_projector()
+    benchmark_columnar_export()
+    benchmark_merge_csv_files()
@@ -0,0 +1,275 @@
+"""
+Fake Workday tenant shared by the service tests: the SOAP answers are built on the fly and served by a transport
+standing for `WorkdayTransport`, which records the requests it receives
+"""
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from workday.workday_implement_api import *
+
+NS = 'urn:com.workday/bsvc'
+NAMESPACE = {'wd': NS}
+
+
+class FakeResponse:
+
+    def __init__(self, content: bytes = b'', status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code), response=self)
+
+
+class FakeTransport:
+    """ Answers each request with `answer(payload, headers)`, counts the requests in flight at the same time """
+
+    def __init__(self, answer: Callable[[Optional[str], Dict[str, str]], FakeResponse], delay: float = 0.0):
+        self.answer = answer
+        self.delay = delay
+        self.payloads: List[Optional[str]] = []
+        self.headers: List[Dict[str, str]] = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, data: Optional[str] = None,
+                **kwargs) -> FakeResponse:
+        with self.lock:
+            self.payloads.append(data)
+            self.headers.append(dict(headers or {}))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            delay = self.delay(data) if callable(self.delay) else self.delay
+            time.sleep(delay)
+            return self.answer(data, headers or {})
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> FakeResponse:
+        return self.request('POST', url, **kwargs)
+
+
+def soap_answer(response_tag: str, data: str, total_results: int = 1, total_pages: int = 1, page: int = 1) -> bytes:
+    """
+    :return: SOAP envelope of a Get_ answer holding the `data` elements
+    """
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"><env:Body>'
+        f'<wd:{response_tag} xmlns:wd="{NS}">'
+        f'<wd:Response_Results><wd:Total_Results>{total_results}</wd:Total_Results>'
+        f'<wd:Total_Pages>{total_pages}</wd:Total_Pages><wd:Page_Results>{total_results}</wd:Page_Results>'
+        f'<wd:Page>{page}</wd:Page></wd:Response_Results>'
+        f'<wd:Response_Data>{data}</wd:Response_Data>'
+        f'</wd:{response_tag}></env:Body></env:Envelope>'
+    ).encode()
+
+
+def reference(tag: str, **ids: str) -> str:
+    return f'<wd:{tag}>' + ''.join(f'<wd:ID wd:type="{key}">{value}</wd:ID>' for key, value in ids.items()) + f'</wd:{tag}>'
+
+
+def requested_page(payload: str) -> int:
+    return int(re.search(r'<wd:Page>(\d+)</wd:Page>', payload).group(1))
+
+
+def requested_ids(payload: str, id_type: str) -> List[str]:
+    return re.findall(rf'<wd:ID wd:type="{id_type}">([^<]+)</wd:ID>', payload)
+
+
+def supplier_data(supplier_id: str) -> str:
+    return (
+        f'<wd:Supplier><wd:Supplier_Data><wd:Supplier_ID>{supplier_id}</wd:Supplier_ID>'
+        f'<wd:Supplier_Name>Supplier {supplier_id}</wd:Supplier_Name></wd:Supplier_Data></wd:Supplier>'
+    )
+
+
+def spend_category_data(category_id: str) -> str:
+    return (
+        f'<wd:Resource_Category><wd:Resource_Category_Data>'
+        f'<wd:Resource_Category_ID>{category_id}</wd:Resource_Category_ID>'
+        f'<wd:Resource_Category_Name>Category {category_id}</wd:Resource_Category_Name>'
+        f'</wd:Resource_Category_Data></wd:Resource_Category>'
+    )
+
+
+def customer_contract_data(contract_id: str) -> str:
+    return (
+        f'<wd:Customer_Contract><wd:Customer_Contract_Data><wd:Customer_Contract_ID>{contract_id}</wd:Customer_Contract_ID>'
+        f'<wd:Contract_Name>Contract {contract_id}</wd:Contract_Name></wd:Customer_Contract_Data></wd:Customer_Contract>'
+    )
+
+
+def journal_data(
+        number: int,
+        lines: int = 3,
+        creation_date: str = '2025-01-20T05:00:00.000-08:00',
+        prefix: str = 'wd',
+) -> str:
+    """
+    :return: One `Journal_Entry` element, its lines reference suppliers, spend categories and contracts
+        depending on the journal number
+    """
+    journal_lines = []
+    for line in range(lines):
+        worktags = [
+            reference('Worktags_Reference', Spend_Category_ID=f'SC{(number + line) % 7}'),
+            reference('Worktags_Reference', Supplier_ID=f'SUP-{(number * 3 + line) % 40}'),
+            reference('Worktags_Reference', Cost_Center_Reference_ID=f'CC{line % 3}'),
+        ]
+        if (number + line) % 2:
+            worktags.append(reference('Worktags_Reference', Customer_Contract_Reference_ID=f'CON-{number % 11}'))
+        journal_lines.append(
+            '<wd:Journal_Entry_Line_Data>'
+            + reference('Line_Company_Reference', WID='w', Organization_Reference_ID='O1', Company_Reference_ID='C1')
+            + reference('Ledger_Account_Reference', WID='w', Ledger_Account_ID=f'LA{line % 4}')
+            + f'<wd:Debit_Amount>{number + line}.5</wd:Debit_Amount><wd:Credit_Amount>0</wd:Credit_Amount>'
+            + f'<wd:Ledger_Debit_Amount>{number + line}</wd:Ledger_Debit_Amount><wd:Ledger_Credit_Amount>0</wd:Ledger_Credit_Amount>'
+            + f'<wd:Currency_Rate>1</wd:Currency_Rate><wd:Journal_Line_Number>{line + 1}</wd:Journal_Line_Number>'
+            + f'<wd:Memo>memo {number}-{line}</wd:Memo>'
+            + ''.join(worktags) + '</wd:Journal_Entry_Line_Data>'
+        )
+    creation = f'<wd:Creation_Date>{creation_date}</wd:Creation_Date>' if creation_date is not None else ''
+    journal = (
+        '<wd:Journal_Entry><wd:Journal_Entry_Data>'
+        + reference('Journal_Entry_Reference', WID=f'wid{number}', Accounting_Journal_ID=f'AJ-{number}')
+        + f'<wd:Journal_Number>JN{number}</wd:Journal_Number>{creation}'
+        + f'<wd:Accounting_Date>2025-01-20</wd:Accounting_Date><wd:Memo>description {number}</wd:Memo>'
+        + f'<wd:Journal_Sequence_Number>SEQ{number}</wd:Journal_Sequence_Number>'
+        + reference('Journal_Status_Reference', WID='s', Journal_Entry_Status_ID='POSTED')
+        + reference('Book_Code_Reference', Book_Code_ID=f'BC{number % 2}')
+        + reference('Company_Reference', WID='c', Organization_Reference_ID='O1', Company_Reference_ID='C1')
+        + reference('Currency_Reference', WID='cur', Currency_ID='USD', Currency_Numeric_Code='840')
+        + reference('Ledger_Reference', WID='l', Ledger_Reference_ID='LEDGER-1')
+        + reference('Journal_Source_Reference', Journal_Source_ID='SRC')
+        + reference('Ledger_Period_Reference', WID='lp')
+        + ''.join(journal_lines) + '</wd:Journal_Entry_Data></wd:Journal_Entry>'
+    )
+    return journal.replace('<wd:', f'<{prefix}:').replace('</wd:', f'</{prefix}:').replace('wd:type=', f'{prefix}:type=')
+
+
+def journals_answer(journals: List[str], page: int, per_page: int, total_journals: Optional[int] = None,
+                    prefix: str = 'wd') -> bytes:
+    """
+    :return: The `page` of a Get_Journals answer listing the `journals` elements
+    """
+    total_journals = len(journals) if total_journals is None else total_journals
+    content = soap_answer(
+        'Get_Journals_Response', ''.join(journals[(page - 1) * per_page:page * per_page]),
+        total_results=total_journals, total_pages=-(-total_journals // per_page), page=page,
+    ).decode()
+    if prefix != 'wd':
+        content = content.replace(f'xmlns:wd="{NS}"', f'xmlns:{prefix}="{NS}"').replace('<wd:', f'<{prefix}:') \
+            .replace('</wd:', f'</{prefix}:')
+    return content.encode()
+
+
+LOOKUP_ANSWERS = {
+    'Get_Suppliers_Request': ('Get_Suppliers_Response', supplier_data, [f'SUP-{index}' for index in range(40)]),
+    'Get_Resource_Categories_Request': (
+        'Get_Resource_Categories_Response', spend_category_data, [f'SC{index}' for index in range(7)]
+    ),
+    'Get_Customer_Contracts_Request': (
+        'Get_Customer_Contracts_Response', customer_contract_data, [f'CON-{index}' for index in range(11)]
+    ),
+}
+
+
+class FakeTenant:
+    """
+    Answers the Get_Journals pages and the supplier, spend category and customer contract lookups:
+    by ID (point or batched lookups), or page by page (full downloads)
+    """
+
+    def __init__(
+            self,
+            journals: List[str],
+            per_page: int = 5,
+            missing_ids: Iterable[str] = ('SUP-13', 'CON-7'),
+            failed_bulk_requests: Iterable[str] = (),
+            lookup_per_page: int = 4,
+            prefix: str = 'wd',
+            failed_journal_pages: Iterable[int] = (),
+    ):
+        """
+        :param failed_bulk_requests: Request tags, e.g: 'Get_Suppliers_Request', whose batched lookups and full
+            downloads answer 404, the point lookups still work
+        :param prefix: Namespace prefix of the Get_Journals pages, the `journals` are written with the same one
+        :param failed_journal_pages: Get_Journals pages answering 500
+        """
+        self.journals = journals
+        self.per_page = per_page
+        self.missing_ids = set(missing_ids)
+        self.failed_bulk_requests = set(failed_bulk_requests)
+        self.lookup_per_page = lookup_per_page
+        self.prefix = prefix
+        self.failed_journal_pages = set(failed_journal_pages)
+        self.requests: List[Tuple[str, int]] = []
+        self.lock = threading.Lock()
+        self.transport = FakeTransport(self.answer)
+
+    def requests_of(self, request_tag: str) -> List[int]:
+        """
+        :return: Number of IDs of each request sent with this tag, 0 for a page of a full download
+        """
+        return [ids for tag, ids in self.requests if tag == request_tag]
+
+    def answer(self, payload: str, headers: Dict[str, str]) -> FakeResponse:
+        request_tag = re.search(r'<wd:(Get_\w+_Request)', payload).group(1)
+        ids = re.findall(r'<wd:ID wd:type="\w+">([^<]*)</wd:ID>', payload)
+        with self.lock:
+            self.requests.append((request_tag, len(ids)))
+
+        if request_tag == 'Get_Journals_Request':
+            if requested_page(payload) in self.failed_journal_pages:
+                return FakeResponse(status_code=500)
+            return FakeResponse(journals_answer(self.journals, requested_page(payload), self.per_page,
+                                                prefix=self.prefix))
+
+        if request_tag in self.failed_bulk_requests and len(ids) != 1:
+            return FakeResponse(status_code=404)
+        response_tag, entity_data, known_ids = LOOKUP_ANSWERS[request_tag]
+        if ids:
+            found = [object_id for object_id in ids if object_id in known_ids and object_id not in self.missing_ids]
+            return FakeResponse(soap_answer(response_tag, ''.join(entity_data(object_id) for object_id in found),
+                                            total_results=len(found)))
+
+        page = requested_page(payload)
+        page_ids = known_ids[(page - 1) * self.lookup_per_page:page * self.lookup_per_page]
+        found = [object_id for object_id in page_ids if object_id not in self.missing_ids]
+        return FakeResponse(soap_answer(
+            response_tag, ''.join(entity_data(object_id) for object_id in found),
+            total_results=len(known_ids), total_pages=-(-len(known_ids) // self.lookup_per_page), page=page,
+        ))
+
+    def journal_service(self, creation_date: str = '2025-01-20', **kwargs) -> GetAllJournals:
+        """
+        :param kwargs: `GetAllJournals` options, e.g: two_phase
+        :return: Journal service whose lookup services are answered by this tenant
+        """
+        services = dict(base_url='https://x', tenant='t', token='tok', transport=self.transport)
+        kwargs.setdefault('book_codes', {'BC0': BookCodeInfo(book_code_id='BC0', name='Book 0'),
+                                         'BC1': BookCodeInfo(book_code_id='BC1', name='Book 1')})
+        for name in MASTER_DATA_REPORTS:
+            kwargs.setdefault(name, {})
+        return GetAllJournals(
+            creation_date=creation_date,
+            filter_by_creation_date=True,
+            raas_suppliers=GetRAASSuppliers(**services),
+            resource_category_service=GetResourceCategories(**services),
+            customer_contract_service=GetCustomerContracts(**services),
+            **services,
+            **kwargs,
+        )
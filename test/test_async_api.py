@@ -0,0 +1,156 @@
+import asyncio
+import contextlib
+import io
+import threading
+import unittest
+
+from fake_workday import *
+from workday.utils import async_retry_on_500
+from workday.workday_async_api import *
+
+ENTITIES_BY_PAGE = 3
+DATA_PATH = './/wd:Resource_Category_Data'
+
+
+def category_page(payload: str, total_pages: int, failed_pages=()) -> FakeResponse:
+    page = requested_page(payload)
+    if page in failed_pages:
+        return FakeResponse(status_code=404)
+    categories = ''.join(spend_category_data(f'P{page}-{index}') for index in range(ENTITIES_BY_PAGE))
+    return FakeResponse(soap_answer(
+        'Get_Resource_Categories_Response', categories,
+        total_results=total_pages * ENTITIES_BY_PAGE, total_pages=total_pages, page=page,
+    ))
+
+
+class TestAsyncGetAllEntities(unittest.TestCase):
+
+    def categories_service(self, total_pages: int, failed_pages=(), delay=0.0) -> GetResourceCategories:
+        transport = FakeTransport(lambda payload, headers: category_page(payload, total_pages, failed_pages), delay)
+        return GetResourceCategories('https://x', 't', 'tok', transport=transport)
+
+    def test_pages_are_returned_in_page_order(self):
+        # the first pages are the slowest to answer
+        service = self.categories_service(
+            6, delay=lambda payload: 0.01 * (7 - requested_page(payload))
+        )
+
+        categories = asyncio.run(AsyncWorkdayService(service).get_all_entities(DATA_PATH, window=3))
+
+        self.assertEqual(
+            [category.code for category in categories],
+            [f'P{page}-{index}' for page in range(1, 7) for index in range(ENTITIES_BY_PAGE)]
+        )
+        self.assertTrue(service.is_complete)
+
+    def test_requests_in_flight_are_bounded_by_the_shared_limiter(self):
+        service = self.categories_service(10, delay=0.02)
+        limiter = create_request_limiter(2)
+
+        async def run():
+            return await AsyncWorkdayService(service, limiter).get_all_entities(DATA_PATH, window=8)
+
+        categories = asyncio.run(run())
+
+        self.assertEqual(len(categories), 10 * ENTITIES_BY_PAGE)
+        self.assertEqual(service.transport.max_running, 2)
+
+    def test_failed_page_is_recorded(self):
+        service = self.categories_service(4, failed_pages={3})
+
+        categories = asyncio.run(AsyncWorkdayService(service).get_all_entities(DATA_PATH, window=2))
+
+        self.assertEqual(len(categories), 3 * ENTITIES_BY_PAGE)
+        self.assertNotIn('P3-0', [category.code for category in categories])
+        self.assertEqual(len(service.failed_entity), 1)
+        self.assertIn('page 3', service.failed_entity[0].reason)
+        self.assertFalse(service.is_complete)
+
+    def test_pages_are_parsed_off_the_event_loop(self):
+        service = self.categories_service(3)
+        parse_threads = []
+        parse_page = service._parse_page
+
+        def tracked_parse_page(*args):
+            parse_threads.append(threading.get_ident())
+            return parse_page(*args)
+
+        service._parse_page = tracked_parse_page
+
+        async def run():
+            await AsyncWorkdayService(service).get_all_entities(DATA_PATH)
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+
+        self.assertEqual(len(parse_threads), 3)
+        self.assertNotIn(loop_thread, parse_threads)
+
+    def test_parsing_error_cancels_the_pages_still_requested(self):
+        service = self.categories_service(8, delay=0.05)
+        parse_page = service._parse_page
+
+        def failing_parse_page(xml_input, entity_entry_data_path):
+            if service.next_page == 2:
+                raise ValueError('master data report down')
+            return parse_page(xml_input, entity_entry_data_path)
+
+        service._parse_page = failing_parse_page
+
+        async def run():
+            with self.assertRaises(ValueError):
+                await AsyncWorkdayService(service).get_all_entities(DATA_PATH, window=4)
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        self.assertEqual(asyncio.run(run()), [])
+
+
+
+class TestAsyncRetryOn500(unittest.TestCase):
+
+    def test_last_500_is_raised_once_the_retries_are_exhausted(self):
+        calls = []
+
+        @async_retry_on_500(retries=2, delay=0)
+        async def call_endpoint():
+            calls.append(len(calls) + 1)
+            FakeResponse(status_code=500).raise_for_status()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(requests.HTTPError) as error:
+                asyncio.run(call_endpoint())
+
+        self.assertEqual(error.exception.response.status_code, 500)
+        self.assertEqual(calls, [1, 2])
+
+    def test_other_errors_are_raised_right_away(self):
+        calls = []
+
+        @async_retry_on_500(retries=3, delay=0)
+        async def call_endpoint():
+            calls.append(len(calls) + 1)
+            FakeResponse(status_code=404 if len(calls) == 2 else 500).raise_for_status()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(requests.HTTPError) as error:
+                asyncio.run(call_endpoint())
+
+        self.assertEqual(error.exception.response.status_code, 404)
+        self.assertEqual(calls, [1, 2])
+
+    def test_success_after_a_500(self):
+        calls = []
+
+        @async_retry_on_500(retries=2, delay=0)
+        async def call_endpoint():
+            calls.append(len(calls) + 1)
+            if len(calls) == 1:
+                FakeResponse(status_code=500).raise_for_status()
+            return b'ok'
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(asyncio.run(call_endpoint()), b'ok')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import unittest
+
+from fake_workday import *
+from workday.workday_async_api import *
+
+MISSING_SUPPLIERS = {'SUP-13', 'SUP-120'}
+
+
+def suppliers_answer(payload: str, headers) -> FakeResponse:
+    found = [supplier_id for supplier_id in requested_ids(payload, 'Supplier_ID') if supplier_id not in MISSING_SUPPLIERS]
+    return FakeResponse(soap_answer('Get_Suppliers_Response', ''.join(supplier_data(supplier_id) for supplier_id in found),
+                                    total_results=len(found)))
+
+
+def region_data(code: str) -> str:
+    return (
+        f'<wd:Organization><wd:Organization_Data><wd:Reference_ID>{code}</wd:Reference_ID>'
+        f'<wd:Name>Region {code}</wd:Name></wd:Organization_Data></wd:Organization>'
+    )
+
+
+def regions_answer(payload: str, headers) -> FakeResponse:
+    found = [code for code in requested_ids(payload, 'Organization_Reference_ID') if code != 'GTM_MISSING']
+    return FakeResponse(soap_answer('Get_Organizations_Response', ''.join(region_data(code) for code in found),
+                                    total_results=len(found)))
+
+
+class TestBatchedLookups(unittest.TestCase):
+
+    def suppliers_service(self) -> GetRAASSuppliers:
+        return GetRAASSuppliers('https://x', 't', 'tok', transport=FakeTransport(suppliers_answer))
+
+    def test_ids_are_packed_into_chunks(self):
+        service = self.suppliers_service()
+        supplier_ids = [f'SUP-{index}' for index in range(250)]
+
+        suppliers = service.get_entities(supplier_ids, './/wd:Supplier_Data', chunk_size=100)
+
+        self.assertEqual(
+            [requested_ids(payload, 'Supplier_ID') for payload in service.transport.payloads],
+            [supplier_ids[0:100], supplier_ids[100:200], supplier_ids[200:250]]
+        )
+        self.assertIn('<wd:Count>50</wd:Count>', service.transport.payloads[2])
+        self.assertEqual(len(suppliers), 250 - len(MISSING_SUPPLIERS))
+
+    def test_entities_are_keyed_by_their_id(self):
+        service = self.suppliers_service()
+
+        suppliers = service.get_entities(['SUP-2', 'SUP-1', '', 'SUP-2', None], './/wd:Supplier_Data')
+
+        self.assertEqual(len(service.transport.payloads), 1)
+        self.assertEqual(requested_ids(service.transport.payloads[0], 'Supplier_ID'), ['SUP-2', 'SUP-1'])
+        self.assertEqual({key: supplier.vendor_code for key, supplier in suppliers.items()},
+                         {'SUP-1': 'SUP-1', 'SUP-2': 'SUP-2'})
+        self.assertEqual(suppliers['SUP-1'].company_name, 'Supplier SUP-1')
+
+    def test_ids_not_found_are_missing_and_remembered(self):
+        service = self.suppliers_service()
+
+        suppliers = service.get_entities(['SUP-1', 'SUP-13'], './/wd:Supplier_Data')
+        self.assertEqual(list(suppliers), ['SUP-1'])
+
+        # both answers are cached: no new request
+        self.assertEqual(list(service.get_entities(['SUP-13', 'SUP-1'], './/wd:Supplier_Data')), ['SUP-1'])
+        with self.assertRaises(AssertionError):
+            service.get_entity('SUP-13', './/wd:Supplier_Data')
+        self.assertEqual(len(service.transport.payloads), 1)
+
+    def test_chunk_size_is_capped_to_the_page_size(self):
+        service = self.suppliers_service()
+
+        service.get_entities([f'SUP-{index}' for index in range(1000)], './/wd:Supplier_Data', chunk_size=5000)
+
+        self.assertEqual([len(requested_ids(payload, 'Supplier_ID')) for payload in service.transport.payloads],
+                         [DEFAULT_WORKDAY_COUNT_PAGINATION, 1])
+
+    def test_service_without_batch_payload_falls_back_on_point_lookups(self):
+        service = Region('https://x', 't', 'tok', transport=FakeTransport(regions_answer))
+        self.assertFalse(service.supports_batch)
+
+        regions = service.get_entities(['GTM_1', 'GTM_MISSING', 'GTM_2'], './/wd:Organization_Data')
+
+        self.assertEqual({code: region.name for code, region in regions.items()},
+                         {'GTM_1': 'Region GTM_1', 'GTM_2': 'Region GTM_2'})
+        self.assertEqual(len(service.transport.payloads), 3)
+        self.assertTrue(service.cache.is_not_found(service.cache.lookup('GTM_MISSING')[1]))
+
+    def test_async_lookups_match_the_sync_ones(self):
+        supplier_ids = [f'SUP-{index}' for index in range(120, 130)]
+        service = AsyncWorkdayService(self.suppliers_service())
+        suppliers = asyncio.run(service.get_entities(supplier_ids, './/wd:Supplier_Data', chunk_size=4))
+        self.assertEqual(len(service.transport.payloads), 3)
+
+        regions_service = AsyncWorkdayService(Region('https://x', 't', 'tok', transport=FakeTransport(regions_answer)))
+        regions = asyncio.run(regions_service.get_entities(['GTM_1', 'GTM_MISSING'], './/wd:Organization_Data'))
+
+        self.assertEqual(suppliers, self.suppliers_service().get_entities(supplier_ids, './/wd:Supplier_Data'))
+        self.assertEqual(list(regions), ['GTM_1'])
+
+
+class TestBatchPayloads(unittest.TestCase):
+
+    def test_batch_payloads_request_every_id(self):
+        services = [
+            (GetRAASSuppliers('https://x', 't', 'tok'), 'Supplier_ID', 'Get_Suppliers_Request'),
+            (GetResourceCategories('https://x', 't', 'tok'), 'Spend_Category_ID', 'Get_Resource_Categories_Request'),
+            (GetCustomerContracts('https://x', 't', 'tok'), 'Customer_Contract_Reference_ID',
+             'Get_Customer_Contracts_Request'),
+        ]
+        for service, id_type, request_tag in services:
+            with self.subTest(request_tag):
+                self.assertTrue(service.supports_batch)
+                payload = service._generate_payload_batch(['ID-1', 'ID-2', 'ID-3'])
+
+                root = ET.fromstring(payload)
+                self.assertIsNotNone(root.find(f'.//wd:{request_tag}', NAMESPACE))
+                self.assertEqual(requested_ids(payload, id_type), ['ID-1', 'ID-2', 'ID-3'])
+                self.assertEqual(root.find('.//wd:Count', NAMESPACE).text, '3')
+
+    def test_supplier_batch_payload_is_pinned_on_the_snapshot(self):
+        payload = GetRAASSuppliers('https://x', 't', 'tok')._generate_payload_batch(
+            ['SUP-1'], as_of_effective_date='2025-01-19', as_of_entry_datetime='2025-01-20T10:00:00.000+00:00'
+        )
+
+        root = ET.fromstring(payload)
+        self.assertEqual(root.find('.//wd:As_Of_Effective_Date', NAMESPACE).text, '2025-01-19')
+        self.assertEqual(root.find('.//wd:As_Of_Entry_DateTime', NAMESPACE).text, '2025-01-20T10:00:00.000+00:00')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from workday.columnar_helpers import *
+from workday.models import MappedJournal, MappedEntryJournal, AmountInfo, VendorInfo
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+def build_journal(journal: int) -> MappedJournal:
+    return MappedJournal(
+        journal_id=f'AJ-{journal}',
+        journal_status='Posted',
+        mapped_entries=[
+            MappedEntryJournal(
+                amount_info=AmountInfo(debit=journal + line, credit=None),
+                vendor_info=VendorInfo(vendor_code='SUP-1') if line else None,
+                memo=f'line\n{line}',
+            )
+            for line in range(2)
+        ],
+    )
+
+
+class TestColumnarJournalHelper(unittest.TestCase):
+
+    def setUp(self):
+        self.helper = ColumnarJournalHelper()
+        self.journals = [build_journal(journal) for journal in range(3)]
+
+    def test_same_columns_and_values_as_the_csv(self):
+        data_frame = self.helper.to_dataframe(self.journals)
+
+        self.assertEqual(list(data_frame.columns), self.helper.csv_helper.get_header())
+        self.assertEqual(len(data_frame), 6)
+        self.assertEqual(list(data_frame['journal_id'][:2]), ['AJ-0', 'AJ-0'])
+        self.assertEqual(list(data_frame['entry_line_number'][:2]), [1, 2])
+        self.assertEqual(data_frame['entry_line_memo'][1], 'line 1')
+
+    def test_typed_columns(self):
+        data_frame = self.helper.to_dataframe(self.journals)
+
+        self.assertEqual(str(data_frame['entry_line_debit'].dtype), 'float64')
+        self.assertEqual(list(data_frame['entry_line_debit'][:2]), [0.0, 1.0])
+        self.assertTrue(data_frame['entry_line_credit'].isna().all())
+        self.assertEqual(str(data_frame['entry_line_vendor_code'].dtype), 'category')
+        self.assertEqual(list(data_frame['entry_line_vendor_code'].cat.categories), ['SUP-1'])
+
+    def test_no_journal(self):
+        data_frame = self.helper.to_dataframe([])
+
+        self.assertEqual(data_frame.shape, (0, len(self.helper.header)))
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+    def test_parquet_round_trip(self):
+        import pandas as pd
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'journals.parquet')
+            self.helper.export_to_parquet(self.journals, path)
+
+            self.assertEqual(len(pd.read_parquet(path)), 6)
+
+
+class TestColumnarExportHelper(unittest.TestCase):
+
+    def test_fields_of_the_csv_export(self):
+        helper = ColumnarExportHelper(
+            [("vendor_code", "vendor_code"), ("company_name", lambda o: o.company_name.upper())],
+            category_columns=['vendor_code'],
+        )
+
+        data_frame = helper.to_dataframe([VendorInfo(vendor_code='SUP-1', company_name='acme')])
+
+        self.assertEqual(data_frame.to_dict('records'), [{'vendor_code': 'SUP-1', 'company_name': 'ACME'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import contextlib
+import io
+import re
+import unittest
+
+from fake_workday import *
+from workday.csv_helpers import CSVJournalHelper
+
+DATA_PATH = './/wd:Journal_Entry_Data'
+MAX_WORKERS = 3
+
+
+class TestConcurrentPages(unittest.TestCase):
+    """ `get_all_entities(max_workers=...)` against the sequential run, 12 pages of 2 journals """
+
+    def setUp(self):
+        self.journals = [journal_data(number) for number in range(23)]
+
+    def run_journals(self, tenant: FakeTenant, **kwargs) -> Tuple[GetAllJournals, str]:
+        journal_service = tenant.journal_service()
+        with contextlib.redirect_stdout(io.StringIO()):
+            journals = journal_service.get_all_entities(DATA_PATH, **kwargs)
+        return journal_service, CSVJournalHelper().mapped_journals_to_csv(journals)
+
+    @staticmethod
+    def journal_payloads(tenant: FakeTenant) -> List[str]:
+        return [payload for payload in tenant.transport.payloads if 'Get_Journals_Request' in payload]
+
+    def test_same_journals_in_page_order_as_the_sequential_run(self):
+        sequential_service, expected_csv = self.run_journals(FakeTenant(self.journals, per_page=2))
+        tenant = FakeTenant(self.journals, per_page=2)
+        # the first pages are the slowest to answer
+        tenant.transport.delay = lambda payload: (
+            0.002 * (13 - requested_page(payload)) if 'Get_Journals_Request' in payload else 0
+        )
+
+        journal_service, csv_content = self.run_journals(tenant, max_workers=MAX_WORKERS)
+
+        self.assertEqual(csv_content, expected_csv)
+        self.assertEqual([journal.journal_id for journal in journal_service.all_entity],
+                         [journal.journal_id for journal in sequential_service.all_entity])
+        self.assertEqual(journal_service.is_complete, sequential_service.is_complete)
+        self.assertEqual(journal_service.failed_entity, [])
+        self.assertEqual(sorted(requested_page(payload) for payload in self.journal_payloads(tenant)),
+                         list(range(1, 13)))
+
+    def test_pages_are_pinned_on_the_same_entry_datetime(self):
+        tenant = FakeTenant(self.journals, per_page=2)
+
+        self.run_journals(tenant, max_workers=MAX_WORKERS)
+
+        entry_datetimes = [re.findall(r'<wd:As_Of_Entry_DateTime>([^<]+)</wd:As_Of_Entry_DateTime>', payload)
+                           for payload in self.journal_payloads(tenant)]
+        self.assertEqual(len(entry_datetimes), 12)
+        self.assertEqual(len({tuple(found) for found in entry_datetimes}), 1)
+        self.assertEqual(len(entry_datetimes[0]), 1)
+
+    def test_pages_in_flight_stay_within_the_window(self):
+        tenant = FakeTenant(self.journals, per_page=2)
+        tenant.transport.delay = lambda payload: 0.005 if 'Get_Journals_Request' in payload else 0
+        journal_service = tenant.journal_service()
+        requested_when_parsed = []
+        parse_page = journal_service._parse_page
+
+        def tracked_parse_page(xml_input, entity_entry_data_path):
+            requested_when_parsed.append((journal_service.next_page, len(self.journal_payloads(tenant))))
+            return parse_page(xml_input, entity_entry_data_path)
+
+        journal_service._parse_page = tracked_parse_page
+        with contextlib.redirect_stdout(io.StringIO()):
+            journal_service.get_all_entities(DATA_PATH, max_workers=MAX_WORKERS)
+
+        self.assertEqual([page for page, _ in requested_when_parsed], list(range(1, 13)))
+        for page, requested in requested_when_parsed[1:]:
+            with self.subTest(page=page):
+                # page 1, then at most 2 x max_workers pages requested ahead of the one parsed
+                self.assertLessEqual(requested, page + 2 * MAX_WORKERS)
+
+    def test_failed_page_is_recorded_and_the_others_kept(self):
+        _, expected_csv = self.run_journals(FakeTenant(self.journals, per_page=2))
+        tenant = FakeTenant(self.journals, per_page=2, failed_journal_pages={5})
+
+        journal_service, csv_content = self.run_journals(tenant, max_workers=MAX_WORKERS)
+
+        self.assertEqual(len(journal_service.failed_entity), 1)
+        failure = journal_service.failed_entity[0]
+        self.assertIsInstance(failure, FailedProcessedJournal)
+        self.assertEqual(failure.reason, 'Could not fetch page 5 in `get_all_entities`')
+        self.assertIn('500', failure.error_message)
+        # the journals 8 and 9 of page 5 are missing, the other pages are kept
+        missing_journals = {'AJ-8', 'AJ-9'}
+        expected_ids = [journal_id for journal_id in self.journal_ids(expected_csv) if journal_id not in missing_journals]
+        self.assertEqual(self.journal_ids(csv_content), expected_ids)
+        self.assertFalse(journal_service.is_complete)
+
+    @staticmethod
+    def journal_ids(csv_content: str) -> List[str]:
+        return list(dict.fromkeys(re.findall(r'AJ-\d+', csv_content)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import csv
+import io
+import unittest
+
+from workday.csv_helpers import *
+
+HEADER = ['journal_id', 'entry_line_memo']
+
+
+def read_rows(csv_chunk: str):
+    return list(csv.reader(io.StringIO(csv_chunk)))
+
+
+class TestCSVChunkWriter(unittest.TestCase):
+
+    def test_chunks_are_cut_every_num_row_limit_rows(self):
+        chunk_writer = CSVChunkWriter(HEADER, num_row_limit=2)
+        chunk_writer.writerows([f'AJ-{journal}', 'memo'] for journal in range(5))
+
+        chunks = chunk_writer.close()
+
+        self.assertEqual([len(read_rows(chunk)) for chunk in chunks], [3, 3, 2])
+        self.assertTrue(all(read_rows(chunk)[0] == HEADER for chunk in chunks))
+        self.assertEqual(read_rows(chunks[2])[1], ['AJ-4', 'memo'])
+
+    def test_quoted_line_break_stays_in_its_row(self):
+        chunk_writer = CSVChunkWriter(HEADER, num_row_limit=1)
+        chunk_writer.writerow(['AJ-1', 'first line\nsecond line'])
+        chunk_writer.writerow(['AJ-2', 'memo'])
+
+        chunks = chunk_writer.close()
+
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(read_rows(chunks[0]), [HEADER, ['AJ-1', 'first line\nsecond line']])
+
+    def test_chunks_are_closed_before_max_chunk_bytes(self):
+        chunk_writer = CSVChunkWriter(HEADER, num_row_limit=100, max_chunk_bytes=90)
+        chunk_writer.writerows([f'AJ-{journal}', 'é' * 10] for journal in range(5))
+
+        chunks = chunk_writer.close()
+
+        self.assertEqual(
+            chunk_writer.chunk_stats,
+            [CSVChunkStats(rows=len(read_rows(chunk)) - 1, bytes=len(chunk.encode('utf-8'))) for chunk in chunks]
+        )
+        self.assertTrue(all(stats.bytes <= 90 for stats in chunk_writer.chunk_stats))
+        self.assertEqual(sum(stats.rows for stats in chunk_writer.chunk_stats), 5)
+        self.assertEqual(len(chunks), 3)
+
+    def test_row_larger_than_max_chunk_bytes_gets_its_own_chunk(self):
+        chunk_writer = CSVChunkWriter(HEADER, max_chunk_bytes=40)
+        chunk_writer.writerows([['AJ-1', 'memo'], ['AJ-2', 'x' * 100], ['AJ-3', 'memo']])
+
+        chunk_writer.close()
+
+        self.assertEqual([stats.rows for stats in chunk_writer.chunk_stats], [1, 1, 1])
+        self.assertGreater(chunk_writer.chunk_stats[1].bytes, 40)
+
+    def test_split_csv_content(self):
+        csv_content = 'journal_id,entry_line_memo\r\nAJ-1,"a\nb"\r\nAJ-2,c\r\n'
+
+        chunk_writer = CSVChunkWriter.split(csv_content, num_row_limit=1)
+
+        self.assertEqual(chunk_writer.chunks, ['journal_id,entry_line_memo\r\nAJ-1,"a\nb"\r\n', 'journal_id,entry_line_memo\r\nAJ-2,c\r\n'])
+        self.assertEqual(CSVChunkWriter.split('', num_row_limit=1).chunks, [])
+
+    def test_no_row_gives_no_chunk(self):
+        self.assertEqual(CSVChunkWriter(HEADER, num_row_limit=10).close(), [])
+
+    def test_journals_generator(self):
+        helper = CSVJournalHelper()
+
+        self.assertEqual(helper.mapped_journals_to_csv_chunks((journal for journal in [None]), 10), ([], []))
+
+
+class Node:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+class TestRowProjector(unittest.TestCase):
+
+    def test_same_values_as_the_field_lambdas(self):
+        deal = Node(customer_contract_id='CON-1', contract_name='Deal')
+        objects = [
+            Node(memo='a\nb', revenue_info=Node(deal=deal, revenue_name='R'), amount_info=Node(debit=0.0)),
+            Node(memo='', revenue_info=Node(deal=None, revenue_name=None), amount_info=None),
+        ]
+        project = compile_row_projector([
+            ("memo", "memo", single_line),
+            ("deal_code", "revenue_info.deal.customer_contract_id"),
+            ("deal_company_name", "revenue_info.deal.contract_name"),
+            ("revenue_category", "revenue_info.revenue_name"),
+            ("debit", "amount_info.debit"),
+            ("constant", lambda o: 'x'),
+        ])
+
+        for o in objects:
+            self.assertEqual(project(o), [
+                o.memo.replace('\n', ' ') if o.memo else None,
+                o.revenue_info.deal.customer_contract_id if o.revenue_info.deal else None,
+                o.revenue_info.deal.contract_name if o.revenue_info.deal else None,
+                o.revenue_info.revenue_name if o.revenue_info else None,
+                o.amount_info.debit if o.amount_info else None,
+                'x',
+            ])
+
+    def test_missing_object_gives_none(self):
+        project = compile_row_projector([("id", "journal_id"), ("code", "account_info.code")])
+
+        self.assertEqual(project(None), [None, None])
+
+    def test_invalid_path(self):
+        with self.assertRaises(ValueError):
+            compile_row_projector([("id", "journal_id; import os")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import contextlib
+import io
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from get_currency_conversion_rates import *
+
+FX_RATES_ANSWER = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"><env:Body>'
+    '<wd:Get_Currency_Conversion_Rates_Response xmlns:wd="urn:com.workday/bsvc">'
+    '<wd:Response_Results><wd:Total_Results>1</wd:Total_Results><wd:Total_Pages>1</wd:Total_Pages>'
+    '<wd:Page_Results>1</wd:Page_Results><wd:Page>1</wd:Page></wd:Response_Results>'
+    '<wd:Response_Data><wd:Currency_Conversion_Rate><wd:Currency_Conversion_Rate_Data>'
+    '<wd:Effective_Timestamp>2025-01-31T00:00:00.000-08:00</wd:Effective_Timestamp>'
+    '<wd:From_Currency_Reference><wd:ID wd:type="Currency_ID">USD</wd:ID>'
+    '<wd:ID wd:type="Currency_Numeric_Code">840</wd:ID></wd:From_Currency_Reference>'
+    '<wd:Target_Currency_Reference><wd:ID wd:type="Currency_ID">EUR</wd:ID>'
+    '<wd:ID wd:type="Currency_Numeric_Code">978</wd:ID></wd:Target_Currency_Reference>'
+    '<wd:Currency_Rate>0.96</wd:Currency_Rate>'
+    '<wd:Currency_Rate_Type_Reference><wd:ID wd:type="Currency_Rate_Type_ID">Current</wd:ID>'
+    '</wd:Currency_Rate_Type_Reference>'
+    '</wd:Currency_Conversion_Rate_Data></wd:Currency_Conversion_Rate></wd:Response_Data>'
+    '</wd:Get_Currency_Conversion_Rates_Response></env:Body></env:Envelope>'
+).encode()
+
+
+class FXRatesHandler(BaseHTTPRequestHandler):
+    """ Rejects the expired tokens with a 401 """
+    expired_tokens = ('token-1',)
+    authorizations = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        authorization = self.headers['Authorization']
+        self.authorizations.append(authorization)
+        expired = authorization in [f'Bearer {token}' for token in self.expired_tokens]
+        body = b'' if expired else FX_RATES_ANSWER
+        self.send_response(401 if expired else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TokenEndpoint:
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'access_token': f'token-{self.calls}', 'expires_in': 3600}
+
+
+class TestGetAllFXRatesToken(unittest.TestCase):
+
+    def setUp(self):
+        FXRatesHandler.authorizations = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FXRatesHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch_rates(self, token) -> List[CurrencyConversionRate]:
+        fx_rates = GetAllFXRates(base_url=self.base_url, service_path='tenant', token=token, version='v42.1')
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fx_rates.fetch_currency_conversion_rates('2025-01-31T00:00:00.000-08:00', 'Current')
+
+    def test_request_is_sent_again_with_a_new_token_after_a_401(self):
+        endpoint = TokenEndpoint()
+        token_provider = TokenProvider(endpoint)
+        token_provider.refresh()
+
+        rates = self.fetch_rates(token_provider)
+
+        self.assertEqual([(rate.Target_Currency.Currency_ID, rate.Currency_Rate) for rate in rates], [('EUR', 0.96)])
+        self.assertEqual(FXRatesHandler.authorizations, ['Bearer token-1', 'Bearer token-2'])
+        self.assertEqual(endpoint.calls, 2)
+
+    def test_plain_token_is_not_refreshed(self):
+        with self.assertRaises(requests.HTTPError) as error:
+            self.fetch_rates('token-1')
+
+        self.assertEqual(error.exception.response.status_code, 401)
+        self.assertEqual(FXRatesHandler.authorizations, ['Bearer token-1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
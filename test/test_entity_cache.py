@@ -0,0 +1,61 @@
+import unittest
+
+from workday.entity_cache import *
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestEntityCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = EntityCache(max_size=2, negative_ttl=60, clock=self.clock)
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(self.cache.get('SUP-1'))
+        self.cache.update({'SUP-1': 'supplier 1'})
+
+        self.assertEqual(self.cache.get('SUP-1'), 'supplier 1')
+        self.assertIn('SUP-1', self.cache)
+        self.assertEqual(self.cache.get_stats(), CacheStats(hits=1, misses=1, size=1))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.put('SUP-1', 'supplier 1')
+        self.cache.put('SUP-2', 'supplier 2')
+        # SUP-1 becomes the most recently used entry
+        self.cache.get('SUP-1')
+        self.cache.put('SUP-3', 'supplier 3')
+
+        self.assertEqual(self.cache.keys(), ['SUP-1', 'SUP-3'])
+        self.assertEqual(self.cache.get_stats().evictions, 1)
+
+    def test_not_found_is_remembered_until_expiry(self):
+        self.cache.put_not_found('SUP-404', 'Expected list to contain exactly one element, but it has 0 elements.')
+
+        is_cached, value = self.cache.lookup('SUP-404')
+        self.assertTrue(is_cached)
+        self.assertIsInstance(value, NotFoundEntity)
+        self.assertIsNone(self.cache.get('SUP-404'))
+        self.assertNotIn('SUP-404', self.cache)
+
+        self.clock.now = 61
+        self.assertEqual(self.cache.lookup('SUP-404'), (False, None))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = EntityCache(max_size=0)
+        cache.put('SUP-1', 'supplier 1')
+        cache.put_not_found('SUP-404', 'not found')
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.lookup('SUP-1'), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
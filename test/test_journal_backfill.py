@@ -0,0 +1,164 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+
+from fake_workday import FakeTenant, journal_data
+from workday.journal_backfill import *
+
+
+class FakeJournalService:
+    """ Stands for `GetAllJournals`: returns one journal by day """
+
+    def __init__(self, creation_date: str, fail: bool):
+        self.creation_date = creation_date
+        self.fail = fail
+        self.failed_journals = []
+        self.failed_entity = ['page error'] if fail else []
+        self.requests = []
+
+    def get_all_entities(self, entity_entry_data_path: str, **kwargs):
+        self.requests.append(kwargs)
+        if self.fail:
+            raise ConnectionError('Workday is down')
+        return [MappedJournal(journal_id=f'AJ-{self.creation_date}', mapped_entries=[MappedEntryJournal(memo='m')])]
+
+    @staticmethod
+    def filter_objects(items, condition):
+        return [item for item in items if condition(item)]
+
+    @staticmethod
+    def callable_condition(journal) -> bool:
+        return True
+
+
+class FakeMasterData:
+
+    def __init__(self, failing_date: Optional[str] = None):
+        self.failing_date = failing_date
+        self.services: Dict[str, FakeJournalService] = {}
+        self._lock = threading.Lock()
+
+    def journal_service(self, connector, creation_date: str, filter_by_creation_date: bool = True, **journal_options):
+        service = FakeJournalService(creation_date, fail=creation_date == self.failing_date)
+        with self._lock:
+            self.services[creation_date] = service
+        return service
+
+
+class ListSink:
+
+    def __init__(self):
+        self.days: Dict[str, List[MappedJournal]] = {}
+
+    def write(self, date: str, journals) -> int:
+        self.days[date] = list(journals)
+        return len(self.days[date])
+
+
+class TestJournalBackfill(unittest.TestCase):
+
+    def test_one_report_by_day_in_date_order(self):
+        master_data = FakeMasterData()
+        sink = ListSink()
+
+        reports = JournalBackfill(None, master_data, day_workers=3).run('2025-01-30', '2025-02-02', sink)
+
+        self.assertEqual([report.date for report in reports], ['2025-01-30', '2025-01-31', '2025-02-01', '2025-02-02'])
+        self.assertEqual([report.journals for report in reports], [1, 1, 1, 1])
+        self.assertEqual(sink.days['2025-02-01'][0].journal_id, 'AJ-2025-02-01')
+        self.assertEqual(master_data.services['2025-02-01'].requests[0]['accounting_from_date'], '2025-02-01')
+        self.assertEqual(master_data.services['2025-02-01'].requests[0]['as_of_effective_date'], '2025-01-31T00:00:00.000')
+
+    def test_failed_day_does_not_stop_the_others(self):
+        sink = ListSink()
+
+        reports = JournalBackfill(None, FakeMasterData('2025-01-21'), day_workers=2).run('2025-01-20', '2025-01-22', sink)
+
+        self.assertEqual(sorted(sink.days), ['2025-01-20', '2025-01-22'])
+        self.assertEqual(reports[1].failure, 'ConnectionError: Workday is down')
+        self.assertEqual(reports[1].errors, ['page error'])
+        self.assertIsNone(reports[0].failure)
+
+
+class TestJournalBackfillLookupServices(unittest.TestCase):
+    """ Backfill against a fake tenant, every day lists the same journals """
+
+    def setUp(self):
+        self.tenant = FakeTenant([journal_data(number) for number in range(23)])
+        self.tenant.transport.delay = 0.002
+        self.connector = SimpleNamespace(
+            base_uri='https://x', tenant='t', token_provider='tok', transport=self.tenant.transport,
+            version=DEFAULT_WORKDAY_API_VERSION,
+        )
+        services = dict(base_url='https://x', tenant='t', token='tok', transport=self.tenant.transport)
+        self.master_data = JournalMasterData(
+            ledger_accounts={}, cost_centers={}, subsidiaries={}, gtm_org={},
+            book_codes={'BC0': BookCodeInfo(book_code_id='BC0', name='Book 0')},
+            suppliers=GetRAASSuppliers(**services),
+            resource_category_service=GetResourceCategories(**services),
+            customer_contract_service=GetCustomerContracts(**services),
+        )
+
+    def run_backfill(self, directory: str, to_date: str, day_workers: int) -> List[BackfillDayReport]:
+        backfill = JournalBackfill(
+            self.connector, self.master_data, day_workers=day_workers, filter_by_creation_date=False,
+            two_phase=True, reference_full_download_pages={'suppliers': 0, 'spend_categories': 0,
+                                                           'customer_contracts': 0},
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            return backfill.run('2025-01-20', to_date, JournalCSVFileSink(directory))
+
+    def test_days_run_together_download_the_references_on_their_own_services(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.run_backfill(directory, '2025-01-20', day_workers=1)
+            with open(JournalCSVFileSink(directory).path('2025-01-20'), newline='') as file:
+                expected_csv = file.read()
+            self.tenant.requests.clear()
+
+            reports = self.run_backfill(directory, '2025-01-23', day_workers=4)
+
+            for report in reports:
+                with self.subTest(report.date):
+                    self.assertIsNone(report.failure)
+                    self.assertEqual(report.journals, 19)
+                    with open(JournalCSVFileSink(directory).path(report.date), newline='') as file:
+                        self.assertEqual(file.read(), expected_csv)
+        # each day downloads the 10 pages of suppliers
+        self.assertEqual(self.tenant.requests_of('Get_Suppliers_Request'), [0] * 40)
+
+    def test_lookup_services_share_the_caches(self):
+        first_services = self.master_data.lookup_services(self.connector)
+        second_services = self.master_data.lookup_services(self.connector)
+        master_data_services = (self.master_data.suppliers, self.master_data.resource_category_service,
+                                self.master_data.customer_contract_service)
+
+        for first, second, service in zip(first_services, second_services, master_data_services):
+            with self.subTest(type(service).__name__):
+                self.assertIs(type(first), type(service))
+                self.assertIsNot(first, second)
+                self.assertIs(first.cache, service.cache)
+                self.assertIs(second.cache, service.cache)
+                self.assertIs(first.transport, self.tenant.transport)
+
+
+class TestJournalCSVFileSink(unittest.TestCase):
+
+    def test_same_content_as_the_journal_csv(self):
+        journals = [MappedJournal(journal_id='AJ-1', mapped_entries=[MappedEntryJournal(memo='a'), MappedEntryJournal(memo='b')])]
+
+        with tempfile.TemporaryDirectory() as directory:
+            sink = JournalCSVFileSink(directory)
+            rows = sink.write('2025-01-20', journals)
+
+            self.assertEqual(sink.path('2025-01-20'), os.path.join(directory, 'accounting_journal_2025-01-20_to_2025-01-20_journal_entries.csv'))
+            with open(sink.path('2025-01-20'), newline='') as file:
+                self.assertEqual(file.read(), CSVJournalHelper().mapped_journals_to_csv(journals))
+        self.assertEqual(rows, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import contextlib
+import io
+import unittest
+
+from fake_workday import *
+from workday.csv_helpers import CSVJournalHelper
+
+DATA_PATH = './/wd:Journal_Entry_Data'
+TAG = b'wd:Journal_Entry_Data'
+OTHER_DAY = '2025-01-19T23:00:00.000-08:00'
+
+
+class TestJournalPrescan(unittest.TestCase):
+
+    def setUp(self):
+        self.journal_service = FakeTenant([]).journal_service()
+
+    def test_raw_journal_tag(self):
+        self.assertEqual(GetAllJournals._get_raw_journal_tag(DATA_PATH), TAG)
+        self.assertEqual(GetAllJournals._get_raw_journal_tag('.//Journal_Entry_Data'), b'Journal_Entry_Data')
+        for path in ('wd:Journal_Entry_Data', './/wd:Journal_Entry/wd:Journal_Entry_Data', './/*', './/',
+                     './/wd:Journal_Entry_Data[1]', './/wd:Journal_Entry_Data/@wd:Descriptor'):
+            with self.subTest(path):
+                self.assertIsNone(GetAllJournals._get_raw_journal_tag(path))
+
+    def test_longer_tag_with_the_same_prefix_is_skipped(self):
+        page = (
+            b'<wd:Response_Data>'
+            b'<wd:Journal_Entry_Data_Summary>summary</wd:Journal_Entry_Data_Summary>'
+            b'<wd:Journal_Entry_Data><wd:Memo>first</wd:Memo></wd:Journal_Entry_Data>'
+            b'<wd:Journal_Entry_DataX/>'
+            b'<wd:Journal_Entry_Data wd:Descriptor="second">\n<wd:Memo>second</wd:Memo></wd:Journal_Entry_Data>'
+            b'</wd:Response_Data>'
+        )
+
+        journals = [page[start:end] for start, end in GetAllJournals._iter_raw_journals(page, TAG)]
+
+        self.assertEqual(journals, [
+            b'<wd:Journal_Entry_Data><wd:Memo>first</wd:Memo></wd:Journal_Entry_Data>',
+            b'<wd:Journal_Entry_Data wd:Descriptor="second">\n<wd:Memo>second</wd:Memo></wd:Journal_Entry_Data>',
+        ])
+
+    def test_unclosed_journal_stops_the_scan(self):
+        closed_journal = b'<wd:Journal_Entry_Data>a</wd:Journal_Entry_Data>'
+        page = closed_journal + b'<wd:Journal_Entry_Data>b'
+
+        self.assertEqual(list(GetAllJournals._iter_raw_journals(page, TAG)), [(0, len(closed_journal))])
+
+    def test_creation_date_window(self):
+        cases = {
+            '2025-01-20T05:00:00.000-08:00': True,
+            OTHER_DAY: False,
+            None: True,  # missing: `_parse_journals` rejects it
+            'not a date': True,  # malformed: `_parse_journals` decides
+            '': True,
+        }
+        for creation_date, expected in cases.items():
+            with self.subTest(creation_date):
+                journal = journal_data(1, creation_date=creation_date).encode()
+                self.assertEqual(
+                    self.journal_service._is_created_in_window(journal, 0, len(journal), b'wd:'), expected
+                )
+
+        unclosed = b'<wd:Journal_Entry_Data><wd:Creation_Date>2025-01-19</wd:Journal_Entry_Data>'
+        self.assertTrue(self.journal_service._is_created_in_window(unclosed, 0, len(unclosed), b'wd:'))
+        # the date of the next journal is not read
+        two_journals = journal_data(1, creation_date=None).encode() + journal_data(2, creation_date=OTHER_DAY).encode()
+        self.assertTrue(self.journal_service._is_created_in_window(
+            two_journals, 0, len(journal_data(1, creation_date=None)), b'wd:'
+        ))
+
+    def test_only_the_journals_of_another_day_are_dropped(self):
+        journals = [journal_data(0), journal_data(1, creation_date=OTHER_DAY), journal_data(2, creation_date=None),
+                    journal_data(3, creation_date='20/01/2025'), journal_data(4, creation_date=OTHER_DAY)]
+        page = journals_answer(journals, 1, 5)
+
+        kept_page, journals_discarded, bytes_discarded = self.journal_service._prescan_creation_dates(page, DATA_PATH)
+
+        # the `Journal_Entry_Data` elements are dropped, their empty `Journal_Entry` parents stay
+        dropped = [journals[number][len('<wd:Journal_Entry>'):-len('</wd:Journal_Entry>')].encode() for number in (1, 4)]
+        self.assertEqual(journals_discarded, 2)
+        self.assertEqual(bytes_discarded, sum(len(journal) for journal in dropped))
+        self.assertEqual(kept_page, page.replace(dropped[0], b'').replace(dropped[1], b''))
+
+    def test_other_namespace_prefix_keeps_the_journals(self):
+        journals = [journal_data(number, creation_date=OTHER_DAY, prefix='ns0') for number in range(3)]
+        page = journals_answer(journals, 1, 3, prefix='ns0')
+
+        self.assertEqual(self.journal_service._prescan_creation_dates(page, DATA_PATH), (page, 0, 0))
+
+
+class TestJournalPrescanTotals(unittest.TestCase):
+
+    def setUp(self):
+        creation_dates = ['2025-01-20T05:00:00.000-08:00', OTHER_DAY, None, 'not a date']
+        self.journals = [
+            journal_data(number, creation_date=creation_dates[number % len(creation_dates)]) for number in range(23)
+        ]
+
+    def run_journals(self, prescan: bool, prefix: str = 'wd', **kwargs) -> Tuple[GetAllJournals, str]:
+        journals = [journal.replace('<wd:', f'<{prefix}:').replace('</wd:', f'</{prefix}:')
+                    .replace('wd:type=', f'{prefix}:type=') for journal in self.journals]
+        journal_service = FakeTenant(journals, prefix=prefix).journal_service(**kwargs)
+        if not prescan:
+            journal_service._prescan_creation_dates = lambda xml_input, entity_entry_data_path: (xml_input, 0, 0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            journals = journal_service.get_all_entities(DATA_PATH)
+        return journal_service, CSVJournalHelper().mapped_journals_to_csv(journals)
+
+    def assertSameTotals(self, journal_service: GetAllJournals, expected_service: GetAllJournals):
+        self.assertEqual(len(journal_service.all_entity), len(expected_service.all_entity))
+        self.assertEqual(journal_service.outdated_counter, expected_service.outdated_counter)
+        self.assertEqual(journal_service.total_record, expected_service.total_record)
+        self.assertEqual(journal_service.is_complete, expected_service.is_complete)
+        self.assertEqual(len(journal_service.failed_journals), len(expected_service.failed_journals))
+
+    def test_totals_are_the_same_without_the_prescan(self):
+        for options in (dict(), dict(two_phase=True)):
+            with self.subTest(**options):
+                expected_service, expected_csv = self.run_journals(prescan=False, **options)
+                journal_service, csv_content = self.run_journals(prescan=True, **options)
+
+                self.assertEqual(csv_content, expected_csv)
+                self.assertSameTotals(journal_service, expected_service)
+                # 6 journals of another day dropped before parsing, 6 without date rejected by the parsing
+                self.assertEqual(sum(report.journals_discarded for report in journal_service.prescan_reports), 6)
+                self.assertEqual(journal_service.outdated_counter, 12)
+
+    def test_other_namespace_prefix_is_parsed_as_without_the_prescan(self):
+        expected_service, expected_csv = self.run_journals(prescan=False)
+
+        journal_service, csv_content = self.run_journals(prescan=True, prefix='ns0')
+
+        self.assertEqual(csv_content, expected_csv)
+        self.assertSameTotals(journal_service, expected_service)
+        self.assertEqual(sum(report.journals_discarded for report in journal_service.prescan_reports), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
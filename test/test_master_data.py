@@ -0,0 +1,153 @@
+import threading
+import time
+import unittest
+
+from workday.journal_backfill import *
+
+
+class FakeRAASService:
+    """ Stands for a `WorkdayRAASService`: counts the reports downloaded at the same time """
+
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def __init__(self, report_name: str, data: dict, delay: float = 0.05, error: Exception = None):
+        self.report_name = report_name
+        self.data = data
+        self.delay = delay
+        self.error = error
+        self.last_fetch = None
+        self.calls = 0
+
+    def get_entity_dic(self):
+        with FakeRAASService.lock:
+            self.calls += 1
+            FakeRAASService.running += 1
+            FakeRAASService.max_running = max(FakeRAASService.max_running, FakeRAASService.running)
+        try:
+            time.sleep(self.delay)
+            if self.error:
+                raise self.error
+            self.last_fetch = RAASFetchReport(report_name=self.report_name, status='snapshot', entries=len(self.data))
+            return self.data
+        finally:
+            with FakeRAASService.lock:
+                FakeRAASService.running -= 1
+
+
+class TestMasterDataLoader(unittest.TestCase):
+
+    def setUp(self):
+        FakeRAASService.running = 0
+        FakeRAASService.max_running = 0
+
+    def test_reports_are_downloaded_concurrently_up_to_max_workers(self):
+        loader = MasterDataLoader(max_workers=2)
+        providers = [loader.load(FakeRAASService(f'Report{index}', {index: index})) for index in range(4)]
+        loader.close()
+
+        loader.wait()
+
+        self.assertEqual(FakeRAASService.max_running, 2)
+        self.assertEqual([dict(provider) for provider in providers], [{index: index} for index in range(4)])
+
+    def test_provider_reads_like_the_report_dict(self):
+        data = {'LA1': 'Account 1', 'LA2': 'Account 2'}
+        loader = MasterDataLoader()
+        provider = loader.load(FakeRAASService('GetRAASLedgerAccount', data))
+        loader.close()
+
+        self.assertEqual(provider.get('LA1'), 'Account 1')
+        self.assertIsNone(provider.get('LA3'))
+        self.assertEqual(provider['LA2'], 'Account 2')
+        self.assertEqual(len(provider), 2)
+        self.assertEqual(dict(provider), data)
+        self.assertIs(provider.wait(), data)
+
+        report = loader.get_reports()[0]
+        self.assertEqual((report.report_name, report.status, report.entries), ('GetRAASLedgerAccount', 'snapshot', 2))
+        self.assertGreaterEqual(report.seconds, 0.05)
+
+    def test_failed_download_is_raised_by_the_reads(self):
+        loader = MasterDataLoader()
+        provider = loader.load(FakeRAASService('GetRAASCostCenter', {}, error=ValueError('report down')))
+        loader.close()
+
+        with self.assertRaises(ValueError):
+            provider.get('CC1')
+        with self.assertRaises(ValueError):
+            loader.wait()
+        self.assertEqual(loader.get_reports()[0].status, 'failed')
+
+    def test_journal_service_waits_for_the_reports(self):
+        loader = MasterDataLoader()
+        ledger_accounts = loader.load(FakeRAASService('GetRAASLedgerAccount', {'LA1': 'Account 1'}, delay=0.2))
+        loader.close()
+        get_all_journals = GetAllJournals(
+            'https://x', 't', 'tok', creation_date='2025-01-20', filter_by_creation_date=True,
+            ledger_accounts=ledger_accounts, cost_centers={}, subsidiaries={}, book_codes={}, gtm_org={},
+            raas_suppliers=None, resource_category_service=None, customer_contract_service=None,
+        )
+        self.assertEqual(loader.get_reports()[0].status, 'pending')
+
+        get_all_journals._resolve_master_data()
+
+        self.assertEqual(get_all_journals.ledger_accounts, {'LA1': 'Account 1'})
+        self.assertIs(type(get_all_journals.ledger_accounts), dict)
+
+    def test_lazy_report_is_downloaded_on_its_first_read_only(self):
+        service = FakeRAASService('GetRAASGeoSales', {'G1': 'Geo 1'})
+        loader = MasterDataLoader()
+        provider = loader.load(service, lazy=True)
+        loader.close()
+
+        loader.wait()
+        self.assertIsNone(provider.get(None))
+        self.assertEqual(service.calls, 0)
+        self.assertEqual(loader.get_reports()[0].status, 'skipped')
+
+        self.assertEqual(provider.get('G1'), 'Geo 1')
+        self.assertEqual(service.calls, 1)
+        self.assertEqual(loader.get_reports()[0].status, 'snapshot')
+
+    def test_lazy_report_is_downloaded_once_by_concurrent_readers(self):
+        service = FakeRAASService('GetRAASGeoSales', {'G1': 'Geo 1'}, delay=0.1)
+        provider = MasterDataLoader().load(service, lazy=True)
+        results = []
+
+        readers = [threading.Thread(target=lambda: results.append(provider.get('G1'))) for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(results, ['Geo 1'] * 8)
+        self.assertEqual(service.calls, 1)
+
+    def test_failed_lazy_report_stops_the_journal_service(self):
+        loader = MasterDataLoader()
+        gtm_org = loader.load(FakeRAASService('GetRAASGeoSales', {}, error=ValueError('report down')), lazy=True)
+        get_all_journals = GetAllJournals(
+            'https://x', 't', 'tok', creation_date='2025-01-20', filter_by_creation_date=True,
+            ledger_accounts={}, cost_centers={}, subsidiaries={}, book_codes={}, gtm_org=gtm_org,
+            raas_suppliers=None, resource_category_service=None, customer_contract_service=None,
+        )
+        get_all_journals._resolve_master_data()
+        self.assertIs(get_all_journals.gtm_org, gtm_org)
+        get_all_journals._raise_failed_master_data()
+
+        # the mapping of a journal catches the error
+        with self.assertRaises(ValueError):
+            gtm_org.get('G1')
+
+        with self.assertRaises(ValueError):
+            get_all_journals._raise_failed_master_data()
+
+    def test_unknown_lazy_report(self):
+        with self.assertRaises(ValueError):
+            JournalMasterData.load(None, lazy_reports=['GetRAASGeoSale'])
+
+
+if __name__ == '__main__':
+    unittest.main()
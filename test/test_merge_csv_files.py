@@ -0,0 +1,92 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from workday.utils import merge_csv_files
+
+
+class TestMergeCSVFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_path = self.path('merged.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def write(self, name: str, content: bytes) -> str:
+        with open(self.path(name), 'wb') as file:
+            file.write(content)
+        return self.path(name)
+
+    def read_output(self) -> bytes:
+        with open(self.output_path, 'rb') as file:
+            return file.read()
+
+    def test_headers_of_the_next_files_are_dropped(self):
+        csv_paths = [
+            self.write('day_1.csv', b'journal_id,amount\r\nAJ-1,"1\nline"\r\nAJ-2,2.50\r\n'),
+            self.write('day_2.csv', b'journal_id,amount\r\n'),
+            self.write('day_3.csv', b'journal_id,amount\r\nAJ-3,007\r\n'),
+        ]
+
+        merge_csv_files(csv_paths, self.output_path, block_size=4)
+
+        self.assertEqual(self.read_output(), b'journal_id,amount\r\nAJ-1,"1\nline"\r\nAJ-2,2.50\r\nAJ-3,007\r\n')
+
+    def test_last_row_without_line_break(self):
+        csv_paths = [
+            self.write('day_1.csv', b'journal_id\nAJ-1'),
+            self.write('day_2.csv', b'journal_id\nAJ-2\n'),
+        ]
+
+        merge_csv_files(csv_paths, self.output_path)
+
+        self.assertEqual(self.read_output(), b'journal_id\nAJ-1\nAJ-2\n')
+
+    def test_missing_files_are_skipped(self):
+        csv_paths = [self.path('missing.csv'), self.write('day_2.csv', b'journal_id\r\nAJ-2\r\n')]
+
+        merge_csv_files(csv_paths, self.output_path)
+
+        self.assertEqual(self.read_output(), b'journal_id\r\nAJ-2\r\n')
+
+    def test_no_file_found(self):
+        merge_csv_files([self.path('missing.csv')], self.output_path)
+
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_different_headers(self):
+        csv_paths = [
+            self.write('day_1.csv', b'journal_id,amount\r\nAJ-1,1\r\n'),
+            self.write('day_2.csv', b'journal_id,memo\r\nAJ-2,memo\r\n'),
+        ]
+
+        with self.assertRaises(ValueError):
+            merge_csv_files(csv_paths, self.output_path)
+        # no half merged file left behind
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_different_headers_name_the_file_of_the_header(self):
+        csv_paths = [
+            self.path('missing.csv'),
+            self.write('empty.csv', b''),
+            self.write('day_1.csv', b'journal_id,amount\r\nAJ-1,1\r\n'),
+            self.write('day_2.csv', b'journal_id,memo\r\nAJ-2,memo\r\n'),
+        ]
+
+        with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(ValueError) as error:
+            merge_csv_files(csv_paths, self.output_path)
+
+        self.assertEqual(str(error.exception),
+                         f'The header of {csv_paths[3]} does not match the header of {csv_paths[2]}')
+        self.assertFalse(os.path.exists(self.output_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from fake_workday import *
+
+DATA_PATH = './/wd:Supplier_Data'
+PAGES = [['SUP-1', 'SUP-2'], ['SUP-3', 'SUP-4'], ['SUP-5']]
+
+
+def suppliers_answer(payload: str, headers) -> FakeResponse:
+    """ Answers the lookups by ID, and the pagination with the suppliers of `PAGES` """
+    supplier_ids = requested_ids(payload, 'Supplier_ID')
+    if supplier_ids:
+        suppliers = ''.join(supplier_data(supplier_id) for supplier_id in supplier_ids)
+        return FakeResponse(soap_answer('Get_Suppliers_Response', suppliers, total_results=len(supplier_ids)))
+
+    page = requested_page(payload)
+    suppliers = ''.join(supplier_data(supplier_id) for supplier_id in PAGES[page - 1])
+    return FakeResponse(soap_answer('Get_Suppliers_Response', suppliers, total_results=sum(map(len, PAGES)),
+                                    total_pages=len(PAGES), page=page))
+
+
+class TestParseOnce(unittest.TestCase):
+    """ Each answer goes through `_parse_response`, and is given to the XML parser, exactly once """
+
+    def setUp(self):
+        self.service = GetRAASSuppliers('https://x', 't', 'tok', transport=FakeTransport(suppliers_answer))
+        self.parsed_answers: List[bytes] = []
+        parse_response = self.service._parse_response
+
+        def spy_parse_response(xml_input, data_entity_path):
+            self.parsed_answers.append(xml_input)
+            return parse_response(xml_input, data_entity_path)
+
+        self.service._parse_response = spy_parse_response
+        patcher = mock.patch.object(ET, 'fromstring', side_effect=ET.fromstring)
+        self.fromstring = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertParsedOnce(self, responses: int):
+        self.assertEqual(len(self.service.transport.payloads), responses)
+        self.assertEqual(len(self.parsed_answers), responses)
+        self.assertEqual(self.fromstring.call_count, responses)
+        # bytes given as is to the parser, no UTF-8 string copy
+        self.assertTrue(all(isinstance(answer, bytes) for answer in self.parsed_answers))
+
+    def test_get_entity(self):
+        supplier = self.service.get_entity('SUP-7', DATA_PATH)
+
+        self.assertEqual(supplier.vendor_code, 'SUP-7')
+        self.assertParsedOnce(1)
+
+    def test_search_entity(self):
+        supplier = self.service.search_entity('SUP-7', DATA_PATH)
+
+        self.assertEqual(supplier.vendor_code, 'SUP-7')
+        self.assertParsedOnce(1)
+
+    def test_get_all_entities(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            suppliers = self.service.get_all_entities(DATA_PATH)
+
+        self.assertEqual([supplier.vendor_code for supplier in suppliers], [f'SUP-{index}' for index in range(1, 6)])
+        self.assertParsedOnce(len(PAGES))
+
+    def test_get_all_entities_by_page(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            suppliers = self.service.get_all_entities_by_page(DATA_PATH, page=2, entity_count=2)
+
+        self.assertEqual([supplier.vendor_code for supplier in suppliers], ['SUP-3', 'SUP-4'])
+        self.assertParsedOnce(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import contextlib
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_workday import *
+from workday.csv_helpers import CSVJournalHelper
+from workday.master_data import RAASReportProvider
+from workday.workday_raas_implementation_api import GetRAASBookCodes, GetRAASGeoSales
+
+DATA_PATH = './/wd:Journal_Entry_Data'
+BOOK_CODES_NS = 'urn:com.workday.report/INT-AUTO-001_MasterData_BookCodes'
+
+
+def book_codes_answer(payload: Optional[str], headers: Dict[str, str]) -> FakeResponse:
+    entries = ''.join(
+        f'<wd:Report_Entry><wd:Book_Code_ID>BC{index}</wd:Book_Code_ID>'
+        f'<wd:Book_Code_Name wd:Descriptor="Book {index}"/></wd:Report_Entry>'
+        for index in range(2)
+    )
+    return FakeResponse(f'<wd:Report_Data xmlns:wd="{BOOK_CODES_NS}">{entries}</wd:Report_Data>'.encode())
+
+
+class TestParseProcesses(unittest.TestCase):
+
+    def setUp(self):
+        self.journals = [journal_data(number) for number in range(23)]
+
+    def run_journals(self, **kwargs) -> Tuple[GetAllJournals, List[MappedJournal]]:
+        journal_service = FakeTenant(self.journals, per_page=10).journal_service(**kwargs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            journals = journal_service.get_all_entities(DATA_PATH)
+        return journal_service, journals
+
+    def test_workers_parse_as_this_process(self):
+        expected_service, expected_journals = self.run_journals()
+        self.assertEqual({journal.book_code_info.name for journal in expected_journals}, {'Book 0', 'Book 1'})
+
+        for options in (dict(), dict(two_phase=True)):
+            with self.subTest(**options):
+                journal_service, journals = self.run_journals(parse_processes=2, **options)
+
+                self.assertEqual([journal.book_code_info for journal in journals],
+                                 [journal.book_code_info for journal in expected_journals])
+                self.assertEqual(CSVJournalHelper().mapped_journals_to_csv(journals),
+                                 CSVJournalHelper().mapped_journals_to_csv(expected_journals))
+                self.assertEqual(journal_service.outdated_counter, expected_service.outdated_counter)
+                self.assertEqual(journal_service.is_complete, expected_service.is_complete)
+
+    def test_workers_receive_the_downloaded_reports(self):
+        with ThreadPoolExecutor(max_workers=1) as executor, contextlib.redirect_stdout(io.StringIO()):
+            for executor_or_lazy in (executor, None):
+                with self.subTest(lazy=executor_or_lazy is None):
+                    book_codes = RAASReportProvider(
+                        GetRAASBookCodes('https://x', 't', 'tok', transport=FakeTransport(book_codes_answer)),
+                        executor_or_lazy,
+                    )
+                    gtm_org = RAASReportProvider(GetRAASGeoSales('https://x', 't', 'tok'))
+
+                    _, expected_journals = self.run_journals()
+                    journal_service, journals = self.run_journals(
+                        parse_processes=2, book_codes=book_codes, gtm_org=gtm_org
+                    )
+
+                    self.assertEqual([journal.book_code_info for journal in journals],
+                                     [journal.book_code_info for journal in expected_journals])
+                    # the parsing does not read the GTM orgs: the lazy report is left to the mapping, never needed
+                    self.assertEqual(gtm_org.get_report().status, 'skipped')
+
+
+if __name__ == '__main__':
+    unittest.main()
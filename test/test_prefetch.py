@@ -0,0 +1,109 @@
+import contextlib
+import io
+import threading
+import time
+import unittest
+
+from fake_workday import *
+from get_currency_conversion_rates import GetAllFXRates
+from test_currency_conversion_rates import FX_RATES_ANSWER
+from workday.utils import prefetch_pages
+
+
+def is_prefetching() -> bool:
+    return any(thread.name == 'page-prefetch' for thread in threading.enumerate())
+
+
+class TestPrefetchPages(unittest.TestCase):
+
+    def test_pages_are_yielded_in_order(self):
+        pages = list(prefetch_pages(lambda page: f'page {page}'.encode(), range(2, 8), depth=2))
+
+        self.assertEqual(pages, [(page, f'page {page}'.encode(), None) for page in range(2, 8)])
+
+    def test_fetch_error_is_yielded_with_its_page(self):
+        def fetch_page(page: int) -> bytes:
+            if page == 3:
+                raise ConnectionError('boom')
+            return b'ok'
+
+        pages = list(prefetch_pages(fetch_page, range(1, 5), depth=1))
+
+        self.assertEqual([page for page, _, _ in pages], [1, 2, 3, 4])
+        self.assertIsInstance(pages[2][2], ConnectionError)
+        self.assertIsNone(pages[2][1])
+
+    def test_fetcher_stays_at_most_depth_pages_ahead(self):
+        fetched = []
+        blocked = threading.Event()
+
+        def fetch_page(page: int) -> bytes:
+            fetched.append(page)
+            if len(fetched) == 4:
+                # 1 consumed, 2 buffered, 1 waiting for a free slot
+                blocked.set()
+            return b''
+
+        pages = prefetch_pages(fetch_page, range(1, 100), depth=2)
+        next(pages)
+        self.assertTrue(blocked.wait(timeout=5))
+        time.sleep(0.2)
+        self.assertEqual(fetched, [1, 2, 3, 4])
+        pages.close()
+
+    def test_closing_early_stops_the_fetcher(self):
+        pages = prefetch_pages(lambda page: b'', range(1, 100), depth=1)
+        next(pages)
+        pages.close()
+
+        self.assertFalse(is_prefetching())
+
+
+class TestPrefetchedPagesConsumerError(unittest.TestCase):
+    """ The fetcher thread is stopped as soon as the consumer of the pages raises, not when it is collected """
+
+    def test_parsing_error_stops_the_fetcher(self):
+        journal_service = FakeTenant([journal_data(number) for number in range(23)], per_page=2).journal_service()
+        parse_page = journal_service._parse_page
+
+        def failing_parse_page(xml_input, entity_entry_data_path):
+            if journal_service.next_page == 3:
+                raise ValueError('parsing failed')
+            return parse_page(xml_input, entity_entry_data_path)
+
+        journal_service._parse_page = failing_parse_page
+        with self.assertRaises(ValueError), contextlib.redirect_stdout(io.StringIO()):
+            try:
+                journal_service.get_all_entities('.//wd:Journal_Entry_Data', prefetch_depth=2)
+            finally:
+                # checked while the traceback still holds the frames of the consumer
+                self.assertFalse(is_prefetching())
+
+        # the fetcher stopped before reaching the last of the 12 pages
+        self.assertNotIn(12, [requested_page(payload) for payload in journal_service.transport.payloads
+                              if 'Get_Journals_Request' in payload])
+
+    def test_failed_fx_rates_page_stops_the_fetcher(self):
+        fx_rates = GetAllFXRates(base_url='https://x', service_path='tenant', token='tok', version='v42.1')
+        first_page = FX_RATES_ANSWER.replace(b'<wd:Total_Pages>1</wd:Total_Pages>',
+                                             b'<wd:Total_Pages>20</wd:Total_Pages>')
+        requested_pages = []
+
+        def fetch_fx_rates(effective_timestamp: str, rates_type: str, next_page: Optional[int] = None) -> bytes:
+            requested_pages.append(next_page)
+            if next_page == 3:
+                raise requests.HTTPError('500')
+            return first_page
+
+        fx_rates.fetch_fx_rates = fetch_fx_rates
+        with self.assertRaises(requests.HTTPError), contextlib.redirect_stdout(io.StringIO()):
+            try:
+                fx_rates.fetch_currency_conversion_rates('2025-01-31T00:00:00.000-08:00', 'Current', prefetch_depth=1)
+            finally:
+                self.assertFalse(is_prefetching())
+
+        self.assertNotIn(20, requested_pages)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from fake_workday import *
+from workday.snapshot_store import RAASSnapshotStore
+from workday.workday_async_api import AsyncWorkdayRAASService
+from workday.workday_raas_implementation_api import GetRAASCompanies
+
+REPORT_NS = 'urn:com.workday.report/INT-UPD-001_MasterData_Companies'
+ETAG = '"companies-v1"'
+LAST_MODIFIED = 'Mon, 20 Jan 2025 10:00:00 GMT'
+
+
+def companies_report(*names: str) -> bytes:
+    entries = ''.join(
+        f'<wd:Report_Entry><wd:referenceID>C{index}</wd:referenceID>'
+        f'<wd:Company wd:Descriptor="{name}"/></wd:Report_Entry>'
+        for index, name in enumerate(names, start=1)
+    )
+    return f'<wd:Report_Data xmlns:wd="{REPORT_NS}">{entries}</wd:Report_Data>'.encode()
+
+
+class FakeReport:
+    """ RAAS endpoint answering 304 to a request holding the ETag of the current report """
+
+    def __init__(self, body: bytes, etag: Optional[str] = ETAG, honour_validators: bool = True):
+        self.body = body
+        self.etag = etag
+        self.honour_validators = honour_validators
+
+    def answer(self, payload: Optional[str], headers: Dict[str, str]) -> FakeResponse:
+        response_headers = {'ETag': self.etag, 'Last-Modified': LAST_MODIFIED} if self.etag else {}
+        if self.honour_validators and self.etag and headers.get('If-None-Match') == self.etag:
+            return FakeResponse(status_code=304)
+        if not self.honour_validators:
+            # broken proxy answering 304 whatever the request
+            return FakeResponse(status_code=304)
+        return FakeResponse(self.body, headers=response_headers)
+
+
+class TestRAASFetch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = RAASSnapshotStore(os.path.join(self.directory.name, 'snapshots.db'), default_ttl=60)
+        self.report = FakeReport(companies_report('Company 1', 'Company 2'))
+        self.transport = FakeTransport(lambda payload, headers: self.report.answer(payload, headers))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def companies_service(self) -> GetRAASCompanies:
+        return GetRAASCompanies('https://x', 't', 'tok', transport=self.transport, snapshot_store=self.store)
+
+    def fetch(self, service: GetRAASCompanies) -> Dict[str, SubsidiaryInfo]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return service.get_entity_dic()
+
+    def test_first_download_is_served_from_the_network(self):
+        service = self.companies_service()
+
+        companies = self.fetch(service)
+
+        self.assertEqual({key: company.name for key, company in companies.items()},
+                         {'C1': 'Company 1', 'C2': 'Company 2'})
+        self.assertEqual(service.last_fetch.status, RAAS_FETCH_NETWORK)
+        self.assertEqual(service.last_fetch.entries, 2)
+        self.assertNotIn('If-None-Match', self.transport.headers[0])
+        self.assertEqual(self.store.get_snapshot(service._snapshot_key()).etag, ETAG)
+
+    def test_fresh_snapshot_is_served_without_request(self):
+        expected = self.fetch(self.companies_service())
+
+        service = self.companies_service()
+        companies = self.fetch(service)
+
+        self.assertEqual(companies, expected)
+        self.assertEqual(service.last_fetch.status, RAAS_FETCH_SNAPSHOT)
+        self.assertEqual(len(self.transport.payloads), 1)
+
+    def test_expired_snapshot_is_revalidated(self):
+        expected = self.fetch(self.companies_service())
+        self.store.default_ttl = 0
+
+        service = self.companies_service()
+        companies = self.fetch(service)
+
+        self.assertEqual(companies, expected)
+        self.assertEqual(service.last_fetch.status, RAAS_FETCH_NOT_MODIFIED)
+        self.assertEqual(self.transport.headers[1]['If-None-Match'], ETAG)
+        self.assertEqual(self.transport.headers[1]['If-Modified-Since'], LAST_MODIFIED)
+        # the validators of the unchanged report are kept for the next request
+        self.assertEqual(service._last_snapshot.etag, ETAG)
+
+    def test_same_body_without_validators_is_not_parsed_again(self):
+        self.report.etag = None
+        service = self.companies_service()
+        self.fetch(service)
+        self.store.default_ttl = 0
+        previous_data = service._last_snapshot.data
+
+        companies = self.fetch(service)
+
+        self.assertEqual(service.last_fetch.status, RAAS_FETCH_HASH_MATCH)
+        self.assertEqual(companies, previous_data)
+        self.assertEqual(self.transport.headers[1], self.transport.headers[0])
+
+    def test_new_validators_of_the_same_body_are_kept_for_the_next_process(self):
+        self.fetch(self.companies_service())
+        self.store.default_ttl = 0
+        self.report.etag = '"companies-v1-regenerated"'
+
+        service = self.companies_service()
+        self.fetch(service)
+        self.assertEqual(service.last_fetch.status, RAAS_FETCH_HASH_MATCH)
+        self.assertEqual(self.store.get_snapshot(service._snapshot_key()).etag, '"companies-v1-regenerated"')
+
+        # next process: a new service reads the validators from the store only
+        service = self.companies_service()
+        self.fetch(service)
+
+        self.assertEqual(self.transport.headers[2]['If-None-Match'], '"companies-v1-regenerated"')
+        self.assertEqual(service.last_fetch.status, RAAS_FETCH_NOT_MODIFIED)
+
+    def test_changed_report_is_downloaded_again(self):
+        service = self.companies_service()
+        self.fetch(service)
+        self.store.default_ttl = 0
+        self.report.body = companies_report('Company 1', 'Company 2', 'Company 3')
+        self.report.etag = '"companies-v2"'
+
+        companies = self.fetch(service)
+
+        self.assertEqual(service.last_fetch.status, RAAS_FETCH_NETWORK)
+        self.assertEqual(len(companies), 3)
+        self.assertEqual(self.store.get_snapshot(service._snapshot_key()).etag, '"companies-v2"')
+
+    def test_not_modified_without_previous_report_raises(self):
+        self.report.honour_validators = False
+        service = self.companies_service()
+
+        with self.assertRaises(ProcessException):
+            self.fetch(service)
+        self.assertIsNone(service.last_fetch)
+        self.assertIsNone(self.store.get_snapshot(service._snapshot_key()))
+
+    def test_returned_dict_does_not_change_the_snapshot(self):
+        service = self.companies_service()
+        for status in (RAAS_FETCH_NETWORK, RAAS_FETCH_SNAPSHOT, RAAS_FETCH_NOT_MODIFIED):
+            with self.subTest(status):
+                if status == RAAS_FETCH_NOT_MODIFIED:
+                    self.store.default_ttl = 0
+                companies = self.fetch(service)
+                self.assertEqual(service.last_fetch.status, status)
+
+                companies.pop('C1')
+                companies['C9'] = SubsidiaryInfo(internal_id='C9', name='Company 9')
+
+                self.assertEqual(sorted(service._last_snapshot.data), ['C1', 'C2'])
+
+    def test_async_fetch_matches_the_sync_one(self):
+        expected = self.fetch(self.companies_service())
+        self.store.default_ttl = 0
+        service = self.companies_service()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            companies = asyncio.run(AsyncWorkdayRAASService(service).get_entity_dic())
+        companies.clear()
+
+        self.assertEqual(service.last_fetch.status, RAAS_FETCH_NOT_MODIFIED)
+        self.assertEqual(service._last_snapshot.data, expected)
+
+    def test_async_not_modified_without_previous_report_raises(self):
+        self.report.honour_validators = False
+        service = AsyncWorkdayRAASService(self.companies_service())
+
+        with self.assertRaises(ProcessException):
+            asyncio.run(service.get_entity_dic())
+
+
+if __name__ == '__main__':
+    unittest.main()
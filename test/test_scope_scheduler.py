@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+
+from workday.scope_scheduler import *
+
+
+class TestScopeScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def step(self, name, result=None, delay=0.05, error=None):
+        def run(*dependencies):
+            with self.lock:
+                self.calls.append((name, dependencies))
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            try:
+                time.sleep(delay)
+                if error:
+                    raise error
+                return result if result is not None else name
+            finally:
+                with self.lock:
+                    self.running -= 1
+        return run
+
+    def test_independent_steps_run_at_the_same_time_up_to_max_workers(self):
+        scheduler = ScopeScheduler(max_workers=3)
+        for name in 'abcdef':
+            scheduler.add(name, self.step(name))
+
+        reports = scheduler.run()
+
+        self.assertEqual(self.max_running, 3)
+        self.assertEqual([report.name for report in reports], list('abcdef'))
+        self.assertTrue(all(report.status == 'done' and report.seconds >= 0.05 for report in reports))
+
+    def test_shared_step_runs_once_for_its_dependents(self):
+        scheduler = ScopeScheduler()
+        scheduler.add('ledger_accounts', self.step('ledger_accounts', result={'LA1': 'Account 1'}))
+        scheduler.add('ledger_account', self.step('ledger_account'), depends_on=['ledger_accounts'])
+        scheduler.add('hierarchy', self.step('hierarchy'), depends_on=['ledger_accounts'])
+        done = []
+
+        scheduler.run(on_done=lambda report, result: done.append(report.name))
+
+        self.assertEqual(sorted(self.calls), [
+            ('hierarchy', ({'LA1': 'Account 1'},)),
+            ('ledger_account', ({'LA1': 'Account 1'},)),
+            ('ledger_accounts', ()),
+        ])
+        self.assertEqual(done[0], 'ledger_accounts')
+
+    def test_failed_step_skips_its_dependents_only(self):
+        scheduler = ScopeScheduler()
+        scheduler.add('ledger_accounts', self.step('ledger_accounts', error=ValueError('report down')))
+        scheduler.add('hierarchy', self.step('hierarchy'), depends_on=['ledger_accounts'])
+        scheduler.add('hierarchy_csv', self.step('hierarchy_csv'), depends_on=['hierarchy'])
+        scheduler.add('currencies', self.step('currencies'))
+
+        reports = scheduler.run()
+
+        self.assertEqual(
+            [(report.name, report.status) for report in reports],
+            [('ledger_accounts', 'failed'), ('hierarchy', 'skipped'), ('hierarchy_csv', 'skipped'),
+             ('currencies', 'done')]
+        )
+        self.assertEqual(scheduler.result('currencies'), 'currencies')
+        with self.assertRaises(ValueError):
+            scheduler.result('hierarchy_csv')
+
+    def test_targets_run_with_the_steps_they_need_only(self):
+        scheduler = ScopeScheduler()
+        scheduler.add('ledger_accounts', self.step('ledger_accounts'))
+        scheduler.add('hierarchy', self.step('hierarchy'), depends_on=['ledger_accounts'])
+        scheduler.add('currencies', self.step('currencies'))
+
+        reports = scheduler.run(['hierarchy'])
+
+        self.assertEqual([report.name for report in reports], ['ledger_accounts', 'hierarchy'])
+        self.assertEqual(scheduler.result('hierarchy'), 'hierarchy')
+
+    def test_results_are_released_once_used(self):
+        scheduler = ScopeScheduler()
+        scheduler.add('ledger_accounts', self.step('ledger_accounts'))
+        scheduler.add('ledger_account', self.step('ledger_account'), depends_on=['ledger_accounts'])
+        results = {}
+
+        scheduler.run(on_done=lambda report, result: results.update({report.name: result}), keep_results=False)
+
+        self.assertEqual(results, {'ledger_accounts': 'ledger_accounts', 'ledger_account': 'ledger_account'})
+        self.assertEqual(scheduler.results, {})
+
+    def test_dependencies_are_declared_first(self):
+        scheduler = ScopeScheduler()
+        with self.assertRaises(ValueError):
+            scheduler.add('hierarchy', self.step('hierarchy'), depends_on=['ledger_accounts'])
+        scheduler.add('ledger_accounts', self.step('ledger_accounts'))
+        with self.assertRaises(ValueError):
+            scheduler.add('ledger_accounts', self.step('ledger_accounts'))
+
+
+if __name__ == '__main__':
+    unittest.main()
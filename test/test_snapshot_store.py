@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from workday.models import SubsidiaryInfo
+from workday.snapshot_store import *
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRAASSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.store = RAASSnapshotStore(
+            os.path.join(self.directory.name, 'snapshots.db'),
+            default_ttl=60,
+            ttls={'GetRAASCostCenter': 10},
+            clock=self.clock,
+        )
+        self.companies = {'C1': SubsidiaryInfo(internal_id='C1', name='Company 1')}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_snapshot_round_trip(self):
+        self.assertIsNone(self.store.load('GetRAASCompanies|url', 'GetRAASCompanies'))
+        self.store.save('GetRAASCompanies|url', 'GetRAASCompanies', self.companies)
+
+        self.assertEqual(self.store.load('GetRAASCompanies|url', 'GetRAASCompanies'), self.companies)
+
+    def test_snapshot_expires_with_its_report_ttl(self):
+        self.store.save('GetRAASCompanies|url', 'GetRAASCompanies', self.companies)
+        self.store.save('GetRAASCostCenter|url', 'GetRAASCostCenter', {})
+
+        self.clock.now += 30
+        self.assertIsNotNone(self.store.load('GetRAASCompanies|url', 'GetRAASCompanies'))
+        self.assertIsNone(self.store.load('GetRAASCostCenter|url', 'GetRAASCostCenter'))
+
+    def test_expired_snapshot_keeps_its_validators(self):
+        self.store.save(
+            'GetRAASCompanies|url', 'GetRAASCompanies', self.companies,
+            etag='"v1"', last_modified='Mon, 02 Sep 2024 10:00:00 GMT', body_hash='abc',
+        )
+
+        self.clock.now += 120
+        self.assertIsNone(self.store.load('GetRAASCompanies|url', 'GetRAASCompanies'))
+        snapshot = self.store.get_snapshot('GetRAASCompanies|url')
+        self.assertEqual((snapshot.etag, snapshot.body_hash), ('"v1"', 'abc'))
+
+        # 304 answer, the report is valid again
+        self.store.touch('GetRAASCompanies|url')
+        self.assertEqual(self.store.load('GetRAASCompanies|url', 'GetRAASCompanies'), self.companies)
+        snapshot = self.store.get_snapshot('GetRAASCompanies|url')
+        self.assertEqual((snapshot.etag, snapshot.last_modified), ('"v1"', 'Mon, 02 Sep 2024 10:00:00 GMT'))
+
+        # same body served with a new ETag, the other validators are kept
+        self.store.touch('GetRAASCompanies|url', etag='"v2"', body_hash='abc')
+        snapshot = self.store.get_snapshot('GetRAASCompanies|url')
+        self.assertEqual((snapshot.etag, snapshot.last_modified, snapshot.body_hash),
+                         ('"v2"', 'Mon, 02 Sep 2024 10:00:00 GMT', 'abc'))
+
+    def test_invalidate(self):
+        self.store.save('GetRAASCompanies|url', 'GetRAASCompanies', self.companies)
+        self.store.save('GetRAASCostCenter|url', 'GetRAASCostCenter', {})
+
+        self.store.invalidate('GetRAASCompanies')
+        self.assertIsNone(self.store.load('GetRAASCompanies|url', 'GetRAASCompanies'))
+        self.assertEqual(self.store.load('GetRAASCostCenter|url', 'GetRAASCostCenter'), {})
+
+        self.store.invalidate()
+        self.assertIsNone(self.store.load('GetRAASCostCenter|url', 'GetRAASCostCenter'))
+
+
+if __name__ == '__main__':
+    unittest.main()
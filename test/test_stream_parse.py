@@ -0,0 +1,98 @@
+import contextlib
+import io
+import unittest
+
+from fake_workday import *
+from workday.csv_helpers import CSVJournalHelper
+from workday.workday_api_generator_call import DEFAULT_STREAM_PARSE_CHUNK_SIZE
+
+DATA_PATH = './/wd:Journal_Entry_Data'
+CATEGORIES_PATH = './/wd:Resource_Category_Data'
+
+
+def big_memo_journal(number: int, memo_size: int) -> str:
+    """ Journal whose description alone is longer than `memo_size` bytes """
+    memo = ''.join(f'line {index} of the memo of journal {number}. ' for index in range(memo_size // 30 + 1))
+    return journal_data(number).replace(f'<wd:Memo>description {number}</wd:Memo>', f'<wd:Memo>{memo}</wd:Memo>')
+
+
+def categories_page(total_results: int = 4, **kwargs) -> bytes:
+    categories = ''.join(spend_category_data(f'SC{index}') for index in range(total_results))
+    return soap_answer('Get_Resource_Categories_Response', categories, total_results=total_results, **kwargs)
+
+
+class TestStreamParse(unittest.TestCase):
+
+    def run_journals(self, journals: List[str], stream_parse: bool, per_page: int = 5) -> Tuple[GetAllJournals, str]:
+        journal_service = FakeTenant(journals, per_page=per_page).journal_service(stream_parse=stream_parse)
+        with contextlib.redirect_stdout(io.StringIO()):
+            journals = journal_service.get_all_entities(DATA_PATH)
+        return journal_service, CSVJournalHelper().mapped_journals_to_csv(journals)
+
+    def assertSameRun(self, journals: List[str], **kwargs):
+        expected_service, expected_csv = self.run_journals(journals, stream_parse=False, **kwargs)
+        journal_service, csv_content = self.run_journals(journals, stream_parse=True, **kwargs)
+
+        self.assertEqual(csv_content, expected_csv)
+        self.assertEqual(len(journal_service.all_entity), len(expected_service.all_entity))
+        self.assertEqual(
+            (journal_service.total_record, journal_service.total_page, journal_service.outdated_counter),
+            (expected_service.total_record, expected_service.total_page, expected_service.outdated_counter)
+        )
+        self.assertEqual(journal_service.is_complete, expected_service.is_complete)
+        return journal_service
+
+    def test_multi_page_run_is_the_same_as_the_tree_parse(self):
+        journals = [journal_data(number) for number in range(23)]
+        journals[4] = journal_data(4, creation_date='2025-01-19T05:00:00.000-08:00')
+
+        journal_service = self.assertSameRun(journals)
+
+        self.assertEqual(journal_service.total_page, 5)
+        self.assertEqual(journal_service.outdated_counter, 1)
+
+    def test_entities_crossing_the_chunk_boundaries(self):
+        journals = [journal_data(number) for number in range(12)]
+        # one journal longer than two chunks, the pages are several chunks long
+        journals[6] = big_memo_journal(6, 2 * DEFAULT_STREAM_PARSE_CHUNK_SIZE)
+        self.assertGreater(len(journals_answer(journals, 1, 12)), 2 * DEFAULT_STREAM_PARSE_CHUNK_SIZE)
+
+        _, csv_content = self.run_journals(journals, stream_parse=True, per_page=12)
+
+        self.assertIn('line 4000 of the memo of journal 6.', csv_content)
+        self.assertSameRun(journals, per_page=12)
+
+    def test_complex_path_falls_back_on_the_tree_parse(self):
+        service = GetResourceCategories('https://x', 't', 'tok')
+        service.stream_parse = True
+        complex_path = './/wd:Resource_Category/wd:Resource_Category_Data'
+        self.assertIsNone(service._get_streaming_tag(complex_path))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            response_results, categories = service._parse_page(categories_page(page=2, total_pages=3), complex_path)
+            _, expected_categories = service._parse_page(categories_page(page=2, total_pages=3), CATEGORIES_PATH)
+
+        self.assertEqual(response_results, ResponseResults(total_results=4, total_pages=3, page_results=4, page=2))
+        self.assertEqual([category.code for category in categories], ['SC0', 'SC1', 'SC2', 'SC3'])
+        self.assertEqual(categories, expected_categories)
+
+    def test_answer_without_response_results(self):
+        answer = categories_page()
+        start = answer.index(b'<wd:Response_Results>')
+        end = answer.index(b'</wd:Response_Results>') + len(b'</wd:Response_Results>')
+        answer = answer[:start] + answer[end:]
+
+        results = {}
+        for stream_parse in (True, False):
+            service = GetResourceCategories('https://x', 't', 'tok')
+            service.stream_parse = stream_parse
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[stream_parse] = service._parse_page(answer, CATEGORIES_PATH)
+
+        self.assertEqual(results[True], results[False])
+        self.assertEqual(results[True][0], ResponseResults(total_results=0, total_pages=1, page_results=0, page=1))
+        self.assertEqual(len(results[True][1]), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
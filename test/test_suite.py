@@ -1,6 +1,28 @@
 import unittest
 
 from test_get_journals import TestXMLJournalParsing
+from test_transport import TestWorkdayTransport
+from test_async_api import TestAsyncGetAllEntities, TestAsyncRetryOn500
+from test_batch_lookups import TestBatchedLookups, TestBatchPayloads
+from test_parse_once import TestParseOnce
+from test_two_phase_journals import TestTwoPhaseJournals
+from test_concurrent_pages import TestConcurrentPages
+from test_stream_parse import TestStreamParse
+from test_journal_prescan import TestJournalPrescan, TestJournalPrescanTotals
+from test_parse_processes import TestParseProcesses
+from test_entity_cache import TestEntityCache
+from test_snapshot_store import TestRAASSnapshotStore
+from test_raas_fetch import TestRAASFetch
+from test_xml_helper import TestReferenceIds, TestFieldExtractor
+from test_prefetch import TestPrefetchPages, TestPrefetchedPagesConsumerError
+from test_csv_helpers import TestCSVChunkWriter, TestRowProjector
+from test_columnar_helpers import TestColumnarJournalHelper, TestColumnarExportHelper
+from test_merge_csv_files import TestMergeCSVFiles
+from test_journal_backfill import TestJournalBackfill, TestJournalBackfillLookupServices, TestJournalCSVFileSink
+from test_token_provider import TestTokenProvider
+from test_currency_conversion_rates import TestGetAllFXRatesToken
+from test_master_data import TestMasterDataLoader
+from test_scope_scheduler import TestScopeScheduler
 
 
 def suite():
@@ -8,6 +30,37 @@ def suite():
     # suite.addTest(unittest.makeSuite(TestAccountingDates))
     # suite.addTest(unittest.makeSuite(TestXMLParsing))
     suite.addTest(unittest.makeSuite(TestXMLJournalParsing))
+    suite.addTest(unittest.makeSuite(TestWorkdayTransport))
+    suite.addTest(unittest.makeSuite(TestAsyncGetAllEntities))
+    suite.addTest(unittest.makeSuite(TestAsyncRetryOn500))
+    suite.addTest(unittest.makeSuite(TestBatchedLookups))
+    suite.addTest(unittest.makeSuite(TestBatchPayloads))
+    suite.addTest(unittest.makeSuite(TestParseOnce))
+    suite.addTest(unittest.makeSuite(TestTwoPhaseJournals))
+    suite.addTest(unittest.makeSuite(TestConcurrentPages))
+    suite.addTest(unittest.makeSuite(TestStreamParse))
+    suite.addTest(unittest.makeSuite(TestJournalPrescan))
+    suite.addTest(unittest.makeSuite(TestJournalPrescanTotals))
+    suite.addTest(unittest.makeSuite(TestParseProcesses))
+    suite.addTest(unittest.makeSuite(TestEntityCache))
+    suite.addTest(unittest.makeSuite(TestRAASSnapshotStore))
+    suite.addTest(unittest.makeSuite(TestRAASFetch))
+    suite.addTest(unittest.makeSuite(TestReferenceIds))
+    suite.addTest(unittest.makeSuite(TestFieldExtractor))
+    suite.addTest(unittest.makeSuite(TestPrefetchPages))
+    suite.addTest(unittest.makeSuite(TestPrefetchedPagesConsumerError))
+    suite.addTest(unittest.makeSuite(TestCSVChunkWriter))
+    suite.addTest(unittest.makeSuite(TestRowProjector))
+    suite.addTest(unittest.makeSuite(TestColumnarJournalHelper))
+    suite.addTest(unittest.makeSuite(TestColumnarExportHelper))
+    suite.addTest(unittest.makeSuite(TestMergeCSVFiles))
+    suite.addTest(unittest.makeSuite(TestJournalBackfill))
+    suite.addTest(unittest.makeSuite(TestJournalBackfillLookupServices))
+    suite.addTest(unittest.makeSuite(TestJournalCSVFileSink))
+    suite.addTest(unittest.makeSuite(TestTokenProvider))
+    suite.addTest(unittest.makeSuite(TestGetAllFXRatesToken))
+    suite.addTest(unittest.makeSuite(TestMasterDataLoader))
+    suite.addTest(unittest.makeSuite(TestScopeScheduler))
     return suite
 
 
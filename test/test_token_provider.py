@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from workday.token_provider import TokenProvider
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTokenEndpoint:
+    """ Hands out token-1, token-2, ... valid for `expires_in` seconds """
+
+    def __init__(self, expires_in=3600, delay: float = 0.0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            return {'access_token': f'token-{self.calls}', 'expires_in': self.expires_in}
+
+
+class TestTokenProvider(unittest.TestCase):
+
+    def test_token_is_refreshed_shortly_before_its_expiry(self):
+        clock = FakeClock()
+        endpoint = FakeTokenEndpoint(expires_in=3600)
+        provider = TokenProvider(endpoint, refresh_margin=120, clock=clock)
+
+        self.assertEqual(provider.get_token(), 'token-1')
+        clock.now += 3400
+        self.assertEqual(provider.get_token(), 'token-1')
+        clock.now += 100
+        self.assertEqual(provider.get_token(), 'token-2')
+        self.assertEqual(endpoint.calls, 2)
+
+    def test_unknown_expiry_waits_for_a_401(self):
+        clock = FakeClock()
+        provider = TokenProvider(FakeTokenEndpoint(expires_in=None), clock=clock)
+        provider.refresh()
+
+        clock.now += 10 ** 6
+
+        self.assertEqual(provider.get_token(), 'token-1')
+
+    def test_one_refresh_for_concurrent_callers(self):
+        endpoint = FakeTokenEndpoint(delay=0.05)
+        provider = TokenProvider(endpoint)
+        tokens = []
+
+        threads = [threading.Thread(target=lambda: tokens.append(provider.get_token())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(endpoint.calls, 1)
+        self.assertEqual(tokens, ['token-1'] * 8)
+
+    def test_one_refresh_for_the_same_rejected_token(self):
+        endpoint = FakeTokenEndpoint()
+        provider = TokenProvider(endpoint)
+        rejected = provider.get_token()
+
+        self.assertTrue(provider.refresh_after_unauthorized(rejected))
+        self.assertTrue(provider.refresh_after_unauthorized(rejected))
+
+        self.assertEqual(provider.get_token(), 'token-2')
+        self.assertEqual(endpoint.calls, 2)
+
+    def test_request_is_sent_again_after_a_401(self):
+        provider = TokenProvider(FakeTokenEndpoint(), access_token='expired')
+        sent = []
+
+        def send(token):
+            sent.append(token)
+            return SimpleNamespace(status_code=401 if token == 'expired' else 200)
+
+        response = provider.call_with_token(send)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sent, ['expired', 'token-1'])
+
+    def test_fixed_token_is_never_refreshed(self):
+        provider = TokenProvider.of('fixed')
+        sent = []
+
+        def send(token):
+            sent.append(token)
+            return SimpleNamespace(status_code=401)
+
+        self.assertEqual(provider.call_with_token(send).status_code, 401)
+        self.assertEqual(sent, ['fixed'])
+        self.assertIs(TokenProvider.of(provider), provider)
+
+    def test_one_refresh_for_concurrent_coroutines(self):
+        endpoint = FakeTokenEndpoint(delay=0.05)
+        provider = TokenProvider(endpoint, access_token='expired')
+
+        async def send(token):
+            await asyncio.sleep(0)
+            return SimpleNamespace(status_code=401 if token == 'expired' else 200, token=token)
+
+        async def run():
+            return await asyncio.gather(*(provider.call_with_token_async(send) for _ in range(8)))
+
+        responses = asyncio.run(run())
+
+        self.assertEqual(endpoint.calls, 1)
+        self.assertEqual({response.token for response in responses}, {'token-1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from workday.transport import *
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestWorkdayTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+        self.transport = WorkdayTransport()
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_no_request(self):
+        self.assertEqual(self.transport.get_stats(), TransportStats())
+
+    def test_connection_is_reused(self):
+        for _ in range(3):
+            self.assertEqual(self.transport.get(self.url).text, 'ok')
+
+        stats = self.transport.get_stats()
+        self.assertEqual(
+            (stats.requests, stats.connections_opened, stats.connections_reused, stats.hosts),
+            (3, 1, 2, 1)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
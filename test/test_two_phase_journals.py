@@ -0,0 +1,103 @@
+import contextlib
+import io
+import unittest
+
+from fake_workday import *
+from workday.csv_helpers import CSVJournalHelper
+
+DATA_PATH = './/wd:Journal_Entry_Data'
+
+
+class TestTwoPhaseJournals(unittest.TestCase):
+
+    def setUp(self):
+        self.journals = [journal_data(number) for number in range(23)]
+
+    def run_journals(self, tenant: FakeTenant, **kwargs) -> Tuple[GetAllJournals, str]:
+        journal_service = tenant.journal_service(**kwargs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            journals = journal_service.get_all_entities(DATA_PATH)
+        return journal_service, CSVJournalHelper().mapped_journals_to_csv(journals)
+
+    def test_csv_is_the_same_as_the_single_phase_path(self):
+        single_phase_tenant = FakeTenant(self.journals)
+        single_phase, expected_csv = self.run_journals(single_phase_tenant)
+        # the journals with a line referencing a missing supplier or contract are dropped by the mapping
+        self.assertEqual(len(single_phase.all_entity), 19)
+        self.assertIn('Supplier SUP-1', expected_csv)
+
+        for options in (
+                dict(two_phase=True),
+                dict(two_phase=True, two_phase_scope=TWO_PHASE_SCOPE_PAGE),
+                dict(two_phase=True,
+                     reference_full_download_pages={name: 0 for name in DEFAULT_REFERENCE_FULL_DOWNLOAD_PAGES}),
+        ):
+            with self.subTest(**options):
+                tenant = FakeTenant(self.journals)
+                two_phase, csv_content = self.run_journals(tenant, **options)
+
+                self.assertEqual(csv_content, expected_csv)
+                self.assertEqual(len(two_phase.all_entity), len(single_phase.all_entity))
+                self.assertEqual(two_phase.is_complete, single_phase.is_complete)
+                # the point lookups are only used for the IDs not found
+                self.assertLess(len(tenant.requests), len(single_phase_tenant.requests))
+
+    def test_batched_lookups_below_the_full_download_threshold(self):
+        tenant = FakeTenant(self.journals)
+
+        journal_service, _ = self.run_journals(tenant, two_phase=True, reference_batch_size=10)
+
+        # 40 suppliers in 4 calls, 7 spend categories in 1 call, 11 contracts in 2 calls
+        self.assertEqual(tenant.requests_of('Get_Suppliers_Request'), [10, 10, 10, 10])
+        self.assertEqual(tenant.requests_of('Get_Resource_Categories_Request'), [7])
+        self.assertEqual(tenant.requests_of('Get_Customer_Contracts_Request'), [10, 1])
+        self.assertEqual(len(journal_service.resolved_references['suppliers']), 40)
+
+    def test_full_download_above_the_threshold(self):
+        tenant = FakeTenant(self.journals, lookup_per_page=4)
+
+        self.run_journals(tenant, two_phase=True, reference_batch_size=10,
+                          reference_full_download_pages={'suppliers': 3, 'spend_categories': None,
+                                                         'customer_contracts': None})
+
+        # 4 batched calls needed, more than the 3 pages allowed: the 10 pages of suppliers are downloaded
+        self.assertEqual(tenant.requests_of('Get_Suppliers_Request'), [0] * 10)
+        self.assertEqual(tenant.requests_of('Get_Resource_Categories_Request'), [7])
+
+    def test_unresolved_id_raises_like_get_entity(self):
+        tenant = FakeTenant(self.journals)
+        journal_service = tenant.journal_service(two_phase=True)
+        journal_service.resolved_references = {'suppliers': {'SUP-1': 'supplier 1', 'SUP-13': None}}
+        suppliers = journal_service.raas_suppliers
+
+        self.assertEqual(
+            journal_service._lookup_reference('suppliers', suppliers, 'SUP-1', './/wd:Supplier_Data'), 'supplier 1'
+        )
+        with self.assertRaises(AssertionError):
+            journal_service._lookup_reference('suppliers', suppliers, 'SUP-13', './/wd:Supplier_Data')
+        with self.assertRaises(AssertionError):
+            suppliers.get_entity('SUP-13', './/wd:Supplier_Data')
+        self.assertEqual(tenant.requests_of('Get_Suppliers_Request'), [1])
+
+        # an ID not collected is looked up by the service
+        self.assertEqual(
+            journal_service._lookup_reference('suppliers', suppliers, 'SUP-2', './/wd:Supplier_Data').vendor_code,
+            'SUP-2'
+        )
+        self.assertEqual(tenant.requests_of('Get_Suppliers_Request'), [1, 1])
+
+    def test_bulk_failure_falls_back_on_the_point_lookups(self):
+        _, expected_csv = self.run_journals(FakeTenant(self.journals))
+        tenant = FakeTenant(self.journals, failed_bulk_requests=['Get_Suppliers_Request'])
+
+        journal_service, csv_content = self.run_journals(tenant, two_phase=True)
+
+        self.assertEqual(csv_content, expected_csv)
+        self.assertEqual([failure.reason for failure in journal_service.failed_journals],
+                         ['Could not resolve the suppliers in bulk in `resolve_references`'])
+        self.assertNotIn('suppliers', journal_service._fully_downloaded_references)
+        self.assertEqual(set(tenant.requests_of('Get_Suppliers_Request')[1:]), {1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import xml.etree.ElementTree as ET
+
+from workday.xml_helper import *
+
+SUPPLIER_DATA = (
+    '<wd:Supplier_Data xmlns:wd="urn:com.workday/bsvc">'
+    '<wd:Supplier_ID>SUP-1</wd:Supplier_ID>'
+    '<wd:Supplier_ID>SUP-2</wd:Supplier_ID>'
+    '<wd:Worktag_Only>1</wd:Worktag_Only>'
+    '<wd:Submit>x</wd:Submit>'
+    '<wd:ASN_Due_In_Days>12</wd:ASN_Due_In_Days>'
+    '<wd:Supplier_Category_Reference>'
+    '<wd:ID wd:type="WID">0af</wd:ID><wd:ID wd:type="Supplier_Category_ID">SC-1</wd:ID>'
+    '</wd:Supplier_Category_Reference>'
+    '<wd:Address_Data><wd:Country>FR</wd:Country></wd:Address_Data>'
+    '</wd:Supplier_Data>'
+)
+
+WORKTAGS_REFERENCE = (
+    '<wd:Worktags_Reference xmlns:wd="urn:com.workday/bsvc">'
+    '<wd:ID wd:type="WID">2d1</wd:ID>'
+    '<wd:ID wd:type="Cost_Center_Reference_ID">CC-1</wd:ID>'
+    '<wd:ID wd:type="Cost_Center_Reference_ID">CC-2</wd:ID>'
+    '<wd:ID wd:type="Supplier_ID">\nSUP-\n1\n</wd:ID>'
+    '<wd:ID wd:type="Project_ID">\n</wd:ID>'
+    '<wd:ID wd:type="Project_ID">PRJ-2</wd:ID>'
+    '<wd:Parent_Reference>'
+    '<wd:ID wd:type="Spend_Category_ID">SC-NESTED</wd:ID>'
+    '<wd:ID wd:type="Custom_Worktag_3_ID">CF-NESTED</wd:ID>'
+    '</wd:Parent_Reference>'
+    '<wd:ID wd:type="Custom_Worktag_3_ID">CF-1</wd:ID>'
+    '</wd:Worktags_Reference>'
+)
+ID_TYPES = ['WID', 'Cost_Center_Reference_ID', 'Supplier_ID', 'Project_ID', 'Spend_Category_ID',
+            'Custom_Worktag_3_ID', 'Customer_ID']
+
+
+class TestReferenceIds(unittest.TestCase):
+    """ `get_id_map` and `create_worktags_object` against the `wd:ID[@wd:type="..."]` lookups they replace """
+
+    def setUp(self):
+        self.xml_helper = XMLHelper()
+        self.reference = ET.fromstring(WORKTAGS_REFERENCE)
+
+    def predicate_lookup(self, id_type: str) -> Optional[str]:
+        return self.xml_helper.safe_get_text(self.reference, f'wd:ID[@wd:type="{id_type}"]')
+
+    def test_same_ids_as_the_predicate_lookups(self):
+        ids = self.xml_helper.get_id_map(self.reference)
+
+        for id_type in ID_TYPES:
+            with self.subTest(id_type):
+                self.assertEqual(ids.get(id_type), self.predicate_lookup(id_type))
+        self.assertEqual(ids, {
+            'WID': '2d1', 'Cost_Center_Reference_ID': 'CC-1', 'Supplier_ID': 'SUP-1', 'Project_ID': '',
+            'Custom_Worktag_3_ID': 'CF-1',
+        })  # the first ID of a type is kept, even the blank `Project_ID`
+
+    def test_nested_ids_are_not_read(self):
+        ids = self.xml_helper.get_id_map(self.reference)
+
+        self.assertNotIn('Spend_Category_ID', ids)
+        self.assertNotEqual(ids['Custom_Worktag_3_ID'], 'CF-NESTED')
+
+    def test_missing_reference(self):
+        self.assertEqual(self.xml_helper.get_id_map(None), {})
+        self.assertEqual(self.xml_helper.create_worktags_object(None, WorktagsReference()), WorktagsReference())
+
+    def test_same_worktags_as_the_predicate_lookups(self):
+        expected = WorktagsReference()
+        for id_type, field_name in WORKTAG_ID_FIELDS:
+            value = self.predicate_lookup(id_type)
+            if value:
+                setattr(expected, field_name, value)
+
+        worktags = self.xml_helper.create_worktags_object(self.reference, WorktagsReference())
+
+        self.assertEqual(worktags, expected)
+        self.assertEqual(
+            (worktags.Cost_Center_Reference_ID, worktags.Supplier_ID, worktags.cash_flow_code),
+            ('CC-1', 'SUP-1', 'CF-1')
+        )
+        self.assertIsNone(worktags.Project_ID)
+        self.assertIsNone(worktags.Spend_Category_ID)
+
+
+class TestFieldExtractor(unittest.TestCase):
+
+    def setUp(self):
+        self.xml_helper = XMLHelper()
+        self.entry = ET.fromstring(SUPPLIER_DATA)
+
+    def extract(self, *specs: FieldSpec):
+        return FieldExtractor(specs, self.xml_helper).extract(self.entry)
+
+    def test_same_values_as_the_per_field_lookups(self):
+        fields = self.extract(
+            FieldSpec('vendor_code', 'wd:Supplier_ID'),
+            FieldSpec('worktag_only', 'wd:Worktag_Only', converter=int_flag, default=False),
+            FieldSpec('asn_due_in_days', 'wd:ASN_Due_In_Days', converter=int),
+            FieldSpec('supplier_category', 'wd:Supplier_Category_Reference', id_type='Supplier_Category_ID'),
+        )
+
+        self.assertEqual(fields, {
+            'vendor_code': self.xml_helper.get_single_tag_line_value(self.entry, 'wd:Supplier_ID', str),
+            'worktag_only': True,
+            'asn_due_in_days': 12,
+            'supplier_category': self.xml_helper.get_reference_id(
+                self.entry, 'wd:Supplier_Category_Reference', 'Supplier_Category_ID'
+            ),
+        })
+        self.assertEqual(fields['vendor_code'], 'SUP-1')
+
+    def test_missing_or_invalid_values_give_the_default(self):
+        fields = self.extract(
+            FieldSpec('submit', 'wd:Submit', converter=int_flag, default=False),
+            FieldSpec('fatca', 'wd:FATCA', converter=int_flag, default=False),
+            FieldSpec('supplier_group_category', 'wd:Supplier_Group_Reference', id_type='Supplier_Group_ID'),
+            FieldSpec('payment_type', 'wd:Supplier_Category_Reference', id_type='Payment_Type_ID'),
+        )
+
+        self.assertEqual(fields, {
+            'submit': False, 'fatca': False, 'supplier_group_category': None, 'payment_type': None
+        })
+
+    def test_nested_path(self):
+        fields = self.extract(FieldSpec('country', 'wd:Address_Data/wd:Country'))
+
+        self.assertEqual(fields, {'country': 'FR'})
+
+
+if __name__ == '__main__':
+    unittest.main()
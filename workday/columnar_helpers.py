@@ -0,0 +1,107 @@
+from typing import List, Iterable, Iterator, Optional, Sequence, Any
+
+from csv_helpers import CSVJournalHelper, compile_row_projector
+
+# Journal columns written as float64
+JOURNAL_FLOAT_COLUMNS = (
+    'entry_line_debit', 'entry_line_credit', 'entry_line_ledger_debit', 'entry_line_ledger_credit',
+    'entry_line_amount_net_usd',
+)
+# Journal columns with few distinct values, dictionary encoded (pandas `category`)
+JOURNAL_CATEGORY_COLUMNS = (
+    'status', 'accounting_period_name', 'book_code_id', 'book_code_name', 'ledger_code', 'journal_source',
+    'ledger_currency', 'entry_line_ledger_account_code', 'entry_line_ledger_account_name',
+    'entry_line_ledger_account_type', 'entry_line_subsidiary_internal_id', 'entry_line_subsidiary_name',
+    'entry_line_vendor_code', 'entry_line_vendor_company_name', 'entry_line_vendor_approval_status',
+    'entry_line_currency_symbol', 'entry_line_cost_center_code', 'entry_line_cost_center_name',
+    'entry_line_revenue_category', 'entry_line_acquisition_channel_dim_id', 'entry_line_acquisition_channel_name',
+    'entry_line_acquisition_channel_dim_name', 'entry_line_deal_code', 'entry_line_deal_company_name',
+    'entry_line_deal_contract_type', 'entry_line_expense_type_code', 'entry_line_expense_type_name',
+    'entry_line_destination',
+)
+
+
+def _import_pandas():
+    # optional dependency, only needed by the columnar exports
+    try:
+        import pandas as pd
+    except ImportError as error:
+        raise ImportError('The columnar export needs pandas: `pip install pandas`') from error
+    return pd
+
+
+class ColumnarExportHelper:
+    """
+        Export Generic Object as typed columns: pandas DataFrame, Parquet or Feather file.
+        The columns come from the same field definitions as `CSVExportHelper`
+    """
+
+    def __init__(self, fields, float_columns: Sequence[str] = (), category_columns: Sequence[str] = ()):
+        """
+        :param fields: List of (header, attribute path or callable[, transform]), see `compile_row_projector`
+        :param float_columns: Headers of the columns written as float64 e.g: amounts
+        :param category_columns: Headers of the columns dictionary encoded e.g: IDs repeated on many rows
+        """
+        self.fields = fields
+        self.header: List[str] = [field_[0] for field_ in fields]
+        self.float_columns = set(float_columns)
+        self.category_columns = set(category_columns)
+        self._projector = compile_row_projector(fields) if fields else None
+
+    def _rows(self, data_list: Iterable[Any]) -> Iterator[List[Any]]:
+        for data in data_list:
+            yield self._projector(data)
+
+    def to_dataframe(self, data_list: Iterable[Any]):
+        """
+        :param data_list: Objects to export, one row by object
+        :return: pandas DataFrame with one typed column by field
+        """
+        pd = _import_pandas()
+        columns = list(zip(*self._rows(data_list))) or [()] * len(self.header)
+
+        series = {}
+        for name, values in zip(self.header, columns):
+            if name in self.float_columns:
+                series[name] = pd.Series(values, dtype='float64')
+            elif name in self.category_columns:
+                series[name] = pd.Series(values, dtype='category')
+            else:
+                series[name] = pd.Series(values)
+        return pd.DataFrame(series, columns=self.header)
+
+    def export_to_parquet(self, data_list: Iterable[Any], path: str, compression: Optional[str] = 'snappy'):
+        """ Write the columns into a Parquet file, needs `pyarrow` """
+        data_frame = self.to_dataframe(data_list)
+        try:
+            data_frame.to_parquet(path, index=False, compression=compression)
+        except ImportError as error:
+            raise ImportError('The Parquet export needs pyarrow: `pip install pyarrow`') from error
+
+    def export_to_feather(self, data_list: Iterable[Any], path: str):
+        """ Write the columns into a Feather (Arrow IPC) file, needs `pyarrow` """
+        data_frame = self.to_dataframe(data_list)
+        try:
+            data_frame.to_feather(path)
+        except ImportError as error:
+            raise ImportError('The Feather export needs pyarrow: `pip install pyarrow`') from error
+
+
+class ColumnarJournalHelper(ColumnarExportHelper):
+    """ Columnar counterpart of `CSVJournalHelper`: one row by journal entry line, with the same columns """
+
+    def __init__(
+            self,
+            csv_helper: Optional[CSVJournalHelper] = None,
+            float_columns: Sequence[str] = JOURNAL_FLOAT_COLUMNS,
+            category_columns: Sequence[str] = JOURNAL_CATEGORY_COLUMNS,
+    ):
+        """
+        :param csv_helper: Journal CSV helper giving the field definitions, a default one when not provided
+        """
+        super().__init__([], float_columns=float_columns, category_columns=category_columns)
+        self.csv_helper = csv_helper if csv_helper is not None else CSVJournalHelper()
+        self.header = self.csv_helper.get_header()
+
+    def _rows(self, data_list: Iterable[Any]) -> Iterator[List[Any]]:
+        return self.csv_helper.mapped_journals_to_rows(data_list)
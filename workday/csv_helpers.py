@@ -1,9 +1,157 @@
 import csv
 import io
-from typing import List
+from typing import List, Iterable, Iterator, Optional, Tuple, Callable, Sequence
 
 from workday.models import T, Any
-from workday.models import MappedJournal, MappedEntryJournal
+from workday.models import MappedJournal, MappedEntryJournal, CSVChunkStats
+
+
+def single_line(text: str) -> str:
+    """ Field transform replacing the line breaks of a free text e.g: a memo """
+    return text.replace('\n', ' ')
+
+
+def compile_row_projector(fields: Sequence[tuple]) -> Callable[[Any], List[Any]]:
+    """
+    Compile CSV field definitions into one generated function building the whole row of an object.
+    A field is `(header, getter)` or `(header, getter, transform)`:
+        - getter: attribute path e.g: 'revenue_info.deal.customer_contract_id', each parent object shared by several
+        fields is read once by row, and a missing (falsy) parent gives None, like `o.x.y if o.x else None`,
+        or any callable taking the object
+        - transform: optional, applied to a truthy path value, a falsy value gives None e.g: `single_line`
+
+    :param fields: Field definitions, in the column order
+    :return: Function object -> list of the column values
+    """
+    namespace = {}
+    body = []
+    columns = []
+    # attribute path -> local variable holding it, '' is the object itself
+    variables = {'': 'o'}
+
+    def resolve(path: str) -> str:
+        if path not in variables:
+            parent_path, _, attribute = path.rpartition('.')
+            parent = resolve(parent_path)
+            variables[path] = f'p{len(variables)}'
+            body.append(f'    {variables[path]} = {parent}.{attribute} if {parent} else None')
+        return variables[path]
+
+    for index, field_ in enumerate(fields):
+        getter = field_[1]
+        transform = field_[2] if len(field_) > 2 else None
+        if callable(getter):
+            namespace[f'f{index}'] = getter
+            columns.append(f'f{index}(o)')
+            continue
+
+        if not all(attribute.isidentifier() for attribute in getter.split('.')):
+            raise ValueError(f'Invalid attribute path {getter!r} for the field {field_[0]!r}')
+        value = resolve(getter)
+        if transform is not None:
+            namespace[f't{index}'] = transform
+            value = f't{index}({value}) if {value} else None'
+        columns.append(value)
+
+    source = 'def project(o):\n' + '\n'.join(body + [f'    return [{", ".join(columns)}]']) + '\n'
+    exec(compile(source, '<csv row projector>', 'exec'), namespace)
+    return namespace['project']
+
+
+class CSVChunkWriter:
+    """
+    Write CSV rows straight into chunks, each chunk starting with the header.
+    A chunk is closed at a row boundary once it holds `num_row_limit` rows or the next row would make it larger
+    than `max_chunk_bytes` (UTF-8). The rows are counted as CSV records, so a quoted value holding a line break
+    never splits a row.
+    """
+
+    def __init__(self, header: List[str], num_row_limit: Optional[int] = None, max_chunk_bytes: Optional[int] = None):
+        """
+        :param header: Header row written at the top of each chunk
+        :param num_row_limit: Maximum number of rows by chunk, header excluded (None: no limit)
+        :param max_chunk_bytes: Maximum size of a chunk in bytes, header included (None: no limit).
+            A single row larger than that still gets its own chunk.
+        """
+        self.header = header
+        self.num_row_limit = num_row_limit
+        self.max_chunk_bytes = max_chunk_bytes
+        self.chunks: List[str] = []
+        self.chunk_stats: List[CSVChunkStats] = []
+
+        # each row is rendered alone first, to know its size before choosing its chunk
+        self._row_buffer = io.StringIO()
+        self._row_writer = csv.writer(self._row_buffer)
+        self._header_text = self._render(header)
+        self._header_bytes = self._size(self._header_text)
+
+        self._buffer: Optional[io.StringIO] = None
+        self._chunk_rows = 0
+        self._chunk_bytes = 0
+
+    @classmethod
+    def split(cls, csv_content: str, num_row_limit: Optional[int] = None, max_chunk_bytes: Optional[int] = None):
+        """
+        Split up an already generated CSV content, its first row is the header
+        :return: The closed writer, holding `chunks` and `chunk_stats`
+        """
+        rows = csv.reader(io.StringIO(csv_content))
+        chunk_writer = cls(next(rows, []), num_row_limit, max_chunk_bytes)
+        chunk_writer.writerows(rows)
+        chunk_writer.close()
+        return chunk_writer
+
+    def _render(self, row: List[Any]) -> str:
+        self._row_buffer.seek(0)
+        self._row_buffer.truncate()
+        self._row_writer.writerow(row)
+        return self._row_buffer.getvalue()
+
+    @staticmethod
+    def _size(text: str) -> int:
+        return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+    def _is_full(self, row_bytes: int) -> bool:
+        if self.num_row_limit is not None and self._chunk_rows >= self.num_row_limit:
+            return True
+        return (
+            self.max_chunk_bytes is not None and self._chunk_rows > 0
+            and self._chunk_bytes + row_bytes > self.max_chunk_bytes
+        )
+
+    def _open_chunk(self):
+        self._buffer = io.StringIO()
+        self._buffer.write(self._header_text)
+        self._chunk_rows = 0
+        self._chunk_bytes = self._header_bytes
+
+    def _close_chunk(self):
+        if self._buffer is not None:
+            self.chunks.append(self._buffer.getvalue())
+            self.chunk_stats.append(CSVChunkStats(rows=self._chunk_rows, bytes=self._chunk_bytes))
+            self._buffer.close()
+            self._buffer = None
+
+    def writerow(self, row: List[Any]):
+        row_text = self._render(row)
+        row_bytes = self._size(row_text)
+        if self._buffer is None or self._is_full(row_bytes):
+            self._close_chunk()
+            self._open_chunk()
+        self._buffer.write(row_text)
+        self._chunk_rows += 1
+        self._chunk_bytes += row_bytes
+
+    def writerows(self, rows: Iterable[List[Any]]):
+        for row in rows:
+            self.writerow(row)
+
+    def close(self) -> List[str]:
+        """
+        :return: List of CSV chunks, empty when no row has been written
+        """
+        self._close_chunk()
+        return self.chunks
 
 
 class CSVJournalHelper:
@@ -12,75 +160,76 @@ class CSVJournalHelper:
     def __init__(self):
         # you can reorganize header by switching index here
         self.fields = [
-            ("journal_workday_id", lambda j: j.journal_workday_id if j else None),
-            ("journal_id", lambda j: j.journal_id if j else None),
-            ("document_number", lambda j: j.document_info.document_number if j and j.document_info else None),
-
-            ("status", lambda j: j.journal_status if j.journal_status else None),
-            ("accounting_period_name", lambda j: j.accounting_period_name if j else None),
-            ("creation_date", lambda j: j.creation_Date if j else None),
-            ("document_description", lambda j: j.document_info.description.replace('\n', ' ') if j and j.document_info and j.document_info.description else None),
-            ("book_code_id", lambda j: j.book_code_info.book_code_id if j and j.book_code_info else None),
-            ("book_code_name", lambda j: j.book_code_info.name if j and j.book_code_info else None),
-            ("ledger_code", lambda j: j.account_info.code if j and j.account_info else None),
-            ("pl_info_destination", lambda j: j.pl_info_destination if j else None),
-            ("journal_source", lambda j: j.journal_source if j else None),
-            ("external", lambda j: j.external_ref_id if j else None),
-            ("ledger_currency", lambda j: j.ledger_currency if j else None),
+            ("journal_workday_id", "journal_workday_id"),
+            ("journal_id", "journal_id"),
+            ("document_number", "document_info.document_number"),
+
+            ("status", "journal_status"),
+            ("accounting_period_name", "accounting_period_name"),
+            ("creation_date", "creation_Date"),
+            ("document_description", "document_info.description", single_line),
+            ("book_code_id", "book_code_info.book_code_id"),
+            ("book_code_name", "book_code_info.name"),
+            ("ledger_code", "account_info.code"),
+            ("pl_info_destination", "pl_info_destination"),
+            ("journal_source", "journal_source"),
+            ("external", "external_ref_id"),
+            ("ledger_currency", "ledger_currency"),
         ]
 
         self.entry_line_fields = [
             ("number", lambda j: j),
 
-            ("cash_flow_code", lambda j: j.cash_flow_code),
+            ("cash_flow_code", "cash_flow_code"),
 
-            ("customer_id", lambda j: j.customer_id),
+            ("customer_id", "customer_id"),
 
-            ("ledger_account_code", lambda j: j.ledger_account.Ledger_Account_ID if j.ledger_account else None),
-            ("ledger_account_name", lambda j: j.ledger_account.Ledger_Account_Name if j.ledger_account else None),
-            ("ledger_account_type", lambda j: j.ledger_account.Types if j.ledger_account else None),
+            ("ledger_account_code", "ledger_account.Ledger_Account_ID"),
+            ("ledger_account_name", "ledger_account.Ledger_Account_Name"),
+            ("ledger_account_type", "ledger_account.Types"),
 
-            ("subsidiary_internal_id", lambda j: j.subsidiary_info.internal_id if j.subsidiary_info else None),
-            ("subsidiary_name", lambda j: j.subsidiary_info.name if j.subsidiary_info else None),
+            ("subsidiary_internal_id", "subsidiary_info.internal_id"),
+            ("subsidiary_name", "subsidiary_info.name"),
 
-            ("vendor_code", lambda j: j.vendor_info.vendor_code if j.vendor_info else None),
-            ("vendor_company_name", lambda j: j.vendor_info.company_name if j.vendor_info else None),
-            ("vendor_approval_status", lambda j: j.vendor_info.approval_status if j.vendor_info else None),
+            ("vendor_code", "vendor_info.vendor_code"),
+            ("vendor_company_name", "vendor_info.company_name"),
+            ("vendor_approval_status", "vendor_info.approval_status"),
 
-            ("debit", lambda j: j.amount_info.debit if j.amount_info else None),
-            ("credit", lambda j: j.amount_info.credit if j.amount_info else None),
-            ("ledger_debit", lambda j: j.amount_info.ledger_debit if j.amount_info else None),
-            ("ledger_credit", lambda j: j.amount_info.ledger_credit if j.amount_info else None),
-            ("currency_symbol", lambda j: j.amount_info.currency_symbol if j.amount_info else None),
-            ("amount_net_usd", lambda j: j.amount_info.amount_net_usd if j.amount_info else None),
+            ("debit", "amount_info.debit"),
+            ("credit", "amount_info.credit"),
+            ("ledger_debit", "amount_info.ledger_debit"),
+            ("ledger_credit", "amount_info.ledger_credit"),
+            ("currency_symbol", "amount_info.currency_symbol"),
+            ("amount_net_usd", "amount_info.amount_net_usd"),
 
-            ("cost_center_code", lambda j: j.cost_center_info.code if j.cost_center_info else None),
-            ("cost_center_name", lambda j: j.cost_center_info.name if j.cost_center_info else None),
+            ("cost_center_code", "cost_center_info.code"),
+            ("cost_center_name", "cost_center_info.name"),
 
-            ("revenue_category", lambda j: j.revenue_info.revenue_name if j.revenue_info else None),
+            ("revenue_category", "revenue_info.revenue_name"),
 
-            ("acquisition_channel_dim_id",
-             lambda j: j.revenue_info.gtm_org.dimension_id if j.revenue_info.gtm_org else None),
-            ("acquisition_channel_name", lambda j: j.revenue_info.gtm_org.name if j.revenue_info.gtm_org else None),
-            ("acquisition_channel_dim_name",
-             lambda j: j.revenue_info.gtm_org.dimension_name if j.revenue_info.gtm_org else None),
+            ("acquisition_channel_dim_id", "revenue_info.gtm_org.dimension_id"),
+            ("acquisition_channel_name", "revenue_info.gtm_org.name"),
+            ("acquisition_channel_dim_name", "revenue_info.gtm_org.dimension_name"),
 
-            ("deal_code", lambda j: j.revenue_info.deal.customer_contract_id if j.revenue_info.deal else None),
-            ("deal_company_name", lambda j: j.revenue_info.deal.contract_name if j.revenue_info.deal else None),
-            ("deal_po", lambda j: j.revenue_info.deal.po_number if j.revenue_info.deal else None),
-            ("deal_on_hold", lambda j: j.revenue_info.deal.on_hold if j.revenue_info.deal else None),
-            ("deal_contract_type", lambda j: j.revenue_info.deal.contract_type if j.revenue_info.deal else None),
+            ("deal_code", "revenue_info.deal.customer_contract_id"),
+            ("deal_company_name", "revenue_info.deal.contract_name"),
+            ("deal_po", "revenue_info.deal.po_number"),
+            ("deal_on_hold", "revenue_info.deal.on_hold"),
+            ("deal_contract_type", "revenue_info.deal.contract_type"),
 
-            ("project_code", lambda j: j.project_code),
+            ("project_code", "project_code"),
 
-            ("expense_type_code", lambda j: j.expense_type.code if j.expense_type else None),
-            ("expense_type_name", lambda j: j.expense_type.name if j.expense_type else None),
+            ("expense_type_code", "expense_type.code"),
+            ("expense_type_name", "expense_type.name"),
 
-            ("memo", lambda j: j.memo.replace('\n', ' ') if j.memo else None),
-            ("destination", lambda j: j.destination),
+            ("memo", "memo", single_line),
+            ("destination", "destination"),
         ]
 
         self.entries_prefix = "entry_line"
+        # one generated function by row type, see `compile_row_projector` (the entry line number is the index)
+        self._journal_projector = compile_row_projector(self.fields)
+        self._entry_line_projector = compile_row_projector(self.entry_line_fields[1:])
 
     @staticmethod
     def export_to_csv(csv_content: str, base_filename: str):
@@ -91,28 +240,38 @@ class CSVJournalHelper:
         # Write each MappedEntryJournal object to the CSV row format
         row = []
         for index, entry in enumerate(mapped_entries):
-            data = [(index + 1)] + [_field[1](entry) for _field in self.entry_line_fields[1:]]
+            data = [(index + 1)] + self._entry_line_projector(entry)
             row.append(data)
         return row
 
-    def mapped_journals_to_csv(self, mapped_journals: List[MappedJournal]) -> str:
-        # Define the output buffer for the CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-        # Extract headers
+    def get_header(self) -> List[str]:
         headers = [field[0] for field in self.fields]
-        # Write the header to the CS
         entries_header = [f'{self.entries_prefix}_{field_[0]}' for field_ in self.entry_line_fields]
-        writer.writerow(headers + entries_header)
-
-        # Write each MappedJournal object to the CSV
+        return headers + entries_header
+
+    def mapped_journals_to_rows(self, mapped_journals: Iterable[MappedJournal]) -> Iterator[List[Any]]:
+        """
+        CSV rows of the journals, without the header (see `get_header`), for the writers streaming them
+        :param mapped_journals: Journals to export, a generator is consumed once
+        :return: Iterator of rows, one by entry line, the journal columns are repeated on each of them
+        """
         for journal in mapped_journals:
             if journal:
-                journal_row = [_field[1](journal) for _field in self.fields]
+                journal_row = self._journal_projector(journal)
                 entity_line_rows = self._mapped_entry_journals_to_csv(journal.mapped_entries)
 
                 for entry_line_row in entity_line_rows:
-                    writer.writerow(journal_row + entry_line_row)
+                    yield journal_row + entry_line_row
+
+    def mapped_journals_to_csv(self, mapped_journals: List[MappedJournal]) -> str:
+        # Define the output buffer for the CSV
+        output = io.StringIO()
+        writer = csv.writer(output)
+        # Write the header to the CS
+        writer.writerow(self.get_header())
+
+        # Write each MappedJournal object to the CSV
+        writer.writerows(self.mapped_journals_to_rows(mapped_journals))
 
         # Get the CSV string from the output buffer
         csv_text = output.getvalue()
@@ -120,6 +279,30 @@ class CSVJournalHelper:
 
         return csv_text
 
+    def mapped_journals_to_csv_chunks(
+            self,
+            mapped_journals: Iterable[MappedJournal],
+            num_row_limit: int,
+            max_chunk_bytes: Optional[int] = None
+    ) -> Tuple[List[str], List[CSVChunkStats]]:
+        """
+        Write the journals straight into CSV chunks, without building the whole CSV first
+        :param mapped_journals: Journals to export, a generator is consumed once
+        :param num_row_limit: Maximum number of rows by chunk, each chunk starts with the header
+        :param max_chunk_bytes: Maximum size of a chunk in bytes, header included (None: no limit)
+        :return: List of CSV chunks, and the rows and bytes of each of them
+        """
+        chunk_writer = CSVChunkWriter(self.get_header(), num_row_limit, max_chunk_bytes)
+        chunk_writer.writerows(self.mapped_journals_to_rows(mapped_journals))
+        return chunk_writer.close(), chunk_writer.chunk_stats
+
+    @staticmethod
+    def export_chunks_to_csv(csv_chunks: List[str], base_filename: str):
+        """ Write the chunks into one CSV file, keeping only the header of the first chunk """
+        with open(f'{base_filename}_journal_entries.csv', 'w', newline='') as file:
+            for index, csv_chunk in enumerate(csv_chunks):
+                file.write(csv_chunk if index == 0 else csv_chunk.split('\r\n', 1)[1])
+
 
 class CSVExportHelper:
     """
@@ -127,8 +310,12 @@ class CSVExportHelper:
     """
 
     def __init__(self, fields):
+        """
+        :param fields: List of (header, attribute path or callable[, transform]), see `compile_row_projector`
+        """
         # you can reorganize header by switching index here
         self.fields = fields
+        self._projector = compile_row_projector(fields)
 
     @staticmethod
     def export_to_csv(csv_content: str, filename: str):
@@ -145,7 +332,7 @@ class CSVExportHelper:
 
         # Write each MappedJournal object to the CSV
         for data in data_list:
-            data_row = [_field[1](data) for _field in self.fields]
+            data_row = self._projector(data)
             writer.writerow(data_row)
 
         # Get the CSV string from the output buffer
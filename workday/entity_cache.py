@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple, Any
+
+from models import CacheStats, NotFoundEntity
+
+
+DEFAULT_CACHE_MAX_SIZE = 10000  # number of entities kept by service
+DEFAULT_NEGATIVE_CACHE_TTL = 600  # number of seconds a "not found" lookup is remembered
+
+
+class EntityCache:
+    """
+    Bounded LRU cache of the entities fetched by a `WorkdayService`.
+    It also remembers, for a limited time, the IDs which did not resolve, so they are not requested again on every line.
+    It keeps the `dict` methods used by the services (`get`, `update`, `keys`, `in`, ...)
+    """
+
+    def __init__(
+            self,
+            max_size: Optional[int] = DEFAULT_CACHE_MAX_SIZE,
+            negative_ttl: float = DEFAULT_NEGATIVE_CACHE_TTL,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param max_size: Maximum number of entries, the least recently used one is evicted first.
+            None for an unbounded cache, 0 to disable the cache
+        :param negative_ttl: Number of seconds a "not found" result is kept, 0 to never store them
+        :param clock: Time source, in seconds
+        """
+        self.max_size = max_size
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look for the key and count the hit or the miss
+        :param key: Entity ID
+        :return: (True, entity or NotFoundEntity) on hit, (False, None) on miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._stats.misses += 1
+                return False, None
+
+            if isinstance(value, NotFoundEntity):
+                if value.expires_at <= self._clock():
+                    # expired, try again
+                    del self._entries[key]
+                    self._stats.misses += 1
+                    return False, None
+                self._stats.negative_hits += 1
+            else:
+                self._stats.hits += 1
+
+            self._entries.move_to_end(key)
+            return True, value
+
+    @staticmethod
+    def is_not_found(value: Any) -> bool:
+        """
+        Whether the value returned by `lookup` is a remembered "not found" result
+        :param value: value returned by `lookup`
+        :return: bool
+        """
+        return isinstance(value, NotFoundEntity)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, value = self.lookup(key)
+        if not found or self.is_not_found(value):
+            return default
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        if key is None or value is None or self.max_size == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while self.max_size is not None and len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def put_not_found(self, key: Hashable, reason: str):
+        """
+        Remember that the key did not resolve, until `negative_ttl` seconds elapsed
+        :param key: Entity ID
+        :param reason: Error message to replay on the next lookups
+        """
+        if self.negative_ttl > 0:
+            self.put(key, NotFoundEntity(reason=reason, expires_at=self._clock() + self.negative_ttl))
+
+    def update(self, entities: Dict[Hashable, Any]):
+        for key, value in entities.items():
+            self.put(key, value)
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.put(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries and not self.is_not_found(self._entries[key])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self):
+        with self._lock:
+            return [key for key, value in self._entries.items() if not self.is_not_found(value)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                negative_hits=self._stats.negative_hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                size=len(self._entries),
+            )
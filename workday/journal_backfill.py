@@ -0,0 +1,301 @@
+import csv
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from workday_implement_api import *
+from workday_raas_implementation_api import *
+from models import *
+from utils import loop_over_date, transform_and_adjust_date
+from entity_cache import EntityCache, DEFAULT_CACHE_MAX_SIZE
+from snapshot_store import RAASSnapshotStore
+from master_data import MasterDataLoader, RAASReportProvider, DEFAULT_MASTER_DATA_WORKERS
+from csv_helpers import CSVJournalHelper
+
+
+DEFAULT_BACKFILL_DAY_WORKERS = 1  # number of days exported at the same time
+# RAAS reports of the journal master data, by service class name
+JOURNAL_MASTER_DATA_REPORTS = (
+    'GetRAASLedgerAccount', 'GetRAASCostCenter', 'GetRAASBookCodes', 'GetRAASCompanies', 'GetRAASGeoSales',
+)
+
+
+@dataclass
+class JournalMasterData:
+    """
+    Master data needed to map the journals: the RAAS reports, loaded once, and the lookup services with their caches.
+    It is shared by the journal exports of every day of a backfill, each export gets its own lookup services sharing
+    the caches of these ones, see `lookup_services`
+    """
+    ledger_accounts: Mapping[str, LedgerAccount]
+    cost_centers: Mapping[str, CostCenterInfo]
+    book_codes: Mapping[str, BookCodeInfo]
+    subsidiaries: Mapping[str, SubsidiaryInfo]
+    gtm_org: Mapping[str, GeoSales]
+    suppliers: GetRAASSuppliers
+    resource_category_service: GetResourceCategories
+    customer_contract_service: GetCustomerContracts
+    # loads the RAAS reports in the background, see `JournalMasterData.load`
+    report_loader: Optional[MasterDataLoader] = None
+    # Workday API version of the lookup services
+    api_version: str = DEFAULT_WORKDAY_API_VERSION
+
+    @classmethod
+    def load(
+            cls,
+            connector: WorkdayConnector,
+            api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            snapshot_store: Optional[RAASSnapshotStore] = None,
+            entity_cache_size: Optional[int] = DEFAULT_CACHE_MAX_SIZE,
+            report_workers: int = DEFAULT_MASTER_DATA_WORKERS,
+            lazy_reports: Iterable[str] = (),
+    ) -> 'JournalMasterData':
+        """
+        Start downloading the RAAS reports and create the lookup services, with the token and the transport of the
+        connector. It returns before the downloads are done: the reports are `RAASReportProvider`, waited for by
+        `GetAllJournals` once its first page is received, or by `wait`
+        :param connector: Connector with an acquired token
+        :param api_version: Workday API version of the lookup services
+        :param snapshot_store: Local snapshots of the RAAS reports, see `RAASSnapshotStore`
+        :param entity_cache_size: Maximum number of entities kept by each lookup service cache (0 disables the caches)
+        :param report_workers: Number of RAAS reports downloaded at the same time
+        :param lazy_reports: Reports only downloaded when a journal line needs them, by service class name
+            e.g: {'GetRAASGeoSales'}, see `JOURNAL_MASTER_DATA_REPORTS`
+        """
+        lazy_reports = set(lazy_reports)
+        unknown_reports = lazy_reports.difference(JOURNAL_MASTER_DATA_REPORTS)
+        if unknown_reports:
+            raise ValueError(
+                f'Unknown master data reports {sorted(unknown_reports)}, expected {list(JOURNAL_MASTER_DATA_REPORTS)}'
+            )
+
+        raas_args = dict(
+            base_url=connector.base_uri, token=connector.token_provider, tenant=connector.tenant,
+            transport=connector.transport, snapshot_store=snapshot_store,
+        )
+        service_args = dict(
+            base_url=connector.base_uri, token=connector.token_provider, tenant=connector.tenant,
+            api_version=api_version, transport=connector.transport,
+        )
+
+        report_loader = MasterDataLoader(max_workers=report_workers)
+
+        def load_report(report_class) -> RAASReportProvider:
+            return report_loader.load(report_class(**raas_args), lazy=report_class.__name__ in lazy_reports)
+
+        master_data = cls(
+            ledger_accounts=load_report(GetRAASLedgerAccount),
+            cost_centers=load_report(GetRAASCostCenter),
+            book_codes=load_report(GetRAASBookCodes),
+            subsidiaries=load_report(GetRAASCompanies),
+            gtm_org=load_report(GetRAASGeoSales),
+            suppliers=GetRAASSuppliers(**service_args, cache=EntityCache(max_size=entity_cache_size)),
+            resource_category_service=GetResourceCategories(
+                **service_args, cache=EntityCache(max_size=entity_cache_size)
+            ),
+            customer_contract_service=GetCustomerContracts(
+                **service_args, cache=EntityCache(max_size=entity_cache_size)
+            ),
+            report_loader=report_loader,
+            api_version=api_version,
+        )
+        report_loader.close()
+        return master_data
+
+    def wait(self):
+        """ Wait for the RAAS reports, a failed download is raised. The lazy reports are not downloaded """
+        if self.report_loader is not None:
+            self.report_loader.wait()
+
+    def lookup_services(
+            self,
+            connector: WorkdayConnector
+    ) -> Tuple[GetRAASSuppliers, GetResourceCategories, GetCustomerContracts]:
+        """
+        New supplier, spend category and customer contract services sharing the caches of the master data ones.
+        A service keeps the state of its paginated downloads (`get_all_entities`, used by the two-phase
+        `resolve_references`), so the journal exports running at the same time cannot share it
+        :param connector: Connector with an acquired token
+        :return: (suppliers, spend categories, customer contracts) services
+        """
+        return tuple(
+            type(service)(
+                base_url=connector.base_uri, token=connector.token_provider, tenant=connector.tenant,
+                api_version=self.api_version, transport=connector.transport, cache=service.cache,
+            )
+            for service in (self.suppliers, self.resource_category_service, self.customer_contract_service)
+        )
+
+    def journal_service(
+            self,
+            connector: WorkdayConnector,
+            creation_date: str,
+            filter_by_creation_date: bool = True,
+            **journal_options
+    ) -> GetAllJournals:
+        """
+        :param connector: Connector with an acquired token
+        :param creation_date: First accounting date, the creation date kept when `filter_by_creation_date`
+        :param journal_options: Other `GetAllJournals` parameters e.g: two_phase, stream_parse, parse_processes
+        :return: Journal service with its own lookup services, see `lookup_services`
+        """
+        suppliers, resource_category_service, customer_contract_service = self.lookup_services(connector)
+        return GetAllJournals(
+            base_url=connector.base_uri,
+            tenant=connector.tenant,
+            token=connector.token_provider,
+
+            creation_date=creation_date,
+            filter_by_creation_date=filter_by_creation_date,
+
+            api_version=connector.version,
+
+            ledger_accounts=self.ledger_accounts,
+            cost_centers=self.cost_centers,
+            book_codes=self.book_codes,
+            gtm_org=self.gtm_org,
+            subsidiaries=self.subsidiaries,
+
+            raas_suppliers=suppliers,
+            resource_category_service=resource_category_service,
+            customer_contract_service=customer_contract_service,
+            transport=connector.transport,
+            **journal_options
+        )
+
+    def print_load_reports(self):
+        """ Status, entries and download time of each RAAS report, and the lazy reports skipped """
+        if self.report_loader is not None:
+            self.report_loader.print_reports()
+
+    def print_cache_stats(self):
+        print(f"Suppliers cache: {self.suppliers.cache.get_stats()}")
+        print(f"Spend categories cache: {self.resource_category_service.cache.get_stats()}")
+        print(f"Customer contracts cache: {self.customer_contract_service.cache.get_stats()}")
+
+
+class JournalCSVFileSink:
+    """
+    Backfill sink writing each day into its own CSV file, row by row, under the name used by the journal entry point
+    in test mode: `accounting_journal_{date}_to_{date}_journal_entries.csv`
+    """
+
+    def __init__(self, directory: str = '.', csv_helper: Optional[CSVJournalHelper] = None):
+        self.directory = directory
+        self.csv_helper = csv_helper if csv_helper is not None else CSVJournalHelper()
+
+    def path(self, date: str) -> str:
+        return os.path.join(self.directory, f'accounting_journal_{date}_to_{date}_journal_entries.csv')
+
+    def write(self, date: str, journals: Iterable[MappedJournal]) -> int:
+        """
+        :param date: Day of the journals
+        :param journals: Mapped journals of the day
+        :return: Number of rows written, header excluded
+        """
+        rows = 0
+        with open(self.path(date), 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(self.csv_helper.get_header())
+            for row in self.csv_helper.mapped_journals_to_rows(journals):
+                writer.writerow(row)
+                rows += 1
+        return rows
+
+
+class JournalBackfill:
+    """
+    Export the journals of a range of days with one connector (token and transport) and one master data load.
+    Each day has its own `GetAllJournals` and is written to the sink as soon as it is mapped, so several days can run
+    at the same time.
+    The sink is any object with a `write(date, journals) -> rows` method, e.g: `JournalCSVFileSink`
+    """
+
+    def __init__(
+            self,
+            connector: WorkdayConnector,
+            master_data: JournalMasterData,
+            day_workers: int = DEFAULT_BACKFILL_DAY_WORKERS,
+            filter_by_creation_date: bool = True,
+            page_workers: int = 1,
+            prefetch_depth: int = 0,
+            **journal_options
+    ):
+        """
+        :param connector: Connector with an acquired token
+        :param master_data: Master data shared by all the days, see `JournalMasterData.load`
+        :param day_workers: Number of days exported at the same time
+        :param filter_by_creation_date: Keep the journals created on the day only
+        :param page_workers: Number of Get_Journals pages fetched concurrently for each day
+        :param prefetch_depth: Number of pages fetched ahead for each day, when page_workers = 1
+        :param journal_options: Other `GetAllJournals` parameters e.g: two_phase, stream_parse, parse_processes
+        """
+        self.connector = connector
+        self.master_data = master_data
+        self.day_workers = max(1, day_workers)
+        self.filter_by_creation_date = filter_by_creation_date
+        self.page_workers = page_workers
+        self.prefetch_depth = prefetch_depth
+        self.journal_options = journal_options
+
+    def run(self, from_date: str, to_date: str, sink) -> List[BackfillDayReport]:
+        """
+        :param from_date: First day, 'YYYY-MM-DD'
+        :param to_date: Last day, included
+        :param sink: Receives the mapped journals of each day
+        :return: One report by day, in date order
+        """
+        days = (datetime.strptime(to_date, "%Y-%m-%d") - datetime.strptime(from_date, "%Y-%m-%d")).days + 1
+        dates = loop_over_date(from_date, days)
+
+        with ThreadPoolExecutor(max_workers=self.day_workers, thread_name_prefix='backfill-day') as executor:
+            return list(executor.map(lambda date: self._run_day(date, sink), dates))
+
+    def _run_day(self, date: str, sink) -> BackfillDayReport:
+        start = time.perf_counter()
+        get_all_journals = None
+        try:
+            get_all_journals = self.master_data.journal_service(
+                self.connector, date, self.filter_by_creation_date, **self.journal_options
+            )
+            journals: List[MappedJournal] = get_all_journals.get_all_entities(
+                './/wd:Journal_Entry_Data',
+                max_workers=self.page_workers,
+                prefetch_depth=self.prefetch_depth,
+                accounting_from_date=date,
+                accounting_to_date=date,
+                # in order to make sure we retrieve all the journals for the required date
+                as_of_effective_date=f"{str(transform_and_adjust_date(date, days=-1))}T00:00:00.000",
+            )
+            journals = get_all_journals.filter_objects(journals, get_all_journals.callable_condition)
+            fetched = time.perf_counter()
+
+            rows = sink.write(date, journals)
+            report = BackfillDayReport(
+                date=date,
+                journals=len(journals),
+                rows=rows,
+                fetch_seconds=fetched - start,
+                write_seconds=time.perf_counter() - fetched,
+                errors=get_all_journals.failed_journals + get_all_journals.failed_entity,
+            )
+        except Exception as error:
+            report = BackfillDayReport(
+                date=date,
+                journals=0,
+                rows=0,
+                fetch_seconds=time.perf_counter() - start,
+                write_seconds=0.0,
+                errors=get_all_journals.failed_journals + get_all_journals.failed_entity if get_all_journals else [],
+                failure=f'{type(error).__name__}: {error}',
+            )
+
+        print(
+            f"🗓️ {report.date}: {report.journals} journals, {report.rows} rows, "
+            f"fetch {report.fetch_seconds:.1f}s, write {report.write_seconds:.1f}s"
+            + (f", failed: {report.failure}" if report.failure else "")
+        )
+        return report
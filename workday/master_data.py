@@ -0,0 +1,148 @@
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from workday_api_generator_call import WorkdayRAASService, RAAS_FETCH_NETWORK
+from models import *
+
+
+DEFAULT_MASTER_DATA_WORKERS = 5  # number of RAAS reports downloaded at the same time
+
+
+class RAASReportProvider(Mapping):
+    """
+    Read-only dict of a RAAS report downloaded in the background, so it can be handed to the services right away.
+    The first read waits for the download, a failed download is raised by the reads.
+    Without executor the report is lazy: it is downloaded by the first read needing it, once, the other readers
+    arriving meanwhile wait for that download. A lookup of a missing ID (None) does not download it.
+    """
+
+    def __init__(self, service: WorkdayRAASService, executor: Optional[Executor] = None):
+        """
+        :param service: RAAS service of the report, e.g: GetRAASLedgerAccount
+        :param executor: Runs the download right away, None for a lazy report
+        """
+        self.service = service
+        self.report_name = service.report_name
+        self.lazy = executor is None
+        # download and parsing, set once done
+        self.seconds: Optional[float] = None
+        self._data: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = executor.submit(self._load) if executor is not None else None
+
+    def _load(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            return self.service.get_entity_dic()
+        finally:
+            self.seconds = time.perf_counter() - start
+
+    def _start_lazy_load(self):
+        with self._lock:
+            if self._future is not None:
+                # started by another reader
+                return
+            self._future = future = Future()
+
+        try:
+            future.set_result(self._load())
+        except Exception as error:
+            future.set_exception(error)
+
+    def wait(self) -> Dict[str, Any]:
+        """
+        :return: The report dict, once downloaded (downloads a lazy report)
+        """
+        data = self._data
+        if data is None:
+            if self._future is None:
+                self._start_lazy_load()
+            data = self._data = self._future.result()
+        return data
+
+    def done(self) -> bool:
+        return self._future is not None and self._future.done()
+
+    def failed(self) -> bool:
+        return self.done() and self._future.exception() is not None
+
+    def __getitem__(self, key: str) -> Any:
+        return self.wait()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.wait())
+
+    def __len__(self) -> int:
+        return len(self.wait())
+
+    def get(self, key: Optional[str], default: Any = None) -> Any:
+        if key is None:
+            return default
+        return self.wait().get(key, default)
+
+    def get_report(self) -> MasterDataReport:
+        if self._future is None:
+            return MasterDataReport(report_name=self.report_name, status='skipped', entries=0, seconds=None)
+        if not self._future.done():
+            return MasterDataReport(report_name=self.report_name, status='pending', entries=0, seconds=None)
+        if self._future.exception() is not None:
+            return MasterDataReport(report_name=self.report_name, status='failed', entries=0, seconds=self.seconds)
+
+        last_fetch = self.service.last_fetch
+        return MasterDataReport(
+            report_name=self.report_name,
+            status=last_fetch.status if last_fetch else RAAS_FETCH_NETWORK,
+            entries=len(self.wait()),
+            seconds=self.seconds,
+        )
+
+
+class MasterDataLoader:
+    """
+    Downloads and parses RAAS reports concurrently, at most `max_workers` at a time.
+    `load` returns at once a `RAASReportProvider`, the callers only wait when they read the report.
+    The lazy reports are only downloaded if a caller needs them, the others are reported as skipped.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MASTER_DATA_WORKERS):
+        """
+        :param max_workers: Number of reports downloaded at the same time (1 = one after the other)
+        """
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='master-data')
+        self.providers: List[RAASReportProvider] = []
+
+    def load(self, service: WorkdayRAASService, lazy: bool = False) -> RAASReportProvider:
+        """
+        :param service: RAAS service of the report
+        :param lazy: Download the report on its first read, by the reader, instead of right away
+        :return: The report, downloading or lazy
+        """
+        provider = RAASReportProvider(service, None if lazy else self._executor)
+        self.providers.append(provider)
+        return provider
+
+    def close(self):
+        """ No more reports to load: the workers stop once the downloads are done """
+        self._executor.shutdown(wait=False)
+
+    def wait(self):
+        """ Wait for all the reports started, the first failed download is raised. The lazy reports are not loaded """
+        for provider in self.providers:
+            if not provider.lazy:
+                provider.wait()
+
+    def get_reports(self) -> List[MasterDataReport]:
+        return [provider.get_report() for provider in self.providers]
+
+    def print_reports(self):
+        for report in self.get_reports():
+            seconds = f"{report.seconds:.1f}s" if report.seconds is not None else "-"
+            print(f"📚 {report.report_name}: {report.status}, {report.entries} entries, {seconds}")
+
+        skipped = [report.report_name for report in self.get_reports() if report.status == 'skipped']
+        if skipped:
+            print(f"⏭️ Reports skipped, never needed: {', '.join(skipped)}")
@@ -1,5 +1,5 @@
-from dataclasses import dataclass, field
-from typing import TypeVar, Optional, List, Any
+from dataclasses import dataclass, field, asdict
+from typing import TypeVar, Optional, List, Any, Dict, Callable
 
 # TypeVar for generic type T
 T = TypeVar('T')
@@ -430,6 +430,106 @@ class ResponseResults:
     page: int
 
 
+@dataclass
+class TransportStats:
+    """ class used to track the HTTP connections opened and reused by the shared transport """
+    requests: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    hosts: int = 0
+
+
+@dataclass
+class CacheStats:
+    """ class used to track the lookups served by a service entity cache """
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+@dataclass(frozen=True)
+class NotFoundEntity:
+    """ class used to remember an entity lookup which did not resolve """
+    reason: str
+    expires_at: float
+
+
+@dataclass
+class RAASSnapshot:
+    """ class used to keep a parsed RAAS report along with the validators of the payload it was built from """
+    data: Dict[str, Any]
+    created_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RAASFetchReport:
+    """ class used to report how a RAAS report was served: snapshot, network, not_modified (304) or hash_match """
+    report_name: str
+    status: str
+    entries: int
+
+
+@dataclass(frozen=True)
+class MasterDataReport:
+    """ class used to report the load of one master data RAAS report, see `MasterDataLoader` """
+    report_name: str
+    status: str  # RAAS_FETCH_* status, 'failed', 'pending' while downloading, 'skipped' when lazy and never needed
+    entries: int
+    seconds: Optional[float]  # download and parsing, None while downloading
+
+
+@dataclass(frozen=True)
+class ScopeReport:
+    """ class used to report one step of a `ScopeScheduler` run, e.g: a master data scope """
+    name: str
+    status: str  # 'done', 'failed', or 'skipped' when a step it needs failed
+    seconds: float  # run time of the step alone, its dependencies excluded
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class JournalPrescanReport:
+    """ class used to report the journals of a page dropped by the creation date pre-scan, before any XML parsing """
+    page: int
+    journals_discarded: int
+    bytes_discarded: int
+    page_bytes: int
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """ class used to declare one field extracted from an entity element, see `FieldExtractor` """
+    name: str  # field name of the mapped object
+    path: str  # child tag e.g: 'wd:Supplier_ID'
+    id_type: Optional[str] = None  # read the `wd:ID` of this type under the child instead of its text
+    converter: Callable[[str], Any] = str
+    default: Any = None  # value when the child is missing or the conversion fails
+
+
+@dataclass(frozen=True)
+class CSVChunkStats:
+    """ class used to report the size of one CSV chunk, see `CSVChunkWriter` """
+    rows: int  # header excluded
+    bytes: int  # UTF-8, header included
+
+
+@dataclass(frozen=True)
+class BackfillDayReport:
+    """ class used to report the journal export of one day of a backfill, see `JournalBackfill` """
+    date: str
+    journals: int  # journals written to the sink
+    rows: int  # entry lines written to the sink
+    fetch_seconds: float  # fetch, parse and mapping of the journals
+    write_seconds: float
+    errors: List[Any] = field(default_factory=list)  # failed journals and pages of the day
+    failure: Optional[str] = None  # error which stopped the day, nothing written
+
+
 @dataclass(frozen=True)
 class FailedProcessedJournal:
     """ class used to track any error on fetching and converting journals data """
@@ -0,0 +1,144 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models import *
+
+
+DEFAULT_SCOPE_WORKERS = 4  # number of steps run at the same time
+
+
+class ScopeScheduler:
+    """
+    Runs steps declared with the steps they depend on, e.g: the ledger account hierarchy needs the ledger accounts.
+    A step starts as soon as its dependencies are done, the independent steps run at the same time (at most
+    `max_workers`), and each step runs once: its result is handed to all the steps depending on it.
+    A failed step is reported, the steps depending on it are skipped and the others keep running.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_SCOPE_WORKERS):
+        """
+        :param max_workers: Number of steps run at the same time (1 = one after the other)
+        """
+        self.max_workers = max(1, max_workers)
+        # name -> (run, dependencies), in declaration order
+        self._steps: Dict[str, Tuple[Callable[..., Any], Tuple[str, ...]]] = {}
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, Exception] = {}
+
+    @property
+    def steps(self) -> List[str]:
+        return list(self._steps)
+
+    def add(self, name: str, run: Callable[..., Any], depends_on: Sequence[str] = ()):
+        """
+        :param name: Unique step name
+        :param run: Called with the results of the dependencies, in the `depends_on` order
+        :param depends_on: Names of the steps needed by this one, declared before it
+        """
+        if name in self._steps:
+            raise ValueError(f'Step {name} is already declared')
+        undeclared = [dependency for dependency in depends_on if dependency not in self._steps]
+        if undeclared:
+            raise ValueError(f'Step {name} depends on undeclared steps {undeclared}')
+        self._steps[name] = (run, tuple(depends_on))
+
+    def _with_dependencies(self, targets: Iterable[str]) -> List[str]:
+        """
+        :return: The targets and all the steps they need, in declaration order (a step comes after its dependencies)
+        """
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self._steps:
+                raise ValueError(f'Unknown step {name}')
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self._steps[name][1])
+        return [name for name in self._steps if name in needed]
+
+    @staticmethod
+    def _run_step(run: Callable[..., Any], arguments: List[Any]) -> Tuple[Any, float, Optional[Exception]]:
+        start = time.perf_counter()
+        try:
+            return run(*arguments), time.perf_counter() - start, None
+        except Exception as error:
+            return None, time.perf_counter() - start, error
+
+    def run(
+            self,
+            targets: Optional[Iterable[str]] = None,
+            on_done: Optional[Callable[[ScopeReport, Any], None]] = None,
+            keep_results: bool = True,
+    ) -> List[ScopeReport]:
+        """
+        :param targets: Steps to run, with the steps they need (None: all the steps)
+        :param on_done: Called on this thread with the report and the result of each step as soon as it is over,
+            e.g: to write its output while the other steps are running
+        :param keep_results: Keep every result into `results`, otherwise a result is released once `on_done` and
+            the steps depending on it are done
+        :return: One report by step, in declaration order
+        """
+        names = self._with_dependencies(self._steps if targets is None else targets)
+        # step -> dependencies not done yet
+        waiting = {name: set(self._steps[name][1]) for name in names}
+        dependents = {name: [other for other in names if name in self._steps[other][1]] for name in names}
+        reports: Dict[str, ScopeReport] = {}
+        running: Dict[Future, str] = {}
+
+        def finish(report: ScopeReport, result: Any = None):
+            reports[report.name] = report
+            if on_done is not None:
+                on_done(report, result)
+            if not keep_results:
+                for name in (report.name,) + self._steps[report.name][1]:
+                    if all(other in reports for other in dependents[name]):
+                        self.results.pop(name, None)
+
+        def skip_dependents(failed_name: str):
+            for name in dependents[failed_name]:
+                if name in waiting:
+                    del waiting[name]
+                    finish(ScopeReport(name=name, status='skipped', seconds=0.0, error=f'{failed_name} failed'))
+                    skip_dependents(name)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scope') as executor:
+            while waiting or running:
+                for name in [name for name, dependencies in waiting.items() if not dependencies]:
+                    del waiting[name]
+                    run, depends_on = self._steps[name]
+                    arguments = [self.results[dependency] for dependency in depends_on]
+                    running[executor.submit(self._run_step, run, arguments)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result, seconds, error = future.result()
+                    if error is not None:
+                        self.errors[name] = error
+                        print(f'Step {name} failed: {error}')
+                        finish(ScopeReport(
+                            name=name, status='failed', seconds=seconds, error=f'{type(error).__name__}: {error}'
+                        ))
+                        skip_dependents(name)
+                        continue
+
+                    self.results[name] = result
+                    for dependent in dependents[name]:
+                        if dependent in waiting:
+                            waiting[dependent].discard(name)
+                    finish(ScopeReport(name=name, status='done', seconds=seconds), result)
+
+        return [reports[name] for name in names]
+
+    def result(self, name: str) -> Any:
+        """
+        :return: Result of a step run with `keep_results`, the error of the step, or of a step it needs, is raised
+        """
+        if name in self.results:
+            return self.results[name]
+        for step in self._with_dependencies([name]):
+            if step in self.errors:
+                raise self.errors[step]
+        raise KeyError(name)
@@ -0,0 +1,156 @@
+import pickle
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Optional
+
+from models import RAASSnapshot
+
+
+DEFAULT_SNAPSHOT_TTL = 24 * 60 * 60  # number of seconds a RAAS report snapshot is served before being refetched
+
+
+class RAASSnapshotStore:
+    """
+    Local SQLite store of the RAAS reports already downloaded and parsed (the dict of dataclasses is pickled),
+    so the next runs rebuild the master data from the disk instead of refetching and reparsing the reports.
+    Only use it with a file you own, the snapshots are unpickled.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            default_ttl: float = DEFAULT_SNAPSHOT_TTL,
+            ttls: Optional[Dict[str, float]] = None,
+            clock: Callable[[], float] = time.time,
+    ):
+        """
+        :param path: SQLite file path
+        :param default_ttl: Number of seconds a snapshot is valid
+        :param ttls: TTL by report, the key is the service class name e.g: {'GetRAASCostCenter': 3600}
+        :param clock: Time source, in seconds
+        """
+        self.path = path
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self._clock = clock
+
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS raas_snapshots ('
+            'report_key TEXT PRIMARY KEY, report_name TEXT NOT NULL, created_at REAL NOT NULL, data BLOB NOT NULL, '
+            'etag TEXT, last_modified TEXT, body_hash TEXT)'
+        )
+        # snapshots files created before the validators were stored
+        columns = {row[1] for row in self._execute('PRAGMA table_info(raas_snapshots)')}
+        for column in ('etag', 'last_modified', 'body_hash'):
+            if column not in columns:
+                self._execute(f'ALTER TABLE raas_snapshots ADD COLUMN {column} TEXT')
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> list:
+        # one connection by operation, the store can be shared across threads
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+    def get_ttl(self, report_name: str) -> float:
+        return self.ttls.get(report_name, self.default_ttl)
+
+    def is_fresh(self, snapshot: RAASSnapshot, report_name: str) -> bool:
+        return self._clock() - snapshot.created_at <= self.get_ttl(report_name)
+
+    def get_snapshot(self, report_key: str) -> Optional[RAASSnapshot]:
+        """
+        Get the snapshot of the report, even expired (its validators are still used for conditional requests)
+        :param report_key: Unique key of the report (service and URL)
+        :return: RAASSnapshot, None when missing or unreadable
+        """
+        rows = self._execute(
+            'SELECT created_at, data, etag, last_modified, body_hash FROM raas_snapshots WHERE report_key = ?',
+            (report_key,)
+        )
+        if not rows:
+            return None
+
+        created_at, data, etag, last_modified, body_hash = rows[0]
+        try:
+            return RAASSnapshot(
+                data=pickle.loads(data),
+                created_at=created_at,
+                etag=etag,
+                last_modified=last_modified,
+                body_hash=body_hash,
+            )
+        except Exception as error:
+            # the dataclasses changed since the snapshot was written, refetch
+            print(f"Could not load the snapshot {report_key}: {error}")
+            return None
+
+    def load(self, report_key: str, report_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the snapshot of the report if it is still valid
+        :param report_key: Unique key of the report (service and URL)
+        :param report_name: Report name, used to get the report TTL
+        :return: Dict of key = Entity ID : T, None when missing or expired
+        """
+        snapshot = self.get_snapshot(report_key)
+        if snapshot is None or not self.is_fresh(snapshot, report_name):
+            return None
+
+        return snapshot.data
+
+    def save(
+            self,
+            report_key: str,
+            report_name: str,
+            data: Dict[str, Any],
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None,
+            body_hash: Optional[str] = None,
+    ) -> RAASSnapshot:
+        snapshot = RAASSnapshot(
+            data=data, created_at=self._clock(), etag=etag, last_modified=last_modified, body_hash=body_hash
+        )
+        self._execute(
+            'INSERT OR REPLACE INTO raas_snapshots '
+            '(report_key, report_name, created_at, data, etag, last_modified, body_hash) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (
+                report_key, report_name, snapshot.created_at, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL),
+                etag, last_modified, body_hash,
+            )
+        )
+        return snapshot
+
+    def touch(
+            self,
+            report_key: str,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None,
+            body_hash: Optional[str] = None,
+    ) -> float:
+        """
+        The report did not change on Workday side, restart its TTL
+        :param report_key: Unique key of the report (service and URL)
+        :param etag: ETag of the unchanged report, None keeps the stored one
+        :param last_modified: Last-Modified of the unchanged report, None keeps the stored one
+        :param body_hash: Hash of the unchanged report body, None keeps the stored one
+        :return: new creation time of the snapshot
+        """
+        created_at = self._clock()
+        self._execute(
+            'UPDATE raas_snapshots SET created_at = ?, etag = COALESCE(?, etag), '
+            'last_modified = COALESCE(?, last_modified), body_hash = COALESCE(?, body_hash) WHERE report_key = ?',
+            (created_at, etag, last_modified, body_hash, report_key)
+        )
+        return created_at
+
+    def invalidate(self, report_name: Optional[str] = None):
+        """
+        Drop the snapshots of the report, or all of them
+        :param report_name: service class name e.g: 'GetRAASCostCenter', None to drop all the snapshots
+        """
+        if report_name is None:
+            self._execute('DELETE FROM raas_snapshots')
+        else:
+            self._execute('DELETE FROM raas_snapshots WHERE report_name = ?', (report_name,))
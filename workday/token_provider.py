@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+
+DEFAULT_TOKEN_REFRESH_MARGIN = 120  # number of seconds before its expiry the access token is refreshed
+
+
+class TokenProvider:
+    """
+    Hands out the access token to every service: the services ask it for the token before each request
+    instead of keeping their own copy.
+    It tracks the token expiry (`expires_in` of the OAuth answer) and refreshes the token shortly before, or after
+    a 401 answer. One refresh runs at a time: Workday rotates the refresh token on each refresh, so two concurrent
+    refreshes would invalidate each other. The callers waiting for it get the new token.
+    """
+
+    def __init__(
+            self,
+            fetch_tokens: Optional[Callable[[], Dict[str, Any]]] = None,
+            access_token: Optional[str] = None,
+            refresh_margin: float = DEFAULT_TOKEN_REFRESH_MARGIN,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param fetch_tokens: Requests a new token and returns the OAuth answer (`access_token`, `expires_in`).
+            None for a fixed token which is never refreshed
+        :param access_token: Token to start with, fetched on the first `get_token` when not provided
+        :param refresh_margin: Number of seconds before the expiry the token is refreshed
+        :param clock: Time source, in seconds
+        """
+        self._fetch_tokens = fetch_tokens
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        # (access token, expiry time or None when unknown), replaced as a whole so it is never read half updated
+        self._state: Tuple[Optional[str], Optional[float]] = (access_token, None)
+        self._lock = threading.Lock()
+        self.refresh_count = 0
+
+    @classmethod
+    def of(cls, token: Union[str, 'TokenProvider', None]) -> 'TokenProvider':
+        """ The provider itself, or a fixed token provider for a plain token """
+        return token if isinstance(token, TokenProvider) else cls(access_token=token)
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """ Current token, without any refresh """
+        return self._state[0]
+
+    @property
+    def can_refresh(self) -> bool:
+        return self._fetch_tokens is not None
+
+    def _is_fresh(self, state: Tuple[Optional[str], Optional[float]]) -> bool:
+        access_token, expires_at = state
+        if access_token is None:
+            return False
+        return expires_at is None or self._clock() < expires_at - self.refresh_margin
+
+    def get_token(self) -> Optional[str]:
+        """
+        :return: A valid token, refreshed first when it is about to expire
+        """
+        if not self.can_refresh or self._is_fresh(self._state):
+            return self._state[0]
+
+        with self._lock:
+            # refreshed by another caller while this one was waiting
+            if not self._is_fresh(self._state):
+                self._refresh()
+            return self._state[0]
+
+    async def get_token_async(self) -> Optional[str]:
+        """ `get_token` for coroutines: a refresh runs in a worker thread, the event loop is not blocked """
+        if not self.can_refresh or self._is_fresh(self._state):
+            return self._state[0]
+        return await asyncio.to_thread(self.get_token)
+
+    def refresh(self) -> Optional[str]:
+        """ Refresh the token now, e.g: on start """
+        with self._lock:
+            self._refresh()
+            return self._state[0]
+
+    def refresh_after_unauthorized(self, rejected_token: Optional[str]) -> bool:
+        """
+        To call after a 401 answer: refresh the token, unless another caller has already replaced the rejected one
+        :param rejected_token: Token sent with the request
+        :return: True when the request can be sent again with `get_token()`
+        """
+        if not self.can_refresh:
+            return False
+
+        with self._lock:
+            if self._state[0] == rejected_token:
+                self._refresh()
+        return True
+
+    def call_with_token(self, send: Callable[[Optional[str]], Any]) -> Any:
+        """
+        Send a request with the current token, and once again with a new token after a 401 answer
+        :param send: Sends the request with the given token and returns the response
+        :return: Response
+        """
+        access_token = self.get_token()
+        response = send(access_token)
+        if response.status_code == 401 and self.refresh_after_unauthorized(access_token):
+            response = send(self.get_token())
+        return response
+
+    async def call_with_token_async(self, send: Callable[[Optional[str]], Awaitable[Any]]) -> Any:
+        """ `call_with_token` for coroutines """
+        access_token = await self.get_token_async()
+        response = await send(access_token)
+        if response.status_code == 401 and await asyncio.to_thread(self.refresh_after_unauthorized, access_token):
+            response = await send(await self.get_token_async())
+        return response
+
+    def _refresh(self):
+        # called with the lock held
+        tokens = self._fetch_tokens() or {}
+        access_token = tokens.get('access_token')
+        if not access_token:
+            raise ValueError('The token answer has no access_token')
+
+        expires_in = tokens.get('expires_in')
+        expires_at = self._clock() + float(expires_in) if expires_in else None
+        self._state = (access_token, expires_at)
+        self.refresh_count += 1
+
+
+# `token` of the services: the shared provider, or a plain access token which is never refreshed
+TokenSource = Union[str, TokenProvider]
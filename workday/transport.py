@@ -0,0 +1,87 @@
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from models import TransportStats
+
+
+DEFAULT_POOL_CONNECTIONS = 4  # number of hosts kept alive in the pool
+DEFAULT_POOL_MAXSIZE = 10  # number of keep-alive connections kept by host
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 300  # large Get_Journals pages can take minutes to be generated
+
+
+class WorkdayTransport:
+    """
+    Shared HTTP transport, create it once alongside `WorkdayConnector` and inject it into every service
+    so all the SOAP pages, entity lookups and RAAS reports reuse the same keep-alive connections
+    """
+
+    def __init__(
+            self,
+            pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+            connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+            read_timeout: float = DEFAULT_READ_TIMEOUT,
+            pool_block: bool = False,
+    ):
+        """
+        :param pool_connections: Number of hosts to keep a connection pool for
+        :param pool_maxsize: Maximum number of connections kept alive by host
+        :param connect_timeout: Default number of seconds to wait for establishing a connection
+        :param read_timeout: Default number of seconds to wait for the server answer
+        :param pool_block: Whether the caller must wait for a free connection when the pool is full
+        """
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+    def request(self, method: str, url: str, timeout: Optional[Tuple[float, float]] = None, **kwargs) -> requests.Response:
+        """
+        Send the request through the pooled session
+
+        :param method: HTTP method [POST, GET, ...]
+        :param url: URL to call
+        :param timeout: (connect, read) timeout overriding the transport default
+        :param kwargs: any other `requests` argument (headers, data, ...)
+        :return: requests.Response
+        """
+        return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def get_stats(self) -> TransportStats:
+        """
+        Count the requests sent and the connections opened or reused across the pools of the transport,
+        a pool evicted (more hosts than `pool_connections`) is no longer counted
+        :return: TransportStats
+        """
+        pool_container = self._adapter.poolmanager.pools
+        pools = []
+        for pool_key in pool_container.keys():
+            pool = pool_container.get(pool_key)
+            if pool is not None:
+                pools.append(pool)
+        total_requests = sum(pool.num_requests for pool in pools)
+        opened = sum(pool.num_connections for pool in pools)
+
+        return TransportStats(
+            requests=total_requests,
+            connections_opened=opened,
+            connections_reused=max(total_requests - opened, 0),
+            hosts=len({(pool.scheme, pool.host, pool.port) for pool in pools}),
+        )
+
+    def close(self):
+        self.session.close()
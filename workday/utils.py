@@ -1,6 +1,9 @@
+import asyncio
 from functools import wraps
-from typing import List, Optional
-import pandas as pd
+import os
+import queue
+import threading
+from typing import List, Optional, Callable, Iterable, Iterator, Tuple
 from datetime import datetime, timedelta
 
 import requests
@@ -21,6 +24,7 @@ def retry_on_500(retries=2, delay=5):
         @wraps(func)
         def wrapper(*args, **kwargs):
             attempt = 0
+            last_error: Optional[requests.HTTPError] = None
             while attempt < retries:
                 try:
                     # Call the original function
@@ -28,21 +32,114 @@ def retry_on_500(retries=2, delay=5):
                 except requests.HTTPError as e:
                     # Check if the status code is 500
                     if e.response.status_code == 500:
+                        last_error = e
                         attempt += 1
                         print(f"Error: {e}\nAttempt {attempt} failed with status 500. Retrying in {delay} seconds...")
                         time.sleep(delay)
                     else:
                         # If it's not a 500 error, raise it immediately
                         raise
-            # If we reach here, it means all retries have failed
+            # If we reach here, it means all retries have failed, raise the last 500 answer
             print("All retries failed.")
-            raise
+            raise last_error
 
         return wrapper
 
     return decorator
 
 
+def async_retry_on_500(retries=2, delay=5):
+    """
+    Awaitable counterpart of `retry_on_500`, wait for the delay without blocking the event loop
+    :param retries: Number of times to retry the wrapped coroutine
+    :param delay: Number of second to wait for between each try
+    :return:
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            attempt = 0
+            last_error: Optional[requests.HTTPError] = None
+            while attempt < retries:
+                try:
+                    # Await the original coroutine
+                    return await func(*args, **kwargs)
+                except requests.HTTPError as e:
+                    # Check if the status code is 500
+                    if e.response.status_code == 500:
+                        last_error = e
+                        attempt += 1
+                        print(f"Error: {e}\nAttempt {attempt} failed with status 500. Retrying in {delay} seconds...")
+                        await asyncio.sleep(delay)
+                    else:
+                        # If it's not a 500 error, raise it immediately
+                        raise
+            # If we reach here, it means all retries have failed, raise the last 500 answer
+            print("All retries failed.")
+            raise last_error
+
+        return wrapper
+
+    return decorator
+
+
+def prefetch_pages(
+        fetch_page: Callable[[int], bytes],
+        pages: Iterable[int],
+        depth: int = 1,
+) -> Iterator[Tuple[int, Optional[bytes], Optional[Exception]]]:
+    """
+    Fetch the pages in order on a background thread which stays up to `depth` pages ahead of the consumer,
+    so the next requests are already on the wire while the current page is parsed.
+    The fetched payloads wait in a bounded queue: at most `depth` pages are buffered, plus the one being fetched.
+
+    :param fetch_page: Function returning the payload of a page number, called on the background thread
+    :param pages: Page numbers to fetch, in the order they are yielded
+    :param depth: Maximum number of fetched pages waiting to be consumed
+    :return: Iterator of (page, payload, None), or (page, None, error) when the page could not be fetched
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, depth))
+    stopped = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        # do not block forever on a full queue once the consumer is gone
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch_all():
+        try:
+            for page in pages:
+                if stopped.is_set():
+                    return
+                try:
+                    item = (page, fetch_page(page), None)
+                except Exception as error:
+                    item = (page, None, error)
+                if not put(item):
+                    return
+        finally:
+            put(done)
+
+    fetcher = threading.Thread(target=fetch_all, name='page-prefetch', daemon=True)
+    fetcher.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            yield item
+    finally:
+        # the consumer stopped early (error or break): release the fetcher, it ends after its current request
+        stopped.set()
+        fetcher.join()
+
+
 def transform_list_to_dict(data: List[str]):
     return {d: True for d in data}
 
@@ -79,36 +176,67 @@ def is_timestamp_on_date(timestamp: str, target_date: str) -> bool:
     return timestamp_date == target_date_obj
 
 
-def merge_csv_files(csv_paths: List[str], output_path: str) -> None:
+def merge_csv_files(csv_paths: List[str], output_path: str, block_size: int = 1024 * 1024) -> None:
     """
     Merges multiple CSV files into one, keeping the header from the first file
     and dropping headers from subsequent files.
+    The bodies are copied as is, by binary blocks, so memory use does not depend on the size of the files.
 
     :param csv_paths: List of paths to the CSV files to merge.
     :param output_path: Path to save the merged CSV file.
+    :param block_size: Number of bytes copied at once
+    :raise ValueError: When the header of a file is not the header of the first file, the partial output is removed
     """
-    # Initialize an empty list to store DataFrames
-    dataframes = []
+    header: Optional[bytes] = None
+    header_path: Optional[str] = None
+    line_terminator = b'\r\n'
+    ends_with_line_terminator = True
+    output = None
 
-    for i, csv_path in enumerate(csv_paths):
-        try:
-            # Read the CSV file
-            df = pd.read_csv(csv_path)
-            # If it's not the first file, skip the header
-            if i > 0:
-                df.columns = dataframes[0].columns  # Ensure consistent column names
-            dataframes.append(df)
-        except FileNotFoundError as error:
-            print(error)
+    try:
+        for csv_path in csv_paths:
+            try:
+                source = open(csv_path, 'rb')
+            except FileNotFoundError as error:
+                print(error)
+                continue
 
-    # if any file found !
-    if dataframes:
-        # Concatenate all DataFrames
-        merged_df = pd.concat(dataframes, ignore_index=True)
+            with source:
+                first_line = source.readline()
+                if not first_line:
+                    print(f'Empty file: {csv_path}')
+                    continue
+
+                if header is None:
+                    header = first_line.rstrip(b'\r\n')
+                    header_path = csv_path
+                    if first_line.endswith(b'\n') and not first_line.endswith(b'\r\n'):
+                        line_terminator = b'\n'
+                    output = open(output_path, 'wb')
+                    output.write(header + line_terminator)
+                elif first_line.rstrip(b'\r\n') != header:
+                    raise ValueError(f'The header of {csv_path} does not match the header of {header_path}')
 
-        # Save the merged DataFrame to the output file
-        merged_df.to_csv(output_path, index=False)
-    else:
+                block = source.read(block_size)
+                # last row of the previous file without line break
+                if block and not ends_with_line_terminator:
+                    output.write(line_terminator)
+                while block:
+                    output.write(block)
+                    ends_with_line_terminator = block.endswith(b'\n')
+                    block = source.read(block_size)
+    except Exception:
+        # do not leave a half merged file behind
+        if output is not None:
+            output.close()
+            os.remove(output_path)
+        raise
+    finally:
+        if output is not None:
+            output.close()
+
+    # if any file found !
+    if header is None:
         print('No data found')
 
 
@@ -6,22 +6,38 @@
 from abc import ABC, abstractmethod
 
 from models import *
-from utils import retry_on_500
-
-from datetime import datetime
-from typing import Dict, Optional, List, Union, Tuple, Callable
+from utils import retry_on_500, prefetch_pages
+from transport import WorkdayTransport
+from entity_cache import EntityCache
+from snapshot_store import RAASSnapshotStore
+from token_provider import TokenProvider, TokenSource
+
+from datetime import datetime, timezone
+import contextlib
+import hashlib
+import time
+from typing import Any, Dict, Optional, List, Union, Tuple, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
 import xml.etree.ElementTree as ET
 
 import requests
 
-from workday_new.workday.csv_helpers import CSVExportHelper
-from workday_new.workday.xml_helper import XMLHelper
+from workday_new.workday.csv_helpers import CSVExportHelper, CSVChunkWriter
+from workday_new.workday.xml_helper import XMLHelper, FieldExtractor, int_flag
 
 
 
 DEFAULT_NUM_ROW_LIMIT = 40000
 DEFAULT_WORKDAY_API_VERSION = 'v43.1'
 DEFAULT_WORKDAY_COUNT_PAGINATION = 999
+DEFAULT_BATCH_LOOKUP_SIZE = 100  # number of IDs packed into one `get_entities` request
+DEFAULT_STREAM_PARSE_CHUNK_SIZE = 64 * 1024  # number of bytes fed at once to the incremental parser
+
+"""How a RAAS report has been served """
+RAAS_FETCH_SNAPSHOT = 'snapshot'  # fresh local snapshot, no request sent
+RAAS_FETCH_NETWORK = 'network'  # report downloaded and parsed
+RAAS_FETCH_NOT_MODIFIED = 'not_modified'  # 304 answer to the conditional request
+RAAS_FETCH_HASH_MATCH = 'hash_match'  # same body as the previous download, parsing skipped
 
 """Master Data Scope """
 ASSET_CATEGORIES = 0
@@ -54,7 +70,8 @@ class WorkdayConnector:
     """
     def __init__(
             self, workday, tenant, client_id, client_secret, refresh_token,
-            version=DEFAULT_WORKDAY_API_VERSION, xml_version='1.0'
+            version=DEFAULT_WORKDAY_API_VERSION, xml_version='1.0',
+            transport: Optional[WorkdayTransport] = None,
     ):
         self.workday = workday
         self.tenant = tenant
@@ -63,11 +80,26 @@ class WorkdayConnector:
         self.refresh_token = refresh_token
         self.version = version
         self.xml_version = xml_version
-        self.access_token = None
         self.base_uri = f'https://{self.workday}'
+        # Shared HTTP transport, inject the same one into every service
+        self.transport = transport if transport is not None else WorkdayTransport()
+        # Shared access token, inject it as the `token` of every service so they get it refreshed
+        self.token_provider = TokenProvider(self._request_tokens)
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """ Last acquired access token, None before `acquire_token` """
+        return self.token_provider.access_token
 
-    @retry_on_500()
     def acquire_token(self):
+        self.token_provider.refresh()
+
+    @retry_on_500()
+    def _request_tokens(self) -> Dict[str, Any]:
+        """
+        Request a new access token with the refresh token
+        :return: OAuth answer: access_token, refresh_token, expires_in, ...
+        """
         refresh_url = f'{self.base_uri}/ccx/oauth2/{self.tenant}/token'
         payload = {
             'grant_type': 'refresh_token',  # constant value do not modify
@@ -79,12 +111,13 @@ class WorkdayConnector:
             'Content-Type': 'application/x-www-form-urlencoded'
         }
 
-        response = requests.post(refresh_url, data=payload, headers=headers)
+        response = self.transport.post(refresh_url, data=payload, headers=headers)
 
         if response.status_code == 200:
             tokens = response.json()
-            self.access_token = tokens.get('access_token')
-            self.refresh_token = tokens.get('refresh_token')
+            # the refresh token may be rotated, the next refresh has to send the new one
+            self.refresh_token = tokens.get('refresh_token') or self.refresh_token
+            return tokens
         else:
             response.raise_for_status()
 
@@ -100,23 +133,39 @@ class WorkdayService(ABC):
     """
     Generic  Workday API Call generator
     """
+    # Optional declarative fields of the entity, extracted with `self.field_extractor.extract(entry)`
+    FIELD_SPECS: Tuple[FieldSpec, ...] = ()
+
     def __init__(
             self,
             url: str,
             tenant: str,
-            token: str,
+            token: TokenSource,
             namespace: Dict[str, str],
             api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            transport: Optional[WorkdayTransport] = None,
+            cache: Optional[EntityCache] = None,
+            stream_parse: bool = False,
     ):
+        """
+        :param token: Access token provider shared with the other services, see `WorkdayConnector.token_provider`,
+            or a plain access token which is never refreshed
+        :param stream_parse: Parse the pages incrementally, each entity element is converted then dropped as soon as
+            it is closed, so the memory used by a page grows with the size of one entity instead of the whole page
+        """
         self.url = url
         self.tenant = tenant
-        self.token = token
+        self.token_provider = TokenProvider.of(token)
         self.namespace = namespace
         self.api_version = api_version
+        self.stream_parse = stream_parse
+        # HTTP transport (pooled keep-alive connections), share the same one across services
+        self.transport = transport if transport is not None else WorkdayTransport()
         # XML Parameters
         self.xml_helper = XMLHelper(ns=namespace)
-        # cache Dictionary
-        self.cache: Dict[str, T] = {}
+        self.field_extractor = FieldExtractor(self.FIELD_SPECS, self.xml_helper)
+        # LRU cache of the looked up entities (also remembers the IDs not found for a while)
+        self.cache: EntityCache = cache if cache is not None else EntityCache()
 
         # Pagination
         self.is_complete = False
@@ -174,6 +223,21 @@ class WorkdayService(ABC):
         """
         pass
 
+    def _generate_payload_batch(self, entity_ids: List[str], **kwargs) -> str:
+        """
+            Optional hook to generate one payload requesting all the provided entity IDs at once,
+            services which do not override it are looked up ID by ID in `get_entities` (see `supports_batch`)
+        :param entity_ids: IDs needed to call the endpoint and get the data
+        :param kwargs: other optional argument
+        :return: String XML request payload
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support batched lookups')
+
+    @property
+    def supports_batch(self) -> bool:
+        """ Whether the service overrides `_generate_payload_batch` to look up several IDs with one request """
+        return type(self)._generate_payload_batch is not WorkdayService._generate_payload_batch
+
     @staticmethod
     def filter_objects(items: List[T], condition: Callable[[T], bool]) -> List[T]:
         """
@@ -189,6 +253,16 @@ class WorkdayService(ABC):
         return list(filter(condition, items))
 
     # Internal Methods
+    @property
+    def token(self) -> Optional[str]:
+        return self.token_provider.get_token()
+
+    def _request_headers(self, token: Optional[str] = None) -> Dict[str, str]:
+        return {
+            'Content-Type': 'application/xml',
+            'Authorization': f'Bearer {token if token is not None else self.token}'
+        }
+
     @retry_on_500()
     def __call_endpoint(self, method: str, payload: Optional[str]) -> bytes:
         """
@@ -199,14 +273,11 @@ class WorkdayService(ABC):
         :return: Bytes representation of response payload
         :raise: Raises :class:`HTTPError`
         """
-        # Generate header
-        headers = {
-            'Content-Type': 'application/xml',
-            'Authorization': f'Bearer {self.token}'
-        }
-
         method = method.strip().upper()
-        response = requests.request(method, self.url, headers=headers, data=payload)
+        # sent again with a new token after a 401
+        response = self.token_provider.call_with_token(
+            lambda token: self.transport.request(method, self.url, headers=self._request_headers(token), data=payload)
+        )
 
         response.raise_for_status()  # Raise an error for bad status codes
 
@@ -223,9 +294,11 @@ class WorkdayService(ABC):
         :return: Return T or None if not found
         """
         if object_id:
-            # check whether the cache contains the requested OBJ
-            obj = self.cache.get(object_id)
-            if obj:
+            # check whether the cache contains the requested OBJ, or already knows it cannot be found
+            is_cached, obj = self.cache.lookup(object_id)
+            if is_cached:
+                if self.cache.is_not_found(obj):
+                    raise AssertionError(obj.reason)
                 return obj
 
             # Run Request otherwise
@@ -235,27 +308,47 @@ class WorkdayService(ABC):
             # Call the Raas endpoint and get payload result
             xml_response_data = self.__call_endpoint(method, payload)
 
-            root = ET.fromstring(xml_response_data)
-            # Find all Supplier_Data elements
-            entity_data_elements = root.findall(data_entity_path, self.namespace)
+            try:
+                entity = self._parse_single_entity(xml_response_data, data_entity_path)
+            except AssertionError as error:
+                self.cache.put_not_found(object_id, str(error))
+                raise
+
+            # update the cache with a new value
+            self.cache.put(object_id, entity)
+            return entity
 
-            entities: List[T] = []
+        return None
+
+    def _parse_single_entity(self, xml_response_data: bytes, data_entity_path: str) -> Optional[T]:
+        """
+        Parse the `get_entity` answer, which must hold exactly one entity
+
+        :param xml_response_data: XML answer payload
+        :param data_entity_path: The path of the data node tag to fetch, e.g: './/wd:Resource_Category_Data'
+        :return: Return T
+        :raise: AssertionError when the answer does not hold exactly one entity
+        """
+        # Find all Supplier_Data elements
+        _, entity_data_elements = self._parse_response(xml_response_data, data_entity_path)
 
-            # Iterate and print each Supplier_Data element
-            for entity in entity_data_elements:
-                element: Optional[T] = self._parse_entity_element(entity)
-                if element:
-                    # add the entity
-                    entities.append(element)
-                    # update the cache with a new value
-                    #self._update_cache(element)
+        entities: List[T] = []
 
-            # Assert to check that the list contains only one element
-            error_message = f"Expected list to contain exactly one element, but it has {len(entities)} elements."
-            assert len(entities) == 1, error_message
+        # Iterate and print each Supplier_Data element
+        for entity in entity_data_elements:
+            element: Optional[T] = self._parse_entity_element(entity)
+            if element:
+                # add the entity
+                entities.append(element)
+                # update the cache with a new value
+                #self._update_cache(element)
 
-            if len(entities) == 1:
-                return entities[0]
+        # Assert to check that the list contains only one element
+        error_message = f"Expected list to contain exactly one element, but it has {len(entities)} elements."
+        assert len(entities) == 1, error_message
+
+        if len(entities) == 1:
+            return entities[0]
 
         return None
 
@@ -271,10 +364,10 @@ class WorkdayService(ABC):
         :return: Return T or None if not found
         """
         if object_id:
-            # check whether the cache contains the requested Object
-            obj = self.cache.get(object_id)
-            if obj:
-                return obj
+            # check whether the cache contains the requested Object, or already knows it cannot be found
+            is_cached, obj = self.cache.lookup(object_id)
+            if is_cached:
+                return None if self.cache.is_not_found(obj) else obj
 
             # Run Request otherwise
             # generate payload
@@ -283,76 +376,273 @@ class WorkdayService(ABC):
             # Call the Raas endpoint and get payload result
             xml_response_data = self.__call_endpoint(method, payload)
 
-            root = ET.fromstring(xml_response_data)
-            # Find all Supplier_Data elements
-            entity_data_elements = root.findall(data_entity_path, self.namespace)
+            entity = self._search_entity_in_response(xml_response_data, data_entity_path, object_id)
+            if entity is None:
+                self.cache.put_not_found(object_id, f'{object_id} not found in the search response')
+            else:
+                self.cache.put(object_id, entity)
+            return entity
+
+        return None
+
+    def _search_entity_in_response(self, xml_response_data: bytes, data_entity_path: str, object_id: str) -> Optional[T]:
+        """
+        Look for the entity matching the provided ID in the `search_entity` answer
+
+        :param xml_response_data: XML answer payload
+        :param data_entity_path: The path of the data node tag to fetch, e.g: './/wd:Resource_Category_Data'
+        :param object_id: Entity ID
+        :return: Return T or None if not found
+        """
+        # Find all Supplier_Data elements
+        _, entity_data_elements = self._parse_response(xml_response_data, data_entity_path)
 
-            # Iterate and print each Supplier_Data element
-            for entity in entity_data_elements:
-                parsed_obj_id = self._get_entity_id(entity)
-                element: Optional[T] = self._parse_entity_element(entity)
-                if element and parsed_obj_id == object_id:
-                    return element
+        # Iterate and print each Supplier_Data element
+        for entity in entity_data_elements:
+            parsed_obj_id = self._get_entity_id(entity)
+            element: Optional[T] = self._parse_entity_element(entity)
+            if element and parsed_obj_id == object_id:
+                return element
 
         return None
 
 
+    def get_entities(
+            self,
+            object_ids: Iterable[str],
+            data_entity_path: str,
+            chunk_size: int = DEFAULT_BATCH_LOOKUP_SIZE,
+            method: Optional[str] = 'POST',
+            **kwargs
+    ) -> Dict[str, T]:
+        """
+        Get the matching Entities regarding the provided IDs, packing up to `chunk_size` IDs into each request
+
+        :param object_ids: Entity IDs, duplicates and empty values are ignored
+        :param data_entity_path: The path of the data node tag to fetch, e.g: './/wd:Supplier_Data'
+        :param chunk_size: Number of IDs requested by call, capped to the page size (999)
+        :param method: HTTP Method to query with e.g: [POST, GET, PATCH, DELETE, ...]
+        :return: Dict of key = Entity ID : T, IDs not found are missing from the dict
+        """
+        entities: Dict[str, T] = {}
+        missing_ids: List[str] = []
+
+        for object_id in dict.fromkeys(object_ids):
+            if not object_id:
+                continue
+            # check whether the cache contains the requested OBJ, or already knows it cannot be found
+            is_cached, obj = self.cache.lookup(object_id)
+            if not is_cached:
+                missing_ids.append(object_id)
+            elif not self.cache.is_not_found(obj):
+                entities[object_id] = obj
+
+        if not self.supports_batch:
+            # fall back on the point lookups
+            for object_id in missing_ids:
+                try:
+                    entities[object_id] = self.get_entity(object_id, data_entity_path, method, **kwargs)
+                except AssertionError as error:
+                    print(f'{object_id} not found: {error}')
+            return entities
+
+        chunk_size = max(1, min(chunk_size, DEFAULT_WORKDAY_COUNT_PAGINATION))
+        for index in range(0, len(missing_ids), chunk_size):
+            chunk = missing_ids[index:index + chunk_size]
+            payload = self._generate_payload_batch(chunk, **kwargs)
+            xml_response_data = self.__call_endpoint(method, payload)
+            found = self._parse_entities_by_id(xml_response_data, data_entity_path)
+            entities.update(found)
+            self._cache_batch_results(chunk, found)
+            print(f'Batched lookup: found {len(found)} / {len(chunk)} entities')
+
+        return entities
+
+    def _cache_batch_results(self, requested_ids: List[str], found: Dict[str, T]):
+        self.cache.update(found)
+        for object_id in requested_ids:
+            if object_id not in found:
+                self.cache.put_not_found(object_id, f'{object_id} not found in the batched lookup response')
+
+    def _parse_entities_by_id(self, xml_response_data: bytes, data_entity_path: str) -> Dict[str, T]:
+        """
+        Parse every entity of the answer and key it with its ID (see `_get_entity_id`)
+
+        :param xml_response_data: XML answer payload
+        :param data_entity_path: The path of the data node tag to fetch, e.g: './/wd:Supplier_Data'
+        :return: Dict of key = Entity ID : T
+        """
+        _, entity_data_elements = self._parse_response(xml_response_data, data_entity_path)
+        entities: Dict[str, T] = {}
+
+        for entity in entity_data_elements:
+            entity_id = self._get_entity_id(entity)
+            element: Optional[T] = self._parse_entity_element(entity)
+            if entity_id and element:
+                entities[entity_id] = element
+
+        return entities
+
     # METHOD FOR GETTING ALL THE ENTITIES FROM ALL THE PAGINATION
-    def __parse_all_entities_page(self, xml_input: Union[str, bytes], entity_entry_data_path: str) -> List[T]:
-        # Check if the input is bytes and convert to string if necessary
-        if isinstance(xml_input, bytes):
-            xml_input = self.xml_helper.bytes_to_utf8_string(xml_input)
+    def _parse_page_entry(self, entry_data_: ET.Element) -> Optional[T]:
+        """
+        Convert one entity element of a page, the failures are tracked into `failed_entity`
+        :param entry_data_: XML element Node to convert
+        :return: T, None when it is skipped or cannot be converted
+        """
+        try:
+            return self._parse_entity_element(entry_data_)
+        except Exception as error:
+            print(error)
+            self.failed_entity.append(
+                FailedProcessedJournal(
+                    journal_id=self._get_entity_id(entry_data_),
+                    data=str(entry_data_),
+                    error_message=str(error),
+                    datetime=str(datetime.now()),
+                    reason=
+                    f'Could not extract data from XML payload in `parse_journals` at page {self.next_page - 1}'
+                )
+            )
+            return None
+
+    def _parse_response(
+            self,
+            xml_input: Union[str, bytes],
+            data_entity_path: str
+    ) -> Tuple[ResponseResults, List[ET.Element]]:
+        """
+        Parse a SOAP answer once and return its pagination metadata with its entity elements
 
+        :param xml_input: XML answer payload, the bytes are given as is to the parser (no UTF-8 string copy)
+        :param data_entity_path: The path of the data node tag to fetch, e.g: './/wd:Journal_Entry_Data'
+        :return: (ResponseResults, entity elements)
+        """
         root = ET.fromstring(xml_input)
-        ns = self.namespace
+        response_results = self._read_response_results(root.find('.//wd:Response_Results', self.namespace))
 
-        root_entry_data = root.findall(entity_entry_data_path, ns)
-        #print(len(root_entry_data))
+        return response_results, root.findall(data_entity_path, self.namespace)
 
+    def _parse_page_entries(self, root_entry_data: List[ET.Element]) -> List[T]:
         parsed_entities = []
 
         for entry_data_ in root_entry_data:
-            try:
-                parsed_entry: Optional[T] = self._parse_entity_element(entry_data_)
-                if parsed_entry is not None:
-                    parsed_entities.append(parsed_entry)
-            except Exception as error:
-                print(error)
-                self.failed_entity.append(
-                    FailedProcessedJournal(
-                        journal_id=self._get_entity_id(entry_data_),
-                        data=str(entry_data_),
-                        error_message=str(error),
-                        datetime=str(datetime.now()),
-                        reason=
-                        f'Could not extract data from XML payload in `parse_journals` at page {self.next_page - 1}'
-                    )
-                )
+            parsed_entry: Optional[T] = self._parse_page_entry(entry_data_)
+            if parsed_entry is not None:
+                parsed_entities.append(parsed_entry)
 
         return parsed_entities
 
-    def __extract_response_results(self, xml_data: Union[str, bytes]) -> ResponseResults:
+    def _parse_all_entities_page(self, xml_input: Union[str, bytes], entity_entry_data_path: str) -> List[T]:
+        _, root_entry_data = self._parse_response(xml_input, entity_entry_data_path)
+
+        return self._parse_page_entries(root_entry_data)
+
+    def _get_streaming_tag(self, data_entity_path: str) -> Optional[str]:
         """
-            Extract the Response_Results node into object
-        :param xml_data: XML answer payload
+        Convert a descendant path e.g: './/wd:Journal_Entry_Data' into the qualified tag matched while streaming
+        :param data_entity_path: The path of the data node tag to fetch
+        :return: '{urn:com.workday/bsvc}Journal_Entry_Data', None when the path cannot be matched by its tag only
+        """
+        if not data_entity_path.startswith('.//'):
+            return None
+        step = data_entity_path[3:]
+        if not step or any(character in step for character in '/[*@'):
+            return None
+
+        prefix, _, name = step.rpartition(':')
+        if not prefix:
+            return name
+        if prefix not in self.namespace:
+            return None
+        return '{' + self.namespace[prefix] + '}' + name
+
+    def _stream_parse_page(
+            self,
+            xml_input: Union[str, bytes],
+            entity_entry_data_path: str
+    ) -> Tuple[ResponseResults, List[T]]:
+        """
+        Parse a page in one incremental pass: every entity element is converted as soon as it is closed then dropped
+        from the tree, and the `Response_Results` node is read on the way
+
+        :param xml_input: XML answer payload
+        :param entity_entry_data_path: The XML path element that holds the entry data e.g: './/wd:Journal_Entry_Data'
+        :return: (ResponseResults, List of converted entry into object type T)
+        """
+        entity_tag = self._get_streaming_tag(entity_entry_data_path)
+        if entity_tag is None:
+            # complex path, it needs the whole tree
+            response_results, root_entry_data = self._parse_response(xml_input, entity_entry_data_path)
+            return response_results, self._parse_page_entries(root_entry_data)
+
+        if isinstance(xml_input, str):
+            xml_input = xml_input.encode('utf-8')
+
+        response_results_tag = self._get_streaming_tag('.//wd:Response_Results')
+        response_results: Optional[ResponseResults] = None
+        parsed_entities: List[T] = []
+
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        # open elements, to detach each entity from its parent once converted
+        open_elements: List[ET.Element] = []
+        for offset in range(0, len(xml_input), DEFAULT_STREAM_PARSE_CHUNK_SIZE):
+            parser.feed(xml_input[offset:offset + DEFAULT_STREAM_PARSE_CHUNK_SIZE])
+
+            for event, element in parser.read_events():
+                if event == 'start':
+                    open_elements.append(element)
+                    continue
+
+                open_elements.pop()
+                if element.tag == entity_tag:
+                    parsed_entry: Optional[T] = self._parse_page_entry(element)
+                    if parsed_entry is not None:
+                        parsed_entities.append(parsed_entry)
+                elif element.tag == response_results_tag:
+                    response_results = self._read_response_results(element)
+                else:
+                    continue
+
+                element.clear()
+                if open_elements:
+                    open_elements[-1].remove(element)
+        parser.close()
+
+        if response_results is None:
+            response_results = ResponseResults(total_results=0, total_pages=1, page_results=0, page=1)
+
+        return response_results, parsed_entities
+
+    def _parse_page(self, xml_input: Union[str, bytes], entity_entry_data_path: str) -> Tuple[ResponseResults, List[T]]:
+        """
+        Read the pagination metadata and convert the entities of a page
+        :param xml_input: XML answer payload
+        :param entity_entry_data_path: The XML path element that holds the entry data e.g: './/wd:Journal_Entry_Data'
+        :return: (ResponseResults, List of converted entry into object type T)
+        """
+        if self.stream_parse:
+            response_results, parsed_entities = self._stream_parse_page(xml_input, entity_entry_data_path)
+        else:
+            response_results, root_entry_data = self._parse_response(xml_input, entity_entry_data_path)
+            parsed_entities = self._parse_page_entries(root_entry_data)
+        print(f'total_results: {response_results.total_results}')
+
+        return response_results, parsed_entities
+
+    def _read_response_results(self, response_filter: Optional[ET.Element]) -> ResponseResults:
+        """
+            Convert the Response_Results node into object
+        :param response_filter: Response_Results element, None when the answer has none
         :return: ResponseResults object
         """
-        # Check if the input is bytes and convert to string if necessary
-        if isinstance(xml_data, bytes):
-            xml_data = self.xml_helper.bytes_to_utf8_string(xml_data)
-        # Parse the XML data
-        root = ET.fromstring(xml_data)
-        # Namespace dictionary to help with the parsing
         ns = self.namespace
-        # Find the Response_Filter element
-        response_filter = root.find('.//wd:Response_Results', ns)
         if response_filter is not None:
             # Extract the fields from the Response_Results element
             total_results = response_filter.find('wd:Total_Results', ns).text if response_filter.find(
                 'wd:Total_Results',
                 ns
             ).text is not None else None
-            print(f'total_results: {response_filter.find("wd:Total_Results", ns).text}')
             total_pages = response_filter.find('wd:Total_Pages', ns).text if response_filter.find(
                 'wd:Total_Pages',
                 ns
@@ -381,13 +671,113 @@ class WorkdayService(ABC):
                 page=1
             )
 
-    def get_all_entities(self, entity_entry_data_path: str, **kwargs) -> List[T]:
+    def __fetch_page(self, page: int, **kwargs) -> bytes:
+        """
+        Generate the pagination payload and call the endpoint for the given page
+        :param page: page number to fetch
+        :param kwargs: optional argument which might be used for forging the payload
+        :return: Bytes representation of response payload
+        """
+        payload = self._generate_payload_pagination(page, **kwargs)
+        return self.__call_endpoint('POST', payload)
+
+    def __fetch_pages_concurrently(self, pages: range, entity_entry_data_path: str, max_workers: int, **kwargs):
+        """
+        Fetch the given pages with a bounded pool of threads, and parse them in page order on the calling thread
+        (the parsing hooks update the service state and are not thread safe).
+        A page which cannot be fetched is tracked into `failed_entity` instead of aborting the whole run.
+
+        :param pages: range of the page numbers to fetch
+        :param entity_entry_data_path: The XML path element that holds the entry data e.g: './/wd:Journal_Entry_Data'
+        :param max_workers: Maximum number of pages fetched at the same time
+        :param kwargs: optional argument which might be used for forging the payload
+        """
+        # keep a bounded window of pages in flight, so the fetched payloads waiting to be parsed stay limited
+        window = max_workers * 2
+        pending: List[Tuple[int, Future]] = []
+        pages_iterator = iter(pages)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for page in pages_iterator:
+                pending.append((page, executor.submit(self.__fetch_page, page, **kwargs)))
+                if len(pending) >= window:
+                    break
+
+            while pending:
+                page, future = pending.pop(0)
+                # refill the window
+                next_page = next(pages_iterator, None)
+                if next_page is not None:
+                    pending.append((next_page, executor.submit(self.__fetch_page, next_page, **kwargs)))
+
+                self.next_page = page
+                try:
+                    response_content = future.result()
+                except Exception as error:
+                    self.__track_failed_page(page, error)
+                    continue
+
+                _, entities = self._parse_page(response_content, entity_entry_data_path)
+                self.all_entity.extend(entities)
+
+    def __fetch_pages_prefetched(self, pages: range, entity_entry_data_path: str, depth: int, **kwargs):
+        """
+        Fetch the given pages in order on a background thread staying up to `depth` pages ahead,
+        while they are parsed on the calling thread: the next request is on the wire during the parsing.
+        A page which cannot be fetched is tracked into `failed_entity` instead of aborting the whole run.
+
+        :param pages: range of the page numbers to fetch
+        :param entity_entry_data_path: The XML path element that holds the entry data e.g: './/wd:Journal_Entry_Data'
+        :param depth: Maximum number of fetched pages waiting to be parsed
+        :param kwargs: optional argument which might be used for forging the payload
+        """
+        # closing: a parsing error stops the fetcher thread right away, not when the generator is collected
+        with contextlib.closing(
+                prefetch_pages(lambda page: self.__fetch_page(page, **kwargs), pages, depth)
+        ) as fetched_pages:
+            for page, response_content, error in fetched_pages:
+                self.next_page = page
+                if error is not None:
+                    self.__track_failed_page(page, error)
+                    continue
+
+                _, entities = self._parse_page(response_content, entity_entry_data_path)
+                self.all_entity.extend(entities)
+
+    def __track_failed_page(self, page: int, error: Exception):
+        print(f'Page {page} failed: {error}')
+        self.failed_entity.append(
+            FailedProcessedJournal(
+                journal_id=None,
+                error_message=str(error),
+                datetime=str(datetime.now()),
+                reason=f'Could not fetch page {page} in `get_all_entities`'
+            )
+        )
+
+    def get_all_entities(
+            self,
+            entity_entry_data_path: str,
+            max_workers: Optional[int] = None,
+            prefetch_depth: int = 0,
+            **kwargs
+    ) -> List[T]:
         """
         Get all entities from all pages with the given [kwargs] argument
         :param entity_entry_data_path: The XML path element that holds the entry data e.g: './/wd:Journal_Entry_Data'
+        :param max_workers: Opt-in, fetch the pages 2..N concurrently with at most `max_workers` requests in flight.
+            All the pages are pinned to the same `As_Of_Entry_DateTime` snapshot to stay consistent.
+        :param prefetch_depth: Opt-in, when the pages are not fetched concurrently, a background thread fetches
+            the pages 2..N in order and stays up to `prefetch_depth` pages ahead of the parsing (0 = fetch then parse)
         :param kwargs: optional argument which might be used for forging the payload
         :return: List of converted entry into object type T
         """
+        is_concurrent = max_workers is not None and max_workers > 1
+        if is_concurrent and kwargs.get('as_of_entry_datetime') is None:
+            # pin every page on the same snapshot, the pages are not fetched in order anymore
+            kwargs['as_of_entry_datetime'] = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+            print(f"Pages pinned on As_Of_Entry_DateTime: {kwargs['as_of_entry_datetime']}")
+
         # Fetch all FX rates using pagination
         # First call, get the first page
         # init inner entities
@@ -397,29 +787,35 @@ class WorkdayService(ABC):
         #print(f'payload: {payload}')
         response_content = self.__call_endpoint('POST', payload)
 
-        # Check for the result page data in the response
-        next_page_data = self.__extract_response_results(response_content)
+        # Check for the result page data in the response, and get first results
+        next_page_data, entities = self._parse_page(response_content, entity_entry_data_path)
 
         self.total_page = next_page_data.total_pages
         self.next_page = next_page_data.page
         self.total_record = next_page_data.total_results
 
-        # get first results
-        entities = self.__parse_all_entities_page(response_content, entity_entry_data_path)
         print(f'Found: {len(entities)} entities')
         # make sure only available lines ore kept
         self.all_entity.extend(entities)
         # get other page results
         if next_page_data.page >= 1:
-            for page in range(2, self.total_page + 1):
-                # call next page
-                self.next_page = page
-                # Generate payload for the next pagination
-                payload = self._generate_payload_pagination(page, **kwargs)
-                response_content = self.__call_endpoint('POST', payload)
+            if is_concurrent:
+                self.__fetch_pages_concurrently(
+                    range(2, self.total_page + 1), entity_entry_data_path, max_workers, **kwargs
+                )
+            elif prefetch_depth > 0:
+                self.__fetch_pages_prefetched(
+                    range(2, self.total_page + 1), entity_entry_data_path, prefetch_depth, **kwargs
+                )
+            else:
+                for page in range(2, self.total_page + 1):
+                    # call next page
+                    self.next_page = page
+                    # Generate payload for the next pagination
+                    response_content = self.__fetch_page(page, **kwargs)
 
-                entities = self.__parse_all_entities_page(response_content, entity_entry_data_path)
-                self.all_entity.extend(entities)
+                    _, entities = self._parse_page(response_content, entity_entry_data_path)
+                    self.all_entity.extend(entities)
 
         # Now `all_fx_rates` contains all the FX rates retrieved across all pages
         print(f"Total Journals fetched: {len(self.all_entity)}")
@@ -451,12 +847,10 @@ class WorkdayService(ABC):
         payload = self._generate_payload_pagination(page, count=entity_count, **kwargs)
         print(f'payload: {payload}')
         response_content = self.__call_endpoint('POST', payload)
-        # Check for the result page data in the response
-        next_page_data = self.__extract_response_results(response_content)
+        # Check for the result page data in the response, and get results
+        next_page_data, entities = self._parse_page(response_content, entity_entry_data_path)
         self.total_page = next_page_data.total_pages
         self.total_record = next_page_data.total_results
-        # get results
-        entities = self.__parse_all_entities_page(response_content, entity_entry_data_path)
         print(f'Parsed: {len(entities)} entities over {self.total_page}')
 
         self.is_complete = len(entities) == entity_count or len(entities) == self.total_record % entity_count
@@ -483,22 +877,36 @@ class WorkdayRAASService(ABC):
     Generic Service to support RAAS endpoint
     (One export Payload answer)
     """
+    # Optional declarative fields of the report entry, extracted with `self.field_extractor.extract(entry)`
+    FIELD_SPECS: Tuple[FieldSpec, ...] = ()
+
     def __init__(
             self,
             url: str,
             tenant: str,
-            token: str,
+            token: TokenSource,
             wd_ns_value: str,  # Ex: 'urn:com.workday.report/INT-UPD-001_MasterData_Companies'
+            transport: Optional[WorkdayTransport] = None,
+            snapshot_store: Optional[RAASSnapshotStore] = None,
     ):
         self.url = url
         self.tenant = tenant
-        self.token = token
+        self.token_provider = TokenProvider.of(token)
+        # HTTP transport (pooled keep-alive connections), share the same one across services
+        self.transport = transport if transport is not None else WorkdayTransport()
         # XML Parameters
         self.wd_ns_value = wd_ns_value
         self.raas_ns = {'wd': self.wd_ns_value}
         self.xml_helper = XMLHelper(ns=self.raas_ns)
+        self.field_extractor = FieldExtractor(self.FIELD_SPECS, self.xml_helper)
         # cache Dictionary
         self.cache: Dict[str, T] = {}
+        # Opt-in local snapshots of the parsed report
+        self.snapshot_store = snapshot_store
+        self.report_name = type(self).__name__
+        # Last version of the report served and how it has been served
+        self._last_snapshot: Optional[RAASSnapshot] = None
+        self.last_fetch: Optional[RAASFetchReport] = None
 
     def get_raas_att_path(self, prpty: str):
         return '{' + self.raas_ns.get('wd') + '}' + prpty
@@ -527,25 +935,37 @@ class WorkdayRAASService(ABC):
         """
         pass
 
+    @property
+    def token(self) -> Optional[str]:
+        return self.token_provider.get_token()
+
+    def _request_headers(self, token: Optional[str] = None) -> Dict[str, str]:
+        return {
+            'Content-Type': 'application/xml',
+            'Authorization': f'Bearer {token if token is not None else self.token}'
+        }
+
     @retry_on_500()
-    def __call_endpoint(self) -> bytes:
+    def __call_endpoint(self, extra_headers: Optional[Dict[str, str]] = None) -> requests.Response:
         """
-        Implemented method to call an API GET endpoint and return the raw response as bytes
+        Implemented method to call an API GET endpoint and return the response
 
-        :return: Bytes representation of response payload
+        :param extra_headers: Headers added to the request, e.g: the conditional request validators
+        :return: Response, its status is 200 or 304 (Not Modified)
         :raise: Raises :class:`HTTPError`
         """
-        # Generate header
-        headers = {
-            'Content-Type': 'application/xml',
-            'Authorization': f'Bearer {self.token}'
-        }
+        def send(token: Optional[str]) -> requests.Response:
+            headers = self._request_headers(token)
+            if extra_headers:
+                headers.update(extra_headers)
+            return self.transport.get(self.url, headers=headers)
 
-        response = requests.get(self.url, headers=headers)
+        # sent again with a new token after a 401
+        response = self.token_provider.call_with_token(send)
 
         response.raise_for_status()  # Raise an error for bad status codes
 
-        return response.content
+        return response
 
     def _parse_all_raas_element(self, element_entries_path: str = 'wd:Report_Entry') -> Dict[str, T]:
         """
@@ -555,8 +975,18 @@ class WorkdayRAASService(ABC):
         :return: Dict of key = Entity ID : T
         """
         # Call the Raas endpoint and get payload result
-        xml_data = self.__call_endpoint()
+        xml_data = self.__call_endpoint().content
+
+        return self._parse_raas_payload(xml_data, element_entries_path)
 
+    def _parse_raas_payload(self, xml_data: Union[str, bytes], element_entries_path: str = 'wd:Report_Entry') -> Dict[str, T]:
+        """
+        Convert the RAAS answer payload into a dictionary
+
+        :param xml_data: XML answer payload
+        :param element_entries_path: path of the element node entries to retrieve
+        :return: Dict of key = Entity ID : T
+        """
         # Check if the input is bytes and convert to string if necessary
         if isinstance(xml_data, bytes):
             xml_data = self.xml_helper.bytes_to_utf8_string(xml_data)
@@ -580,13 +1010,144 @@ class WorkdayRAASService(ABC):
 
         return element_dict
 
+    def _snapshot_key(self) -> str:
+        return f'{self.report_name}|{self.url}'
+
+    def _load_fresh_snapshot(self) -> Optional[RAASSnapshot]:
+        """
+        Get the snapshot of the report still valid, the one kept in memory first then the local store one
+        :return: RAASSnapshot, None when missing or expired
+        """
+        if self.snapshot_store is None:
+            return None
+
+        if self._last_snapshot is not None and self.snapshot_store.is_fresh(self._last_snapshot, self.report_name):
+            return self._last_snapshot
+
+        snapshot = self.snapshot_store.get_snapshot(self._snapshot_key())
+        if snapshot is not None and self.snapshot_store.is_fresh(snapshot, self.report_name):
+            self._last_snapshot = snapshot
+            return snapshot
+
+        return None
+
+    def _previous_snapshot(self) -> Optional[RAASSnapshot]:
+        """
+        Get the last known version of the report, even expired, to send a conditional request
+        :return: RAASSnapshot, None when the report has never been downloaded
+        """
+        if self._last_snapshot is None and self.snapshot_store is not None:
+            self._last_snapshot = self.snapshot_store.get_snapshot(self._snapshot_key())
+
+        return self._last_snapshot
+
+    @staticmethod
+    def _conditional_headers(previous: Optional[RAASSnapshot]) -> Dict[str, str]:
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers['If-None-Match'] = previous.etag
+            if previous.last_modified:
+                headers['If-Modified-Since'] = previous.last_modified
+
+        return headers
+
+    @staticmethod
+    def _hash_body(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def _read_raas_response(
+            self,
+            response: requests.Response,
+            previous: Optional[RAASSnapshot],
+            element_entries_path: str = 'wd:Report_Entry',
+    ) -> Tuple[str, Dict[str, T], Optional[str]]:
+        """
+        Get the report data from the response, the previous one is reused when the report did not change
+        :param response: RAAS endpoint response
+        :param previous: Last known version of the report
+        :param element_entries_path: path of the element node entries to retrieve
+        :return: (fetch status, Dict of key = Entity ID : T, body hash)
+        :raise: ProcessException on a 304 answer to a request sent without validators, there is no report to reuse
+        """
+        if response.status_code == 304:
+            if previous is None:
+                raise ProcessException(f'{self.report_name}: 304 Not Modified answered without any previous report')
+            return RAAS_FETCH_NOT_MODIFIED, previous.data, previous.body_hash
+
+        body_hash = self._hash_body(response.content)
+        if previous is not None and previous.body_hash == body_hash:
+            return RAAS_FETCH_HASH_MATCH, previous.data, body_hash
+
+        return RAAS_FETCH_NETWORK, self._parse_raas_payload(response.content, element_entries_path), body_hash
+
+    def _record_fetch(
+            self,
+            status: str,
+            data: Dict[str, T],
+            response: Optional[requests.Response] = None,
+            body_hash: Optional[str] = None,
+    ):
+        """
+        Keep the report version just served (memory and local store) and report how it has been served
+        :param status: RAAS_FETCH_* status
+        :param data: Dict of key = Entity ID : T
+        :param response: RAAS endpoint response, None when served from the snapshot
+        :param body_hash: Hash of the report body
+        """
+        if response is not None:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            previous = self._last_snapshot
+            if status != RAAS_FETCH_NETWORK and previous is not None:
+                # a 304 may not repeat the validators, keep the ones of the unchanged report
+                etag = etag or previous.etag
+                last_modified = last_modified or previous.last_modified
+
+            if self.snapshot_store is None:
+                created_at = time.time()
+            elif status == RAAS_FETCH_NETWORK:
+                created_at = self.snapshot_store.save(
+                    self._snapshot_key(), self.report_name, data,
+                    etag=etag, last_modified=last_modified, body_hash=body_hash,
+                ).created_at
+            else:
+                # same report, restart its TTL and keep its new validators for the next runs
+                created_at = self.snapshot_store.touch(
+                    self._snapshot_key(), etag=etag, last_modified=last_modified, body_hash=body_hash
+                )
+
+            self._last_snapshot = RAASSnapshot(
+                data=data, created_at=created_at, etag=etag, last_modified=last_modified, body_hash=body_hash
+            )
+
+        self.last_fetch = RAASFetchReport(report_name=self.report_name, status=status, entries=len(data))
+        print(f'{self.report_name}: {len(data)} entries ({status}).')
+
     def get_entity_dic(self) -> Dict[str, T]:
         """
             Call the internal function to compute all the data and return it as a dictionary of UID and their matching
-            object T
-        :return: Dict of UID and Object T
+            object T.
+            The report is requested with the validators of its last version (ETag / Last-Modified) and is not parsed
+            again when Workday answers 304 or the same body, `last_fetch` tells how it has been served.
+        :return: Dict of UID and Object T, a new dict on each call: the snapshot kept for the next calls is not changed
+            by the caller adding or removing entries
         """
-        data = self._parse_all_raas_element()
-
-        return data
+        snapshot = self._load_fresh_snapshot()
+        if snapshot is not None:
+            self._record_fetch(RAAS_FETCH_SNAPSHOT, snapshot.data)
+            return dict(snapshot.data)
+
+        previous = self._previous_snapshot()
+        response = self.__call_endpoint(self._conditional_headers(previous))
+        status, data, body_hash = self._read_raas_response(response, previous)
+        self._record_fetch(status, data, response, body_hash)
+
+        return dict(data)
+
+    def invalidate_snapshot(self):
+        """ Drop the local snapshot of the report, the next `get_entity_dic` call downloads it again """
+        self._last_snapshot = None
+        if self.snapshot_store is not None:
+            self.snapshot_store.invalidate(self.report_name)
 
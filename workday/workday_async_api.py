@@ -0,0 +1,330 @@
+"""
+Asyncio counterparts of the generic Workday services.
+
+`AsyncWorkdayService` and `AsyncWorkdayRAASService` wrap an existing concrete service
+(`GetAllJournals`, `GetRAASSuppliers`, `GetRAASCostCenter`, ...) and reuse its payload and parsing hooks unchanged.
+The HTTP calls run on the service transport in worker threads, and all the services sharing the same
+`asyncio.Semaphore` share the same limit of requests in flight.
+The journal pages and the RAAS reports are parsed in a worker thread too, one at a time, so the event loop keeps
+sending the requests meanwhile. The single entity answers are small and stay parsed on the event loop thread.
+"""
+import asyncio
+from itertools import islice
+from datetime import datetime, timezone
+from typing import Dict, Optional, List, Tuple, Generic, Iterable
+
+from models import *
+from utils import async_retry_on_500
+from workday_api_generator_call import WorkdayService, WorkdayRAASService, DEFAULT_BATCH_LOOKUP_SIZE, \
+    DEFAULT_WORKDAY_COUNT_PAGINATION, RAAS_FETCH_SNAPSHOT
+
+DEFAULT_MAX_IN_FLIGHT = 8
+
+
+def create_request_limiter(max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> asyncio.Semaphore:
+    """
+    Create the limiter to share across all the async services of a run
+    :param max_in_flight: Maximum number of HTTP requests in flight at the same time
+    :return: asyncio.Semaphore
+    """
+    return asyncio.Semaphore(max_in_flight)
+
+
+class AsyncWorkdayService(Generic[T]):
+    """
+    Awaitable Workday API Call generator wrapping a concrete `WorkdayService`
+    """
+    def __init__(self, service: WorkdayService, limiter: Optional[asyncio.Semaphore] = None):
+        """
+        :param service: Concrete service providing the payload and parsing hooks
+        :param limiter: Shared limit on the requests in flight, a dedicated one is created by default
+        """
+        self.service = service
+        self.limiter = limiter if limiter is not None else create_request_limiter()
+
+    def __getattr__(self, item):
+        # expose the wrapped service state (failed_entity, total_record, is_complete, ...)
+        return getattr(self.service, item)
+
+    @async_retry_on_500()
+    async def _call_endpoint(self, method: str, payload: Optional[str]) -> bytes:
+        """
+        Call the service endpoint without blocking the event loop and return the raw response as bytes
+
+        :param method: HTTP method [POST, GET, ...]
+        :param payload: Request payload
+        :return: Bytes representation of response payload
+        :raise: Raises :class:`HTTPError`
+        """
+        method = method.strip().upper()
+        async with self.limiter:
+            # sent again with a new token after a 401
+            response = await self.service.token_provider.call_with_token_async(
+                lambda token: asyncio.to_thread(
+                    self.service.transport.request,
+                    method,
+                    self.service.url,
+                    headers=self.service._request_headers(token),
+                    data=payload,
+                )
+            )
+
+        response.raise_for_status()  # Raise an error for bad status codes
+
+        return response.content
+
+    async def get_entity(self, object_id: str, data_entity_path: str, method: Optional[str] = 'POST', **kwargs) -> Optional[
+        T]:
+        """
+        Get the matching Entity regarding the provided ID, see `WorkdayService.get_entity`
+
+        :param object_id: Entity ID
+        :param data_entity_path: The path of the data node tag to fetch, e.g: './/wd:Resource_Category_Data'
+        :param method: HTTP Method to query with e.g: [POST, GET, PATCH, DELETE, ...]
+        :return: Return T or None if not found
+        """
+        if object_id:
+            is_cached, obj = self.service.cache.lookup(object_id)
+            if is_cached:
+                if self.service.cache.is_not_found(obj):
+                    raise AssertionError(obj.reason)
+                return obj
+
+            payload = self.service._generate_payload(object_id, **kwargs)
+            xml_response_data = await self._call_endpoint(method, payload)
+
+            try:
+                entity = self.service._parse_single_entity(xml_response_data, data_entity_path)
+            except AssertionError as error:
+                self.service.cache.put_not_found(object_id, str(error))
+                raise
+
+            self.service.cache.put(object_id, entity)
+            return entity
+
+        return None
+
+    async def search_entity(self, object_id: str, data_entity_path: str, method: Optional[str] = 'POST', **kwargs) -> Optional[
+        T]:
+        """
+        Search the matching Entity regarding the provided ID in a one payload response, see `WorkdayService.search_entity`
+
+        :param object_id: Entity ID
+        :param data_entity_path: The path of the data node tag to fetch, e.g: './/wd:Resource_Category_Data'
+        :param method: HTTP Method to query with e.g: [POST, GET, PATCH, DELETE, ...]
+        :return: Return T or None if not found
+        """
+        if object_id:
+            is_cached, obj = self.service.cache.lookup(object_id)
+            if is_cached:
+                return None if self.service.cache.is_not_found(obj) else obj
+
+            payload = self.service._generate_payload(object_id, **kwargs)
+            xml_response_data = await self._call_endpoint(method, payload)
+
+            entity = self.service._search_entity_in_response(xml_response_data, data_entity_path, object_id)
+            if entity is None:
+                self.service.cache.put_not_found(object_id, f'{object_id} not found in the search response')
+            else:
+                self.service.cache.put(object_id, entity)
+            return entity
+
+        return None
+
+    async def get_entities(
+            self,
+            object_ids: Iterable[str],
+            data_entity_path: str,
+            chunk_size: int = DEFAULT_BATCH_LOOKUP_SIZE,
+            method: Optional[str] = 'POST',
+            **kwargs
+    ) -> Dict[str, T]:
+        """
+        Get the matching Entities regarding the provided IDs, see `WorkdayService.get_entities`.
+        The chunks are requested concurrently, bounded by the shared limiter.
+
+        :param object_ids: Entity IDs, duplicates and empty values are ignored
+        :param data_entity_path: The path of the data node tag to fetch, e.g: './/wd:Supplier_Data'
+        :param chunk_size: Number of IDs requested by call, capped to the page size (999)
+        :param method: HTTP Method to query with e.g: [POST, GET, PATCH, DELETE, ...]
+        :return: Dict of key = Entity ID : T, IDs not found are missing from the dict
+        """
+        entities: Dict[str, T] = {}
+        missing_ids: List[str] = []
+        for object_id in dict.fromkeys(object_ids):
+            if not object_id:
+                continue
+            is_cached, obj = self.service.cache.lookup(object_id)
+            if not is_cached:
+                missing_ids.append(object_id)
+            elif not self.service.cache.is_not_found(obj):
+                entities[object_id] = obj
+
+        async def _lookup_one(object_id: str) -> Dict[str, T]:
+            try:
+                return {object_id: await self.get_entity(object_id, data_entity_path, method, **kwargs)}
+            except AssertionError as error:
+                print(f'{object_id} not found: {error}')
+                return {}
+
+        async def _lookup_chunk(chunk: List[str]) -> Dict[str, T]:
+            payload = self.service._generate_payload_batch(chunk, **kwargs)
+            xml_response_data = await self._call_endpoint(method, payload)
+            found = self.service._parse_entities_by_id(xml_response_data, data_entity_path)
+            self.service._cache_batch_results(chunk, found)
+            return found
+
+        if self.service.supports_batch:
+            chunk_size = max(1, min(chunk_size, DEFAULT_WORKDAY_COUNT_PAGINATION))
+            lookups = (
+                _lookup_chunk(missing_ids[index:index + chunk_size]) for index in range(0, len(missing_ids), chunk_size)
+            )
+        else:
+            # fall back on the point lookups
+            lookups = (_lookup_one(object_id) for object_id in missing_ids)
+        results = await asyncio.gather(*lookups)
+        for found in results:
+            entities.update(found)
+
+        return entities
+
+    async def _fetch_page(self, page: int, **kwargs) -> bytes:
+        payload = self.service._generate_payload_pagination(page, **kwargs)
+        return await self._call_endpoint('POST', payload)
+
+    async def get_all_entities(self, entity_entry_data_path: str, window: int = DEFAULT_MAX_IN_FLIGHT * 2, **kwargs) -> List[T]:
+        """
+        Get all entities from all pages with the given [kwargs] argument.
+        The pages 2..N are requested concurrently (bounded by the shared limiter) and parsed in page order in a
+        worker thread, all of them pinned on the same `As_Of_Entry_DateTime` snapshot.
+        A page which cannot be fetched is recorded into `failed_entity`, a parsing error is raised once the pages
+        still requested are cancelled.
+
+        :param entity_entry_data_path: The XML path element that holds the entry data e.g: './/wd:Journal_Entry_Data'
+        :param window: Maximum number of pages requested ahead of the page being parsed
+        :param kwargs: optional argument which might be used for forging the payload
+        :return: List of converted entry into object type T
+        """
+        service = self.service
+        if kwargs.get('as_of_entry_datetime') is None:
+            kwargs['as_of_entry_datetime'] = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+            print(f"Pages pinned on As_Of_Entry_DateTime: {kwargs['as_of_entry_datetime']}")
+
+        service.all_entity = []
+        response_content = await self._fetch_page(service.next_page, **kwargs)
+
+        next_page_data, entities = await asyncio.to_thread(service._parse_page, response_content, entity_entry_data_path)
+        service.total_page = next_page_data.total_pages
+        service.next_page = next_page_data.page
+        service.total_record = next_page_data.total_results
+
+        print(f'Found: {len(entities)} entities')
+        service.all_entity.extend(entities)
+
+        if next_page_data.page >= 1:
+            pages = iter(range(2, service.total_page + 1))
+            pending: List[Tuple[int, asyncio.Task]] = [
+                (page, asyncio.create_task(self._fetch_page(page, **kwargs)))
+                for page in islice(pages, window)
+            ]
+
+            try:
+                while pending:
+                    page, task = pending.pop(0)
+                    # refill the window
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        pending.append((next_page, asyncio.create_task(self._fetch_page(next_page, **kwargs))))
+
+                    service.next_page = page
+                    try:
+                        response_content = await task
+                    except Exception as error:
+                        print(f'Page {page} failed: {error}')
+                        service.failed_entity.append(
+                            FailedProcessedJournal(
+                                journal_id=None,
+                                error_message=str(error),
+                                datetime=str(datetime.now()),
+                                reason=f'Could not fetch page {page} in `get_all_entities`'
+                            )
+                        )
+                        continue
+
+                    _, entities = await asyncio.to_thread(service._parse_page, response_content, entity_entry_data_path)
+                    service.all_entity.extend(entities)
+            finally:
+                # a parsing error stops the loop, drop the pages still requested
+                for _, task in pending:
+                    task.cancel()
+                await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+        print(f"Total Journals fetched: {len(service.all_entity)}")
+        service.is_complete = (len(service.all_entity) + service.outdated_counter) == service.total_record
+        print(f"Is Complete: {service.is_complete}")
+        if not service.is_complete:
+            print(f"The number found is {service.total_record}, but fetch {len(service.all_entity)} records.")
+        print("OK")
+
+        return service.all_entity
+
+
+class AsyncWorkdayRAASService(Generic[T]):
+    """
+    Awaitable RAAS report download wrapping a concrete `WorkdayRAASService`
+    """
+    def __init__(self, service: WorkdayRAASService, limiter: Optional[asyncio.Semaphore] = None):
+        """
+        :param service: Concrete RAAS service providing `parse_raas_element`
+        :param limiter: Shared limit on the requests in flight, a dedicated one is created by default
+        """
+        self.service = service
+        self.limiter = limiter if limiter is not None else create_request_limiter()
+
+    def __getattr__(self, item):
+        return getattr(self.service, item)
+
+    @async_retry_on_500()
+    async def _call_endpoint(self, extra_headers: Optional[Dict[str, str]] = None):
+        """
+        Call the RAAS GET endpoint without blocking the event loop and return the response
+
+        :param extra_headers: Headers added to the request, e.g: the conditional request validators
+        :return: Response, its status is 200 or 304 (Not Modified)
+        :raise: Raises :class:`HTTPError`
+        """
+        def send(token: Optional[str]):
+            headers = self.service._request_headers(token)
+            if extra_headers:
+                headers.update(extra_headers)
+            return asyncio.to_thread(self.service.transport.get, self.service.url, headers=headers)
+
+        async with self.limiter:
+            # sent again with a new token after a 401
+            response = await self.service.token_provider.call_with_token_async(send)
+
+        response.raise_for_status()  # Raise an error for bad status codes
+
+        return response
+
+    async def get_entity_dic(self, element_entries_path: str = 'wd:Report_Entry') -> Dict[str, T]:
+        """
+        Download the report and return it as a dictionary of UID and their matching object T,
+        with the same conditional request and unchanged report short-circuit as `WorkdayRAASService.get_entity_dic`
+        :param element_entries_path: path of the element node entries to retrieve
+        :return: Dict of UID and Object T, a new dict on each call
+        """
+        service = self.service
+        snapshot = await asyncio.to_thread(service._load_fresh_snapshot)
+        if snapshot is not None:
+            service._record_fetch(RAAS_FETCH_SNAPSHOT, snapshot.data)
+            return dict(snapshot.data)
+
+        previous = await asyncio.to_thread(service._previous_snapshot)
+        response = await self._call_endpoint(service._conditional_headers(previous))
+        status, data, body_hash = await asyncio.to_thread(
+            service._read_raas_response, response, previous, element_entries_path
+        )
+        await asyncio.to_thread(service._record_fetch, status, data, response, body_hash)
+
+        return dict(data)
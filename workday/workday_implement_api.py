@@ -4,17 +4,37 @@ import xml.etree.ElementTree as ET
 
 from models import *
 from workday_new.workday.utils import is_timestamp_on_date
+from master_data import RAASReportProvider
+
+# Two-phase journal pipeline: map the journals once a page, or once all the pages, have been parsed
+TWO_PHASE_SCOPE_PAGE = 'page'
+TWO_PHASE_SCOPE_ALL = 'all'
+# `GetAllJournals` attributes holding the RAAS reports
+MASTER_DATA_REPORTS = ('ledger_accounts', 'cost_centers', 'subsidiaries', 'book_codes', 'gtm_org')
+# RAAS reports read while parsing a journal (the others are only read by the mapping)
+JOURNAL_PARSE_MASTER_DATA = ('book_codes',)
+# Estimated number of pages of a full download by reference type, when the batched lookups of the distinct IDs
+# need more calls than that, the whole reference is downloaded instead (None: always use batched lookups)
+DEFAULT_REFERENCE_FULL_DOWNLOAD_PAGES: Dict[str, Optional[int]] = {
+    'spend_categories': 1,
+    'customer_contracts': 10,
+    'suppliers': 10,
+}
 
 
 class GetResourceCategories(WorkdayService, ABC):
     """ Get Resource Categories with resource management endpoint """
 
-    def __init__(self, base_url: str, tenant: str, token: str, api_version: str = DEFAULT_WORKDAY_API_VERSION):
+    def __init__(
+            self, base_url: str, tenant: str, token: TokenSource, api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            transport: Optional[WorkdayTransport] = None,
+            cache: Optional[EntityCache] = None,
+    ):
         # Initialize the parent class (WorkdayService)
         self._url = f'{base_url}/ccx/service/{tenant}/Resource_Management/{api_version}'
         self.namespace = {'wd': 'urn:com.workday/bsvc'}
 
-        super().__init__(self._url, tenant, token, self.namespace)
+        super().__init__(self._url, tenant, token, self.namespace, transport=transport, cache=cache)
 
     def _generate_payload_pagination(self, next_page: int, **kwargs) -> str:
         payload = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Resource_Categories_Request\r\n            xmlns:wd=\"urn:com.workday/bsvc\"\r\n            wd:version=\"v42.2\">\r\n            \r\n            <wd:Response_Filter>\r\n                <wd:Page>{next_page}</wd:Page>\r\n                <wd:Count>999</wd:Count>\r\n            </wd:Response_Filter>\r\n           \r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n            </wd:Response_Group>\r\n        </wd:Get_Resource_Categories_Request>\r\n    </env:Body>\r\n</env:Envelope>"
@@ -29,6 +49,15 @@ class GetResourceCategories(WorkdayService, ABC):
         payload = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Resource_Categories_Request\r\n            xmlns:wd=\"urn:com.workday/bsvc\"\r\n            wd:version=\"v42.2\">\r\n            \r\n            <wd:Request_References>\r\n                <wd:Resource_Category_Reference>\r\n                    <wd:ID wd:type=\"Spend_Category_ID\">{entity_id}</wd:ID>\r\n                </wd:Resource_Category_Reference>\r\n            </wd:Request_References>\r\n           \r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n            </wd:Response_Group>\r\n        </wd:Get_Resource_Categories_Request>\r\n    </env:Body>\r\n</env:Envelope>"
         return payload
 
+    def _generate_payload_batch(self, entity_ids: List[str], **kwargs) -> str:
+        """generate the body request payload for several spend categories"""
+        references = "".join(
+            f"                <wd:Resource_Category_Reference>\r\n                    <wd:ID wd:type=\"Spend_Category_ID\">{entity_id}</wd:ID>\r\n                </wd:Resource_Category_Reference>\r\n"
+            for entity_id in entity_ids
+        )
+        payload = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Resource_Categories_Request\r\n            xmlns:wd=\"urn:com.workday/bsvc\"\r\n            wd:version=\"v42.2\">\r\n            \r\n            <wd:Request_References>\r\n{references}            </wd:Request_References>\r\n           \r\n            <wd:Response_Filter>\r\n                <wd:Page>1</wd:Page>\r\n                <wd:Count>{len(entity_ids)}</wd:Count>\r\n            </wd:Response_Filter>\r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n            </wd:Response_Group>\r\n        </wd:Get_Resource_Categories_Request>\r\n    </env:Body>\r\n</env:Envelope>"
+        return payload
+
     def _parse_entity_element(self, entry: ET.Element) -> SpendCategory:
         """Parses an XML element and returns a Type T object"""
         # Find the Supplier ID
@@ -48,12 +77,16 @@ class GetResourceCategories(WorkdayService, ABC):
 class GetCustomerContracts(WorkdayService, ABC):
     """ Get Customer Contract aka Deals with the Revenue Management endpoint """
 
-    def __init__(self, base_url: str, tenant: str, token: str, api_version: str = DEFAULT_WORKDAY_API_VERSION):
+    def __init__(
+            self, base_url: str, tenant: str, token: TokenSource, api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            transport: Optional[WorkdayTransport] = None,
+            cache: Optional[EntityCache] = None,
+    ):
         # Initialize the parent class (WorkdayService)
         self._url = f'{base_url}/ccx/service/{tenant}/Revenue_Management/{api_version}'
         self.namespace = {'wd': 'urn:com.workday/bsvc'}
 
-        super().__init__(self._url, tenant, token, self.namespace)
+        super().__init__(self._url, tenant, token, self.namespace, transport=transport, cache=cache)
 
     def _generate_payload_pagination(self, next_page: int, **kwargs) -> str:
         payload = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Customer_Contracts_Request\r\n            xmlns:wd=\"urn:com.workday/bsvc\"\r\n            wd:version=\"v42.2\">\r\n            \r\n            <wd:Response_Filter>\r\n                <wd:Page>{next_page}</wd:Page>\r\n                <wd:Count>999</wd:Count>\r\n            </wd:Response_Filter>\r\n           \r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n                <wd:Include_Customer_Contract_Data>true</wd:Include_Customer_Contract_Data>\r\n            </wd:Response_Group>\r\n        </wd:Get_Customer_Contracts_Request>\r\n    </env:Body>\r\n</env:Envelope>"
@@ -68,6 +101,15 @@ class GetCustomerContracts(WorkdayService, ABC):
         payload = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Customer_Contracts_Request\r\n            xmlns:wd=\"urn:com.workday/bsvc\"\r\n            wd:version=\"v42.2\">\r\n            \r\n            <wd:Request_References>\r\n                <wd:Customer_Contract_Reference>\r\n                    <wd:ID wd:type=\"Customer_Contract_Reference_ID\">{entity_id}</wd:ID>\r\n                </wd:Customer_Contract_Reference>\r\n            </wd:Request_References>\r\n           \r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n                <wd:Include_Customer_Contract_Data>true</wd:Include_Customer_Contract_Data>\r\n            </wd:Response_Group>\r\n        </wd:Get_Customer_Contracts_Request>\r\n    </env:Body>\r\n</env:Envelope>"
         return payload
 
+    def _generate_payload_batch(self, entity_ids: List[str], **kwargs) -> str:
+        """generate the body request payload for several customer contracts"""
+        references = "".join(
+            f"                <wd:Customer_Contract_Reference>\r\n                    <wd:ID wd:type=\"Customer_Contract_Reference_ID\">{entity_id}</wd:ID>\r\n                </wd:Customer_Contract_Reference>\r\n"
+            for entity_id in entity_ids
+        )
+        payload = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Customer_Contracts_Request\r\n            xmlns:wd=\"urn:com.workday/bsvc\"\r\n            wd:version=\"v42.2\">\r\n            \r\n            <wd:Request_References>\r\n{references}            </wd:Request_References>\r\n           \r\n            <wd:Response_Filter>\r\n                <wd:Page>1</wd:Page>\r\n                <wd:Count>{len(entity_ids)}</wd:Count>\r\n            </wd:Response_Filter>\r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n                <wd:Include_Customer_Contract_Data>true</wd:Include_Customer_Contract_Data>\r\n            </wd:Response_Group>\r\n        </wd:Get_Customer_Contracts_Request>\r\n    </env:Body>\r\n</env:Envelope>"
+        return payload
+
     def _parse_entity_element(self, entry: ET.Element) -> DealInfo:
         """Parses an XML element and returns a Type T object"""
         # Find the Customer_Contract_ID
@@ -79,8 +121,7 @@ class GetCustomerContracts(WorkdayService, ABC):
         # Get On_Hold
         on_hold = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:On_Hold', int))
         # Get Customer_Contract_Type_Reference
-        contract_type = self.xml_helper.get_single_tag_nested_value(entry, 'wd:Customer_Contract_Type_Reference',
-                                                                    'wd:ID[@wd:type="Contract_Type_ID"]', str)
+        contract_type = self.xml_helper.get_reference_id(entry, 'wd:Customer_Contract_Type_Reference', 'Contract_Type_ID')
         return DealInfo(
             customer_contract_id=customer_contract_id,
             contract_name=contract_name,
@@ -96,12 +137,15 @@ class GetCustomerContracts(WorkdayService, ABC):
 class Region(WorkdayService, ABC):
     """ Get GTM Organization Region data (For Revenue only) """
 
-    def __init__(self, base_url: str, tenant: str, token: str, api_version: str = DEFAULT_WORKDAY_API_VERSION):
+    def __init__(
+            self, base_url: str, tenant: str, token: TokenSource, api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            transport: Optional[WorkdayTransport] = None,
+    ):
         # Initialize the parent class (WorkdayService)
         self._url = f'{base_url}/ccx/service/{tenant}/Recruiting/{api_version}'
         self.namespace = {'wd': 'urn:com.workday/bsvc'}
 
-        super().__init__(self._url, tenant, token, self.namespace)
+        super().__init__(self._url, tenant, token, self.namespace, transport=transport)
 
     def _generate_payload_pagination(self, next_page: int, **kwargs) -> str:
         payload = f"<?xml version=\"1.0\" ?>\r\n<env:Envelope xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\">\r\n    <env:Body>\r\n        <wd:Get_Organizations_Request xmlns:wd=\"urn:com.workday/bsvc\" wd:version=\"v42.2\">\r\n            <wd:Response_Filter>\r\n                <wd:Page>{next_page}</wd:Page>\r\n                <wd:Count>999</wd:Count>\r\n            </wd:Response_Filter>\r\n            <wd:Response_Group>\r\n                <wd:Include_Hierarchy_Data>true</wd:Include_Hierarchy_Data>\r\n            </wd:Response_Group>\r\n        </wd:Get_Organizations_Request>\r\n    </env:Body>\r\n</env:Envelope>"
@@ -140,17 +184,42 @@ class GetRAASSuppliers(WorkdayService, ABC):
         ADN DOCUMENTATION LINK:
         https://community.workday.com/sites/default/files/file-hosting/productionapi/Resource_Management/v43.0/Get_Suppliers.html
     """
+    FIELD_SPECS = (
+        FieldSpec('vendor_code', 'wd:Supplier_ID'),
+        FieldSpec('vendor_ref_id', 'wd:Supplier_Reference_ID'),
+        FieldSpec('company_name', 'wd:Supplier_Name'),
+        FieldSpec('worktag_only', 'wd:Worktag_Only', converter=int_flag, default=False),
+        FieldSpec('submit', 'wd:Submit', converter=int_flag, default=False),
+        FieldSpec('approval_status', 'wd:Approval_Status_Reference', id_type='Document_Status_ID'),
+        FieldSpec('supplier_category', 'wd:Supplier_Category_Reference', id_type='Supplier_Category_ID'),
+        FieldSpec('supplier_group_category', 'wd:Supplier_Group_Reference', id_type='Supplier_Group_ID'),
+        FieldSpec('fatca', 'wd:FATCA', converter=int_flag, default=False),
+        FieldSpec('disable_change_order', 'wd:Disable_Change_Order', converter=int_flag, default=False),
+        FieldSpec('acknowledgement_expected', 'wd:Acknowledgement_Expected', converter=int_flag, default=False),
+        FieldSpec('payment_terms_reference', 'wd:Payment_Terms_Reference', id_type='Payment_Terms_ID'),
+        FieldSpec('default_payment_type_reference', 'wd:Default_Payment_Type_Reference', id_type='Payment_Type_ID'),
+        FieldSpec('invoice_any_supplier', 'wd:Invoice_Any_Supplier', converter=int),
+        FieldSpec('supplier_minimum_order_amount', 'wd:Supplier_Minimum_Order_Amount', converter=int),
+        FieldSpec('edit_port_taxes', 'wd:Edit_Portal_Taxes', converter=int_flag, default=False),
+        FieldSpec('irs_1099_supplier', 'wd:IRS_1099_Supplier', converter=int_flag, default=False),
+        FieldSpec('asn_due_in_days', 'wd:ASN_Due_In_Days', converter=int),
+        FieldSpec('enable_asn', 'wd:Enable_ASN', converter=int_flag, default=False),
+        FieldSpec('enable_global_location_number', 'wd:Enable_Global_Location_Number', converter=int_flag,
+                  default=False),
+    )
 
     def __init__(
             self, base_url: str,
-            tenant: str, token: str,
+            tenant: str, token: TokenSource,
             api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            transport: Optional[WorkdayTransport] = None,
+            cache: Optional[EntityCache] = None,
     ):
         # Initialize the parent class (WorkdayService)
         self._url = f'{base_url}/ccx/service/{tenant}/Resource_Management/{api_version}'
         self.namespace = {'wd': 'urn:com.workday/bsvc'}
 
-        super().__init__(self._url, tenant, token, self.namespace)
+        super().__init__(self._url, tenant, token, self.namespace, transport=transport, cache=cache)
 
     def _generate_payload_pagination(self, next_page: int, **kwargs) -> str:
         payload = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Suppliers_Request xmlns:wd=\"urn:com.workday/bsvc\">\r\n            <wd:Response_Filter>\r\n                <wd:Page>{next_page}</wd:Page>\r\n                <wd:Count>999</wd:Count>\r\n            </wd:Response_Filter>\r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n                <wd:Include_Attachment_Data>true</wd:Include_Attachment_Data>\r\n            </wd:Response_Group>\r\n        </wd:Get_Suppliers_Request>\r\n    </env:Body>\r\n</env:Envelope>"
@@ -178,6 +247,23 @@ class GetRAASSuppliers(WorkdayService, ABC):
 
         return payload
 
+    def _generate_payload_batch(self, entity_ids: List[str], **kwargs) -> str:
+        """generate the body request payload for several suppliers"""
+        as_of_effective_date = kwargs.get('as_of_effective_date')
+        as_of_entry_datetime = kwargs.get('as_of_entry_datetime')
+
+        _as_of_effective_date_filter: str = f"<wd:As_Of_Effective_Date>{as_of_effective_date}</wd:As_Of_Effective_Date>\r\n" if as_of_effective_date is not None else ""
+        _as_of_entry_dateTime: Optional[
+            str] = f"<wd:As_Of_Entry_DateTime>{as_of_entry_datetime}</wd:As_Of_Entry_DateTime>\r\n" if as_of_entry_datetime is not None else ""
+        references = "".join(
+            f"                <wd:Supplier_Reference>\r\n                    <wd:ID wd:type=\"Supplier_ID\">{entity_id}</wd:ID>\r\n                </wd:Supplier_Reference>\r\n"
+            for entity_id in entity_ids
+        )
+
+        payload = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\r\n<env:Envelope\r\n    xmlns:env=\"http://schemas.xmlsoap.org/soap/envelope/\"\r\n    xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\r\n    <env:Body>\r\n        <wd:Get_Suppliers_Request xmlns:wd=\"urn:com.workday/bsvc\">\r\n        \r\n            <wd:Request_References>\r\n{references}            </wd:Request_References>\r\n           \r\n            <wd:Response_Filter>\r\n                {_as_of_effective_date_filter}                {_as_of_entry_dateTime}                <wd:Page>1</wd:Page>\r\n                <wd:Count>{len(entity_ids)}</wd:Count>\r\n            </wd:Response_Filter>\r\n            <wd:Response_Group>\r\n                <wd:Include_Reference>true</wd:Include_Reference>\r\n                <wd:Include_Attachment_Data>true</wd:Include_Attachment_Data>\r\n            </wd:Response_Group>\r\n        </wd:Get_Suppliers_Request>\r\n    </env:Body>\r\n</env:Envelope>"
+
+        return payload
+
     def _parse_entity_element(self, entry: ET.Element) -> VendorInfo:
         """
         Parse the Get supplier response paylaod
@@ -185,70 +271,8 @@ class GetRAASSuppliers(WorkdayService, ABC):
         :param entry: XML element node
         :return: [VendorInfo]
         """
-        # Find the Supplier ID
-        supplier_id: str = self.xml_helper.get_single_tag_line_value(entry, 'wd:Supplier_ID', str)
-        supplier_ref_id: str = self.xml_helper.get_single_tag_line_value(entry, 'wd:Supplier_Reference_ID', str)
-        supplier_name = self.xml_helper.get_single_tag_line_value(entry, 'wd:Supplier_Name', str)
-        worktag_only = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:Worktag_Only', int))
-        submit: Optional[bool] = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:Submit', int))
-
-        app_status = self.xml_helper.get_single_tag_nested_value(entry, 'wd:Approval_Status_Reference',
-                                                                 'wd:ID[@wd:type="Document_Status_ID"]', str)
-        supplier_category = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Supplier_Category_Reference', 'wd:ID[@wd:type="Supplier_Category_ID"]', str
-        )
-        supplier_group_category = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Supplier_Group_Reference', 'wd:ID[@wd:type="Supplier_Group_ID"]', str
-        )
-        fatca: Optional[bool] = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:FATCA', int))
-        disable_change_order: Optional[bool] = bool(
-            self.xml_helper.get_single_tag_line_value(entry, 'wd:Disable_Change_Order', int))
-        acknowledgement_expected: Optional[bool] = bool(
-            self.xml_helper.get_single_tag_line_value(entry, 'wd:Acknowledgement_Expected', int))
-        payment_terms_reference = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Payment_Terms_Reference', 'wd:ID[@wd:type="Payment_Terms_ID"]', str
-        )
-        default_payment_type_reference = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Default_Payment_Type_Reference', 'wd:ID[@wd:type="Payment_Type_ID"]', str
-        )
-        invoice_any_supplier: Optional[int] = self.xml_helper.get_single_tag_line_value(
-            entry, 'wd:Invoice_Any_Supplier', int
-        )
-        supplier_minimum_order_amount: Optional[int] = self.xml_helper.get_single_tag_line_value(
-            entry, 'wd:Supplier_Minimum_Order_Amount', int
-        )
-        edit_port_taxes: Optional[bool] = bool(
-            self.xml_helper.get_single_tag_line_value(entry, 'wd:Edit_Portal_Taxes', int))
-        irs_1099_supplier: Optional[bool] = bool(
-            self.xml_helper.get_single_tag_line_value(entry, 'wd:IRS_1099_Supplier', int))
-        asn_due_in_days: Optional[int] = self.xml_helper.get_single_tag_line_value(entry, 'wd:ASN_Due_In_Days', int)
-        enable_asn: Optional[bool] = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:Enable_ASN', int))
-        enable_global_location_number: Optional[bool] = bool(
-            self.xml_helper.get_single_tag_line_value(entry, 'wd:Enable_Global_Location_Number', int)
-        )
-
-        return VendorInfo(
-            company_name=supplier_name,
-            vendor_code=supplier_id,
-            irs_1099_supplier=irs_1099_supplier,
-            supplier_category=supplier_category,
-            invoice_any_supplier=invoice_any_supplier,
-            supplier_group_category=supplier_group_category,
-            supplier_minimum_order_amount=supplier_minimum_order_amount,
-            submit=submit,
-            enable_asn=enable_asn,
-            worktag_only=worktag_only,
-            enable_global_location_number=enable_global_location_number,
-            approval_status=app_status,
-            vendor_ref_id=supplier_ref_id,
-            asn_due_in_days=asn_due_in_days,
-            edit_port_taxes=edit_port_taxes,
-            default_payment_type_reference=default_payment_type_reference,
-            disable_change_order=disable_change_order,
-            acknowledgement_expected=acknowledgement_expected,
-            payment_terms_reference=payment_terms_reference,
-            fatca=fatca,
-        )
+        # all the supplier fields are declared in FIELD_SPECS
+        return VendorInfo(**self.field_extractor.extract(entry))
 
     def _update_cache(self, vendor: VendorInfo):
         self.cache.update({vendor.vendor_code: vendor})
@@ -261,12 +285,15 @@ class GetPaymentMethod(WorkdayService, ABC):
     https://community.workday.com/sites/default/files/file-hosting/productionapi/Financial_Management/v43.0/Get_Payment_Terms.html
      """
 
-    def __init__(self, base_url: str, tenant: str, token: str, api_version: str = DEFAULT_WORKDAY_API_VERSION):
+    def __init__(
+            self, base_url: str, tenant: str, token: TokenSource, api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            transport: Optional[WorkdayTransport] = None,
+    ):
         # Initialize the parent class (WorkdayService)
         self._url = f'{base_url}/ccx/service/{tenant}/Financial_Management/{api_version}'
         self.namespace = {'wd': 'urn:com.workday/bsvc'}
 
-        super().__init__(self._url, tenant, token, self.namespace)
+        super().__init__(self._url, tenant, token, self.namespace, transport=transport)
 
     def _generate_payload_pagination(self, next_page: int, **kwargs) -> str:
         """generate the body request payload"""
@@ -326,14 +353,15 @@ class GetCurrencies(WorkdayService, ABC):
 
     def __init__(
             self, base_url: str,
-            tenant: str, token: str,
+            tenant: str, token: TokenSource,
             api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            transport: Optional[WorkdayTransport] = None,
     ):
         # Initialize the parent class (WorkdayService)
         self._url = f'{base_url}/ccx/service/{tenant}/Financial_Management/{api_version}'
         self.namespace = {'wd': 'urn:com.workday/bsvc'}
 
-        super().__init__(self._url, tenant, token, self.namespace)
+        super().__init__(self._url, tenant, token, self.namespace, transport=transport)
 
     def _generate_payload_pagination(self, next_page: int, **kwargs) -> str:
         payload = """<?xml version="1.0" encoding="UTF-8"?>
@@ -390,17 +418,38 @@ class GetCustomers(WorkdayService, ABC):
         ADN DOCUMENTATION LINK:
         https://community.workday.com/sites/default/files/file-hosting/productionapi/Revenue_Management/v43.0/Get_Customers.html
     """
+    FIELD_SPECS = (
+        FieldSpec('Customer_ID', 'wd:Customer_ID'),
+        FieldSpec('Customer_Reference_ID', 'wd:Customer_Reference_ID'),
+        FieldSpec('Customer_Name', 'wd:Customer_Name'),
+        FieldSpec('Worktag_Only', 'wd:Worktag_Only', converter=int_flag, default=False),
+        FieldSpec('Submit', 'wd:Submit', converter=int_flag, default=False),
+        FieldSpec('Exempt', 'wd:Exempt', converter=int_flag, default=False),
+        FieldSpec('Exempt_From_Dunning', 'wd:Exempt_From_Dunning', converter=int_flag, default=False),
+        FieldSpec('Customer_Category_ID', 'wd:Customer_Category_Reference', id_type='Customer_Category_ID'),
+        FieldSpec('Customer_Group_ID', 'wd:Customer_Group_Reference', id_type='Customer_Group_ID'),
+        FieldSpec('Payment_Terms_ID', 'wd:Payment_Terms_Reference', id_type='Payment_Terms_ID'),
+        FieldSpec('credit_limit', 'wd:Credit_Limit', converter=float),
+        FieldSpec('credit_verification_date', 'wd:Credit_Verification_Date'),
+        FieldSpec('Composite_Risk_Score', 'wd:Composite_Risk_Score', converter=float),
+        FieldSpec('Composite_Risk_Date', 'wd:Composite_Risk_Date'),
+        FieldSpec('Composite_Risk_Note', 'wd:Composite_Risk_Note'),
+        FieldSpec('DUNS_number', 'wd:DUNS_Number'),
+        FieldSpec('Customer_Satisfaction_Score', 'wd:Customer_Satisfaction_Score', converter=float),
+        FieldSpec('hierarchy_credit_limit', 'wd:Hierarchy_Credit_Limit', converter=float),
+    )
 
     def __init__(
             self, base_url: str,
-            tenant: str, token: str,
+            tenant: str, token: TokenSource,
             api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            transport: Optional[WorkdayTransport] = None,
     ):
         # Initialize the parent class (WorkdayService)
         self._url = f'{base_url}/ccx/service/{tenant}/Revenue_Management/{api_version}'
         self.namespace = {'wd': 'urn:com.workday/bsvc'}
 
-        super().__init__(self._url, tenant, token, self.namespace)
+        super().__init__(self._url, tenant, token, self.namespace, transport=transport)
 
     def _generate_payload_pagination(self, next_page: int, **kwargs) -> str:
         as_of_effective_date = None
@@ -465,59 +514,8 @@ class GetCustomers(WorkdayService, ABC):
         :param entry: XML element node
         :return: [CustomerInfo]
         """
-        customer_id: str = self.xml_helper.get_single_tag_line_value(entry, 'wd:Customer_ID', str)
-        Customer_Reference_ID: str = self.xml_helper.get_single_tag_line_value(entry, 'wd:Customer_Reference_ID', str)
-        Customer_Name = self.xml_helper.get_single_tag_line_value(entry, 'wd:Customer_Name', str)
-
-        Worktag_Only = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:Worktag_Only', int))
-        Submit: Optional[bool] = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:Submit', int))
-        Exempt: Optional[bool] = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:Exempt', int))
-        Exempt_From_Dunning: Optional[bool] = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:Exempt_From_Dunning', int))
-
-        Customer_Category_ID = self.xml_helper.get_single_tag_nested_value(entry, 'wd:Customer_Category_Reference',
-                                                                 'wd:ID[@wd:type="Customer_Category_ID"]', str)
-        Customer_Group_ID = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Customer_Group_Reference', 'wd:ID[@wd:type="Customer_Group_ID"]', str
-        )
-
-        Payment_Terms_ID = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Payment_Terms_Reference', 'wd:ID[@wd:type="Payment_Terms_ID"]', str
-        )
-
-        Credit_Limit = self.xml_helper.get_single_tag_line_value(entry, 'wd:Credit_Limit', float)
-        Credit_Verification_Date = self.xml_helper.get_single_tag_line_value(entry, 'wd:Credit_Verification_Date', str)
-
-        Composite_Risk_Score = self.xml_helper.get_single_tag_line_value(entry, 'wd:Composite_Risk_Score', float)
-        Composite_Risk_Date = self.xml_helper.get_single_tag_line_value(entry, 'wd:Composite_Risk_Date', str)
-        Composite_Risk_Note = self.xml_helper.get_single_tag_line_value(entry, 'wd:Composite_Risk_Note', str)
-
-        DUNS_Number = self.xml_helper.get_single_tag_line_value(entry, 'wd:DUNS_Number', str)
-
-        Customer_Satisfaction_Score = self.xml_helper.get_single_tag_line_value(entry, 'wd:Customer_Satisfaction_Score', float)
-        hierarchy_credit_limit = self.xml_helper.get_single_tag_line_value(entry, 'wd:Hierarchy_Credit_Limit', float)
-
-        return CustomerInfo(
-            Customer_ID=customer_id,
-            Customer_Reference_ID=Customer_Reference_ID,
-            Customer_Name=Customer_Name,
-            Worktag_Only=Worktag_Only,
-            Submit=Submit,
-            Customer_Group_ID=Customer_Group_ID,
-            Customer_Category_ID=Customer_Category_ID,
-            Payment_Terms_ID=Payment_Terms_ID,
-
-            Composite_Risk_Score=Composite_Risk_Score,
-            Composite_Risk_Date=Composite_Risk_Date,
-            Composite_Risk_Note=Composite_Risk_Note,
-            Customer_Satisfaction_Score=Customer_Satisfaction_Score,
-            DUNS_number=DUNS_Number,
-
-            credit_limit=Credit_Limit,
-            credit_verification_date=Credit_Verification_Date,
-            hierarchy_credit_limit=hierarchy_credit_limit,
-            Exempt_From_Dunning=Exempt_From_Dunning,
-            Exempt=Exempt
-        )
+        # all the customer fields are declared in FIELD_SPECS
+        return CustomerInfo(**self.field_extractor.extract(entry))
 
     def _update_cache(self, customer: CustomerInfo):
         self.cache.update({customer.Customer_ID: customer})
@@ -528,7 +526,7 @@ class GetAllJournals(WorkdayService, ABC):
     def __init__(
             self, base_url: str,
             tenant: str,
-            token: str,
+            token: TokenSource,
             creation_date: str,
             filter_by_creation_date: bool,
 
@@ -542,7 +540,32 @@ class GetAllJournals(WorkdayService, ABC):
             customer_contract_service: GetCustomerContracts,
 
             api_version: str = DEFAULT_WORKDAY_API_VERSION,
+            transport: Optional[WorkdayTransport] = None,
+
+            two_phase: bool = False,
+            two_phase_scope: str = TWO_PHASE_SCOPE_ALL,
+            reference_batch_size: int = DEFAULT_BATCH_LOOKUP_SIZE,
+            reference_full_download_pages: Optional[Dict[str, Optional[int]]] = None,
+            stream_parse: bool = False,
+            parse_processes: Optional[int] = None,
     ):
+        """
+        :param two_phase: Parse the journals first, resolve the distinct suppliers, spend categories and customer
+            contracts in bulk, then map the journals without any network call
+        :param two_phase_scope: `TWO_PHASE_SCOPE_ALL` to resolve once all the pages are parsed,
+            `TWO_PHASE_SCOPE_PAGE` to resolve page by page
+        :param reference_batch_size: Number of IDs by batched lookup request
+        :param reference_full_download_pages: Estimated pages of a full download by reference type,
+            see `DEFAULT_REFERENCE_FULL_DOWNLOAD_PAGES`
+        :param stream_parse: Parse the journal pages incrementally, see `WorkdayService`
+        :param parse_processes: Split each page between this number of worker processes which parse the journals,
+            the mapping stays in this process (None: parse in this process). The RAAS dicts are shipped once to
+            each worker
+
+        The RAAS dicts (ledger_accounts, ...) can be `RAASReportProvider` still downloading, they are waited for
+        once the first page is received. A lazy one is downloaded by the first journal line needing it, e.g: the GTM
+        orgs when a line has a `Custom_Organization_Reference_ID`.
+        """
         # Initialize the parent class (WorkdayService)
         self._url = f'{base_url}/ccx/service/{tenant}/Financial_Management/{api_version}'
         self.api_version = api_version
@@ -550,6 +573,10 @@ class GetAllJournals(WorkdayService, ABC):
 
         self.filter_by_creation_date = filter_by_creation_date
         self.creation_date = creation_date
+        # Journals dropped from each page by the creation date pre-scan, see `_prescan_creation_dates`
+        self.prescan_reports: List[JournalPrescanReport] = []
+        self._creation_target_date = datetime.strptime(creation_date, "%Y-%m-%d").date() \
+            if filter_by_creation_date else None
 
         # Initialize the external data resources
         self.resource_category_service = resource_category_service
@@ -565,7 +592,22 @@ class GetAllJournals(WorkdayService, ABC):
         # Will be updated within `parse_journals` and `map_workday_journal_to_pigment_data` functions
         self.failed_journals: List[FailedProcessedJournal] = []
 
-        super().__init__(self._url, tenant, token, self.namespace)
+        # Two-phase pipeline
+        self.two_phase = two_phase
+        self.two_phase_scope = two_phase_scope
+        self.reference_batch_size = reference_batch_size
+        self.reference_full_download_pages = reference_full_download_pages if reference_full_download_pages is not None \
+            else DEFAULT_REFERENCE_FULL_DOWNLOAD_PAGES
+        # reference type -> {ID: entity or None when not found}, filled by `resolve_references`
+        self.resolved_references: Optional[Dict[str, Dict[str, Any]]] = None
+        self._fully_downloaded_references: Dict[str, Dict[str, Any]] = {}
+        self._is_collecting_all_pages = False
+
+        # Worker processes parsing the journals, started on the first page
+        self.parse_processes = parse_processes
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+
+        super().__init__(self._url, tenant, token, self.namespace, transport=transport, stream_parse=stream_parse)
 
     """ Override """
 
@@ -657,6 +699,10 @@ class GetAllJournals(WorkdayService, ABC):
         """
         journal: Optional[JournalEntry] = self._parse_journals(entry)
 
+        if self.two_phase:
+            # mapped once the references of the whole page / all the pages are resolved
+            return journal
+
         if journal:
             # start converting data into Pigment Data
             converted_journal: Optional[MappedJournal] = self._convert_all_journals_into_pigment_journals(
@@ -684,6 +730,399 @@ class GetAllJournals(WorkdayService, ABC):
                 if converted_journal:
                     self.cache.update({journal.journalEntryReference.Accounting_Journal_ID: converted_journal})
 
+    @staticmethod
+    def _get_raw_journal_tag(entity_entry_data_path: str) -> Optional[bytes]:
+        """
+        :param entity_entry_data_path: The XML path element that holds the journal e.g: './/wd:Journal_Entry_Data'
+        :return: The prefixed tag as written in the payload e.g: b'wd:Journal_Entry_Data', None for a complex path
+        """
+        if not entity_entry_data_path.startswith('.//'):
+            return None
+        tag = entity_entry_data_path[3:].encode('utf-8')
+        if not tag or any(character in tag for character in b'/[*@'):
+            return None
+        return tag
+
+    @staticmethod
+    def _iter_raw_journals(xml_input: bytes, tag: bytes) -> Iterator[Tuple[int, int]]:
+        """
+        Find the journal elements of a raw page with plain byte searches, no XML parsing
+        :param xml_input: XML answer payload
+        :param tag: Prefixed tag of the journal element e.g: b'wd:Journal_Entry_Data'
+        :return: Iterator of the (start, end) offsets of each journal element
+        """
+        open_tag, close_tag = b'<' + tag, b'</' + tag + b'>'
+        start = xml_input.find(open_tag)
+        while start != -1:
+            # skip the longer tag names e.g: <wd:Journal_Entry_Data_Other
+            if xml_input[start + len(open_tag):start + len(open_tag) + 1] not in (b'>', b' ', b'\t', b'\r', b'\n'):
+                start = xml_input.find(open_tag, start + len(open_tag))
+                continue
+            end = xml_input.find(close_tag, start)
+            if end == -1:
+                return
+            end += len(close_tag)
+            yield start, end
+            start = xml_input.find(open_tag, end)
+
+    def _is_created_in_window(self, xml_input: bytes, start: int, end: int, prefix: bytes) -> bool:
+        """
+        Read the first `Creation_Date` of a raw journal, as `_parse_journals` does with `.//wd:Creation_Date`
+        :return: False only when the date is readable and not on `creation_date`, `_parse_journals` decides otherwise
+        """
+        open_tag = b'<' + prefix + b'Creation_Date>'
+        date_start = xml_input.find(open_tag, start, end)
+        if date_start == -1:
+            return True
+        date_start += len(open_tag)
+        date_end = xml_input.find(b'</' + prefix + b'Creation_Date>', date_start, end)
+        if date_end == -1:
+            return True
+        try:
+            creation_date = xml_input[date_start:date_end].decode('utf-8').replace('\n', '')
+            return datetime.fromisoformat(creation_date).date() == self._creation_target_date
+        except ValueError:
+            return True
+
+    def _prescan_creation_dates(self, xml_input: bytes, entity_entry_data_path: str) -> Tuple[bytes, int, int]:
+        """
+        Drop the journals which are not created on `creation_date` from the raw page, so they are never parsed.
+        Only the `Creation_Date` of each journal is read, with plain byte searches
+
+        :param xml_input: XML answer payload
+        :param entity_entry_data_path: The XML path element that holds the journal e.g: './/wd:Journal_Entry_Data'
+        :return: (payload without the dropped journals, number of journals dropped, number of bytes dropped)
+        """
+        tag = self._get_raw_journal_tag(entity_entry_data_path)
+        if tag is None:
+            return xml_input, 0, 0
+        prefix = tag[:tag.index(b':') + 1] if b':' in tag else b''
+
+        kept_parts: List[bytes] = []
+        position = 0
+        journals_discarded = 0
+        bytes_discarded = 0
+        for start, end in self._iter_raw_journals(xml_input, tag):
+            if not self._is_created_in_window(xml_input, start, end, prefix):
+                kept_parts.append(xml_input[position:start])
+                position = end
+                journals_discarded += 1
+                bytes_discarded += end - start
+
+        if not journals_discarded:
+            return xml_input, 0, 0
+        kept_parts.append(xml_input[position:])
+
+        return b''.join(kept_parts), journals_discarded, bytes_discarded
+
+    def _resolve_master_data(self):
+        # the RAAS reports may still be downloading (see `RAASReportProvider`): wait for them before mapping the
+        # first page, so a failed download stops the export instead of failing each journal.
+        # The lazy reports stay as they are, downloaded by the first journal needing them
+        for name in MASTER_DATA_REPORTS:
+            report = getattr(self, name)
+            if isinstance(report, RAASReportProvider) and not report.lazy:
+                setattr(self, name, report.wait())
+
+    def _raise_failed_master_data(self):
+        # a lazy report failing while a journal is mapped is caught with that journal, stop the export here
+        for name in MASTER_DATA_REPORTS:
+            report = getattr(self, name)
+            if isinstance(report, RAASReportProvider) and report.failed():
+                report.wait()
+
+    def _parse_page(self, xml_input: Union[str, bytes], entity_entry_data_path: str) -> Tuple[ResponseResults, List[T]]:
+        self._resolve_master_data()
+        response_results, entities = self._parse_and_map_page(xml_input, entity_entry_data_path)
+        self._raise_failed_master_data()
+        return response_results, entities
+
+    def _parse_and_map_page(
+            self,
+            xml_input: Union[str, bytes],
+            entity_entry_data_path: str
+    ) -> Tuple[ResponseResults, List[T]]:
+        prescan = None
+        if self.filter_by_creation_date:
+            if isinstance(xml_input, str):
+                xml_input = xml_input.encode('utf-8')
+            page_bytes = len(xml_input)
+            xml_input, journals_discarded, bytes_discarded = self._prescan_creation_dates(
+                xml_input, entity_entry_data_path
+            )
+            # counted as the journals rejected by `_parse_journals`
+            self.outdated_counter += journals_discarded
+            prescan = (journals_discarded, bytes_discarded, page_bytes)
+
+        if self.parse_processes:
+            response_results, entities = self._parse_page_in_processes(xml_input, entity_entry_data_path)
+        else:
+            response_results, entities = super()._parse_page(xml_input, entity_entry_data_path)
+
+        if prescan is not None:
+            journals_discarded, bytes_discarded, page_bytes = prescan
+            self.prescan_reports.append(JournalPrescanReport(
+                page=response_results.page,
+                journals_discarded=journals_discarded,
+                bytes_discarded=bytes_discarded,
+                page_bytes=page_bytes,
+            ))
+            print(f'Page {response_results.page}: {journals_discarded} journals ({bytes_discarded} / {page_bytes} bytes) '
+                  f'discarded by the creation date pre-scan')
+
+        if self.two_phase and not self._is_collecting_all_pages:
+            return response_results, self.map_journals(entities)
+
+        return response_results, entities
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        if self._parse_pool is None:
+            # the parse settings are shipped once to each worker, not with every page
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_processes,
+                initializer=_init_journal_parse_worker,
+                initargs=(self.api_version, self.creation_date, self.filter_by_creation_date,
+                          self._get_parse_worker_master_data()),
+            )
+        return self._parse_pool
+
+    def _get_parse_worker_master_data(self) -> Dict[str, Dict[str, Any]]:
+        """
+        The RAAS dicts for the `parse_processes` workers, a `RAASReportProvider` is replaced by its report.
+        A lazy report is only downloaded when the parsing reads it (`JOURNAL_PARSE_MASTER_DATA`), the other lazy
+        ones are left to the mapping of this process
+        :return: Dict of key = `MASTER_DATA_REPORTS` attribute : report dict
+        """
+        master_data: Dict[str, Dict[str, Any]] = {}
+        for name in MASTER_DATA_REPORTS:
+            report = getattr(self, name)
+            if isinstance(report, RAASReportProvider):
+                if report.lazy and name not in JOURNAL_PARSE_MASTER_DATA:
+                    continue
+                report = report.wait()
+            master_data[name] = report if report is not None else {}
+        return master_data
+
+    def shutdown_parse_pool(self):
+        """ Stop the `parse_processes` workers, they are started again by the next page """
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+
+    def _parse_page_in_processes(
+            self,
+            xml_input: Union[str, bytes],
+            entity_entry_data_path: str
+    ) -> Tuple[ResponseResults, List[T]]:
+        """
+        Split the raw journals of a page into one chunk by worker process. The workers parse them into `JournalEntry`
+        (pickled back with their failures), this process reads the pagination metadata and maps the journals
+
+        :param xml_input: XML answer payload
+        :param entity_entry_data_path: The XML path element that holds the journal e.g: './/wd:Journal_Entry_Data'
+        :return: (ResponseResults, List of MappedJournal, or of JournalEntry with `two_phase`)
+        """
+        if isinstance(xml_input, str):
+            xml_input = xml_input.encode('utf-8')
+        tag = self._get_raw_journal_tag(entity_entry_data_path)
+        prefix = tag.split(b':')[0].decode('utf-8') if tag is not None and b':' in tag else None
+        spans = list(self._iter_raw_journals(xml_input, tag)) if tag is not None else []
+        if not spans or (prefix is not None and prefix not in self.namespace):
+            return super()._parse_page(xml_input, entity_entry_data_path)
+
+        # the page without its journals, for the `Response_Results`
+        skeleton_parts: List[bytes] = []
+        position = 0
+        for start, end in spans:
+            skeleton_parts.append(xml_input[position:start])
+            position = end
+        skeleton_parts.append(xml_input[position:])
+        response_results, _ = self._parse_response(b''.join(skeleton_parts), entity_entry_data_path)
+        print(f'total_results: {response_results.total_results}')
+
+        # each chunk is a standalone document declaring the journals namespace
+        root_tag = f'{prefix}:Journals xmlns:{prefix}="{self.namespace[prefix]}"' if prefix else 'Journals'
+        chunk_size = -(-len(spans) // self.parse_processes)
+        chunks = [
+            f'<{root_tag}>'.encode('utf-8')
+            + b''.join(xml_input[start:end] for start, end in spans[index:index + chunk_size])
+            + (f'</{prefix}:Journals>' if prefix else '</Journals>').encode('utf-8')
+            for index in range(0, len(spans), chunk_size)
+        ]
+        try:
+            chunk_results = list(self._get_parse_pool().map(
+                _parse_journal_chunk, chunks, [self.next_page] * len(chunks)
+            ))
+        except ET.ParseError as error:
+            print(f'Could not split the page between the parse processes: {error}')
+            return super()._parse_page(xml_input, entity_entry_data_path)
+
+        journals: List[JournalEntry] = []
+        for chunk_journals, outdated, failed_journals, failed_entity in chunk_results:
+            journals.extend(chunk_journals)
+            self.outdated_counter += outdated
+            self.failed_journals.extend(failed_journals)
+            self.failed_entity.extend(failed_entity)
+
+        if self.two_phase:
+            return response_results, journals
+
+        mapped_journals: List[MappedJournal] = []
+        for journal in journals:
+            converted_journal: Optional[MappedJournal] = self._convert_all_journals_into_pigment_journals(
+                journal,
+                self.ledger_accounts,
+                self.cost_centers,
+                self.subsidiaries
+            )
+            if converted_journal:
+                mapped_journals.append(converted_journal)
+
+        return response_results, mapped_journals
+
+    def get_all_entities_by_page(self, entity_entry_data_path: str, page: int, entity_count: int = 999, **kwargs) -> List[T]:
+        try:
+            return super().get_all_entities_by_page(entity_entry_data_path, page, entity_count=entity_count, **kwargs)
+        finally:
+            self.shutdown_parse_pool()
+
+    def get_all_entities(self, entity_entry_data_path: str, max_workers: Optional[int] = None, **kwargs) -> List[T]:
+        try:
+            return self._get_all_journals(entity_entry_data_path, max_workers=max_workers, **kwargs)
+        finally:
+            self.shutdown_parse_pool()
+
+    def _get_all_journals(self, entity_entry_data_path: str, max_workers: Optional[int] = None, **kwargs) -> List[T]:
+        if not (self.two_phase and self.two_phase_scope == TWO_PHASE_SCOPE_ALL):
+            return super().get_all_entities(entity_entry_data_path, max_workers=max_workers, **kwargs)
+
+        # Phase 1: parse every page into JournalEntry
+        self._is_collecting_all_pages = True
+        try:
+            journals: List[JournalEntry] = super().get_all_entities(
+                entity_entry_data_path, max_workers=max_workers, **kwargs
+            )
+        finally:
+            self._is_collecting_all_pages = False
+
+        # Phase 2 and 3: resolve the references in bulk, then map
+        self.all_entity = self.map_journals(journals)
+        self._raise_failed_master_data()
+        self.is_complete = (len(self.all_entity) + self.outdated_counter) == self.total_record
+        print(f"Journals mapped: {len(self.all_entity)} / {len(journals)}")
+
+        return self.all_entity
+
+    def _reference_lookups(self) -> Tuple[Tuple[str, WorkdayService, str, Callable, Callable], ...]:
+        """
+        Reference types resolved in bulk by the two-phase pipeline:
+        (reference type, lookup service, data entity path, line ID getter, entity ID getter)
+        """
+        return (
+            (
+                'spend_categories', self.resource_category_service, './/wd:Resource_Category_Data',
+                lambda line: line.worktagsReference.Spend_Category_ID, lambda o: o.code,
+            ),
+            (
+                'customer_contracts', self.customer_contract_service, './/wd:Customer_Contract_Data',
+                lambda line: line.worktagsReference.Customer_Contract_Reference_ID, lambda o: o.customer_contract_id,
+            ),
+            (
+                'suppliers', self.raas_suppliers, './/wd:Supplier_Data',
+                lambda line: line.worktagsReference.Supplier_ID, lambda o: o.vendor_code,
+            ),
+        )
+
+    def resolve_references(self, journals: List[JournalEntry]):
+        """
+        Collect the distinct reference IDs of the journal lines and resolve the ones not resolved yet.
+        For each reference type, batched point lookups are used unless they would need more calls than
+        one full paginated download of the reference.
+
+        :param journals: parsed journals
+        """
+        if self.resolved_references is None:
+            self.resolved_references = {}
+
+        for kind, service, data_entity_path, get_line_id, get_entity_id in self._reference_lookups():
+            resolved = self.resolved_references.setdefault(kind, {})
+            distinct_ids = list(dict.fromkeys(
+                get_line_id(line)
+                for journal in journals
+                for line in journal.journalEntryLines
+                if get_line_id(line) and get_line_id(line) not in resolved
+            ))
+            if not distinct_ids:
+                continue
+
+            batch_calls = -(-len(distinct_ids) // self.reference_batch_size)
+            full_download_pages = self.reference_full_download_pages.get(kind)
+            try:
+                if kind in self._fully_downloaded_references or (
+                        full_download_pages is not None and batch_calls > full_download_pages
+                ):
+                    if kind not in self._fully_downloaded_references:
+                        print(f"{kind}: {len(distinct_ids)} distinct IDs, full download instead of {batch_calls} batched calls")
+                        self._fully_downloaded_references[kind] = {
+                            get_entity_id(entity): entity
+                            for entity in service.get_all_entities(data_entity_path) if entity
+                        }
+                    found = self._fully_downloaded_references[kind]
+                else:
+                    print(f"{kind}: {len(distinct_ids)} distinct IDs, {batch_calls} batched calls")
+                    found = service.get_entities(distinct_ids, data_entity_path, chunk_size=self.reference_batch_size)
+            except Exception as error:
+                # left unresolved, the mapping falls back on the point lookups
+                print(f"Could not resolve {kind}: {error}")
+                self.failed_journals.append(
+                    FailedProcessedJournal(
+                        journal_id=None,
+                        error_message=str(error),
+                        datetime=str(datetime.now()),
+                        reason=f'Could not resolve the {kind} in bulk in `resolve_references`'
+                    )
+                )
+                continue
+
+            for object_id in distinct_ids:
+                resolved[object_id] = found.get(object_id)
+
+    def _lookup_reference(self, kind: str, service: WorkdayService, object_id: Optional[str], data_entity_path: str):
+        """
+        Get the reference from the two-phase resolved references, or from the lookup service otherwise
+        :raise: AssertionError when the reference could not be found, as `get_entity` does
+        """
+        resolved = self.resolved_references.get(kind) if self.resolved_references is not None else None
+        if not object_id or resolved is None or object_id not in resolved:
+            return service.get_entity(object_id=object_id, data_entity_path=data_entity_path)
+
+        entity = resolved[object_id]
+        if entity is None:
+            raise AssertionError(f"Expected list to contain exactly one element, but {object_id} was not found.")
+        return entity
+
+    def map_journals(self, journals: List[JournalEntry]) -> List[MappedJournal]:
+        """
+        Resolve the references of the parsed journals in bulk, then map them without any network call
+        :param journals: parsed journals
+        :return: List of the mapped journals
+        """
+        journals = [journal for journal in journals if journal]
+        self.resolve_references(journals)
+
+        mapped_journals: List[MappedJournal] = []
+        for journal in journals:
+            converted_journal: Optional[MappedJournal] = self._convert_all_journals_into_pigment_journals(
+                journal,
+                self.ledger_accounts,
+                self.cost_centers,
+                self.subsidiaries
+            )
+            if converted_journal:
+                mapped_journals.append(converted_journal)
+
+        return mapped_journals
+
     @staticmethod
     def callable_condition(journal: MappedJournal) -> bool:
         """
@@ -735,7 +1174,9 @@ class GetAllJournals(WorkdayService, ABC):
 
             for entry in journal.journalEntryLines:
                 # Expense type (Account)
-                expense_type: SpendCategory = self.resource_category_service.get_entity(
+                expense_type: SpendCategory = self._lookup_reference(
+                    'spend_categories',
+                    self.resource_category_service,
                     object_id=entry.worktagsReference.Spend_Category_ID,
                     data_entity_path='.//wd:Resource_Category_Data'
                 )
@@ -762,7 +1203,9 @@ class GetAllJournals(WorkdayService, ABC):
                 customer_contract_ref = entry.worktagsReference.Customer_Contract_Reference_ID
                 deal = None
                 if customer_contract_ref:
-                    deal: Optional[DealInfo] = self.customer_contract_service.get_entity(
+                    deal: Optional[DealInfo] = self._lookup_reference(
+                        'customer_contracts',
+                        self.customer_contract_service,
                         object_id=customer_contract_ref,
                         data_entity_path='.//wd:Customer_Contract_Data',
                     )
@@ -774,7 +1217,9 @@ class GetAllJournals(WorkdayService, ABC):
                     gtm_org=gtm_org
                 )
                 # Vendor
-                vendor_line = self.raas_suppliers.get_entity(
+                vendor_line = self._lookup_reference(
+                    'suppliers',
+                    self.raas_suppliers,
                     object_id=entry.worktagsReference.Supplier_ID,
                     data_entity_path='.//wd:Supplier_Data'
                 )
@@ -873,9 +1318,9 @@ class GetAllJournals(WorkdayService, ABC):
         entry_lines = []
 
         # Extract the Journal Entry reference
-        journal_entry_ref = journal_data.find('.//wd:Journal_Entry_Reference', ns)
-        workday_journal_id = self.xml_helper.safe_get_text(journal_entry_ref, 'wd:ID[@wd:type="WID"]')
-        journal_id = self.xml_helper.safe_get_text(journal_entry_ref, 'wd:ID[@wd:type="Accounting_Journal_ID"]')
+        journal_entry_ids = self.xml_helper.get_id_map(journal_data.find('.//wd:Journal_Entry_Reference', ns))
+        workday_journal_id = journal_entry_ids.get('WID')
+        journal_id = journal_entry_ids.get('Accounting_Journal_ID')
         journal_entry = JournalEntryReference(Accounting_Journal_ID=journal_id)
 
         # Extract Journal Number
@@ -893,9 +1338,9 @@ class GetAllJournals(WorkdayService, ABC):
         if (self.filter_by_creation_date and is_aj_generated_today) or (self.filter_by_creation_date is False):
             try:
                 # P & L Destination
-                custom_Worktag_4_ref = journal_data.find('.//wd:Worktags_Reference', ns)
-                custom_Worktag_4_ID = self.xml_helper.safe_get_text(custom_Worktag_4_ref,
-                                                                    'wd:ID[@wd:type="Custom_Worktag_4_ID"]')
+                custom_Worktag_4_ID = self.xml_helper.get_id_map(
+                    journal_data.find('.//wd:Worktags_Reference', ns)
+                ).get('Custom_Worktag_4_ID')
 
                 # Get Description if present
                 journal_description = self.xml_helper.safe_get_text(journal_data, './/wd:Memo')
@@ -922,56 +1367,51 @@ class GetAllJournals(WorkdayService, ABC):
                 journal_sequence_number = self.xml_helper.safe_get_text(journal_data, './/wd:Journal_Sequence_Number')
 
                 # Extract the Journal Status reference
-                journal_status_ref = journal_data.find('.//wd:Journal_Status_Reference', ns)
+                journal_status_ids = self.xml_helper.get_id_map(journal_data.find('.//wd:Journal_Status_Reference', ns))
                 journal_status = JournalStatusReference(
-                    WID=self.xml_helper.safe_get_text(journal_status_ref, 'wd:ID[@wd:type="WID"]'),
-                    Journal_Entry_Status_ID=self.xml_helper.safe_get_text(journal_status_ref,
-                                                                          'wd:ID[@wd:type="Journal_Entry_Status_ID"]')
+                    WID=journal_status_ids.get('WID'),
+                    Journal_Entry_Status_ID=journal_status_ids.get('Journal_Entry_Status_ID')
                 )
 
                 # Extract the Journal Book Code
-                journal_bookcode_ref = journal_data.find('.//wd:Book_Code_Reference', ns)
-                book_code_id = self.xml_helper.safe_get_text(journal_bookcode_ref, 'wd:ID[@wd:type="Book_Code_ID"]')
+                book_code_id = self.xml_helper.get_id_map(
+                    journal_data.find('.//wd:Book_Code_Reference', ns)
+                ).get('Book_Code_ID')
                 book_code = self.book_codes.get(book_code_id)
 
                 # Extract Company_Reference
-                journal_comp_ref = journal_data.find('.//wd:Company_Reference', ns)
+                journal_comp_ids = self.xml_helper.get_id_map(journal_data.find('.//wd:Company_Reference', ns))
                 company_ref = CompanyReference(
-                    WID=self.xml_helper.safe_get_text(journal_comp_ref, 'wd:ID[@wd:type="WID"]'),
-                    Organization_Reference_ID=self.xml_helper.safe_get_text(journal_comp_ref,
-                                                                            'wd:ID[@wd:type="Organization_Reference_ID"]'),
-                    Company_Reference_ID=self.xml_helper.safe_get_text(journal_comp_ref,
-                                                                       'wd:ID[@wd:type="Company_Reference_ID"]')
+                    WID=journal_comp_ids.get('WID'),
+                    Organization_Reference_ID=journal_comp_ids.get('Organization_Reference_ID'),
+                    Company_Reference_ID=journal_comp_ids.get('Company_Reference_ID')
                 )
 
                 # Extract Currency_Reference
-                currency_ref = journal_data.find('.//wd:Currency_Reference', ns)
+                currency_ids = self.xml_helper.get_id_map(journal_data.find('.//wd:Currency_Reference', ns))
                 ledger_currency = CurrencyReference(
-                    WID=self.xml_helper.safe_get_text(currency_ref, 'wd:ID[@wd:type="WID"]'),
-                    Currency_ID=self.xml_helper.safe_get_text(currency_ref, 'wd:ID[@wd:type="Currency_ID"]'),
-                    Currency_Numeric_Code=self.xml_helper.safe_get_text(currency_ref,
-                                                                        'wd:ID[@wd:type="Currency_Numeric_Code"]')
+                    WID=currency_ids.get('WID'),
+                    Currency_ID=currency_ids.get('Currency_ID'),
+                    Currency_Numeric_Code=currency_ids.get('Currency_Numeric_Code')
                 )
 
                 # Extract Ledger_Reference
-                ledger_ref = journal_data.find('.//wd:Ledger_Reference', ns)
+                ledger_ids = self.xml_helper.get_id_map(journal_data.find('.//wd:Ledger_Reference', ns))
                 ledger = LedgerReference(
-                    WID=self.xml_helper.safe_get_text(ledger_ref, 'wd:ID[@wd:type="WID"]'),
-                    Ledger_Reference_ID=self.xml_helper.safe_get_text(ledger_ref,
-                                                                      'wd:ID[@wd:type="Ledger_Reference_ID"]')
+                    WID=ledger_ids.get('WID'),
+                    Ledger_Reference_ID=ledger_ids.get('Ledger_Reference_ID')
                 )
 
                 # Extract Journal_Source_Reference
-                source_ref = journal_data.find('.//wd:Journal_Source_Reference', ns)
                 journal_source = JournalSourceReference(
-                    Journal_Source_ID=self.xml_helper.safe_get_text(source_ref,
-                                                                    'wd:ID[@wd:type="Journal_Source_ID"]')
+                    Journal_Source_ID=self.xml_helper.get_id_map(
+                        journal_data.find('.//wd:Journal_Source_Reference', ns)
+                    ).get('Journal_Source_ID')
                 )
 
                 # Extract Ledger_Period_Reference
-                ledger_per_ref = journal_data.find('.//wd:Ledger_Period_Reference', ns)
                 ledger_period = LedgerPeriodReference(
-                    WID=self.xml_helper.safe_get_text(ledger_per_ref, 'wd:ID[@wd:type="WID"]')
+                    WID=self.xml_helper.get_id_map(journal_data.find('.//wd:Ledger_Period_Reference', ns)).get('WID')
                 )
 
                 # Get All Journal Entry Lines
@@ -979,21 +1419,22 @@ class GetAllJournals(WorkdayService, ABC):
                 for journal_entry_line_data in journal_entry_lines:
 
                     # Extract Line_Company_Reference
-                    line_company_ref = journal_entry_line_data.find('wd:Line_Company_Reference', ns)
+                    line_company_ids = self.xml_helper.get_id_map(
+                        journal_entry_line_data.find('wd:Line_Company_Reference', ns)
+                    )
                     line_company = LineCompanyReference(
-                        WID=self.xml_helper.safe_get_text(line_company_ref, 'wd:ID[@wd:type="WID"]'),
-                        Organization_Reference_ID=self.xml_helper.safe_get_text(line_company_ref,
-                                                                                'wd:ID[@wd:type="Organization_Reference_ID"]'),
-                        Company_Reference_ID=self.xml_helper.safe_get_text(line_company_ref,
-                                                                           'wd:ID[@wd:type="Company_Reference_ID"]')
+                        WID=line_company_ids.get('WID'),
+                        Organization_Reference_ID=line_company_ids.get('Organization_Reference_ID'),
+                        Company_Reference_ID=line_company_ids.get('Company_Reference_ID')
                     )
 
                     # Extract Ledger_Account_Reference
-                    ledger_acc_ref = journal_entry_line_data.find('wd:Ledger_Account_Reference', ns)
+                    ledger_acc_ids = self.xml_helper.get_id_map(
+                        journal_entry_line_data.find('wd:Ledger_Account_Reference', ns)
+                    )
                     ledger_account = LedgerAccountReference(
-                        WID=self.xml_helper.safe_get_text(ledger_acc_ref, 'wd:ID[@wd:type="WID"]'),
-                        Ledger_Account_ID=self.xml_helper.safe_get_text(ledger_acc_ref,
-                                                                        'wd:ID[@wd:type="Ledger_Account_ID"]')
+                        WID=ledger_acc_ids.get('WID'),
+                        Ledger_Account_ID=ledger_acc_ids.get('Ledger_Account_ID')
                     )
                     # Extract the Worktags_Reference with Organization_Reference_ID
                     worktags = WorktagsReference()
@@ -1031,13 +1472,11 @@ class GetAllJournals(WorkdayService, ABC):
                     # Extract Memo
                     memo = self.xml_helper.safe_get_text(journal_entry_line_data, 'wd:Memo')
 
-                    # Extract Currency_Reference
-                    currency_ref = journal_data.find('.//wd:Currency_Reference', ns)
+                    # Currency_Reference of the journal, already scanned
                     home_currency = CurrencyReference(
-                        WID=self.xml_helper.safe_get_text(currency_ref, 'wd:ID[@wd:type="WID"]'),
-                        Currency_ID=self.xml_helper.safe_get_text(currency_ref, 'wd:ID[@wd:type="Currency_ID"]'),
-                        Currency_Numeric_Code=self.xml_helper.safe_get_text(currency_ref,
-                                                                            'wd:ID[@wd:type="Currency_Numeric_Code"]')
+                        WID=currency_ids.get('WID'),
+                        Currency_ID=currency_ids.get('Currency_ID'),
+                        Currency_Numeric_Code=currency_ids.get('Currency_Numeric_Code')
                     )
 
                     # Create the JournalEntryLine object
@@ -1100,21 +1539,56 @@ class GetAllJournals(WorkdayService, ABC):
             return None
 
     @staticmethod
-    def split_csv_content(csv_content: str, line_number: int) -> List[str]:
+    def split_csv_content(csv_content: str, line_number: int, max_chunk_bytes: Optional[int] = None) -> List[str]:
         """
         Split up the csv content when the file is `large`
         :param csv_content: Full CSV size
-        :param line_number: Number of line you want to start splitting up the file
+        :param line_number: Number of rows by chunk, a quoted value holding a line break stays in its row
+        :param max_chunk_bytes: Maximum size of a chunk in bytes, header included (None: no limit)
         :return: List of CSV chunks
         """
-        # Split the CSV content into lines
-        lines = csv_content.strip().split('\n')
-        # Extract the header and the rest of the lines
-        header, lines = lines[0], lines[1:]
-        # Split the lines into chunks of 'line_number' size
-        chunks = [lines[i:i + line_number] for i in range(0, len(lines), line_number)]
-        # Join each chunk back into a CSV string
-        csv_chunks = ['\n'.join([header] + chunk) for chunk in chunks]
+        return CSVChunkWriter.split(csv_content, line_number, max_chunk_bytes).chunks
+
+
+
+# Journal parser of a `parse_processes` worker, built once by `_init_journal_parse_worker`
+_worker_journal_parser: Optional[GetAllJournals] = None
 
-        return csv_chunks
 
+def _init_journal_parse_worker(
+        api_version: str,
+        creation_date: str,
+        filter_by_creation_date: bool,
+        master_data: Dict[str, Dict[str, Any]],
+):
+    """
+    Initializer of the `parse_processes` workers, the journals are only parsed, not mapped
+    :param master_data: RAAS dicts by `MASTER_DATA_REPORTS` attribute, see `GetAllJournals._get_parse_worker_master_data`
+    """
+    global _worker_journal_parser
+    _worker_journal_parser = GetAllJournals(
+        '', '', '', creation_date, filter_by_creation_date,
+        **{name: master_data.get(name, {}) for name in MASTER_DATA_REPORTS},
+        raas_suppliers=None, resource_category_service=None, customer_contract_service=None,
+        api_version=api_version, two_phase=True,
+    )
+
+
+def _parse_journal_chunk(
+        chunk: bytes,
+        next_page: int
+) -> Tuple[List[JournalEntry], int, List[FailedProcessedJournal], List[FailedProcessedJournal]]:
+    """
+    Parse a chunk of raw journals in a `parse_processes` worker
+    :param chunk: Standalone document holding the journal elements
+    :param next_page: Page counter of the parent service, for the failure messages
+    :return: (parsed journals, number of rejected journals, failed_journals, failed_entity)
+    """
+    parser = _worker_journal_parser
+    parser.next_page = next_page
+    parser.outdated_counter = 0
+    parser.failed_journals = []
+    parser.failed_entity = []
+    journals = parser._parse_page_entries(list(ET.fromstring(chunk)))
+
+    return journals, parser.outdated_counter, parser.failed_journals, parser.failed_entity
@@ -2,7 +2,7 @@ from abc import ABC
 import xml.etree.ElementTree as ET
 from typing import Tuple, Dict
 
-from workday_api_generator_call import WorkdayRAASService
+from workday_api_generator_call import WorkdayRAASService, WorkdayTransport, RAASSnapshotStore, TokenSource, int_flag
 from models import *
 
 
@@ -11,7 +11,9 @@ class GetRAASCompanies(WorkdayRAASService, ABC):
 
     def __init__(
             self, base_url: str,
-            tenant: str, token: str,
+            tenant: str, token: TokenSource,
+            transport: Optional[WorkdayTransport] = None,
+            snapshot_store: Optional[RAASSnapshotStore] = None,
     ):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-UPD-001_MasterData_Companies'
@@ -19,6 +21,8 @@ class GetRAASCompanies(WorkdayRAASService, ABC):
         super().__init__(
             self._url, tenant, token,
             'urn:com.workday.report/INT-UPD-001_MasterData_Companies',
+            transport=transport,
+            snapshot_store=snapshot_store,
         )
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[str, T]:
@@ -41,10 +45,17 @@ class GetRAASCompanies(WorkdayRAASService, ABC):
 
 class GetWDCompanies(WorkdayRAASService, ABC):
     """ Get all companies aka Subsidiaries with Workday element for Zuora inbound"""
+    FIELD_SPECS = (
+        FieldSpec('wid', 'wd:Company', id_type='WID'),
+        FieldSpec('organization_reference_id', 'wd:Company', id_type='Organization_Reference_ID'),
+        FieldSpec('company_reference_id', 'wd:Company', id_type='Company_Reference_ID'),
+    )
 
     def __init__(
             self, base_url: str,
-            tenant: str, token: str,
+            tenant: str, token: TokenSource,
+            transport: Optional[WorkdayTransport] = None,
+            snapshot_store: Optional[RAASSnapshotStore] = None,
     ):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-UPD-001_MasterData_Companies'
@@ -52,46 +63,38 @@ class GetWDCompanies(WorkdayRAASService, ABC):
         super().__init__(
             self._url, tenant, token,
             'urn:com.workday.report/INT-UPD-001_MasterData_Companies',
+            transport=transport,
+            snapshot_store=snapshot_store,
         )
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[str, T]:
         namespace = self.raas_ns
 
-        wid: str = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Company', 'wd:ID[@wd:type="WID"]', str
-        )
-        organization_ref_id: str = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Company', 'wd:ID[@wd:type="Organization_Reference_ID"]', str
-        )
-        company_ref_id: str = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Company', 'wd:ID[@wd:type="Company_Reference_ID"]', str
-        )
+        fields = self.field_extractor.extract(entry)
         # Extract Descriptor of Company Element with null safety
         company_entry = entry.find('wd:Company', namespace)
         descriptor = company_entry.attrib.get(
             self.get_raas_att_path('Descriptor')) if company_entry is not None else None
 
         # convert into Mapped Object
-        cmp = WorkdayCompanies(
-            wid=wid,
-            organization_reference_id=organization_ref_id,
-            company_reference_id=company_ref_id,
-            descriptor=descriptor
-        )
+        cmp = WorkdayCompanies(descriptor=descriptor, **fields)
 
-        return company_ref_id, cmp
+        return cmp.company_reference_id, cmp
 
 
 class GetRAASBookCodes(WorkdayRAASService, ABC):
     """ Get all Book Codes """
 
-    def __init__(self, base_url: str, tenant: str, token: str):
+    def __init__(self, base_url: str, tenant: str, token: TokenSource,
+                 transport: Optional[WorkdayTransport] = None, snapshot_store: Optional[RAASSnapshotStore] = None):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-AUTO-001_MasterData_BookCodes'
 
         super().__init__(
             self._url, tenant, token,
             'urn:com.workday.report/INT-AUTO-001_MasterData_BookCodes',
+            transport=transport,
+            snapshot_store=snapshot_store,
         )
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[str, BookCodeInfo]:
@@ -113,14 +116,22 @@ class GetRAASBookCodes(WorkdayRAASService, ABC):
 
 class GetRAASCostCenter(WorkdayRAASService, ABC):
     """ Get all Cost Center """
-
-    def __init__(self, base_url: str, tenant: str, token: str):
+    FIELD_SPECS = (
+        FieldSpec('reference_id', 'wd:referenceID'),
+        FieldSpec('cost_center_code', 'wd:Cost_Center_Code'),
+        FieldSpec('manager_employee_id', 'wd:Cost_Center_Manager', id_type='Employee_ID'),
+    )
+
+    def __init__(self, base_url: str, tenant: str, token: TokenSource,
+                 transport: Optional[WorkdayTransport] = None, snapshot_store: Optional[RAASSnapshotStore] = None):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-UPL-002_MasterData_CostCenters'
 
         super().__init__(
             self._url, tenant, token,
             'urn:com.workday.report/INT-UPL-002_MasterData_CostCenters',
+            transport=transport,
+            snapshot_store=snapshot_store,
         )
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[str, CostCenterInfo]:
@@ -131,22 +142,14 @@ class GetRAASCostCenter(WorkdayRAASService, ABC):
         # use `NOT` because the header is 'is active'
         is_active = not bool(int(is_active_element.text)) if is_active_element is not None else None
 
-        # Find the CC reference ID
-        reference_id_element = entry.find('wd:referenceID', namespace)
-        reference_id = reference_id_element.text if reference_id_element is not None else None
-
-        # Extract Cost_Center_Code with null safety
-        cost_center_code_element = entry.find('wd:Cost_Center_Code', namespace)
-        cost_center_code = cost_center_code_element.text if cost_center_code_element is not None else None
+        # CC reference ID, Cost_Center_Code and manager ID
+        fields = self.field_extractor.extract(entry)
 
         cost_center_mger_element = entry.find('.//wd:Cost_Center_Manager', namespace)
         cost_center_mng_name = cost_center_mger_element.attrib.get(
             self.get_raas_att_path('Descriptor')) if cost_center_mger_element is not None else None
 
-        cost_center_mng_id = self.xml_helper.get_single_tag_nested_value(entry, 'wd:Cost_Center_Manager',
-                                                                         'wd:ID[@wd:type="Employee_ID"]', str)
-
-        manager = Manager(manager_employee_id=cost_center_mng_id, manager_name=cost_center_mng_name)
+        manager = Manager(manager_employee_id=fields['manager_employee_id'], manager_name=cost_center_mng_name)
 
         # Extract Descriptor of Cost_Center Element with null safety
         cost_center_element = entry.find('wd:Cost_Center', namespace)
@@ -161,11 +164,11 @@ class GetRAASCostCenter(WorkdayRAASService, ABC):
 
         # convert into Mapped Object
         cc_info = CostCenterInfo(
-            code=cost_center_code,
+            code=fields['cost_center_code'],
             name=name,
             manager=manager,
             isActive=is_active,
-            referenceID=reference_id
+            referenceID=fields['reference_id']
         )
 
         return cc_info.referenceID, cc_info
@@ -173,22 +176,31 @@ class GetRAASCostCenter(WorkdayRAASService, ABC):
 
 class GetRAASSites(WorkdayRAASService, ABC):
     """ Get all Site Locations """
-
-    def __init__(self, base_url: str, tenant: str, token: str):
+    FIELD_SPECS = (
+        FieldSpec('site_id', 'wd:Location_ID'),
+        FieldSpec('inactive', 'wd:Inactive', converter=int_flag, default=False),
+        FieldSpec('country_alpha_code', 'wd:country', id_type='ISO_3166-1_Alpha-3_Code'),
+        FieldSpec('country_digit_code', 'wd:country', id_type='ISO_3166-1_Numeric-3_Code', converter=int),
+        FieldSpec('location_type', 'wd:Location_Type', id_type='Location_Type_ID'),
+        FieldSpec('location_usage', 'wd:locationUsage', id_type='Location_Usage_ID'),
+    )
+
+    def __init__(self, base_url: str, tenant: str, token: TokenSource,
+                 transport: Optional[WorkdayTransport] = None, snapshot_store: Optional[RAASSnapshotStore] = None):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-UPD-002_MasterData_Sites'
 
         super().__init__(
             self._url, tenant, token,
             'urn:com.workday.report/INT-UPD-002_MasterData_Sites',
+            transport=transport,
+            snapshot_store=snapshot_store,
         )
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[str, SiteInfo]:
         namespace = self.raas_ns
 
-        site_id = self.xml_helper.get_single_tag_line_value(entry, 'wd:Location_ID', str)
-
-        inactive = bool(self.xml_helper.get_single_tag_line_value(entry, 'wd:Inactive', int))
+        fields = self.field_extractor.extract(entry)
 
         location_arch_elmt = entry.find('wd:Location_Hierarchies', namespace)
         location_arch = location_arch_elmt.attrib.get(
@@ -204,141 +216,111 @@ class GetRAASSites(WorkdayRAASService, ABC):
         country_name = country_elmt.attrib.get(
             self.get_raas_att_path('Descriptor')) if country_elmt else None
 
-        country_alpha = self.xml_helper.get_single_tag_nested_value(entry, 'wd:country',
-                                                                    'wd:ID[@wd:type="ISO_3166-1_Alpha-3_Code"]', str)
-        country_digit = self.xml_helper.get_single_tag_nested_value(entry, 'wd:country',
-                                                                    'wd:ID[@wd:type="ISO_3166-1_Numeric-3_Code"]', int)
-
-        location_type = self.xml_helper.get_single_tag_nested_value(entry, 'wd:Location_Type',
-                                                                    'wd:ID[@wd:type="Location_Type_ID"]', str)
-
-        location_usage = self.xml_helper.get_single_tag_nested_value(entry, 'wd:locationUsage',
-                                                                     'wd:ID[@wd:type="Location_Usage_ID"]', str)
-
         sites = SiteInfo(
-            site_id=site_id,
-            inactive=inactive,
             country_name=country_name,
-            location_usage=location_usage,
             location_name=location_name,
-            location_type=location_type,
             location_address=address,
             location_hierarchies=location_arch,
-            country_alpha_code=country_alpha,
-            country_digit_code=country_digit,
+            **fields
         )
 
-        return site_id, sites
+        return sites.site_id, sites
 
 
 class GetRAASProjectCodes(WorkdayRAASService, ABC):
     """ Get all Project Codes ⚠️ Depreciated """
-
-    def __init__(self, base_url: str, tenant: str, token: str, projects_and_project_hierarchies_id: str):
+    FIELD_SPECS = (
+        FieldSpec('project_id', 'wd:referenceID'),
+        FieldSpec('start_date', 'wd:Start_Date'),
+        FieldSpec('end_date', 'wd:End_Date'),
+        FieldSpec('project_status', 'wd:Project_Status'),
+        FieldSpec('company', 'wd:Company'),
+        FieldSpec('project_currency_id', 'wd:Project_Currency', id_type='Currency_ID'),
+        FieldSpec('project_currency_num_code', 'wd:Project_Currency', id_type='Currency_Numeric_Code'),
+        FieldSpec('name', 'wd:Project', id_type='Project_ID'),
+    )
+
+    def __init__(self, base_url: str, tenant: str, token: TokenSource, projects_and_project_hierarchies_id: str,
+                 transport: Optional[WorkdayTransport] = None, snapshot_store: Optional[RAASSnapshotStore] = None):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-AUTO-022_MasterData_Projects?Projects_and_Project_Hierarchies!WID={projects_and_project_hierarchies_id}'
 
         super().__init__(
             self._url, tenant, token,
             'urn:com.workday.report/INT-AUTO-022_MasterData_Projects',
+            transport=transport,
+            snapshot_store=snapshot_store,
         )
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[str, ProjectCodeInfo]:
-        reference_id = self.xml_helper.get_single_tag_line_value(entry, 'wd:referenceID', str)
-
-        start_date = self.xml_helper.get_single_tag_line_value(entry, 'wd:Start_Date', str)
-        end_date = self.xml_helper.get_single_tag_line_value(entry, 'wd:End_Date', str)
-        project_status = self.xml_helper.get_single_tag_line_value(entry, 'wd:Project_Status', str)
-        company = self.xml_helper.get_single_tag_line_value(entry, 'wd:Company', str)
-
-        project_currency_id = self.xml_helper.get_single_tag_nested_value(entry, 'wd:Project_Currency',
-                                                                          'wd:ID[@wd:type="Currency_ID"]', str)
-
-        project_currency_num_code = self.xml_helper.get_single_tag_nested_value(entry, 'wd:Project_Currency',
-                                                                                'wd:ID[@wd:type="Currency_Numeric_Code"]',
-                                                                                str)
-
-        project_name = self.xml_helper.get_single_tag_nested_value(entry, 'wd:Project',
-                                                                   'wd:ID[@wd:type="Project_ID"]', str)
-
-        project_code = ProjectCodeInfo(
-            project_id=reference_id,
-            name=project_name,
-            project_currency_id=project_currency_id,
-            project_currency_num_code=project_currency_num_code,
-            start_date=start_date,
-            end_date=end_date,
-            project_status=project_status,
-            company=company
-        )
+        project_code = ProjectCodeInfo(**self.field_extractor.extract(entry))
 
-        return reference_id, project_code
+        return project_code.project_id, project_code
 
 
 class GetRAASEmployees(WorkdayRAASService, ABC):
     """ Get all Employees """
-
-    def __init__(self, base_url: str, tenant: str, token: str, worker_types: str):
+    FIELD_SPECS = (
+        FieldSpec('employee_id', 'wd:Employee_ID'),
+        FieldSpec('full_legal_name', 'wd:Full_Legal_Name'),
+        FieldSpec('employee_contract_type', 'wd:CF_Employee_Type_Contract_Type'),
+        FieldSpec('primary_work_email', 'wd:primaryWorkEmail'),
+        FieldSpec('manager_email', 'wd:Manager_Email'),
+        FieldSpec('manager_employee_id', 'wd:Manager', id_type='Employee_ID'),
+        FieldSpec('country_alpha_code', 'wd:Primary_Work_Address_-_Country', id_type='ISO_3166-1_Alpha-3_Code'),
+        FieldSpec('country_digit_code', 'wd:Primary_Work_Address_-_Country', id_type='ISO_3166-1_Numeric-3_Code'),
+    )
+
+    def __init__(self, base_url: str, tenant: str, token: TokenSource, worker_types: str,
+                 transport: Optional[WorkdayTransport] = None, snapshot_store: Optional[RAASSnapshotStore] = None):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-UPL-003_MasterData_Employees?Worker_Types!WID={worker_types}'
         namespace = 'urn:com.workday.report/Master_Data_-_Employees'
 
-        super().__init__(self._url, tenant, token, namespace)
+        super().__init__(self._url, tenant, token, namespace, transport=transport, snapshot_store=snapshot_store)
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[str, EmployeeInfo]:
-        employee_id = self.xml_helper.get_single_tag_line_value(entry, 'wd:Employee_ID', str)
-        full_name = self.xml_helper.get_single_tag_line_value(entry, 'wd:Full_Legal_Name', str)
-        contract_type = self.xml_helper.get_single_tag_line_value(entry, 'wd:CF_Employee_Type_Contract_Type', str)
-        primary_work_email = self.xml_helper.get_single_tag_line_value(entry, 'wd:primaryWorkEmail', str)
+        fields = self.field_extractor.extract(entry)
 
-        manager_email = self.xml_helper.get_single_tag_line_value(entry, 'wd:Manager_Email', str)
         manager_element = entry.find('wd:Manager', self.raas_ns)
         manager_name = manager_element.attrib.get(self.get_raas_att_path('Descriptor')) if manager_element else None
-        manager_employee_id = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Manager', 'wd:ID[@wd:type="Employee_ID"]', str
-        )
 
         primary_address = self.get_tag_property_value(entry, 'wd:Primary_Work_Address', 'Descriptor')
 
         work_address_country = self.get_tag_property_value(entry, 'wd:Primary_Work_Address_-_Country', 'Descriptor')
-        work_address_country_code = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Primary_Work_Address_-_Country', 'wd:ID[@wd:type="ISO_3166-1_Alpha-3_Code"]', str
-        )
-        work_address_country_num = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Primary_Work_Address_-_Country', 'wd:ID[@wd:type="ISO_3166-1_Numeric-3_Code"]', str
-        )
 
         primary_country_address = Country(
             country_name=work_address_country,
-            country_digit_code=work_address_country_num,
-            country_alpha_code=work_address_country_code
+            country_digit_code=fields['country_digit_code'],
+            country_alpha_code=fields['country_alpha_code']
         )
 
-        manager = Manager(manager_employee_id=manager_employee_id, manager_name=manager_name,
-                          manager_email=manager_email)
+        manager = Manager(manager_employee_id=fields['manager_employee_id'], manager_name=manager_name,
+                          manager_email=fields['manager_email'])
 
         employee = EmployeeInfo(
-            employee_id=employee_id,
-            full_legal_name=full_name,
-            employee_contract_type=contract_type,
-            primary_work_email=primary_work_email,
+            employee_id=fields['employee_id'],
+            full_legal_name=fields['full_legal_name'],
+            employee_contract_type=fields['employee_contract_type'],
+            primary_work_email=fields['primary_work_email'],
             primary_work_address=primary_address,
             primary_work_country_address=primary_country_address,
             manager=manager
         )
 
-        return employee_id, employee
+        return employee.employee_id, employee
 
 
 class GetRAASAssetCategories(WorkdayRAASService, ABC):
     """ Get all Asset Categories """
 
-    def __init__(self, base_url: str, tenant: str, token: str):
+    def __init__(self, base_url: str, tenant: str, token: TokenSource,
+                 transport: Optional[WorkdayTransport] = None, snapshot_store: Optional[RAASSnapshotStore] = None):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-UPL-004_MasterData_AssetCategories'
         namespace = 'urn:com.workday.report/INT-UPL-004_MasterData_AssetCategories'
 
-        super().__init__(self._url, tenant, token, namespace)
+        super().__init__(self._url, tenant, token, namespace, transport=transport, snapshot_store=snapshot_store)
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[str, AssetCategories]:
         asset_id = self.xml_helper.get_single_tag_line_value(entry, 'wd:Reference_ID_Value', str)
@@ -354,30 +336,28 @@ class GetRAASAssetCategories(WorkdayRAASService, ABC):
 
 class GetRAASGeoSales(WorkdayRAASService, ABC):
     """ Get all Geo Sales aka GTM Organization """
-
-    def __init__(self, base_url: str, tenant: str, token: str):
+    FIELD_SPECS = (
+        FieldSpec('dimension_id', 'wd:Dimension_Reference_ID'),
+        FieldSpec('name', 'wd:name'),
+        FieldSpec('organization_active', 'wd:RPT_TF_Organization_Active', converter=int_flag, default=False),
+    )
+
+    def __init__(self, base_url: str, tenant: str, token: TokenSource,
+                 transport: Optional[WorkdayTransport] = None, snapshot_store: Optional[RAASSnapshotStore] = None):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-AUTO-014_MasterData_GeoSales'
         namespace = 'urn:com.workday.report/INT-AUTO-014_MasterData_GeoSales'
 
-        super().__init__(self._url, tenant, token, namespace)
+        super().__init__(self._url, tenant, token, namespace, transport=transport, snapshot_store=snapshot_store)
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[Optional[str], Optional[GeoSales]]:
-        dimension_id = self.xml_helper.get_single_tag_line_value(entry, 'wd:Dimension_Reference_ID', str)
-        name = self.xml_helper.get_single_tag_line_value(entry, 'wd:name', str)
-        organization_active = bool(
-            self.xml_helper.get_single_tag_line_value(entry, 'wd:RPT_TF_Organization_Active', int))
-        dimension_name = self.get_tag_property_value(entry, 'wd:Dimension', 'Descriptor')
+        fields = self.field_extractor.extract(entry)
 
         # return Active only:
-        if organization_active:
-            geosales = GeoSales(
-                dimension_id=dimension_id,
-                name=name,
-                dimension_name=dimension_name,
-                organization_active=organization_active
-            )
-            return dimension_id, geosales
+        if fields['organization_active']:
+            dimension_name = self.get_tag_property_value(entry, 'wd:Dimension', 'Descriptor')
+            geosales = GeoSales(dimension_name=dimension_name, **fields)
+            return geosales.dimension_id, geosales
         else:
             # will not be processed
             return None, None
@@ -385,14 +365,22 @@ class GetRAASGeoSales(WorkdayRAASService, ABC):
 
 class GetRAASLedgerAccount(WorkdayRAASService, ABC):
     """ Get all Ledger Accounts """
-
-    def __init__(self, base_url: str, tenant: str, token: str):
+    FIELD_SPECS = (
+        FieldSpec('Ledger_Account_ID', 'wd:Ledger_Account_ID'),
+        FieldSpec('WID', 'wd:Ledger_Account', id_type='WID'),
+        FieldSpec('Ledger_Account_Summary_ID', 'wd:Ledger_Account_Summary', id_type='Ledger_Account_Summary_ID'),
+    )
+
+    def __init__(self, base_url: str, tenant: str, token: TokenSource,
+                 transport: Optional[WorkdayTransport] = None, snapshot_store: Optional[RAASSnapshotStore] = None):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/INT-UPL-001_MasterData_LedgerAccounts'
 
         super().__init__(
             self._url, tenant, token,
             'urn:com.workday.report/Master_Data_-_Ledger_Accounts__MSA_',
+            transport=transport,
+            snapshot_store=snapshot_store,
         )
 
     @staticmethod
@@ -403,18 +391,12 @@ class GetRAASLedgerAccount(WorkdayRAASService, ABC):
         return text
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[str, LedgerAccount]:
-        ledger_account_id = self.xml_helper.get_single_tag_line_value(entry, 'wd:Ledger_Account_ID', str)
+        fields = self.field_extractor.extract(entry)
 
-        ledger_account_wid = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Ledger_Account', 'wd:ID[@wd:type="WID"]', str
-        )
         ledger_account_name = self.get_tag_property_value(entry, 'wd:Ledger_Account_Name', 'Descriptor')
         ledger_account_summary = self._clean_up_string(
             self.get_tag_property_value(entry, 'wd:Ledger_Account_Summary', 'Descriptor')
         )
-        ledger_account_summary_id = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Ledger_Account_Summary', 'wd:ID[@wd:type="Ledger_Account_Summary_ID"]', str
-        )
         #ledger_account_type = self.get_tag_property_value(entry, 'wd:Types', 'Descriptor')
         ledger_account_types = [
             type_.attrib.get(self.get_raas_att_path('Descriptor'))
@@ -428,27 +410,34 @@ class GetRAASLedgerAccount(WorkdayRAASService, ABC):
         types = "#".join(ledger_account_types)
 
         ledger_account = LedgerAccount(
-            Ledger_Account_ID=ledger_account_id,
             Ledger_Account_Name=ledger_account_name,
             Ledger_Account_Summary=ledger_account_summary,
-            Ledger_Account_Summary_ID=ledger_account_summary_id,
             Types=types,
             Account_Sets=account_sets,
-            WID=ledger_account_wid
+            **fields
         )
 
-        return ledger_account_id, ledger_account
+        return ledger_account.Ledger_Account_ID, ledger_account
 
 
 class GetRAASLedgerHierarchy(WorkdayRAASService, ABC):
     """ Get all Geo Sales aka GTM Organization """
+    FIELD_SPECS = (
+        FieldSpec('ledger_account_id', 'wd:Ledger_Account_by_Identifier', id_type='Ledger_Account_ID'),
+        FieldSpec('management_view_lvl_1_name', 'wd:Management_View_-_Level_1', id_type='Ledger_Account_Summary_ID'),
+        FieldSpec('management_view_lvl_2_name', 'wd:Management_View_-_Level_2', id_type='Ledger_Account_Summary_ID'),
+        FieldSpec('management_view_lvl_3_name', 'wd:Management_View_-_Level_3', id_type='Ledger_Account_Summary_ID'),
+        FieldSpec('management_view_lvl_4_name', 'wd:Management_View_-_Level_4', id_type='Ledger_Account_Summary_ID'),
+    )
 
     def __init__(
             self,
             base_url: str,
             tenant: str,
-            token: str,
-            ledger_account_dic: Dict[str, LedgerAccount]
+            token: TokenSource,
+            ledger_account_dic: Dict[str, LedgerAccount],
+            transport: Optional[WorkdayTransport] = None,
+            snapshot_store: Optional[RAASSnapshotStore] = None,
     ):
         # Initialize the parent class (ADNService)
         self._url = f'{base_url}/ccx/service/customreport2/{tenant}/ISU%20Workato/Ledger_Account_Hierarchies_-_Management_View_Non-GAAP'
@@ -456,7 +445,7 @@ class GetRAASLedgerHierarchy(WorkdayRAASService, ABC):
 
         self.ledger_account_dic = ledger_account_dic
 
-        super().__init__(self._url, tenant, token, namespace)
+        super().__init__(self._url, tenant, token, namespace, transport=transport, snapshot_store=snapshot_store)
 
     @staticmethod
     def _clean_up_string(text: str) -> str:
@@ -487,9 +476,8 @@ class GetRAASLedgerHierarchy(WorkdayRAASService, ABC):
         return ledger_account_summary_id, ledger_account_summary_name, ledger_account_type
 
     def parse_raas_element(self, entry: ET.Element) -> Tuple[Optional[str], Optional[LedgerAccountHierarchy]]:
-        ledger_account_id = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Ledger_Account_by_Identifier', 'wd:ID[@wd:type="Ledger_Account_ID"]', str
-        )
+        fields = self.field_extractor.extract(entry)
+        ledger_account_id = fields['ledger_account_id']
         ledger_account_name = self._clean_up_string(
             self.get_tag_property_value(entry, 'wd:Ledger_Account', 'Descriptor')
         )
@@ -501,30 +489,18 @@ class GetRAASLedgerHierarchy(WorkdayRAASService, ABC):
         management_view_lvl_1_id = self._clean_up_string(
             self.get_tag_property_value(entry, 'wd:Management_View_-_Level_1', 'Descriptor')
         )
-        management_view_lvl_1_name = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Management_View_-_Level_1', 'wd:ID[@wd:type="Ledger_Account_Summary_ID"]', str
-        )
 
         management_view_lvl_2_id = self._clean_up_string(
             self.get_tag_property_value(entry, 'wd:Management_View_-_Level_2', 'Descriptor')
         )
-        management_view_lvl_2_name = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Management_View_-_Level_2', 'wd:ID[@wd:type="Ledger_Account_Summary_ID"]', str
-        )
 
         management_view_lvl_3_id = self._clean_up_string(
             self.get_tag_property_value(entry, 'wd:Management_View_-_Level_3', 'Descriptor')
         )
-        management_view_lvl_3_name = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Management_View_-_Level_3', 'wd:ID[@wd:type="Ledger_Account_Summary_ID"]', str
-        )
 
         management_view_lvl_4_id = self._clean_up_string(
             self.get_tag_property_value(entry, 'wd:Management_View_-_Level_4', 'Descriptor')
         )
-        management_view_lvl_4_name = self.xml_helper.get_single_tag_nested_value(
-            entry, 'wd:Management_View_-_Level_4', 'wd:ID[@wd:type="Ledger_Account_Summary_ID"]', str
-        )
 
         ledger_account_hierarchy = LedgerAccountHierarchy(
             ledger_account_id=ledger_account_id,
@@ -535,16 +511,16 @@ class GetRAASLedgerHierarchy(WorkdayRAASService, ABC):
             ledger_account_type=ledger_account_type,
 
             management_view_lvl_1_id=management_view_lvl_1_id,
-            management_view_lvl_1_name=management_view_lvl_1_name,
+            management_view_lvl_1_name=fields['management_view_lvl_1_name'],
 
             management_view_lvl_2_id=management_view_lvl_2_id,
-            management_view_lvl_2_name=management_view_lvl_2_name,
+            management_view_lvl_2_name=fields['management_view_lvl_2_name'],
 
             management_view_lvl_3_id=management_view_lvl_3_id,
-            management_view_lvl_3_name=management_view_lvl_3_name,
+            management_view_lvl_3_name=fields['management_view_lvl_3_name'],
 
             management_view_lvl_4_id=management_view_lvl_4_id,
-            management_view_lvl_4_name=management_view_lvl_4_name,
+            management_view_lvl_4_name=fields['management_view_lvl_4_name'],
         )
 
         return ledger_account_id, ledger_account_hierarchy
@@ -1,7 +1,21 @@
-from typing import Optional, Type, Dict
+from typing import Optional, Type, Dict, Tuple, List, Any, Iterable
 import xml.etree.ElementTree as ET
 
-from workday.models import T, WorktagsReference
+from workday.models import T, WorktagsReference, FieldSpec
+
+# Worktag ID type -> `WorktagsReference` field
+WORKTAG_ID_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('Custom_Organization_Reference_ID', 'Custom_Organization_Reference_ID'),  # acquisition channel using GTM org
+    ('Cost_Center_Reference_ID', 'Cost_Center_Reference_ID'),
+    ('Supplier_ID', 'Supplier_ID'),
+    ('Project_ID', 'Project_ID'),
+    ('Spend_Category_ID', 'Spend_Category_ID'),
+    ('Revenue_Category_ID', 'Revenue_Category_ID'),
+    ('Customer_Contract_Reference_ID', 'Customer_Contract_Reference_ID'),
+    ('Custom_Worktag_3_ID', 'cash_flow_code'),  # Cash Flow Code
+    ('Customer_ID', 'customer_id'),
+    ('Custom_Worktag_4_ID', 'destination_id_cust_worktag_4'),  # Item Destination
+)
 
 
 class XMLHelper:
@@ -14,6 +28,10 @@ class XMLHelper:
         self.raas_ns = raas_ns if raas_ns is not None else {
             'wd': 'urn:com.workday.report/Master_Data_-_Ledger_Accounts__MSA_'
         }
+        # qualified names of the reference IDs, e.g: <wd:ID wd:type="WID">
+        wd_ns = self.ns.get('wd')
+        self.id_tag = '{' + wd_ns + '}ID' if wd_ns else 'ID'
+        self.id_type_attribute = '{' + wd_ns + '}type' if wd_ns else 'type'
 
     def get_single_tag_line_value(self, entry: ET.Element, tag_name: str, return_type: Optional[Type[T]]):
         """
@@ -54,6 +72,43 @@ class XMLHelper:
                     return None  # Return None if conversion fails
         return None
 
+    def get_id_map(self, reference: Optional[ET.Element]) -> Dict[str, Optional[str]]:
+        """
+        Scan the `wd:ID` children of a reference element once, instead of one `wd:ID[@wd:type="..."]` lookup by type
+
+        :param reference: Reference element e.g: <wd:Company_Reference>, None is accepted
+        :return: Dict of key = ID type : ID text, the first ID of each type is kept
+        """
+        ids: Dict[str, Optional[str]] = {}
+        if reference is None:
+            return ids
+
+        for child in reference:
+            if child.tag == self.id_tag:
+                id_type = child.get(self.id_type_attribute)
+                if id_type not in ids:
+                    ids[id_type] = child.text.replace('\n', '') if child.text is not None else None
+        return ids
+
+    def get_reference_id(self, entry: ET.Element, tag_name: str, id_type: str, return_type: Optional[Type[T]] = str):
+        """
+        Null safely get the ID of the given type from a reference child, e.g: the `Supplier_Category_ID`
+        of <wd:Supplier_Category_Reference>
+
+        :param entry: Entry element where you want to find the reference
+        :param tag_name: String representing the path of the reference, example: 'wd:Supplier_Category_Reference'
+        :param id_type: ID type, example: 'Supplier_Category_ID'
+        :param return_type: The type to which the ID should be converted, e.g., int, str
+        :return: The ID converted to the specified type, or None if the ID is not found or conversion fails
+        """
+        text = self.get_id_map(entry.find(tag_name, self.ns)).get(id_type)
+        if text is not None:
+            try:
+                return return_type(text)
+            except (ValueError, TypeError):
+                return None  # Return None if conversion fails
+        return None
+
     def get_raas_att_path(self, prpty: str):
         return '{' + self.raas_ns.get('wd') + '}' + prpty
 
@@ -86,48 +141,94 @@ class XMLHelper:
             return None
 
     def create_worktags_object(self, worktag, wortakObj: WorktagsReference) -> WorktagsReference:
-        # acquisition channel dimension usingGTM org
-        custom_org_id = self.safe_get_text(worktag, './/wd:ID[@wd:type="Custom_Organization_Reference_ID"]')
-        if custom_org_id:
-            wortakObj.Custom_Organization_Reference_ID = custom_org_id
-
-        cost_center_id = self.safe_get_text(worktag, './/wd:ID[@wd:type="Cost_Center_Reference_ID"]')
-        if cost_center_id:
-            wortakObj.Cost_Center_Reference_ID = cost_center_id
-
-        supplier_id = self.safe_get_text(worktag, 'wd:ID[@wd:type="Supplier_ID"]')
-        if supplier_id:
-            wortakObj.Supplier_ID = supplier_id
-
-        project_id = self.safe_get_text(worktag, 'wd:ID[@wd:type="Project_ID"]')
-        if project_id:
-            wortakObj.Project_ID = project_id
-
-        spend_cat_id = self.safe_get_text(worktag, 'wd:ID[@wd:type="Spend_Category_ID"]')
-        if spend_cat_id:
-            wortakObj.Spend_Category_ID = spend_cat_id
-
-        revenue_cat_id = self.safe_get_text(worktag, 'wd:ID[@wd:type="Revenue_Category_ID"]')
-        if revenue_cat_id:
-            wortakObj.Revenue_Category_ID = revenue_cat_id
-
-        cust_contract_id = self.safe_get_text(worktag, 'wd:ID[@wd:type="Customer_Contract_Reference_ID"]')
-        if cust_contract_id:
-            wortakObj.Customer_Contract_Reference_ID = cust_contract_id
-
-        # Cash Flow Code
-        cash_flow_code = self.safe_get_text(worktag, 'wd:ID[@wd:type="Custom_Worktag_3_ID"]')
-        if cash_flow_code:
-            wortakObj.cash_flow_code = cash_flow_code
-
-        # Customer ID
-        customer_id = self.safe_get_text(worktag, 'wd:ID[@wd:type="Customer_ID"]')
-        if customer_id:
-            wortakObj.customer_id = customer_id
-
-        # Item Destination
-        destination = self.safe_get_text(worktag, 'wd:ID[@wd:type="Custom_Worktag_4_ID"]')
-        if destination:
-            wortakObj.destination_id_cust_worktag_4 = destination
+        ids = self.get_id_map(worktag)
+        for id_type, field_name in WORKTAG_ID_FIELDS:
+            value = ids.get(id_type)
+            if value:
+                setattr(wortakObj, field_name, value)
 
         return wortakObj
+
+
+def int_flag(text: str) -> bool:
+    """ FieldSpec converter of the '0' / '1' flags """
+    return bool(int(text))
+
+
+class FieldExtractor:
+    """
+    Extract a set of declared fields (`FieldSpec`) from entity elements.
+    The specs are compiled once: the child tags are qualified and grouped, then every `extract` call
+    collects all the fields in one walk over the entry children, keeping the first child of each tag like `find`
+    """
+
+    def __init__(self, specs: Iterable[FieldSpec], xml_helper: XMLHelper):
+        """
+        :param specs: Fields to extract, the child paths are relative to the entry e.g: 'wd:Supplier_ID'
+        :param xml_helper: Helper of the service, gives the namespaces
+        """
+        self.specs: Tuple[FieldSpec, ...] = tuple(specs)
+        self.xml_helper = xml_helper
+        self._defaults: Dict[str, Any] = {spec.name: spec.default for spec in self.specs}
+        self._specs_by_tag: Dict[str, List[FieldSpec]] = {}
+        # paths which are not a single child tag, looked up with `find`
+        self._other_specs: List[FieldSpec] = []
+
+        for spec in self.specs:
+            tag = self._qualify(spec.path)
+            if tag is None:
+                self._other_specs.append(spec)
+            else:
+                self._specs_by_tag.setdefault(tag, []).append(spec)
+        self._tags_with_ids = {
+            tag for tag, specs in self._specs_by_tag.items() if any(spec.id_type for spec in specs)
+        }
+
+    def _qualify(self, path: str) -> Optional[str]:
+        if any(character in path for character in './[*@'):
+            return None
+        prefix, _, name = path.rpartition(':')
+        if not prefix:
+            return name
+        namespace = self.xml_helper.ns.get(prefix)
+        return '{' + namespace + '}' + name if namespace else None
+
+    @staticmethod
+    def _convert(spec: FieldSpec, text: Optional[str]) -> Any:
+        if text is None:
+            return spec.default
+        try:
+            return spec.converter(text)
+        except (ValueError, TypeError):
+            return spec.default  # Return the default if conversion fails
+
+    def _read(self, spec: FieldSpec, child: ET.Element, ids: Optional[Dict[str, Optional[str]]]) -> Any:
+        if spec.id_type is None:
+            return self._convert(spec, child.text)
+        return self._convert(spec, ids.get(spec.id_type))
+
+    def extract(self, entry: ET.Element) -> Dict[str, Any]:
+        """
+        :param entry: Entity element
+        :return: Dict of key = field name : converted value
+        """
+        values = dict(self._defaults)
+        found_tags = set()
+
+        for child in entry:
+            specs = self._specs_by_tag.get(child.tag)
+            if specs is None or child.tag in found_tags:
+                continue
+            found_tags.add(child.tag)
+
+            ids = self.xml_helper.get_id_map(child) if child.tag in self._tags_with_ids else None
+            for spec in specs:
+                values[spec.name] = self._read(spec, child, ids)
+
+        for spec in self._other_specs:
+            child = entry.find(spec.path, self.xml_helper.ns)
+            if child is not None:
+                ids = self.xml_helper.get_id_map(child) if spec.id_type else None
+                values[spec.name] = self._read(spec, child, ids)
+
+        return values
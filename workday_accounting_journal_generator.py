@@ -4,6 +4,10 @@ from workday.csv_helpers import CSVJournalHelper
 from workday.workday_api_generator_call import *
 from workday.workday_implement_api import *
 from workday.workday_raas_implementation_api import *
+from workday.transport import *
+from workday.entity_cache import *
+from workday.snapshot_store import *
+from workday.journal_backfill import *
 from workday_new.workday.utils import *
 
 
@@ -28,75 +32,85 @@ def main(input):
 
     # filter_by_creation_date = input.get('filter_by_creation_date', True)
     filter_by_creation_date = str(input.get('filter_by_creation_date', "true")) == "true"
+    # Optional, number of Get_Journals pages fetched concurrently (1 = sequential)
+    page_workers = int(input.get('page_workers') or 1)
+    # Optional, number of pages fetched ahead while the current one is parsed, when page_workers = 1 (0 = disabled)
+    prefetch_depth = int(input.get('prefetch_depth') or 0)
 
     is_test = False if (input.get("is_test") or "") == "false" else True
     _DEFAULT_WORKDAY_API_VERSION = input.get("api_version") or DEFAULT_WORKDAY_API_VERSION
 
-    connector = WorkdayConnector(workday, tenant, client_id, client_secret, refresh_token)
-    connector.acquire_token()
-
-    # Get Raas Data
-    raas_ledger_account = GetRAASLedgerAccount(base_url=connector.base_uri, token=connector.access_token, tenant=tenant)
-    raas_cost_center = GetRAASCostCenter(base_url=connector.base_uri, token=connector.access_token, tenant=tenant)
-    raas_book_code = GetRAASBookCodes(base_url=connector.base_uri, token=connector.access_token, tenant=tenant)
-    raas_subsidiaries = GetRAASCompanies(base_url=connector.base_uri, token=connector.access_token, tenant=tenant)
-    gtm_org_service = GetRAASGeoSales(base_url=connector.base_uri, token=connector.access_token, tenant=tenant)
-
-    resource_category_service = GetResourceCategories(
-        base_url=connector.base_uri, token=connector.access_token,
-        tenant=tenant, api_version=_DEFAULT_WORKDAY_API_VERSION
-    )
-
-    customer_contract_service = GetCustomerContracts(
-        base_url=connector.base_uri, token=connector.access_token,
-        tenant=tenant, api_version=_DEFAULT_WORKDAY_API_VERSION
+    # Optional, parse the journals first then resolve the suppliers, spend categories and contracts in bulk
+    two_phase_mapping = str(input.get('two_phase_mapping', "false")) == "true"
+    two_phase_scope = input.get('two_phase_scope') or TWO_PHASE_SCOPE_ALL
+    # Optional, parse the journal pages incrementally so the memory stays bounded on large pages
+    stream_parse = str(input.get('stream_parse', "false")) == "true"
+    # Optional, number of worker processes parsing each journal page (the mapping stays in this process)
+    parse_processes = int(input.get('parse_processes') or 0) or None
+
+    # Optional, maximum number of entities kept by each lookup service cache ("0" disables the caches)
+    entity_cache_size = int(input.get('entity_cache_size') or DEFAULT_CACHE_MAX_SIZE)
+    # Optional, number of master data RAAS reports downloaded at the same time, while the first journal page is fetched
+    master_data_workers = int(input.get('master_data_workers') or DEFAULT_MASTER_DATA_WORKERS)
+    # Optional, comma separated master data reports only downloaded if a journal line needs them e.g: "GetRAASGeoSales"
+    lazy_master_data_reports = [
+        report.strip() for report in (input.get('lazy_master_data_reports') or '').split(',') if report.strip()
+    ]
+
+    # Shared pooled HTTP transport injected in every service
+    transport = WorkdayTransport(
+        pool_maxsize=int(input.get('http_pool_size') or DEFAULT_POOL_MAXSIZE),
+        read_timeout=float(input.get('http_read_timeout') or DEFAULT_READ_TIMEOUT),
     )
+    connector = WorkdayConnector(workday, tenant, client_id, client_secret, refresh_token, transport=transport)
+    connector.acquire_token()
 
-    suppliers = GetRAASSuppliers(
-        base_url=connector.base_uri, token=connector.access_token,
-        tenant=tenant, api_version=_DEFAULT_WORKDAY_API_VERSION
+    # Optional, local snapshots of the master data reports, reused by the next runs until their TTL expires
+    snapshot_store = None
+    if input.get('snapshot_path'):
+        snapshot_store = RAASSnapshotStore(
+            input['snapshot_path'],
+            default_ttl=float(input.get('snapshot_ttl') or DEFAULT_SNAPSHOT_TTL),
+        )
+        if str(input.get('invalidate_snapshots', "false")) == "true":
+            snapshot_store.invalidate()
+
+    # Get Raas Data and the lookup services
+    master_data = JournalMasterData.load(
+        connector,
+        api_version=_DEFAULT_WORKDAY_API_VERSION,
+        snapshot_store=snapshot_store,
+        entity_cache_size=entity_cache_size,
+        report_workers=master_data_workers,
+        lazy_reports=lazy_master_data_reports,
     )
 
-    # Call the RAAS Endpoint and get all the ledger accounts into a dict
-    ledger_accounts: Dict[str, LedgerAccount] = raas_ledger_account.get_entity_dic()
-    # Call RAAS Endpoint and get all the Cost Centers into a dict
-    cost_centers: Dict[str, CostCenterInfo] = raas_cost_center.get_entity_dic()
-    # Book Code
-    book_codes: Dict[str, BookCodeInfo] = raas_book_code.get_entity_dic()
-    # Call RAAS Endpoint and get all the Companies (Subsidiaries) into a dict
-    subsidiaries: Dict[str, SubsidiaryInfo] = raas_subsidiaries.get_entity_dic()
-    # Use Geo Sales Raas to extract GTM ORG
-    gtm_org: Dict[str, GeoSales] = gtm_org_service.get_entity_dic()
-
     # Init GetAllJournals with all the fetched data
-    get_all_journals = GetAllJournals(
-        base_url=connector.base_uri,
-        tenant=connector.tenant,
-        token=connector.access_token,
-
+    get_all_journals = master_data.journal_service(
+        connector,
         creation_date=accounting_from_date,
         filter_by_creation_date=filter_by_creation_date,
 
-        api_version=connector.version,
-
-        ledger_accounts=ledger_accounts,
-        cost_centers=cost_centers,
-        book_codes=book_codes,
-        gtm_org=gtm_org,
-        subsidiaries=subsidiaries,
-
-        raas_suppliers=suppliers,
-        resource_category_service=resource_category_service,
-        customer_contract_service=customer_contract_service,
+        two_phase=two_phase_mapping,
+        two_phase_scope=two_phase_scope,
+        stream_parse=stream_parse,
+        parse_processes=parse_processes,
     )
 
     journals: List[MappedJournal] = get_all_journals.get_all_entities(
         './/wd:Journal_Entry_Data',
+        max_workers=page_workers,
+        prefetch_depth=prefetch_depth,
         accounting_from_date=accounting_from_date,
         accounting_to_date=accounting_to_date,
         as_of_effective_date=as_of_effective_date,
     )
 
+    # requests sent and connections opened or reused by the shared transport
+    transport_stats = asdict(transport.get_stats())
+    master_data.print_load_reports()
+    master_data.print_cache_stats()
+
     scv_helper = CSVJournalHelper()
     total_journals = len(journals)
     print(f"journals transformed: {total_journals}")
@@ -105,13 +119,6 @@ def main(input):
         # 🔎🕵🏽 filter Journals, check override `callable_condition` function in [workday_implementation_api.py]
         journals = get_all_journals.filter_objects(journals, get_all_journals.callable_condition)
         print(f"journals Filtered: {len(journals)}")
-        csv_content = scv_helper.mapped_journals_to_csv(journals)
-
-        if is_test:
-            scv_helper.export_to_csv(
-                csv_content,
-                f'accounting_journal_{accounting_from_date[0:10]}_to_{accounting_to_date[0:10]}'
-            )
 
         # Split up csv into several chunks
         line_number = input.get('num_row_limit')
@@ -119,20 +126,37 @@ def main(input):
             line_number = int(line_number)
         else:
             line_number = 40000
+        # Optional, maximum size of a chunk in bytes, the chunks are closed at a row boundary
+        max_chunk_bytes = int(input.get('max_chunk_bytes') or 0) or None
+
+        # the rows are written straight into the chunks
+        csvs, chunk_stats = scv_helper.mapped_journals_to_csv_chunks(
+            journals, num_row_limit=line_number, max_chunk_bytes=max_chunk_bytes
+        )
+
+        if is_test:
+            scv_helper.export_chunks_to_csv(
+                csvs,
+                f'accounting_journal_{accounting_from_date[0:10]}_to_{accounting_to_date[0:10]}'
+            )
 
-        csvs: List[str] = get_all_journals.split_csv_content(csv_content, line_number=line_number)
         print(f"Generated {len(csvs)} chunks for {len(journals)} journals")
 
         return {
+            "http_transport_stats": transport_stats,
             "journals_csv_contents": csvs,
+            # rows and bytes of each chunk
+            "journals_csv_chunk_stats": [asdict(stats) for stats in chunk_stats],
             # return process errors and parse error
-            "journals_error": [data for data in get_all_journals.failed_journals]
+            "journals_error": [data for data in get_all_journals.failed_journals + get_all_journals.failed_entity]
         }
     else:
         return {
+            "http_transport_stats": transport_stats,
             "journals_csv_contents": [],  # empty list when nothing is found
+            "journals_csv_chunk_stats": [],
             # return process errors and parse error
-            "journals_error": [data for data in get_all_journals.failed_journals]
+            "journals_error": [data for data in get_all_journals.failed_journals + get_all_journals.failed_entity]
         }
 
 
@@ -156,32 +180,23 @@ if __name__ == '__main__':
 
         start_date = accounting_from_date
         dates = loop_over_date(start_date, days)
+        day_workers = 2  # Number of days exported at the same time
+
+        # One token, one transport and one master data load for all the days
+        transport = WorkdayTransport()
+        connector = WorkdayConnector(workday, tenant, client_id, client_secret, refresh_token, transport=transport)
+        connector.acquire_token()
+        master_data = JournalMasterData.load(connector)
+
+        print(f"🚀 Parsing from {dates[0]} to {dates[-1]}")
+        sink = JournalCSVFileSink()
+        reports = JournalBackfill(connector, master_data, day_workers=day_workers).run(dates[0], dates[-1], sink)
+
+        for report in reports:
+            print(report.date, report.failure or report.errors)
 
-        print("Dates:")
-        csv_files = []
-        for date in dates:
-            print(f"🚀 Parsing for: {date}")
-
-            csv_files.append(f"accounting_journal_{date}_to_{date}_journal_entries.csv")
-
-            res = main({
-                "accounting_from_date": date,
-                "accounting_to_date": date,
-                "workday_server": workday,
-                "workday_tenant": tenant,
-                "workday_client_id": client_id,
-                "workday_client_secret": client_secret,
-                "workday_refresh_token": refresh_token,
-                "is_test": "true",
-                "num_row_limit": 40000,
-                "filter_by_creation_date": filter_by_creation_date,
-            })
-
-            print(res['journals_error'])
-
-            if len(dates):
-                output_file = f"accounting_journal_{dates[0]}_to_{dates[-1]}_journal_entries.csv"
-                merge_csv_files(csv_files, output_file)
+        output_file = f"accounting_journal_{dates[0]}_to_{dates[-1]}_journal_entries.csv"
+        merge_csv_files([sink.path(report.date) for report in reports if report.failure is None], output_file)
     else:
         res = main({
             "accounting_from_date": accounting_from_date,
@@ -1,5 +1,481 @@
+import os
+from dataclasses import dataclass
+from functools import partial
+
 from workday.workday_implement_api import *
 from workday.workday_raas_implementation_api import *
+from workday.transport import *
+from workday.scope_scheduler import *
+
+
+def master_data_output(csv_content: str, num_row_limit: Optional[int], max_chunk_bytes: Optional[int]) -> Dict[str, Any]:
+    """
+    Output of a master data integration, the CSV is also split up into chunks when a limit is given
+    :param csv_content: Generated CSV content
+    :param num_row_limit: Maximum number of rows by chunk (None: no limit)
+    :param max_chunk_bytes: Maximum size of a chunk in bytes, header included (None: no limit)
+    :return: Dict with the CSV, and the chunks with their rows and bytes
+    """
+    output: Dict[str, Any] = {"master_data_csv": csv_content}
+    if num_row_limit or max_chunk_bytes:
+        chunk_writer = CSVChunkWriter.split(csv_content, num_row_limit, max_chunk_bytes)
+        output["master_data_csv_chunks"] = chunk_writer.chunks
+        output["master_data_csv_chunk_stats"] = [asdict(stats) for stats in chunk_writer.chunk_stats]
+    return output
+
+
+@dataclass(frozen=True)
+class ScopeContext:
+    """ What the master data scopes of a run share: the connector, with its token and its transport """
+    connector: WorkdayConnector
+    api_version: str
+
+    @property
+    def raas_args(self) -> Dict[str, Any]:
+        return dict(
+            base_url=self.connector.base_uri,
+            token=self.connector.token_provider,
+            tenant=self.connector.tenant,
+            transport=self.connector.transport,
+        )
+
+    @property
+    def service_args(self) -> Dict[str, Any]:
+        return dict(**self.raas_args, api_version=self.api_version)
+
+
+def master_data_csv(data_list: List[Any], fields) -> str:
+    return CSVExportHelper(fields=fields).generate_csv_content(data_list)
+
+
+"""LEDGER ACCOUNT"""
+
+
+def fetch_ledger_accounts(context: ScopeContext) -> Dict[str, LedgerAccount]:
+    # shared by the ledger account and the ledger account hierarchy scopes
+    return GetRAASLedgerAccount(**context.raas_args).get_entity_dic()
+
+
+def ledger_account_scope(context: ScopeContext, ledger_accounts: Dict[str, LedgerAccount]) -> str:
+    print(ledger_accounts)
+    ledger_accounts_list: List[LedgerAccount] = list(ledger_accounts.values())
+    # @Omer asked `take only the "Corporate COA || Corporate COA Child" in the column Ledger_Account_Account_Sets`
+    # From: https://docs.google.com/spreadsheets/d/1ObsDQllv46CPfaSjAKfFPYa2x2IYZ3uFeqvAq8rtEVI
+    filtered_ledger_account = [la for la in ledger_accounts_list if
+                               'Corporate COA' in la.Account_Sets and 'Corporate COA Child' in la.Account_Sets]
+    return master_data_csv(
+        filtered_ledger_account,
+        [
+            ("Ledger_Account_WD_ID", "WID"),
+            ("Ledger_Account_ID", "Ledger_Account_ID"),
+            ("Ledger_Account_Name", "Ledger_Account_Name"),
+            ("Ledger_Account_Types", "Types"),
+            ("Ledger_Account_Summary_ID", "Ledger_Account_Summary_ID"),
+            ("Ledger_Account_Summary", "Ledger_Account_Summary"),
+            ("Ledger_Account_Account_Sets", lambda o: "||".join(o.Account_Sets or []) if o else None),
+        ],
+    )
+
+
+"""LEDGER_ACCOUNT_HIERARCHY"""
+
+
+def ledger_account_hierarchy_scope(context: ScopeContext, ledger_accounts: Dict[str, LedgerAccount]) -> str:
+    ledger_acc_hierarchies_service = GetRAASLedgerHierarchy(**context.raas_args, ledger_account_dic=ledger_accounts)
+
+    ledger_acc_hierarchies: Dict[str, LedgerAccountHierarchy] = ledger_acc_hierarchies_service.get_entity_dic()
+    print(ledger_acc_hierarchies)
+    return master_data_csv(
+        list(ledger_acc_hierarchies.values()),
+        [
+            ("ledger_account_id", "ledger_account_id"),
+            ("ledger_account_name", "ledger_account_name"),
+
+            ("ledger_account_summary_id", "ledger_account_summary_id"),
+            ("ledger_account_summary_name", "ledger_account_summary_name"),
+            ("ledger_account_type", "ledger_account_type"),
+
+            ("management_view_lvl_1_id", "management_view_lvl_1_id"),
+            ("management_view_lvl_2_id", "management_view_lvl_2_id"),
+            ("management_view_lvl_3_id", "management_view_lvl_3_id"),
+            ("management_view_lvl_3_name", "management_view_lvl_3_name"),
+            ("management_view_lvl_4_id", "management_view_lvl_4_id"),
+            ("management_view_lvl_4_name", "management_view_lvl_4_name"),
+        ],
+    )
+
+
+"""CURRENCY CATEGORY"""
+
+
+def currency_scope(context: ScopeContext) -> str:
+    currency_service = GetCurrencies(**context.service_args)
+
+    eur_cur = currency_service.search_entity('EUR', './/wd:Currency_Data')
+    print(eur_cur)
+    all_currencies = currency_service.get_all_entities('.//wd:Currency_Data')
+    return master_data_csv(
+        list(all_currencies),
+        [
+            ("wid", "wid"),
+            ("currency_description", "currency_description"),
+            ("currency_numeric_code", "currency_numeric_code"),
+            ("currency_id", "currency_id"),
+            ("currency_id", "currency_id"),
+        ],
+    )
+
+
+"""Companies WD CATEGORY"""
+
+
+def companies_wd_scope(context: ScopeContext) -> str:
+    cp_wd_service = GetWDCompanies(**context.raas_args)
+    companies: Dict[str, WorkdayCompanies] = cp_wd_service.get_entity_dic()
+    print(companies.get("LE107"))
+    return master_data_csv(
+        list(companies.values()),
+        [
+            ("wid", "wid"),
+            ("organization_reference_id", "organization_reference_id"),
+            ("company_reference_id", "company_reference_id"),
+            ("name", "descriptor")
+        ],
+    )
+
+
+"""SPEND CATEGORY"""
+
+
+def spend_categories_scope(context: ScopeContext) -> str:
+    spend_category_service = GetResourceCategories(**context.service_args)
+
+    # spend_cat = spend_category_service.get_entity('MAR_2_6', './/wd:Resource_Category_Data')
+    spend_categories = spend_category_service.get_all_entities('.//wd:Resource_Category_Data')
+    return master_data_csv(
+        list(spend_categories),
+        [
+            ("code", "code"),
+            ("name", "name"),
+        ],
+    )
+
+
+"""CUSTOMER CONTRACT CATEGORY"""
+
+
+def customer_contract_scope(context: ScopeContext) -> str:
+    deal_service = GetCustomerContracts(**context.service_args)
+    # deal = deal_service.get_entity(object_id='CUSTOMER_CONTRACT-6-1', data_entity_path='.//wd:Customer_Contract_Data')
+    customer_contracts = deal_service.get_all_entities('.//wd:Customer_Contract_Data')
+    return master_data_csv(
+        customer_contracts,
+        [
+            ("id", "customer_contract_id"),
+            ("name", "contract_name"),
+            ("po_number", "po_number"),
+            ("on_hold", "on_hold"),
+            ("contract_type", "contract_type"),
+        ],
+    )
+
+
+"""REGION CATEGORIES"""
+
+
+def region_categories_scope(context: ScopeContext) -> str:
+    regions_service = Region(**context.service_args)
+    # region = regions_service.get_entity(object_id='GTM_24', data_entity_path='.//wd:Organization_Data')
+    regions = regions_service.get_all_entities('.//wd:Organization_Data')
+    return master_data_csv(
+        regions,
+        [
+            ("code", "code"),
+            ("name", "name"),
+        ],
+    )
+
+
+"""COMPANIES/SUPPLIERS CATEGORIES"""
+
+
+def companies_categories_scope(context: ScopeContext) -> str:
+    companies_service = GetRAASSuppliers(**context.service_args)
+    # supplier = companies_service.get_entity(
+    #     object_id='SUP-691', data_entity_path='.//wd:Supplier_Data',
+    #     as_of_effective_date=None, as_of_entry_datetime=None
+    # )
+    suppliers = companies_service.get_all_entities(
+        './/wd:Supplier_Data',
+        # can use effective and entry date
+        # as_of_effective_date="2024-09-05", as_of_entry_datetime="2024-09-05"
+    )
+    return master_data_csv(
+        suppliers,
+        [
+            ("vendor_ref_id", "vendor_ref_id"),
+            ("id", "vendor_code"),
+            ("company_name", "company_name"),
+            ("approval_status", "approval_status"),
+            ("supplier_category", "supplier_category"),
+            ("supplier_group_category", "supplier_group_category"),
+            ("worktag_only", "worktag_only"),
+            ("submit", "submit"),
+            ("disable_change_order", "disable_change_order"),
+            ("acknowledgement_expected", "acknowledgement_expected"),
+            ("enable_global_location_number", "enable_global_location_number"),
+            ("enable_asn", "enable_asn"),
+            ("edit_port_taxes", "edit_port_taxes"),
+            ("payment_terms_reference", "payment_terms_reference"),
+            ("default_payment_type_reference", "default_payment_type_reference"),
+            ("fatca", "fatca"),
+            ("irs_1099_supplier", "irs_1099_supplier"),
+            ("invoice_any_supplier", "invoice_any_supplier"),
+            ("supplier_minimum_order_amount", "supplier_minimum_order_amount"),
+            ("asn_due_in_days", "asn_due_in_days"),
+        ],
+    )
+
+
+"""PAYMENT METHOD CATEGORIES"""
+
+
+def pay_meth_categories_scope(context: ScopeContext) -> str:
+    pay_meth_service = GetPaymentMethod(**context.service_args)
+    # payment_meth = pay_meth_service.get_entity(object_id='Immediate', data_entity_path='.//wd:Payment_Term_Data')
+    payment_methods = pay_meth_service.get_all_entities(
+        './/wd:Payment_Term_Data', as_of_effective_date=None, as_of_entry_datetime=None
+    )
+    return master_data_csv(
+        payment_methods,
+        [
+            ("payment_term_id", "payment_term_id"),
+            ("name", "name"),
+            ("cut_off_day", "cut_off_day"),
+            ("grace_days", "grace_days"),
+            ("payment_discount_days", "payment_discount_days"),
+            ("payment_discount_percent", "payment_discount_percent"),
+        ],
+    )
+
+
+"""SUBSIDIARIES aka Comnpanies CATEGORIES"""
+
+
+def subsidiaries_categories_scope(context: ScopeContext) -> str:
+    subsidiaries_service = GetRAASCompanies(**context.raas_args)
+    subsidiaries = subsidiaries_service.get_entity_dic()
+    return master_data_csv(
+        list(subsidiaries.values()),
+        [
+            ("id", "internal_id"),
+            ("name", "name"),
+        ],
+    )
+
+
+"""BOOK CODE CATEGORIES"""
+
+
+def book_code_categories_scope(context: ScopeContext) -> str:
+    book_code_service = GetRAASBookCodes(**context.raas_args)
+    book_codes = book_code_service.get_entity_dic()
+    print(book_codes)
+    return master_data_csv(
+        list(book_codes.values()),
+        [
+            ("book_code", "book_code_id"),
+            ("book_code_name", "name"),
+        ],
+    )
+
+
+"""COST CENTER CATEGORIES"""
+
+
+def cost_center_categories_scope(context: ScopeContext) -> str:
+    cost_center_service = GetRAASCostCenter(**context.raas_args)
+    cost_centers = cost_center_service.get_entity_dic()
+    print(cost_centers)
+    cost_centers_list: List[CostCenterInfo] = list(cost_centers.values())
+    filtered_active_cost_center = [cc for cc in cost_centers_list if cc.isActive]
+    return master_data_csv(
+        filtered_active_cost_center,
+        [
+            ("referenceID", "referenceID"),
+            ("name", "name"),
+            ("code", "code"),
+            ("isActive", "isActive"),
+            # Manager
+            ("manager_employee_id", "manager.manager_employee_id"),
+            ("manager_name", "manager.manager_name"),
+            ("manager_email", "manager.manager_email"),
+        ],
+    )
+
+
+"""SITES"""
+
+
+def sites_scope(context: ScopeContext) -> str:
+    sites_service = GetRAASSites(**context.raas_args)
+    sites: Dict[str, SiteInfo] = sites_service.get_entity_dic()
+    print(sites)
+    return master_data_csv(
+        list(sites.values()),
+        [
+            ("site_id", "site_id"),
+            ("inactive", "inactive"),
+            ("location_name", "location_name"),
+            ("location_address", "location_address"),
+            ("location_type", "location_type"),
+            ("location_usage", "location_usage"),
+            ("country_name", "country_name"),
+            ("country_digit_code", "country_digit_code"),
+            ("country_alpha_code", "country_alpha_code"),
+            ("location_hierarchies", "location_hierarchies"),
+        ],
+    )
+
+
+"""Employees"""
+
+
+def employees_scope(context: ScopeContext) -> str:
+    employees_service = GetRAASEmployees(
+        **context.raas_args,
+        worker_types='d588c334446c11de98360015c5e6daf6!d588c41a446c11de98360015c5e6daf6',
+    )
+    employees: Dict[str, EmployeeInfo] = employees_service.get_entity_dic()
+    print(list(employees.items())[:5])
+    return master_data_csv(
+        list(employees.values()),
+        [
+            ("employee_id", "employee_id"),
+            ("full_legal_name", "full_legal_name"),
+            ("employee_contract_type", "employee_contract_type"),
+            ("primary_work_email", "primary_work_email"),
+            ("manager_employee_id", "manager.manager_employee_id"),
+            ("manager_name", "manager.manager_name"),
+            ("manager_email", "manager.manager_email"),
+            ("primary_work_address", "primary_work_address"),
+            ("country_name", "primary_work_country_address.country_name"),
+            ("country_digit_code", "primary_work_country_address.country_digit_code"),
+            ("country_alpha_code", "primary_work_country_address.country_alpha_code"),
+        ],
+    )
+
+
+"""ASSETS"""
+
+
+def assets_scope(context: ScopeContext) -> str:
+    asset_cat_service = GetRAASAssetCategories(**context.raas_args)
+    asset_cat: Dict[str, AssetCategories] = asset_cat_service.get_entity_dic()
+    print(asset_cat)
+    return master_data_csv(
+        list(asset_cat.values()),
+        [
+            ("asset_class_id", "asset_class_id"),
+            ("asset_class_name", "asset_class_name"),
+        ],
+    )
+
+
+"""GTM ORGANIZATION"""
+
+
+def gtm_org_scope(context: ScopeContext) -> str:
+    gtm_org_service = GetRAASGeoSales(**context.raas_args)
+
+    gtm_orgs: Dict[str, GeoSales] = gtm_org_service.get_entity_dic()
+    print(gtm_orgs)
+    return master_data_csv(
+        list(gtm_orgs.values()),
+        [
+            ("dimension_id", "dimension_id"),
+            ("name", "name"),
+            ("organization_active", "organization_active"),
+            ("dimension_name", "dimension_name"),
+        ],
+    )
+
+
+""" CUSTOMERS """
+
+
+def customers_scope(context: ScopeContext) -> str:
+    currency_service = GetCustomers(**context.service_args)
+
+    #customer_401 = currency_service.search_entity('C-LE401', './/wd:Customer_Data')
+    #print(customer_401)
+    all_customers = currency_service.get_all_entities('.//wd:Customer_Data')
+    return master_data_csv(
+        list(all_customers),
+        [
+            ("customer_id", "Customer_ID"),
+            ("Customer_Reference_ID", "Customer_Reference_ID"),
+            ("Customer_Name", "Customer_Name"),
+            ("Customer_Category_ID", "Customer_Category_ID"),
+            ("Customer_Group_ID", "Customer_Group_ID"),
+            ("Payment_Terms_ID", "Payment_Terms_ID"),
+            ("Worktag_Only", "Worktag_Only"),
+            ("Exempt", "Exempt"),
+            ("Submit", "Submit"),
+            ("Exempt_From_Dunning", "Submit"),
+
+            ("credit_limit", "credit_limit"),
+            ("hierarchy_credit_limit", "hierarchy_credit_limit"),
+            ("credit_verification_date", "credit_verification_date"),
+            ("DUNS_number", "DUNS_number"),
+
+            ("Customer_Satisfaction_Score", "Customer_Satisfaction_Score"),
+            ("Composite_Risk_Score", "Composite_Risk_Score"),
+            ("Composite_Risk_Date", "Composite_Risk_Date"),
+            ("Composite_Risk_Note", "Composite_Risk_Note"),
+        ],
+    )
+
+
+# Steps shared by several scopes: name -> function called with the context
+SHARED_STEPS: Dict[str, Callable[[ScopeContext], Any]] = {
+    'ledger_accounts': fetch_ledger_accounts,
+}
+# integration scope -> (step name, also the CSV file name of the test mode, function called with the context and
+# the results of the steps it depends on, dependencies), in the order of the test mode run
+MASTER_DATA_SCOPES: Dict[int, Tuple[str, Callable[..., str], Tuple[str, ...]]] = {
+    LEDGER_ACCOUNT: ('ledger_account', ledger_account_scope, ('ledger_accounts',)),
+    LEDGER_ACCOUNT_HIERARCHY: ('ledger_account_hierarchy', ledger_account_hierarchy_scope, ('ledger_accounts',)),
+    CURRENCY: ('all_currencies', currency_scope, ()),
+    COMPANIES_WD: ('workday_companies', companies_wd_scope, ()),
+    SPEND_CATEGORIES: ('spend_categories', spend_categories_scope, ()),
+    CUSTOMER_CONTRACT: ('customer_contracts', customer_contract_scope, ()),
+    REGION_CATEGORIES: ('regions_GTM', region_categories_scope, ()),
+    COMPANIES_CATEGORIES: ('vendors_suppliers', companies_categories_scope, ()),
+    PAY_METH_CATEGORIES: ('payment_methods', pay_meth_categories_scope, ()),
+    SUBSIDIARIES_CATEGORIES: ('companies_aka_subsidiaries', subsidiaries_categories_scope, ()),
+    BOOK_CODE_CATEGORIES: ('book_codes', book_code_categories_scope, ()),
+    COST_CENTER_CATEGORIES: ('cost_centers', cost_center_categories_scope, ()),
+    SITES: ('sites', sites_scope, ()),
+    EMPLOYEES: ('employees', employees_scope, ()),
+    ASSETS: ('asset_categories', assets_scope, ()),
+    GTM_ORG: ('GTM_organizations', gtm_org_scope, ()),
+    CUSTOMERS: ('customers', customers_scope, ()),
+}
+
+
+def build_scope_scheduler(context: ScopeContext, max_workers: int = DEFAULT_SCOPE_WORKERS) -> ScopeScheduler:
+    """
+    Declare the shared steps and the master data scopes with their dependencies
+    :param context: Connector and API version of the scopes
+    :param max_workers: Number of steps run at the same time
+    """
+    scheduler = ScopeScheduler(max_workers=max_workers)
+    for name, step in SHARED_STEPS.items():
+        scheduler.add(name, partial(step, context))
+    for name, scope_function, depends_on in MASTER_DATA_SCOPES.values():
+        scheduler.add(name, partial(scope_function, context), depends_on)
+    return scheduler
 
 
 def main(input):
@@ -18,498 +494,48 @@ def main(input):
     is_test = False if (input.get("is_test") or "") == "false" else True
     # Optional  argument
     generate_all = is_test
-    IS_PROD = not is_test
     _DEFAULT_WORKDAY_API_VERSION = input.get("api_version") or DEFAULT_WORKDAY_API_VERSION
-
-    connector = WorkdayConnector(workday, tenant, client_id, client_secret, refresh_token)
+    # Optional, split up the CSV into chunks of rows and / or bytes, closed at a row boundary
+    num_row_limit = int(input.get('num_row_limit') or 0) or None
+    max_chunk_bytes = int(input.get('max_chunk_bytes') or 0) or None
+    # Optional, number of scopes run at the same time when all of them are generated
+    scope_workers = int(input.get('scope_workers') or DEFAULT_SCOPE_WORKERS)
+
+    # Shared pooled HTTP transport injected in every service
+    transport = WorkdayTransport(
+        pool_maxsize=int(input.get('http_pool_size') or DEFAULT_POOL_MAXSIZE),
+        read_timeout=float(input.get('http_read_timeout') or DEFAULT_READ_TIMEOUT),
+    )
+    connector = WorkdayConnector(workday, tenant, client_id, client_secret, refresh_token, transport=transport)
     connector.acquire_token()
 
-    """LEDGER ACCOUNT"""
-    if generate_all or LEDGER_ACCOUNT == integration_scope:
-        ledger_account_service = GetRAASLedgerAccount(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-        )
-        ledger_accounts: Dict[str, LedgerAccount] = ledger_account_service.get_entity_dic()
-        print(ledger_accounts)
-        ledger_accounts_list: List[LedgerAccount] = list(ledger_accounts.values())
-        # @Omer asked `take only the "Corporate COA || Corporate COA Child" in the column Ledger_Account_Account_Sets`
-        # From: https://docs.google.com/spreadsheets/d/1ObsDQllv46CPfaSjAKfFPYa2x2IYZ3uFeqvAq8rtEVI
-        filtered_ledger_account = [la for la in ledger_accounts_list if
-                                   'Corporate COA' in la.Account_Sets and 'Corporate COA Child' in la.Account_Sets]
-        csv_content: str = ledger_account_service.generate_csv(
-            filtered_ledger_account,
-            [
-                ("Ledger_Account_WD_ID", lambda o: o.WID if o else None),
-                ("Ledger_Account_ID", lambda o: o.Ledger_Account_ID if o else None),
-                ("Ledger_Account_Name", lambda o: o.Ledger_Account_Name if o else None),
-                ("Ledger_Account_Types", lambda o: o.Types if o else None),
-                ("Ledger_Account_Summary_ID", lambda o: o.Ledger_Account_Summary_ID if o else None),
-                ("Ledger_Account_Summary", lambda o: o.Ledger_Account_Summary if o else None),
-                ("Ledger_Account_Account_Sets", lambda o: "||".join(o.Account_Sets or []) if o else None),
-            ],
-            filename='generated_csv/ledger_account',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-
-    """LEDGER_ACCOUNT_HIERARCHY"""
-    if generate_all or LEDGER_ACCOUNT_HIERARCHY == integration_scope:
-        ledger_account_service = GetRAASLedgerAccount(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-        )
-
-        ledger_acc_hierarchies_service = GetRAASLedgerHierarchy(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-            ledger_account_dic=ledger_account_service.get_entity_dic(),
-        )
-
-        ledger_acc_hierarchies: Dict[str, LedgerAccountHierarchy] = ledger_acc_hierarchies_service.get_entity_dic()
-        print(ledger_acc_hierarchies)
-        csv_content: str = ledger_acc_hierarchies_service.generate_csv(
-            list(ledger_acc_hierarchies.values()),
-            [
-                ("ledger_account_id", lambda o: o.ledger_account_id if o else None),
-                ("ledger_account_name", lambda o: o.ledger_account_name if o else None),
-
-                ("ledger_account_summary_id", lambda o: o.ledger_account_summary_id if o else None),
-                ("ledger_account_summary_name", lambda o: o.ledger_account_summary_name if o else None),
-                ("ledger_account_type", lambda o: o.ledger_account_type if o else None),
-
-                ("management_view_lvl_1_id", lambda o: o.management_view_lvl_1_id if o else None),
-                ("management_view_lvl_2_id", lambda o: o.management_view_lvl_2_id if o else None),
-                ("management_view_lvl_3_id", lambda o: o.management_view_lvl_3_id if o else None),
-                ("management_view_lvl_3_name", lambda o: o.management_view_lvl_3_name if o else None),
-                ("management_view_lvl_4_id", lambda o: o.management_view_lvl_4_id if o else None),
-                ("management_view_lvl_4_name", lambda o: o.management_view_lvl_4_name if o else None),
-            ],
-            filename='generated_csv/ledger_account_hierarchy',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """CURRENCY CATEGORY"""
-    if generate_all or CURRENCY == integration_scope:
-        currency_service = GetCurrencies(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-            api_version=_DEFAULT_WORKDAY_API_VERSION,
-        )
-
-        eur_cur = currency_service.search_entity('EUR', './/wd:Currency_Data')
-        print(eur_cur)
-        all_currencies = currency_service.get_all_entities('.//wd:Currency_Data')
-        csv_content: str = currency_service.generate_csv(
-            list(all_currencies),
-            [
-                ("wid", lambda o: o.wid if o else None),
-                ("currency_description", lambda o: o.currency_description if o else None),
-                ("currency_numeric_code", lambda o: o.currency_numeric_code if o else None),
-                ("currency_id", lambda o: o.currency_id if o else None),
-                ("currency_id", lambda o: o.currency_id if o else None),
-            ],
-            filename='generated_csv/all_currencies',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """Companies WD CATEGORY"""
-    if generate_all or COMPANIES_WD == integration_scope:
-        cp_wd_service = GetWDCompanies(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-        )
-        companies: Dict[str, WorkdayCompanies] = cp_wd_service.get_entity_dic()
-        print(companies.get("LE107"))
-        csv_content: str = cp_wd_service.generate_csv(
-            list(companies.values()),
-            [
-                ("wid", lambda o: o.wid if o else None),
-                ("organization_reference_id", lambda o: o.organization_reference_id if o else None),
-                ("company_reference_id", lambda o: o.company_reference_id if o else None),
-                ("name", lambda o: o.descriptor if o else None)
-            ],
-            filename='generated_csv/workday_companies',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """SPEND CATEGORY"""
-    if generate_all or SPEND_CATEGORIES == integration_scope:
-        spend_category_service = GetResourceCategories(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-            api_version=_DEFAULT_WORKDAY_API_VERSION,
-        )
-
-        # spend_cat = spend_category_service.get_entity('MAR_2_6', './/wd:Resource_Category_Data')
-        spend_categories = spend_category_service.get_all_entities('.//wd:Resource_Category_Data')
-        csv_content: str = spend_category_service.generate_csv(
-            list(spend_categories),
-            [
-                ("code", lambda o: o.code if o else None),
-                ("name", lambda o: o.name if o else None),
-            ],
-            filename='generated_csv/spend_categories',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """CUSTOMER CONTRACT CATEGORY"""
-    if generate_all or CUSTOMER_CONTRACT == integration_scope:
-        deal_service = GetCustomerContracts(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-            api_version=_DEFAULT_WORKDAY_API_VERSION
-        )
-        # deal = deal_service.get_entity(object_id='CUSTOMER_CONTRACT-6-1', data_entity_path='.//wd:Customer_Contract_Data')
-        customer_contracts = deal_service.get_all_entities('.//wd:Customer_Contract_Data')
-        csv_content: str = deal_service.generate_csv(
-            customer_contracts,
-            [
-                ("id", lambda o: o.customer_contract_id if o else None),
-                ("name", lambda o: o.contract_name if o else None),
-                ("po_number", lambda o: o.po_number if o else None),
-                ("on_hold", lambda o: o.on_hold if o else None),
-                ("contract_type", lambda o: o.contract_type if o else None),
-            ],
-            filename='generated_csv/customer_contracts',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """REGION CATEGORIES"""
-    if generate_all or REGION_CATEGORIES == integration_scope:
-        regions_service = Region(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-            api_version=_DEFAULT_WORKDAY_API_VERSION
-        )
-        # region = regions_service.get_entity(object_id='GTM_24', data_entity_path='.//wd:Organization_Data')
-        regions = regions_service.get_all_entities('.//wd:Organization_Data')
-        csv_content: str = regions_service.generate_csv(
-            regions,
-            [
-                ("code", lambda o: o.code if o else None),
-                ("name", lambda o: o.name if o else None),
-            ],
-            filename='generated_csv/regions_GTM',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """COMPANIES/SUPPLIERS CATEGORIES"""
-    if generate_all or COMPANIES_CATEGORIES == integration_scope:
-        companies_service = GetRAASSuppliers(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-            api_version=_DEFAULT_WORKDAY_API_VERSION
-        )
-        # supplier = companies_service.get_entity(
-        #     object_id='SUP-691', data_entity_path='.//wd:Supplier_Data',
-        #     as_of_effective_date=None, as_of_entry_datetime=None
-        # )
-        suppliers = companies_service.get_all_entities(
-            './/wd:Supplier_Data',
-            # can use effective and entry date
-            # as_of_effective_date="2024-09-05", as_of_entry_datetime="2024-09-05"
-        )
-        csv_content: str = companies_service.generate_csv(
-            suppliers,
-            [
-                ("vendor_ref_id", lambda o: o.vendor_ref_id if o else None),
-                ("id", lambda o: o.vendor_code if o else None),
-                ("company_name", lambda o: o.company_name if o else None),
-                ("approval_status", lambda o: o.approval_status if o else None),
-                ("supplier_category", lambda o: o.supplier_category if o else None),
-                ("supplier_group_category", lambda o: o.supplier_group_category if o else None),
-                ("worktag_only", lambda o: o.worktag_only if o else None),
-                ("submit", lambda o: o.submit if o else None),
-                ("disable_change_order", lambda o: o.disable_change_order if o else None),
-                ("acknowledgement_expected", lambda o: o.acknowledgement_expected if o else None),
-                ("enable_global_location_number", lambda o: o.enable_global_location_number if o else None),
-                ("enable_asn", lambda o: o.enable_asn if o else None),
-                ("edit_port_taxes", lambda o: o.edit_port_taxes if o else None),
-                ("payment_terms_reference", lambda o: o.payment_terms_reference if o else None),
-                ("default_payment_type_reference", lambda o: o.default_payment_type_reference if o else None),
-                ("fatca", lambda o: o.fatca if o else None),
-                ("irs_1099_supplier", lambda o: o.irs_1099_supplier if o else None),
-                ("invoice_any_supplier", lambda o: o.invoice_any_supplier if o else None),
-                ("supplier_minimum_order_amount", lambda o: o.supplier_minimum_order_amount if o else None),
-                ("asn_due_in_days", lambda o: o.asn_due_in_days if o else None),
-            ],
-            filename='generated_csv/vendors_suppliers',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """PAYMENT METHOD CATEGORIES"""
-    if generate_all or PAY_METH_CATEGORIES == integration_scope:
-        pay_meth_service = GetPaymentMethod(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-            api_version=_DEFAULT_WORKDAY_API_VERSION
-        )
-        # payment_meth = pay_meth_service.get_entity(object_id='Immediate', data_entity_path='.//wd:Payment_Term_Data')
-        payment_methods = pay_meth_service.get_all_entities(
-            './/wd:Payment_Term_Data', as_of_effective_date=None, as_of_entry_datetime=None
-        )
-        csv_content: str = pay_meth_service.generate_csv(
-            payment_methods,
-            [
-                ("payment_term_id", lambda o: o.payment_term_id if o else None),
-                ("name", lambda o: o.name if o else None),
-                ("cut_off_day", lambda o: o.cut_off_day if o else None),
-                ("grace_days", lambda o: o.grace_days if o else None),
-                ("payment_discount_days", lambda o: o.payment_discount_days if o else None),
-                ("payment_discount_percent", lambda o: o.payment_discount_percent if o else None),
-            ],
-            filename='generated_csv/payment_methods',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """SUBSIDIARIES aka Comnpanies CATEGORIES"""
-    if generate_all or SUBSIDIARIES_CATEGORIES == integration_scope:
-        subsidiaries_service = GetRAASCompanies(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant
-        )
-        subsidiaries = subsidiaries_service.get_entity_dic()
-        csv_content: str = subsidiaries_service.generate_csv(
-            list(subsidiaries.values()),
-            [
-                ("id", lambda o: o.internal_id if o else None),
-                ("name", lambda o: o.name if o else None),
-            ],
-            filename='generated_csv/companies_aka_subsidiaries',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """BOOK CODE CATEGORIES"""
-    if generate_all or BOOK_CODE_CATEGORIES == integration_scope:
-        book_code_service = GetRAASBookCodes(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-        )
-        book_codes = book_code_service.get_entity_dic()
-        print(book_codes)
-        csv_content: str = book_code_service.generate_csv(
-            list(book_codes.values()),
-            [
-                ("book_code", lambda o: o.book_code_id if o else None),
-                ("book_code_name", lambda o: o.name if o else None),
-            ],
-            filename='generated_csv/book_codes',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """COST CENTER CATEGORIES"""
-    if generate_all or COST_CENTER_CATEGORIES == integration_scope:
-        cost_center_service = GetRAASCostCenter(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-        )
-        cost_centers = cost_center_service.get_entity_dic()
-        print(cost_centers)
-        cost_centers_list: List[CostCenterInfo] = list(cost_centers.values())
-        filtered_active_cost_center = [cc for cc in cost_centers_list if cc.isActive]
-        csv_content: str = cost_center_service.generate_csv(
-            filtered_active_cost_center,
-            [
-                ("referenceID", lambda o: o.referenceID if o else None),
-                ("name", lambda o: o.name if o else None),
-                ("code", lambda o: o.code if o else None),
-                ("isActive", lambda o: o.isActive if o else None),
-                # Manager
-                ("manager_employee_id", lambda o: o.manager.manager_employee_id if o.manager else None),
-                ("manager_name", lambda o: o.manager.manager_name if o.manager else None),
-                ("manager_email", lambda o: o.manager.manager_email if o.manager else None),
-            ],
-            filename='generated_csv/cost_centers',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """SITES"""
-    if generate_all or SITES == integration_scope:
-        sites_service = GetRAASSites(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-        )
-        sites: Dict[str, SiteInfo] = sites_service.get_entity_dic()
-        print(sites)
-        csv_content: str = sites_service.generate_csv(
-            list(sites.values()),
-            [
-                ("site_id", lambda o: o.site_id if o else None),
-                ("inactive", lambda o: o.inactive if o else None),
-                ("location_name", lambda o: o.location_name if o else None),
-                ("location_address", lambda o: o.location_address if o else None),
-                ("location_type", lambda o: o.location_type if o else None),
-                ("location_usage", lambda o: o.location_usage if o else None),
-                ("country_name", lambda o: o.country_name if o else None),
-                ("country_digit_code", lambda o: o.country_digit_code if o else None),
-                ("country_alpha_code", lambda o: o.country_alpha_code if o else None),
-                ("location_hierarchies", lambda o: o.location_hierarchies if o else None),
-            ],
-            filename='generated_csv/sites',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """Employees"""
-    if generate_all or EMPLOYEES == integration_scope:
-        employees_service = GetRAASEmployees(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-            worker_types='d588c334446c11de98360015c5e6daf6!d588c41a446c11de98360015c5e6daf6'
-        )
-        employees: Dict[str, EmployeeInfo] = employees_service.get_entity_dic()
-        print(list(employees.items())[:5])
-        csv_content: str = employees_service.generate_csv(
-            list(employees.values()),
-            [
-                ("employee_id", lambda o: o.employee_id if o else None),
-                ("full_legal_name", lambda o: o.full_legal_name if o else None),
-                ("employee_contract_type", lambda o: o.employee_contract_type if o else None),
-                ("primary_work_email", lambda o: o.primary_work_email if o else None),
-                ("manager_employee_id", lambda o: o.manager.manager_employee_id if o.manager else None),
-                ("manager_name", lambda o: o.manager.manager_name if o.manager else None),
-                ("manager_email", lambda o: o.manager.manager_email if o.manager else None),
-                ("primary_work_address", lambda o: o.primary_work_address if o else None),
-                ("country_name",
-                 lambda o: o.primary_work_country_address.country_name if o.primary_work_country_address else None),
-                ("country_digit_code", lambda
-                    o: o.primary_work_country_address.country_digit_code if o.primary_work_country_address else None),
-                ("country_alpha_code", lambda
-                    o: o.primary_work_country_address.country_alpha_code if o.primary_work_country_address else None),
-            ],
-            filename='generated_csv/employees',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """ASSETS"""
-    if generate_all or ASSETS == integration_scope:
-        asset_cat_service = GetRAASAssetCategories(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-        )
-        asset_cat: Dict[str, AssetCategories] = asset_cat_service.get_entity_dic()
-        print(asset_cat)
-        csv_content: str = asset_cat_service.generate_csv(
-            list(asset_cat.values()),
-            [
-                ("asset_class_id", lambda o: o.asset_class_id if o else None),
-                ("asset_class_name", lambda o: o.asset_class_name if o else None),
-            ],
-            filename='generated_csv/asset_categories',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """GTM ORGANIZATION"""
-    if generate_all or GTM_ORG == integration_scope:
-        gtm_org_service = GetRAASGeoSales(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant
-        )
-
-        gtm_orgs: Dict[str, GeoSales] = gtm_org_service.get_entity_dic()
-        print(gtm_orgs)
-        csv_content: str = gtm_org_service.generate_csv(
-            list(gtm_orgs.values()),
-            [
-                ("dimension_id", lambda o: o.dimension_id if o else None),
-                ("name", lambda o: o.name if o else None),
-                ("organization_active", lambda o: o.organization_active if o else None),
-                ("dimension_name", lambda o: o.dimension_name if o else None),
-            ],
-            filename='generated_csv/GTM_organizations',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
-
-    """ CUSTOMERS """
-    if generate_all or CUSTOMERS == integration_scope:
-        currency_service = GetCustomers(
-            base_url=connector.base_uri,
-            token=connector.access_token,
-            tenant=tenant,
-            api_version=_DEFAULT_WORKDAY_API_VERSION,
-        )
-
-        #customer_401 = currency_service.search_entity('C-LE401', './/wd:Customer_Data')
-        #print(customer_401)
-        all_customers = currency_service.get_all_entities('.//wd:Customer_Data')
-        csv_content: str = currency_service.generate_csv(
-            list(all_customers),
-            [
-                ("customer_id", lambda o: o.Customer_ID if o else None),
-                ("Customer_Reference_ID", lambda o: o.Customer_Reference_ID if o else None),
-                ("Customer_Name", lambda o: o.Customer_Name if o else None),
-                ("Customer_Category_ID", lambda o: o.Customer_Category_ID if o else None),
-                ("Customer_Group_ID", lambda o: o.Customer_Group_ID if o else None),
-                ("Payment_Terms_ID", lambda o: o.Payment_Terms_ID if o else None),
-                ("Worktag_Only", lambda o: o.Worktag_Only if o else None),
-                ("Exempt", lambda o: o.Exempt if o else None),
-                ("Submit", lambda o: o.Submit if o else None),
-                ("Exempt_From_Dunning", lambda o: o.Submit if o else None),
-
-                ("credit_limit", lambda o: o.credit_limit if o else None),
-                ("hierarchy_credit_limit", lambda o: o.hierarchy_credit_limit if o else None),
-                ("credit_verification_date", lambda o: o.credit_verification_date if o else None),
-                ("DUNS_number", lambda o: o.DUNS_number if o else None),
-
-                ("Customer_Satisfaction_Score", lambda o: o.Customer_Satisfaction_Score if o else None),
-                ("Composite_Risk_Score", lambda o: o.Composite_Risk_Score if o else None),
-                ("Composite_Risk_Date", lambda o: o.Composite_Risk_Date if o else None),
-                ("Composite_Risk_Note", lambda o: o.Composite_Risk_Note if o else None),
-            ],
-            filename='generated_csv/customers',
-            prod=IS_PROD
-        )
-        if IS_PROD:
-            return {"master_data_csv": csv_content}
+    context = ScopeContext(connector=connector, api_version=_DEFAULT_WORKDAY_API_VERSION)
+
+    if generate_all:
+        scheduler = build_scope_scheduler(context, max_workers=scope_workers)
+        scope_names = {name for name, _, _ in MASTER_DATA_SCOPES.values()}
+        outputs: List[str] = []
+
+        def write_scope_csv(report: ScopeReport, csv_content: Optional[str]):
+            # each CSV is written as soon as its scope is over, the content is released once written
+            print(f"📄 {report.name}: {report.status} in {report.seconds:.1f}s")
+            if report.name in scope_names and report.status == 'done':
+                os.makedirs('generated_csv', exist_ok=True)
+                CSVExportHelper.export_to_csv(csv_content, f'generated_csv/{report.name}')
+                outputs.append(f'generated_csv/{report.name}.csv')
+
+        reports = scheduler.run(on_done=write_scope_csv, keep_results=False)
+        return {
+            # run time and status of each scope and shared step
+            "scope_reports": [asdict(report) for report in reports],
+            "outputs": outputs,
+        }
+
+    if integration_scope in MASTER_DATA_SCOPES:
+        name = MASTER_DATA_SCOPES[integration_scope][0]
+        scheduler = build_scope_scheduler(context, max_workers=1)
+        scheduler.run([name])
+        return master_data_output(scheduler.result(name), num_row_limit, max_chunk_bytes)
 
 
 if __name__ == '__main__':